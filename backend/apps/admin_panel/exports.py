@@ -0,0 +1,86 @@
+"""
+The admin data tables that /api/v1/admin/export/<dataset>.<format> streams.
+
+Each entry is an apps.core.exports.Dataset: columns, queryset and the list
+view filters it honours. Rendering, chunked reads and gzip live there.
+"""
+from django.contrib.auth import get_user_model
+
+from apps.attendance.models import AttendanceSession
+from apps.core.exports import Dataset, flag_param, text_param
+from apps.enrollments.models import Enrollment
+from apps.payments.models import Payment
+from apps.quizzes.models import Quiz
+
+from .querysets import with_quiz_stats
+
+User = get_user_model()
+
+_USER_COLUMNS = [
+    ('id', 'id'), ('name', 'name'), ('email', 'email'), ('phone_number', 'phone_number'),
+    ('is_active', 'is_active'), ('is_email_verified', 'is_email_verified'),
+    ('created_at', 'created_at'), ('last_login', 'last_login'),
+]
+_IS_ACTIVE = [('is_active', 'is_active', flag_param)]
+
+DATASETS = {dataset.name: dataset for dataset in [
+    Dataset(
+        'students',
+        _USER_COLUMNS[:2] + [('student_id', 'student_id'), ('grade_level', 'grade_level')] + _USER_COLUMNS[2:],
+        lambda: User.objects.filter(role='student'),
+        _IS_ACTIVE,
+    ),
+    Dataset(
+        'teachers',
+        _USER_COLUMNS[:2] + [('teacher_id', 'teacher_id')] + _USER_COLUMNS[2:],
+        lambda: User.objects.filter(role='teacher'),
+        _IS_ACTIVE,
+    ),
+    Dataset(
+        'enrollments',
+        [
+            ('id', 'id'), ('student', 'student_id'), ('student_name', 'student__name'),
+            ('student_email', 'student__email'), ('student_id_num', 'student__student_id'),
+            ('course', 'course_id'), ('course_title', 'course__title'),
+            ('teacher_name', 'course__teacher__name'), ('is_active', 'is_active'),
+            ('enrolled_at', 'enrolled_at'), ('unenrolled_at', 'unenrolled_at'),
+        ],
+        lambda: Enrollment.objects.all(),
+        _IS_ACTIVE + [('course', 'course_id', text_param)],
+        ordering=('-enrolled_at',),
+    ),
+    Dataset(
+        'attendance',
+        [
+            ('id', 'id'), ('course', 'course_id'), ('course_title', 'course__title'),
+            ('teacher_name', 'teacher__name'), ('date', 'date'), ('start_time', 'start_time'),
+            ('total_records', 'total_count'), ('present_count', 'present_count'),
+        ],
+        lambda: AttendanceSession.objects.all(),
+        [('course', 'course_id', text_param)],
+        ordering=('-date', '-start_time'),
+    ),
+    Dataset(
+        'quizzes',
+        [
+            ('id', 'id'), ('title', 'title'), ('course', 'course_id'), ('course_title', 'course__title'),
+            ('duration', 'duration'), ('passing_score', 'passing_score'), ('is_published', 'is_published'),
+            ('max_attempts', 'max_attempts'), ('question_count', 'questions_total'),
+            ('attempts_count', 'attempts_total'), ('avg_score', 'avg_percentage'), ('created_at', 'created_at'),
+        ],
+        lambda: with_quiz_stats(Quiz.objects.all()),
+        [('is_published', 'is_published', flag_param), ('course', 'course_id', text_param)],
+    ),
+    Dataset(
+        'payments',
+        [
+            ('id', 'id'), ('student', 'student_id'), ('student_name', 'student__name'),
+            ('student_email', 'student__email'), ('course', 'course_id'), ('course_title', 'course__title'),
+            ('amount', 'amount'), ('currency', 'currency'), ('status', 'status'),
+            ('payment_method', 'payment_method'), ('stripe_payment_intent_id', 'stripe_payment_intent_id'),
+            ('created_at', 'created_at'),
+        ],
+        lambda: Payment.objects.all(),
+        [('status', 'status', text_param)],
+    ),
+]}
@@ -0,0 +1,119 @@
+"""
+Querysets behind the admin panel's read views.
+
+The admin serializers read related rows and counts from attributes prepared
+here: Prefetch(..., to_attr=...) lists for nested collections and correlated
+subquery annotations for counts and averages. A page therefore costs a fixed
+number of queries however many lessons, enrollments, attempts or reviews sit
+behind it. Counts are subqueries rather than JOIN + COUNT so that several of
+them on one row do not multiply each other.
+
+Serializers fall back to querying when handed a bare instance (right after a
+create or update), so these are an optimisation, never a requirement.
+"""
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, IntegerField, OuterRef, Prefetch, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce
+
+from apps.attendance.models import AttendanceRecord
+from apps.courses.models import Course, CourseReview
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.quizzes.models import Quiz, QuizAttempt, QuizQuestion
+
+
+def _count(queryset, field):
+    """Correlated COUNT(*) of `queryset` rows whose `field` is the outer row."""
+    rows = (
+        queryset.filter(**{field: OuterRef('pk')}).order_by()
+        .values(field).annotate(n=Count('pk')).values('n')
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def _average_percentage():
+    """Mean QuizAttempt.percentage of the outer quiz's attempts."""
+    percentage = Case(
+        When(total_questions__gt=0, then=F('score') * 100.0 / F('total_questions')),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    rows = (
+        QuizAttempt.objects.filter(quiz=OuterRef('pk')).order_by()
+        .values('quiz').annotate(avg=Avg(percentage)).values('avg')
+    )
+    return Coalesce(Subquery(rows, output_field=FloatField()), 0.0)
+
+
+# ─── Users ────────────────────────────────────────────────────────
+
+def with_user_counts(queryset):
+    """Counts shown in the admin user lists (AdminUserListSerializer)."""
+    return queryset.annotate(
+        courses_total=_count(Course.objects.all(), 'teacher'),
+        active_enrollments_total=_count(Enrollment.objects.filter(is_active=True), 'student'),
+    )
+
+
+def user_detail_queryset(queryset):
+    """Everything AdminUserDetailSerializer renders, in three queries."""
+    return queryset.annotate(
+        quiz_attempts_total=_count(QuizAttempt.objects.all(), 'student'),
+        attendance_total=_count(AttendanceRecord.objects.all(), 'student'),
+        attendance_present=_count(AttendanceRecord.objects.filter(is_present=True), 'student'),
+    ).prefetch_related(
+        Prefetch(
+            'courses',
+            queryset=Course.objects.only('id', 'teacher_id', 'title', 'category', 'is_published', 'created_at'),
+            to_attr='admin_courses',
+        ),
+        Prefetch(
+            'enrollments',
+            queryset=Enrollment.objects.filter(is_active=True).select_related('course')
+            .only('id', 'student_id', 'course_id', 'enrolled_at', 'course__title'),
+            to_attr='admin_enrollments',
+        ),
+    )
+
+
+# ─── Courses & Quizzes ────────────────────────────────────────────
+
+def with_quiz_stats(queryset):
+    """Question/attempt counts and average score (AdminQuizSerializer)."""
+    return queryset.annotate(
+        questions_total=_count(QuizQuestion.objects.all(), 'quiz'),
+        attempts_total=_count(QuizAttempt.objects.all(), 'quiz'),
+        avg_percentage=_average_percentage(),
+    )
+
+
+def course_detail_queryset(queryset):
+    """Everything AdminCourseDetailSerializer renders, in five queries."""
+    return queryset.select_related('teacher').prefetch_related(
+        Prefetch(
+            'lessons',
+            queryset=Lesson.objects.only('id', 'course_id', 'title', 'sequence_number', 'file_type', 'duration'),
+            to_attr='admin_lessons',
+        ),
+        Prefetch(
+            'quizzes',
+            queryset=with_quiz_stats(Quiz.objects.all()).only(
+                'id', 'course_id', 'title', 'is_published', 'passing_score', 'duration',
+            ),
+            to_attr='admin_quizzes',
+        ),
+        Prefetch(
+            'enrollments',
+            queryset=Enrollment.objects.filter(is_active=True).select_related('student')
+            .only('id', 'course_id', 'enrolled_at', 'student__id', 'student__name',
+                  'student__email', 'student__student_id'),
+            to_attr='admin_enrollments',
+        ),
+        Prefetch(
+            'reviews',
+            queryset=CourseReview.objects.select_related('student')
+            .only('id', 'course_id', 'rating', 'comment', 'created_at', 'student__name'),
+            to_attr='admin_reviews',
+        ),
+    )
@@ -42,13 +42,19 @@ class AdminUserListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    # The *_total annotations come from querysets.with_user_counts().
+
     def get_courses_count(self, obj):
         if obj.role == 'teacher':
+            if hasattr(obj, 'courses_total'):
+                return obj.courses_total
             return obj.courses.count()
         return 0
 
     def get_enrollments_count(self, obj):
         if obj.role == 'student':
+            if hasattr(obj, 'active_enrollments_total'):
+                return obj.active_enrollments_total
             return obj.enrollments.filter(is_active=True).count()
         return 0
 
@@ -74,16 +80,32 @@ class AdminUserDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    # Prefetched lists and counts come from querysets.user_detail_queryset();
+    # a bare instance (e.g. right after a create) is queried directly.
+
     def get_courses(self, obj):
         """Return courses taught (teacher) or enrolled in (student)."""
         if obj.role == 'teacher':
-            return list(obj.courses.values('id', 'title', 'category', 'is_published', 'created_at'))
+            if not hasattr(obj, 'admin_courses'):
+                return list(obj.courses.values('id', 'title', 'category', 'is_published', 'created_at'))
+            return [
+                {
+                    'id': c.id,
+                    'title': c.title,
+                    'category': c.category,
+                    'is_published': c.is_published,
+                    'created_at': c.created_at,
+                }
+                for c in obj.admin_courses
+            ]
         return []
 
     def get_enrollments(self, obj):
         """Return enrollment details for students."""
         if obj.role == 'student':
-            enrollments = Enrollment.objects.filter(student=obj, is_active=True).select_related('course')
+            enrollments = getattr(obj, 'admin_enrollments', None)
+            if enrollments is None:
+                enrollments = Enrollment.objects.filter(student=obj, is_active=True).select_related('course')
             return [
                 {
                     'id': str(e.id),
@@ -97,13 +119,18 @@ class AdminUserDetailSerializer(serializers.ModelSerializer):
 
     def get_quiz_attempts_count(self, obj):
         if obj.role == 'student':
+            if hasattr(obj, 'quiz_attempts_total'):
+                return obj.quiz_attempts_total
             return obj.quiz_attempts.count()
         return 0
 
     def get_attendance_stats(self, obj):
         if obj.role == 'student':
-            total = AttendanceRecord.objects.filter(student=obj).count()
-            present = AttendanceRecord.objects.filter(student=obj, is_present=True).count()
+            if hasattr(obj, 'attendance_total'):
+                total, present = obj.attendance_total, obj.attendance_present
+            else:
+                total = AttendanceRecord.objects.filter(student=obj).count()
+                present = AttendanceRecord.objects.filter(student=obj, is_present=True).count()
             return {
                 'total_sessions': total,
                 'present': present,
@@ -257,12 +284,16 @@ class AdminCourseListSerializer(serializers.ModelSerializer):
 
 
 class AdminCourseDetailSerializer(serializers.ModelSerializer):
-    """Detailed course view for admin with lessons, quizzes, enrollments."""
+    """
+    Detailed course view for admin with lessons, quizzes, enrollments.
+    Expects an instance from querysets.course_detail_queryset(): every
+    collection and count below is read from its prefetched lists.
+    """
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
     teacher_email = serializers.CharField(source='teacher.email', read_only=True)
-    student_count = serializers.ReadOnlyField()
-    lesson_count = serializers.ReadOnlyField()
-    quiz_count = serializers.ReadOnlyField()
+    student_count = serializers.SerializerMethodField()
+    lesson_count = serializers.SerializerMethodField()
+    quiz_count = serializers.SerializerMethodField()
     lessons = serializers.SerializerMethodField()
     quizzes = serializers.SerializerMethodField()
     enrolled_students = serializers.SerializerMethodField()
@@ -280,20 +311,43 @@ class AdminCourseDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    def get_student_count(self, obj):
+        return len(obj.admin_enrollments)
+
+    def get_lesson_count(self, obj):
+        return len(obj.admin_lessons)
+
+    def get_quiz_count(self, obj):
+        return len(obj.admin_quizzes)
+
     def get_lessons(self, obj):
-        return list(obj.lessons.filter(is_deleted=False).values(
-            'id', 'title', 'sequence_number', 'file_type', 'duration'
-        ))
+        return [
+            {
+                'id': lesson.id,
+                'title': lesson.title,
+                'sequence_number': lesson.sequence_number,
+                'file_type': lesson.file_type,
+                'duration': lesson.duration,
+            }
+            for lesson in obj.admin_lessons
+        ]
 
     def get_quizzes(self, obj):
-        return list(obj.quizzes.values(
-            'id', 'title', 'is_published', 'passing_score', 'duration'
-        ))
+        return [
+            {
+                'id': quiz.id,
+                'title': quiz.title,
+                'is_published': quiz.is_published,
+                'passing_score': quiz.passing_score,
+                'duration': quiz.duration,
+                'question_count': quiz.questions_total,
+                'attempts_count': quiz.attempts_total,
+                'avg_score': round(quiz.avg_percentage, 1),
+            }
+            for quiz in obj.admin_quizzes
+        ]
 
     def get_enrolled_students(self, obj):
-        enrollments = Enrollment.objects.filter(
-            course=obj, is_active=True
-        ).select_related('student')
         return [
             {
                 'id': str(e.student.id),
@@ -302,13 +356,20 @@ class AdminCourseDetailSerializer(serializers.ModelSerializer):
                 'student_id': e.student.student_id,
                 'enrolled_at': e.enrolled_at,
             }
-            for e in enrollments
+            for e in obj.admin_enrollments
         ]
 
     def get_reviews(self, obj):
-        return list(obj.reviews.values(
-            'id', 'student__name', 'rating', 'comment', 'created_at'
-        ))
+        return [
+            {
+                'id': review.id,
+                'student__name': review.student.name,
+                'rating': review.rating,
+                'comment': review.comment,
+                'created_at': review.created_at,
+            }
+            for review in obj.admin_reviews
+        ]
 
 
 # ───────────────────────────────────────────────────────────────
@@ -342,8 +403,8 @@ class AdminAttendanceSessionSerializer(serializers.ModelSerializer):
     """Attendance session overview for admin."""
     course_title = serializers.CharField(source='course.title', read_only=True)
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
-    total_records = serializers.SerializerMethodField()
-    present_count = serializers.SerializerMethodField()
+    # Kept up to date by apps.attendance.services.mark_session on every marking.
+    total_records = serializers.IntegerField(source='total_count', read_only=True)
 
     class Meta:
         model = AttendanceSession
@@ -354,12 +415,6 @@ class AdminAttendanceSessionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_total_records(self, obj):
-        return obj.records.count()
-
-    def get_present_count(self, obj):
-        return obj.records.filter(is_present=True).count()
-
 
 # ───────────────────────────────────────────────────────────────
 # QUIZ OVERVIEW
@@ -368,30 +423,47 @@ class AdminAttendanceSessionSerializer(serializers.ModelSerializer):
 class AdminQuizSerializer(serializers.ModelSerializer):
     """Quiz details for admin view."""
     course_title = serializers.CharField(source='course.title', read_only=True)
-    question_count = serializers.ReadOnlyField()
+    question_count = serializers.SerializerMethodField()
     attempts_count = serializers.SerializerMethodField()
     avg_score = serializers.SerializerMethodField()
+    item_analysis = serializers.SerializerMethodField()
 
     class Meta:
         model = Quiz
         fields = [
             'id', 'title', 'description', 'course', 'course_title',
             'duration', 'passing_score', 'is_published', 'max_attempts',
-            'question_count', 'attempts_count', 'avg_score',
+            'question_count', 'attempts_count', 'avg_score', 'item_analysis',
             'created_at',
         ]
         read_only_fields = fields
 
+    # questions_total / attempts_total / avg_percentage come from
+    # querysets.with_quiz_stats().
+
+    def get_question_count(self, obj):
+        if hasattr(obj, 'questions_total'):
+            return obj.questions_total
+        return obj.question_count
+
     def get_attempts_count(self, obj):
+        if hasattr(obj, 'attempts_total'):
+            return obj.attempts_total
         return obj.attempts.count()
 
     def get_avg_score(self, obj):
+        if hasattr(obj, 'avg_percentage'):
+            return round(obj.avg_percentage, 1)
         attempts = obj.attempts.all()
         if not attempts.exists():
             return 0
         total_pct = sum(a.percentage for a in attempts)
         return round(total_pct / attempts.count(), 1)
 
+    def get_item_analysis(self, obj):
+        from apps.quizzes.item_analysis import quiz_summary
+        return quiz_summary(obj.question_stats.all())
+
 
 # ───────────────────────────────────────────────────────────────
 # PAYMENT OVERVIEW
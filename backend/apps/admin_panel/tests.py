@@ -0,0 +1,99 @@
+"""
+Query budgets for the admin detail pages.
+
+Each page is rendered at two data sizes and must cost the same number of
+queries at both (see apps.admin_panel.querysets); a serializer that starts
+querying per lesson, enrollment or attempt fails here.
+"""
+from datetime import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.attendance.models import AttendanceRecord, AttendanceSession
+from apps.courses.models import Course, CourseReview
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.quizzes.models import Quiz, QuizAttempt
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+SIZES = [1, 8]
+
+# force_authenticate skips the token lookup, so these are the querysets' own.
+COURSE_DETAIL_QUERIES = 5  # course + teacher, lessons, quizzes, enrollments, reviews
+USER_DETAIL_QUERIES = 3    # user with counts, courses, enrollments
+
+
+@pytest.fixture
+def admin_client():
+    admin = User.objects.create_user(email='admin@example.com', password='x', name='Admin', role='admin')
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+def _students(n):
+    return [
+        User.objects.create_user(email=f'student{i}@example.com', password='x', name=f'Student {i}', role='student')
+        for i in range(n)
+    ]
+
+
+def _course(teacher, students, size):
+    course = Course.objects.create(teacher=teacher, title='Algebra', is_published=True)
+    for i in range(size):
+        Lesson.objects.create(course=course, title=f'Lesson {i}', sequence_number=i + 1)
+        quiz = Quiz.objects.create(course=course, title=f'Quiz {i}')
+        for student in students:
+            QuizAttempt.objects.create(quiz=quiz, student=student, score=1, total_questions=2)
+    for student in students:
+        Enrollment.objects.create(student=student, course=course)
+        CourseReview.objects.create(course=course, student=student, rating=4, comment='Good')
+    return course
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_course_detail_query_count_is_constant(admin_client, django_assert_num_queries, size):
+    teacher = User.objects.create_user(email='teacher@example.com', password='x', name='Teacher', role='teacher')
+    course = _course(teacher, _students(size), size)
+
+    with django_assert_num_queries(COURSE_DETAIL_QUERIES):
+        response = admin_client.get(f'/api/v1/admin/courses/{course.id}/')
+
+    assert response.status_code == 200
+    data = response.data['data']
+    assert len(data['lessons']) == len(data['quizzes']) == size
+    assert len(data['enrolled_students']) == len(data['reviews']) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_student_detail_query_count_is_constant(admin_client, django_assert_num_queries, size):
+    teacher = User.objects.create_user(email='teacher@example.com', password='x', name='Teacher', role='teacher')
+    student = _students(1)[0]
+    for i in range(size):
+        course = _course(teacher, [student], 1)
+        session = AttendanceSession.objects.create(course=course, teacher=teacher, start_time=time(9))
+        AttendanceRecord.objects.create(session=session, student=student, is_present=i % 2 == 0)
+
+    with django_assert_num_queries(USER_DETAIL_QUERIES):
+        response = admin_client.get(f'/api/v1/admin/students/{student.id}/')
+
+    assert response.status_code == 200
+    data = response.data['data']
+    assert len(data['enrollments']) == data['quiz_attempts_count'] == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_teacher_detail_query_count_is_constant(admin_client, django_assert_num_queries, size):
+    teacher = User.objects.create_user(email='teacher@example.com', password='x', name='Teacher', role='teacher')
+    students = _students(2)
+    for _ in range(size):
+        _course(teacher, students, 1)
+
+    with django_assert_num_queries(USER_DETAIL_QUERIES):
+        response = admin_client.get(f'/api/v1/admin/teachers/{teacher.id}/')
+
+    assert response.status_code == 200
+    assert len(response.data['data']['courses']) == size
@@ -57,6 +57,12 @@ urlpatterns = [
     # ── Live Class Overview ───────────────────────────────────
     path('live-classes/', views.AdminLiveClassListView.as_view(), name='live-class-list'),
 
+    # ── Data Exports ──────────────────────────────────────────
+    path('export/<slug:dataset>.<slug:fmt>', views.AdminExportView.as_view(), name='export'),
+
+    # ── Media Jobs ────────────────────────────────────────────
+    path('media-jobs/', views.AdminMediaJobsView.as_view(), name='media-jobs'),
+
     # ── Premium Plan Management ────────────────────────────────
     path('premium/', views.AdminPremiumPlanListView.as_view(), name='premium-list'),
     path('premium/init/', views.AdminPremiumPlanInitView.as_view(), name='premium-init'),
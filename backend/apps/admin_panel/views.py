@@ -9,23 +9,24 @@ Provides:
     Announcements, and Live Classes
 """
 from django.contrib.auth import get_user_model
-from django.db.models import Sum, Q
+from django.db.models import Q
 from rest_framework import generics, status, filters
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.core.exports import FORMATS, StreamingExportView
 from apps.core.permissions import IsAdmin
 from apps.courses.models import Course
 from apps.enrollments.models import Enrollment
-from apps.quizzes.models import Quiz, QuizAttempt
-from apps.lessons.models import Lesson
+from apps.quizzes.models import Quiz
 from apps.attendance.models import AttendanceSession, AttendanceRecord
 from apps.payments.models import Payment
 from apps.announcements.models import Announcement
 from apps.live_classes.models import LiveClass
 
+from .querysets import course_detail_queryset, user_detail_queryset, with_quiz_stats, with_user_counts
 from .serializers import (
     AdminUserListSerializer,
     AdminUserDetailSerializer,
@@ -60,26 +61,25 @@ class AdminDashboardView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
 
     def get(self, request):
-        total_revenue = Payment.objects.filter(
-            status='completed'
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        from apps.analytics.counters import platform_counters
 
-        recent_students = User.objects.filter(role='student').order_by('-created_at')[:5]
-        recent_teachers = User.objects.filter(role='teacher').order_by('-created_at')[:5]
+        counters = platform_counters()
+        recent_students = with_user_counts(User.objects.filter(role='student')).order_by('-created_at')[:5]
+        recent_teachers = with_user_counts(User.objects.filter(role='teacher')).order_by('-created_at')[:5]
 
         data = {
-            'total_students': User.objects.filter(role='student', is_active=True).count(),
-            'total_teachers': User.objects.filter(role='teacher', is_active=True).count(),
-            'total_courses': Course.objects.count(),
-            'published_courses': Course.objects.filter(is_published=True).count(),
-            'total_enrollments': Enrollment.objects.filter(is_active=True).count(),
-            'total_quizzes': Quiz.objects.count(),
-            'total_quiz_attempts': QuizAttempt.objects.count(),
-            'total_lessons': Lesson.objects.count(),
-            'total_payments': Payment.objects.count(),
-            'total_revenue': str(total_revenue),
-            'total_live_classes': LiveClass.objects.count(),
-            'total_announcements': Announcement.objects.count(),
+            'total_students': counters['total_students'],
+            'total_teachers': counters['total_teachers'],
+            'total_courses': counters['total_courses'],
+            'published_courses': counters['published_courses'],
+            'total_enrollments': counters['total_enrollments'],
+            'total_quizzes': counters['total_quizzes'],
+            'total_quiz_attempts': counters['total_quiz_attempts'],
+            'total_lessons': counters['total_lessons'],
+            'total_payments': counters['total_payments'],
+            'total_revenue': str(counters['total_revenue']),
+            'total_live_classes': counters['total_live_classes'],
+            'total_announcements': counters['total_announcements'],
             'recent_students': AdminUserListSerializer(recent_students, many=True).data,
             'recent_teachers': AdminUserListSerializer(recent_teachers, many=True).data,
         }
@@ -107,7 +107,7 @@ class AdminTeacherListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        qs = User.objects.filter(role='teacher')
+        qs = with_user_counts(User.objects.filter(role='teacher'))
         is_active = self.request.query_params.get('is_active')
         if is_active is not None:
             qs = qs.filter(is_active=is_active.lower() == 'true')
@@ -159,7 +159,7 @@ class AdminTeacherDetailView(generics.RetrieveAPIView):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return User.objects.filter(role='teacher')
+        return user_detail_queryset(User.objects.filter(role='teacher'))
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -179,7 +179,7 @@ class AdminTeacherUpdateView(generics.UpdateAPIView):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return User.objects.filter(role='teacher')
+        return user_detail_queryset(User.objects.filter(role='teacher'))
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -324,7 +324,7 @@ class AdminStudentListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        qs = User.objects.filter(role='student')
+        qs = with_user_counts(User.objects.filter(role='student'))
         is_active = self.request.query_params.get('is_active')
         if is_active is not None:
             qs = qs.filter(is_active=is_active.lower() == 'true')
@@ -376,7 +376,7 @@ class AdminStudentDetailView(generics.RetrieveAPIView):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return User.objects.filter(role='student')
+        return user_detail_queryset(User.objects.filter(role='student'))
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -396,7 +396,7 @@ class AdminStudentUpdateView(generics.UpdateAPIView):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return User.objects.filter(role='student')
+        return user_detail_queryset(User.objects.filter(role='student'))
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -559,7 +559,9 @@ class AdminCourseDetailView(generics.RetrieveAPIView):
     serializer_class = AdminCourseDetailSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
     lookup_field = 'id'
-    queryset = Course.objects.select_related('teacher').all()
+
+    def get_queryset(self):
+        return course_detail_queryset(Course.objects.all())
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -816,7 +818,7 @@ class AdminQuizListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        qs = Quiz.objects.select_related('course').all()
+        qs = with_quiz_stats(Quiz.objects.select_related('course').prefetch_related('question_stats'))
         is_published = self.request.query_params.get('is_published')
         if is_published is not None:
             qs = qs.filter(is_published=is_published.lower() == 'true')
@@ -944,6 +946,61 @@ class AdminLiveClassListView(generics.ListAPIView):
         return qs
 
 
+# ═══════════════════════════════════════════════════════════════
+# DATA EXPORTS
+# ═══════════════════════════════════════════════════════════════
+
+class AdminExportView(StreamingExportView):
+    """
+    GET /api/v1/admin/export/<dataset>.<csv|ndjson>
+    Stream a whole admin table (students, teachers, enrollments, attendance,
+    quizzes, payments) as one file, honouring the list view's filters.
+    Gzipped on the fly when the client sends Accept-Encoding: gzip.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, dataset, fmt):
+        from .exports import DATASETS
+
+        table = DATASETS.get(dataset)
+        if table is None or fmt not in FORMATS:
+            return Response({
+                'success': False,
+                'error': {'message': f'Unknown export "{dataset}.{fmt}". '
+                                     f'Datasets: {", ".join(DATASETS)}; formats: csv, ndjson.'},
+            }, status=status.HTTP_404_NOT_FOUND)
+        return self.stream_response(request, table, fmt)
+
+
+# ═══════════════════════════════════════════════════════════════
+# MEDIA JOBS
+# ═══════════════════════════════════════════════════════════════
+
+class AdminMediaJobsView(APIView):
+    """
+    GET  /api/v1/admin/media-jobs/   Micro-lesson job queue depth, throughput and recent failures
+    POST /api/v1/admin/media-jobs/   Re-queue failed jobs with a fresh retry budget
+                                     (optional body: {"lesson_ids": [...]})
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        from apps.offline.media_jobs import queue_stats
+
+        return Response({'success': True, 'data': queue_stats()})
+
+    def post(self, request):
+        from apps.offline.media_jobs import retry_failed
+
+        lesson_ids = request.data.get('lesson_ids')
+        requeued = retry_failed(lesson_ids if isinstance(lesson_ids, list) else None)
+        return Response({
+            'success': True,
+            'message': f'{requeued} failed media jobs re-queued.',
+            'data': {'requeued': requeued},
+        })
+
+
 # ═══════════════════════════════════════════════════════════════
 # PREMIUM PLAN MANAGEMENT
 # ═══════════════════════════════════════════════════════════════
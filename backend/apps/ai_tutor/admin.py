@@ -2,7 +2,10 @@
 Admin registration for AI Tutor and Cognitive AI Companion models.
 """
 from django.contrib import admin
-from .models import FlashcardSession, InteractionEvent, CognitiveState, CognitiveStateHistory
+from .models import (
+    CognitiveState, CognitiveStateHistory, Flashcard, FlashcardDeck, FlashcardSession, InteractionEvent,
+    InteractionRollup,
+)
 
 
 @admin.register(FlashcardSession)
@@ -13,18 +16,48 @@ class FlashcardSessionAdmin(admin.ModelAdmin):
     readonly_fields = ('id', 'created_at', 'updated_at')
 
 
+@admin.register(FlashcardDeck)
+class FlashcardDeckAdmin(admin.ModelAdmin):
+    list_display = ('topic', 'lesson', 'cards_count', 'created_at')
+    search_fields = ('topic', 'topic_key', 'lesson__title')
+    raw_id_fields = ('lesson',)
+    readonly_fields = ('id', 'topic_key', 'created_at', 'updated_at')
+
+
+@admin.register(Flashcard)
+class FlashcardAdmin(admin.ModelAdmin):
+    list_display = ('front', 'deck', 'position')
+    search_fields = ('front', 'back', 'deck__topic')
+    raw_id_fields = ('deck',)
+
+
 @admin.register(InteractionEvent)
 class InteractionEventAdmin(admin.ModelAdmin):
     list_display = ('student', 'event_type', 'platform', 'session_id', 'created_at')
     list_filter = ('event_type', 'platform', 'created_at')
     search_fields = ('student__name', 'student__email', 'session_id')
-    readonly_fields = ('id', 'created_at', 'updated_at', 'metrics', 'context')
+    readonly_fields = ('id', 'created_at', 'updated_at', *InteractionEvent.METRIC_FIELDS, 'context')
     date_hierarchy = 'created_at'
 
     def has_add_permission(self, request):
         return False  # Events are created via API only
 
 
+@admin.register(InteractionRollup)
+class InteractionRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        'student', 'hour', 'event_count', 'session_minutes', 'dominant_mood',
+        'avg_frustration', 'avg_engagement', 'avg_confidence',
+    )
+    list_filter = ('dominant_mood',)
+    search_fields = ('student__name', 'student__email')
+    readonly_fields = [field.name for field in InteractionRollup._meta.fields]
+    date_hierarchy = 'hour'
+
+    def has_add_permission(self, request):
+        return False  # Rollups are built by rollup_interactions_task only
+
+
 @admin.register(CognitiveState)
 class CognitiveStateAdmin(admin.ModelAdmin):
     list_display = (
@@ -55,4 +88,4 @@ class CognitiveStateHistoryAdmin(admin.ModelAdmin):
     date_hierarchy = 'date'
 
     def has_add_permission(self, request):
-        return False  # History is updated by RecordInteractionView only
+        return False  # History is rolled up from InteractionRollups only
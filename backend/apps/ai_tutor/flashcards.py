@@ -0,0 +1,166 @@
+"""
+Persisted flashcard decks with SM-2 spaced repetition.
+
+- get_or_generate_deck() returns the stored deck for a (lesson, topic) pair
+  and only calls the LLM when none exists. Topics are normalised (case,
+  whitespace), and the pair is unique in the database, so each topic is
+  generated once and shared by every student. A cache lock stops
+  concurrent requests for a new topic from all calling the LLM.
+- enroll() gives a student a review row for every card of a deck, due now.
+- due_cards() is the student's review queue: an index range scan on
+  (student, due_at).
+- review() grades one card with SM-2 (quality 0-5) and schedules the next
+  review.
+"""
+import json
+import logging
+import re
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Flashcard, FlashcardDeck, FlashcardReview
+
+logger = logging.getLogger(__name__)
+
+GENERATE_LOCK_TIMEOUT = 120     # seconds one request may spend generating a deck
+GENERATE_WAIT = 30              # seconds other requests wait for that deck
+GENERATE_POLL = 0.5
+MIN_EASE = 1.3
+PASSING_QUALITY = 3
+
+
+def normalize_topic(topic) -> str:
+    return re.sub(r'\s+', ' ', str(topic)).strip().lower()[:255]
+
+
+# ─── Decks ────────────────────────────────────────────────────────
+
+def _find_deck(lesson, topic_key):
+    return FlashcardDeck.objects.filter(lesson=lesson, topic_key=topic_key).first()
+
+
+def _parse_cards(raw) -> list:
+    """Keep the well-formed {front, back} items of the LLM's JSON array."""
+    data = json.loads(raw)
+    if not isinstance(data, list):
+        raise json.JSONDecodeError('Expected a JSON array', raw, 0)
+    return [
+        {'front': str(item['front']).strip(), 'back': str(item['back']).strip()}
+        for item in data
+        if isinstance(item, dict) and item.get('front') and item.get('back')
+    ]
+
+
+def _store_deck(lesson, topic, topic_key, cards):
+    try:
+        with transaction.atomic():
+            deck = FlashcardDeck.objects.create(
+                lesson=lesson, topic=str(topic)[:255], topic_key=topic_key, cards_count=len(cards),
+            )
+            Flashcard.objects.bulk_create([
+                Flashcard(deck=deck, position=i, front=card['front'], back=card['back'])
+                for i, card in enumerate(cards)
+            ])
+        return deck
+    except IntegrityError:
+        # Another request stored the same topic first; use theirs.
+        return _find_deck(lesson, topic_key)
+
+
+def get_or_generate_deck(topic, lesson=None, generate=None):
+    """
+    (deck, created) for `topic`, calling `generate(topic)` (the LLM, returning
+    a JSON string) only when no deck is stored. Raises json.JSONDecodeError
+    when the generated text is not a JSON array; returns (None, False) when
+    it holds no usable cards.
+    """
+    topic_key = normalize_topic(topic)
+    deck = _find_deck(lesson, topic_key)
+    if deck is not None:
+        return deck, False
+
+    lock = f"flashcard-deck-lock:{lesson.pk if lesson else '-'}:{topic_key}"
+    if not cache.add(lock, 1, GENERATE_LOCK_TIMEOUT):
+        deadline = time.monotonic() + GENERATE_WAIT
+        while time.monotonic() < deadline and cache.get(lock) is not None:
+            time.sleep(GENERATE_POLL)
+        deck = _find_deck(lesson, topic_key)
+        if deck is not None:
+            return deck, False
+    try:
+        if generate is None:
+            from .services import QbitService
+            generate = QbitService().generate_flashcards
+        cards = _parse_cards(generate(topic))
+        if not cards:
+            return None, False
+        deck = _store_deck(lesson, topic, topic_key, cards)
+        logger.info(f"🃏 Generated {len(cards)} flashcards for '{topic_key}'")
+        return deck, True
+    finally:
+        cache.delete(lock)
+
+
+def enroll(student, deck) -> int:
+    """Create the student's review rows for `deck` (due now); existing rows are kept."""
+    card_ids = deck.cards.values_list('pk', flat=True)
+    now = timezone.now()
+    created = FlashcardReview.objects.bulk_create(
+        [FlashcardReview(student=student, card_id=pk, due_at=now) for pk in card_ids],
+        ignore_conflicts=True,
+    )
+    return len(created)
+
+
+# ─── Reviews ──────────────────────────────────────────────────────
+
+def due_cards(student, limit=20, deck_id=None, now=None):
+    """The student's cards due for review, most overdue first."""
+    reviews = FlashcardReview.objects.filter(student=student, due_at__lte=now or timezone.now())
+    if deck_id:
+        reviews = reviews.filter(card__deck_id=deck_id)
+    return reviews.select_related('card').order_by('due_at')[:limit]
+
+
+def sm2(ease_factor, interval_days, repetitions, quality):
+    """
+    One SM-2 step. Returns (ease_factor, interval_days, repetitions, lapsed).
+    quality: 5 perfect, 4 correct after hesitation, 3 correct with difficulty,
+    0-2 wrong.
+    """
+    lapsed = quality < PASSING_QUALITY
+    if lapsed:
+        repetitions, interval_days = 0, 1
+    else:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * ease_factor)
+        repetitions += 1
+    ease_factor = max(MIN_EASE, ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return round(ease_factor, 3), interval_days, repetitions, lapsed
+
+
+@transaction.atomic
+def review(student, card_id, quality):
+    """Apply a graded review to the student's card and schedule the next one."""
+    state = FlashcardReview.objects.select_for_update().get(student=student, card_id=card_id)
+    state.ease_factor, state.interval_days, state.repetitions, lapsed = sm2(
+        state.ease_factor, state.interval_days, state.repetitions, quality,
+    )
+    now = timezone.now()
+    state.lapses += lapsed
+    state.review_count += 1
+    state.last_reviewed_at = now
+    state.due_at = now + timedelta(days=state.interval_days)
+    state.save(update_fields=[
+        'ease_factor', 'interval_days', 'repetitions', 'lapses', 'review_count',
+        'last_reviewed_at', 'due_at', 'updated_at',
+    ])
+    return state
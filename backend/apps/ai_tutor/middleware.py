@@ -2,54 +2,63 @@
 CognitiveStateMiddleware — Attaches the student's cognitive state to AI requests.
 
 This middleware runs ONLY on /api/v1/ai/ endpoints to avoid impacting
-non-AI request performance. It fetches the student's latest CognitiveState
-and attaches it to request.cognitive_state for views to use.
+non-AI request performance. It attaches request.cognitive_state for views
+to use, read cache-first from apps.ai_tutor.state_cache.
+
+The state is resolved lazily, on first use inside the view: API clients
+authenticate with JWT, which DRF only resolves once the view runs, so at
+middleware time request.user is still anonymous for them.
 """
 import logging
 
-from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 
 logger = logging.getLogger(__name__)
 
 
-class CognitiveStateMiddleware(MiddlewareMixin):
+def _cognitive_state(request):
+    # DRF copies the authenticated user onto the underlying HttpRequest.
+    user = getattr(request, 'user', None)
+    if not user or not user.is_authenticated:
+        return None
+
+    role = getattr(user, 'role', '')
+    if role != 'student':
+        return None
+
+    try:
+        from .state_cache import get_state
+        state = get_state(user.pk)
+        if state:
+            return {
+                'frustration_score': state['frustration_score'],
+                'engagement_score': state['engagement_score'],
+                'confidence_score': state['confidence_score'],
+                'cognitive_load': state['cognitive_load'],
+                'current_mood': state['current_mood'],
+                'last_adaptation': state['last_adaptation'],
+                'computed_at': state['computed_at'].isoformat() if state['computed_at'] else None,
+            }
+    except Exception as e:
+        # Never block requests due to cognitive state lookup failure
+        logger.warning(f"CognitiveStateMiddleware error for user {user.pk}: {e}")
+    return None
+
+
+class CognitiveStateMiddleware:
     """
     Attaches cognitive state to request context for AI endpoints.
-    
+
     Only activates for authenticated students hitting /api/v1/ai/ endpoints.
     Adds request.cognitive_state (dict or None) without blocking.
     """
 
-    def process_request(self, request):
-        # Default: no cognitive state
-        request.cognitive_state = None
-
-        # Only process AI endpoints
-        if not request.path.startswith('/api/v1/ai/'):
-            return
-
-        # Only for authenticated students
-        user = getattr(request, 'user', None)
-        if not user or not user.is_authenticated:
-            return
-
-        role = getattr(user, 'role', '')
-        if role != 'student':
-            return
-
-        try:
-            from .models import CognitiveState
-            state = CognitiveState.objects.filter(student=user).first()
-            if state:
-                request.cognitive_state = {
-                    'frustration_score': state.frustration_score,
-                    'engagement_score': state.engagement_score,
-                    'confidence_score': state.confidence_score,
-                    'cognitive_load': state.cognitive_load,
-                    'current_mood': state.current_mood,
-                    'last_adaptation': state.last_adaptation,
-                    'computed_at': state.computed_at.isoformat() if state.computed_at else None,
-                }
-        except Exception as e:
-            # Never block requests due to cognitive state lookup failure
-            logger.warning(f"CognitiveStateMiddleware error for user {user.id}: {e}")
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith('/api/v1/ai/'):
+            request.cognitive_state = SimpleLazyObject(lambda: _cognitive_state(request))
+        else:
+            request.cognitive_state = None
+        return self.get_response(request)
@@ -0,0 +1,167 @@
+# Generated by Django 5.1.15 on 2026-10-19 18:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_tutor", "0003_cognitive_ai_companion"),
+        ("lessons", "0005_lesson_rank_ordering"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlashcardDeck",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("topic", models.CharField(max_length=255)),
+                (
+                    "topic_key",
+                    models.CharField(
+                        help_text="Normalised topic used for de-duplication",
+                        max_length=255,
+                    ),
+                ),
+                ("cards_count", models.PositiveIntegerField(default=0)),
+                (
+                    "lesson",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="flashcard_decks",
+                        to="lessons.lesson",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ai_flashcard_decks",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Flashcard",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("position", models.PositiveIntegerField()),
+                ("front", models.TextField()),
+                ("back", models.TextField()),
+                (
+                    "deck",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cards",
+                        to="ai_tutor.flashcarddeck",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ai_flashcards",
+                "ordering": ["deck", "position"],
+            },
+        ),
+        migrations.CreateModel(
+            name="FlashcardReview",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("ease_factor", models.FloatField(default=2.5)),
+                ("interval_days", models.PositiveIntegerField(default=0)),
+                (
+                    "repetitions",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Successful reviews in a row"
+                    ),
+                ),
+                ("lapses", models.PositiveIntegerField(default=0)),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("due_at", models.DateTimeField()),
+                ("last_reviewed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "card",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reviews",
+                        to="ai_tutor.flashcard",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        limit_choices_to={"role": "student"},
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="flashcard_reviews",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ai_flashcard_reviews",
+                "ordering": ["due_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="flashcarddeck",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("lesson__isnull", False)),
+                fields=("lesson", "topic_key"),
+                name="flashcard_deck_lesson_topic_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="flashcarddeck",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("lesson__isnull", True)),
+                fields=("topic_key",),
+                name="flashcard_deck_topic_uniq",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="flashcard",
+            unique_together={("deck", "position")},
+        ),
+        migrations.AddIndex(
+            model_name="flashcardreview",
+            index=models.Index(
+                fields=["student", "due_at"], name="ai_flashcar_student_e74fcd_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="flashcardreview",
+            unique_together={("student", "card")},
+        ),
+    ]
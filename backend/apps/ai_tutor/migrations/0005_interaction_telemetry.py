@@ -0,0 +1,259 @@
+# Generated by Django 5.1.15 on 2026-10-19 18:18
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = 'ai_interaction_events'
+UNPARTITIONED = f'{TABLE}_unpartitioned'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITIONS_AHEAD_DAYS = 3
+METRIC_FIELDS = (
+    'typing_speed_wpm', 'backspace_rate', 'pause_count', 'long_pause_count',
+    'tap_frequency', 'scroll_velocity', 'rapid_clicks', 'idle_seconds',
+    'answer_time_seconds', 'answer_changes', 'repeat_attempts', 'session_duration_minutes',
+)
+
+
+def copy_metrics(apps, schema_editor):
+    """Move the reported metrics out of the JSON column into their typed columns."""
+    from django.db.models.fields.json import KT
+    from django.db.models.functions import Cast
+
+    InteractionEvent = apps.get_model('ai_tutor', 'InteractionEvent')
+    InteractionEvent.objects.update(**{
+        name: Cast(
+            KT(f'metrics__{name}'),
+            models.FloatField() if isinstance(InteractionEvent._meta.get_field(name), models.FloatField)
+            else models.IntegerField(),
+        )
+        for name in METRIC_FIELDS
+    })
+
+
+def restore_metrics(apps, schema_editor):
+    InteractionEvent = apps.get_model('ai_tutor', 'InteractionEvent')
+    batch = []
+    for event in InteractionEvent.objects.only('id', *METRIC_FIELDS).iterator(chunk_size=2000):
+        event.metrics = {
+            name: getattr(event, name) for name in METRIC_FIELDS if getattr(event, name) is not None
+        }
+        batch.append(event)
+        if len(batch) == 2000:
+            InteractionEvent.objects.bulk_update(batch, ['metrics'])
+            batch = []
+    InteractionEvent.objects.bulk_update(batch, ['metrics'])
+    if schema_editor.connection.vendor == 'postgresql':
+        # unpartition_events re-inserted these rows in this transaction, so the
+        # update above queued deferred foreign key checks; fire them now or the
+        # column drops that follow fail with "pending trigger events".
+        schema_editor.connection.check_constraints()
+
+
+def _definitions(cursor, table):
+    """(primary key name, [(index name, CREATE INDEX ...)], [(foreign key name, definition)]) of `table`."""
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'f')",
+        [table],
+    )
+    constraints = cursor.fetchall()
+    primary_key = next(name for name, kind, _ in constraints if kind == 'p')
+    foreign_keys = [(name, definition) for name, kind, definition in constraints if kind == 'f']
+    cursor.execute(
+        'SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s',
+        [table],
+    )
+    indexes = [(name, definition) for name, definition in cursor.fetchall() if name != primary_key]
+    return primary_key, indexes, foreign_keys
+
+
+def _create_partition(cursor, day):
+    """Partition of one UTC day, named like apps.ai_tutor.telemetry names them."""
+    from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    end = start + timedelta(days=1)
+    cursor.execute(
+        f"CREATE TABLE {TABLE}_{day:%Y%m%d} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def partition_events(apps, schema_editor):
+    """
+    PostgreSQL only: rebuild ai_interaction_events as a table range-partitioned
+    by day on created_at, with a DEFAULT partition and one partition per day
+    that has events plus the next few (see apps.ai_tutor.telemetry). The
+    primary key becomes (id, created_at), as partitioned tables require.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    with schema_editor.connection.cursor() as cursor:
+        primary_key, indexes, foreign_keys = _definitions(cursor, TABLE)
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {UNPARTITIONED}')
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE {UNPARTITIONED} DROP CONSTRAINT {name}')
+        cursor.execute(f'ALTER TABLE {UNPARTITIONED} DROP CONSTRAINT {primary_key}')
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {name}')
+
+        cursor.execute(f'CREATE TABLE {TABLE} (LIKE {UNPARTITIONED} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {primary_key} PRIMARY KEY (id, created_at)')
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT')
+        cursor.execute(f"SELECT DISTINCT (created_at AT TIME ZONE 'UTC')::date FROM {UNPARTITIONED}")
+        days = {row[0] for row in cursor.fetchall()}
+        today = timezone.now().date()
+        days.update(today + timedelta(days=n) for n in range(PARTITIONS_AHEAD_DAYS + 1))
+        for day in sorted(days):
+            _create_partition(cursor, day)
+
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {UNPARTITIONED}')
+        cursor.execute(f'DROP TABLE {UNPARTITIONED}')
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+
+
+def unpartition_events(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        primary_key, indexes, foreign_keys = _definitions(cursor, TABLE)
+        cursor.execute(f'CREATE TABLE {UNPARTITIONED} (LIKE {TABLE} INCLUDING DEFAULTS)')
+        cursor.execute(f'INSERT INTO {UNPARTITIONED} SELECT * FROM {TABLE}')
+        cursor.execute(f'DROP TABLE {TABLE}')
+        cursor.execute(f'ALTER TABLE {UNPARTITIONED} RENAME TO {TABLE}')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {primary_key} PRIMARY KEY (id)')
+        for _, definition in indexes:
+            cursor.execute(definition.replace(' ON ONLY ', ' ON '))
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_tutor", "0004_flashcard_decks_and_reviews"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interactionevent",
+            name="answer_changes",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="answer_time_seconds",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="backspace_rate",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="idle_seconds",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="long_pause_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="pause_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="rapid_clicks",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="repeat_attempts",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="scroll_velocity",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="session_duration_minutes",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="tap_frequency",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interactionevent",
+            name="typing_speed_wpm",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_metrics, restore_metrics),
+        migrations.RemoveField(
+            model_name="interactionevent",
+            name="metrics",
+        ),
+        migrations.CreateModel(
+            name="InteractionRollup",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("hour", models.DateTimeField(help_text="Start of the hour (UTC)")),
+                ("event_count", models.PositiveIntegerField(default=0)),
+                ("session_count", models.PositiveIntegerField(default=0)),
+                ("session_minutes", models.FloatField(default=0.0)),
+                ("avg_frustration", models.FloatField(default=0.0)),
+                ("avg_engagement", models.FloatField(default=0.5)),
+                ("avg_confidence", models.FloatField(default=0.5)),
+                ("dominant_mood", models.CharField(default="neutral", max_length=12)),
+                ("avg_typing_speed_wpm", models.FloatField(blank=True, null=True)),
+                ("avg_backspace_rate", models.FloatField(blank=True, null=True)),
+                ("avg_idle_seconds", models.FloatField(blank=True, null=True)),
+                ("avg_answer_time_seconds", models.FloatField(blank=True, null=True)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        limit_choices_to={"role": "student"},
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="interaction_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ai_interaction_rollups",
+                "ordering": ["-hour"],
+                "indexes": [
+                    models.Index(fields=["hour"], name="ai_interact_hour_0770a8_idx")
+                ],
+                "unique_together": {("student", "hour")},
+            },
+        ),
+        migrations.RunPython(partition_events, unpartition_events),
+    ]
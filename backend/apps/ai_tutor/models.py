@@ -33,6 +33,85 @@ class FlashcardSession(TimeStampedModel):
         return f"{self.student.email} - {self.topic} ({self.cards_generated} cards)"
 
 
+class FlashcardDeck(TimeStampedModel):
+    """
+    Generated flashcards for one topic, optionally scoped to a lesson.
+    Generated once and shared by every student (see apps.ai_tutor.flashcards).
+    """
+    lesson = models.ForeignKey(
+        'lessons.Lesson',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='flashcard_decks',
+    )
+    topic = models.CharField(max_length=255)
+    topic_key = models.CharField(max_length=255, help_text='Normalised topic used for de-duplication')
+    cards_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'ai_flashcard_decks'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['lesson', 'topic_key'], condition=models.Q(lesson__isnull=False),
+                name='flashcard_deck_lesson_topic_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['topic_key'], condition=models.Q(lesson__isnull=True),
+                name='flashcard_deck_topic_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} ({self.cards_count} cards)"
+
+
+class Flashcard(TimeStampedModel):
+    """One card of a generated deck."""
+    deck = models.ForeignKey(FlashcardDeck, on_delete=models.CASCADE, related_name='cards')
+    position = models.PositiveIntegerField()
+    front = models.TextField()
+    back = models.TextField()
+
+    class Meta:
+        db_table = 'ai_flashcards'
+        ordering = ['deck', 'position']
+        unique_together = ('deck', 'position')
+
+    def __str__(self):
+        return self.front[:80]
+
+
+class FlashcardReview(TimeStampedModel):
+    """A student's SM-2 review state for one card; due when due_at has passed."""
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='flashcard_reviews',
+        limit_choices_to={'role': 'student'},
+    )
+    card = models.ForeignKey(Flashcard, on_delete=models.CASCADE, related_name='reviews')
+    ease_factor = models.FloatField(default=2.5)
+    interval_days = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveIntegerField(default=0, help_text='Successful reviews in a row')
+    lapses = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'ai_flashcard_reviews'
+        ordering = ['due_at']
+        unique_together = ('student', 'card')
+        indexes = [
+            models.Index(fields=['student', 'due_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - card {self.card_id} due {self.due_at:%Y-%m-%d}"
+
+
 # ─────────────────────────────────────────────────────────────
 # 🧠 COGNITIVE AI COMPANION MODELS
 # ─────────────────────────────────────────────────────────────
@@ -41,9 +120,19 @@ class InteractionEvent(TimeStampedModel):
     """
     Stores batched interaction snapshots sent from mobile/web clients.
     Each record represents a 30-second interaction window.
-    Raw events are retained for 20 days, then cleaned up.
+    Metrics are stored in typed columns (METRIC_FIELDS). On PostgreSQL the
+    table is range-partitioned by day on created_at and raw events are
+    retained for INTERACTION_EVENT_RETENTION_DAYS (20) days by dropping
+    whole partitions (see apps.ai_tutor.telemetry). Hourly InteractionRollups
+    outlive them.
     """
 
+    METRIC_FIELDS = (
+        'typing_speed_wpm', 'backspace_rate', 'pause_count', 'long_pause_count',
+        'tap_frequency', 'scroll_velocity', 'rapid_clicks', 'idle_seconds',
+        'answer_time_seconds', 'answer_changes', 'repeat_attempts', 'session_duration_minutes',
+    )
+
     PLATFORM_CHOICES = [
         ('mobile', 'Mobile (Expo)'),
         ('web', 'Web (React)'),
@@ -73,12 +162,19 @@ class InteractionEvent(TimeStampedModel):
     event_type = models.CharField(max_length=30, choices=EVENT_TYPE_CHOICES)
     platform = models.CharField(max_length=10, choices=PLATFORM_CHOICES)
 
-    # Aggregated metrics (privacy-safe — no raw keystrokes/coordinates)
-    metrics = models.JSONField(
-        default=dict,
-        help_text="Aggregated interaction metrics: typing_speed_wpm, backspace_rate, "
-                  "pause_count, scroll_velocity, tap_frequency, idle_seconds, etc."
-    )
+    # Aggregated metrics (privacy-safe — no raw keystrokes/coordinates); null when not reported
+    typing_speed_wpm = models.FloatField(null=True, blank=True)
+    backspace_rate = models.FloatField(null=True, blank=True)
+    pause_count = models.PositiveIntegerField(null=True, blank=True)
+    long_pause_count = models.PositiveIntegerField(null=True, blank=True)
+    tap_frequency = models.FloatField(null=True, blank=True)
+    scroll_velocity = models.FloatField(null=True, blank=True)
+    rapid_clicks = models.PositiveIntegerField(null=True, blank=True)
+    idle_seconds = models.FloatField(null=True, blank=True)
+    answer_time_seconds = models.FloatField(null=True, blank=True)
+    answer_changes = models.PositiveIntegerField(null=True, blank=True)
+    repeat_attempts = models.PositiveIntegerField(null=True, blank=True)
+    session_duration_minutes = models.FloatField(null=True, blank=True)
 
     # Context about what the student was doing
     context = models.JSONField(
@@ -100,6 +196,57 @@ class InteractionEvent(TimeStampedModel):
     def __str__(self):
         return f"{self.student.name} | {self.event_type} | {self.platform} | {self.created_at:%H:%M}"
 
+    @property
+    def metrics(self):
+        """The reported metrics as a dict, as clients send them."""
+        return {
+            field: getattr(self, field) for field in self.METRIC_FIELDS
+            if getattr(self, field) is not None
+        }
+
+
+class InteractionRollup(TimeStampedModel):
+    """
+    One student's interaction events of one hour, rolled up by
+    rollup_interactions_task. Scores are the EmotionDetector's, averaged over
+    the hour's 5-minute windows and weighted by events. Daily
+    CognitiveStateHistory rows are rebuilt from these.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='interaction_rollups',
+        limit_choices_to={'role': 'student'},
+    )
+    hour = models.DateTimeField(help_text="Start of the hour (UTC)")
+
+    event_count = models.PositiveIntegerField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+    session_minutes = models.FloatField(default=0.0)
+
+    avg_frustration = models.FloatField(default=0.0)
+    avg_engagement = models.FloatField(default=0.5)
+    avg_confidence = models.FloatField(default=0.5)
+    dominant_mood = models.CharField(max_length=12, default='neutral')
+
+    # Hourly means of the headline metrics (null when none were reported)
+    avg_typing_speed_wpm = models.FloatField(null=True, blank=True)
+    avg_backspace_rate = models.FloatField(null=True, blank=True)
+    avg_idle_seconds = models.FloatField(null=True, blank=True)
+    avg_answer_time_seconds = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'ai_interaction_rollups'
+        unique_together = ['student', 'hour']
+        ordering = ['-hour']
+        indexes = [
+            models.Index(fields=['hour']),
+        ]
+
+    def __str__(self):
+        return f"{self.student.name} | {self.hour:%Y-%m-%d %H:00} | {self.event_count} events"
+
 
 class CognitiveState(TimeStampedModel):
     """
@@ -180,7 +327,8 @@ class CognitiveState(TimeStampedModel):
 class CognitiveStateHistory(TimeStampedModel):
     """
     Historical snapshots of cognitive state for trend analysis.
-    One record per day per student (aggregated daily summary).
+    One record per day per student (aggregated daily summary), rebuilt
+    from the day's InteractionRollups every hour.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(
@@ -1,9 +1,9 @@
 """
-Serializers for the Cognitive AI Companion system.
+Serializers for the Cognitive AI Companion system and flashcard reviews.
 Handles validation of interaction events and serialization of cognitive state data.
 """
 from rest_framework import serializers
-from .models import InteractionEvent, CognitiveState, CognitiveStateHistory
+from .models import InteractionEvent, CognitiveState, CognitiveStateHistory, Flashcard, FlashcardReview
 
 
 class InteractionMetricsSerializer(serializers.Serializer):
@@ -104,3 +104,34 @@ class CognitiveHistorySerializer(serializers.ModelSerializer):
             'dominant_mood', 'total_interaction_events', 'total_session_minutes',
         ]
         read_only_fields = fields
+
+
+# ─── Flashcards ───────────────────────────────────────────────────
+
+class FlashcardSerializer(serializers.ModelSerializer):
+    """A card of a generated deck."""
+
+    class Meta:
+        model = Flashcard
+        fields = ['id', 'deck', 'position', 'front', 'back']
+
+
+class FlashcardReviewStateSerializer(serializers.ModelSerializer):
+    """A card in the student's review queue, with its SM-2 schedule."""
+    card_id = serializers.UUIDField(source='card.id', read_only=True)
+    deck_id = serializers.UUIDField(source='card.deck_id', read_only=True)
+    front = serializers.CharField(source='card.front', read_only=True)
+    back = serializers.CharField(source='card.back', read_only=True)
+
+    class Meta:
+        model = FlashcardReview
+        fields = [
+            'card_id', 'deck_id', 'front', 'back', 'due_at', 'interval_days',
+            'ease_factor', 'repetitions', 'lapses', 'review_count', 'last_reviewed_at',
+        ]
+
+
+class FlashcardGradeSerializer(serializers.Serializer):
+    """SM-2 grade for one card: 5 perfect, 3 correct with difficulty, 0-2 wrong."""
+    card_id = serializers.UUIDField()
+    quality = serializers.IntegerField(min_value=0, max_value=5)
@@ -0,0 +1,208 @@
+"""
+Cache-first storage for the students' CognitiveState.
+
+Interaction batches arrive every few seconds per active student and every
+AI request reads the state, so neither touches the ai_cognitive_states row
+on the hot path any more:
+
+- write_state() is called by the ingestion endpoint with the freshly
+  computed state. It writes through to the shared cache and marks the
+  student dirty; no row is written per batch.
+- get_state() serves the cached state. An entry is fresh for
+  COGNITIVE_STATE_FRESH_SECONDS; after that it is still served
+  (stale-while-revalidate) and revalidate_cognitive_state_task refreshes it
+  in the background, one task per student at a time. Only a cold miss reads
+  the DB inline, and students without a row are cached too.
+- flush_dirty() persists the dirty entries with one upsert per batch. Celery
+  beat runs it every minute ('flush-cognitive-states'), so the row trails
+  the cache by at most that interval.
+
+The dirty set is a Redis set when CACHE_BACKEND is redis. LocMemCache is
+per process, so the Celery worker running the flush would never see what the
+web processes marked dirty: without Redis, write_state() upserts the row
+inline instead and the cache only serves reads.
+"""
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+STATE_FIELDS = (
+    'frustration_score', 'engagement_score', 'confidence_score',
+    'cognitive_load', 'current_mood', 'last_signals', 'last_adaptation',
+)
+DIRTY_SET = 'cognitive-state:dirty'
+FLUSH_BATCH_SIZE = 500
+
+
+def _key(student_id):
+    return make_key('cognitive-state', student_id)
+
+
+def _revalidate_key(student_id):
+    return make_key('cognitive-state-revalidate', student_id)
+
+
+def _store(student_id, state, dirty):
+    """Cache an entry; `state` is None for students without a row."""
+    entry = {
+        'state': state,
+        'dirty': dirty,
+        'fresh_until': time.time() + settings.COGNITIVE_STATE_FRESH_SECONDS,
+    }
+    cache.set(_key(student_id), entry, settings.CACHE_TIMEOUTS['cognitive_state'])
+    return entry
+
+
+# ─── Dirty Set ────────────────────────────────────────────────────
+
+def _redis():
+    """The shared Redis connection, or None when the cache is per-process."""
+    if settings.CACHE_BACKEND not in ('redis', 'fakeredis'):
+        return None
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def _mark_dirty(*student_ids):
+    redis = _redis()
+    if redis is None:
+        return
+    try:
+        redis.sadd(cache.make_key(DIRTY_SET), *(str(sid) for sid in student_ids))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not mark cognitive state dirty for {student_ids}: {e}")
+
+
+def _pop_dirty(count):
+    redis = _redis()
+    if redis is None:
+        return []
+    return [sid.decode() for sid in redis.spop(cache.make_key(DIRTY_SET), count) or []]
+
+
+# ─── Read / Write ─────────────────────────────────────────────────
+
+def _load(student_id):
+    """Read the row into a clean cache entry."""
+    from .models import CognitiveState
+
+    row = (
+        CognitiveState.objects.filter(student_id=student_id)
+        .values('id', 'computed_at', 'created_at', *STATE_FIELDS)
+        .first()
+    )
+    return _store(student_id, row, dirty=False)
+
+
+def get_state(student_id):
+    """Current state dict (see STATE_FIELDS, plus id and timestamps) or None."""
+    entry = cache.get(_key(student_id))
+    if entry is None:
+        return _load(student_id)['state']
+    if entry['fresh_until'] < time.time() and cache.add(_revalidate_key(student_id), 1, 30):
+        try:
+            from .tasks import revalidate_cognitive_state_task
+            revalidate_cognitive_state_task.apply_async(args=[str(student_id)], retry=False)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not queue cognitive state revalidation for {student_id}: {e}")
+    return entry['state']
+
+
+def write_state(student_id, analysis, adaptation):
+    """
+    Write-through for a freshly analysed state (EmotionDetector.analyze()
+    output plus its adaptation). The row is written by the next flush, or
+    right away when the cache is not shared (see module docstring).
+    """
+    previous = cache.get(_key(student_id))
+    previous = previous['state'] if previous and previous['state'] else {}
+    now = timezone.now()
+    state = {
+        'id': previous.get('id') or uuid.uuid4(),
+        'frustration_score': analysis['frustration_score'],
+        'engagement_score': analysis['engagement_score'],
+        'confidence_score': analysis['confidence_score'],
+        'cognitive_load': analysis['cognitive_load'],
+        'current_mood': analysis['current_mood'],
+        'last_signals': analysis.get('signals', {}),
+        'last_adaptation': adaptation,
+        'computed_at': now,
+        'created_at': previous.get('created_at') or now,
+    }
+    if _redis() is None:
+        _upsert({student_id: state})
+        _store(student_id, state, dirty=False)
+        return state
+    _store(student_id, state, dirty=True)
+    _mark_dirty(student_id)
+    return state
+
+
+def revalidate(student_id):
+    """
+    Refresh a stale entry. A dirty entry is newer than the row, so it is
+    kept and only its freshness renewed; a clean one is re-read.
+    """
+    entry = cache.get(_key(student_id))
+    if entry is not None and entry['dirty']:
+        _store(student_id, entry['state'], dirty=True)
+    else:
+        _load(student_id)
+    cache.delete(_revalidate_key(student_id))
+
+
+# ─── Periodic Flush ───────────────────────────────────────────────
+
+def _upsert(states, batch_size=FLUSH_BATCH_SIZE):
+    """Write {student_id: state} to ai_cognitive_states, one upsert per batch."""
+    from .models import CognitiveState
+
+    CognitiveState.objects.bulk_create(
+        [
+            CognitiveState(
+                student_id=sid, id=state['id'], created_at=state['created_at'],
+                **{field: state[field] for field in STATE_FIELDS},
+            )
+            for sid, state in states.items()
+        ],
+        batch_size=batch_size, update_conflicts=True,
+        unique_fields=['student'],
+        update_fields=[*STATE_FIELDS, 'computed_at', 'updated_at'],
+    )
+
+
+def flush_dirty(batch_size=FLUSH_BATCH_SIZE) -> int:
+    """Upsert every dirty cached state into ai_cognitive_states."""
+    flushed = 0
+    while True:
+        student_ids = _pop_dirty(batch_size)
+        if not student_ids:
+            return flushed
+        entries = cache.get_many([_key(sid) for sid in student_ids])
+        states = {}
+        for sid in student_ids:
+            entry = entries.get(_key(sid))
+            if entry and entry['dirty'] and entry['state']:
+                states[sid] = entry['state']
+        written = {sid: state['computed_at'] for sid, state in states.items()}
+        try:
+            _upsert(states, batch_size)
+        except Exception:
+            _mark_dirty(*written)
+            raise
+
+        # Entries rewritten since they were read stay dirty for the next flush.
+        current = cache.get_many([_key(sid) for sid in written])
+        for sid, computed_at in written.items():
+            entry = current.get(_key(sid))
+            if entry and entry['dirty'] and entry['state']['computed_at'] == computed_at:
+                cache.set(_key(sid), {**entry, 'dirty': False}, settings.CACHE_TIMEOUTS['cognitive_state'])
+        flushed += len(states)
@@ -0,0 +1,67 @@
+"""
+Celery tasks for the cache-first cognitive state (see state_cache) and
+the interaction telemetry: partitions, retention and hourly rollups (see
+telemetry).
+"""
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+
+from apps.core.sweeps import Sweep
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_cognitive_states_task():
+    """Persist cognitive states written to the cache since the last flush."""
+    from .state_cache import flush_dirty
+
+    flushed = flush_dirty()
+    if flushed:
+        logger.info(f"🧠 Flushed {flushed} cognitive states")
+    return {'flushed': flushed}
+
+
+@shared_task
+def revalidate_cognitive_state_task(student_id):
+    """Refresh one student's stale cache entry."""
+    from .state_cache import revalidate
+
+    revalidate(student_id)
+
+
+# Retention where interaction events are not partitioned (see telemetry)
+OLD_INTERACTION_EVENTS = Sweep(
+    'interaction_events',
+    'ai_tutor.InteractionEvent',
+    where=lambda now: {'created_at__lt': now - timedelta(days=settings.INTERACTION_EVENT_RETENTION_DAYS)},
+)
+
+OLD_INTERACTION_ROLLUPS = Sweep(
+    'interaction_rollups',
+    'ai_tutor.InteractionRollup',
+    where=lambda now: {'hour__lt': now - timedelta(days=settings.INTERACTION_ROLLUP_RETENTION_DAYS)},
+)
+
+
+@shared_task
+def maintain_interaction_events_task():
+    """Create upcoming event partitions and expire raw events and rollups past retention."""
+    from .telemetry import drop_expired_partitions, ensure_partitions, is_partitioned
+
+    if is_partitioned():
+        events = {'created': ensure_partitions(), 'dropped': drop_expired_partitions()}
+    else:
+        events = OLD_INTERACTION_EVENTS.run()
+    return {'events': events, 'rollups': OLD_INTERACTION_ROLLUPS.run()}
+
+
+@shared_task
+def rollup_interactions_task():
+    """Roll up the closed hours of interaction events into the cognitive history."""
+    from .telemetry import rollup_interactions
+
+    return rollup_interactions()
@@ -0,0 +1,325 @@
+"""
+Storage for the cognitive companion's interaction telemetry.
+
+Interaction batches arrive every 30 seconds per active student, so the raw
+InteractionEvent table is by far the fastest-growing one. It is laid out
+for the two ways it is read, by time range and per student:
+
+- The metrics clients report are typed columns (InteractionEvent.
+  METRIC_FIELDS), so the EmotionDetector reads its window with a plain
+  column select (recent_events) and nothing decodes JSON per row.
+- On PostgreSQL the table is range-partitioned by day on created_at
+  (ai_interaction_events_YYYYMMDD, UTC days, plus a DEFAULT partition for
+  days that have none yet). ensure_partitions() creates them
+  INTERACTION_PARTITIONS_AHEAD_DAYS ahead and moves anything stranded in
+  the default partition into its day. Retention drops whole partitions
+  (drop_expired_partitions) instead of deleting rows. On other databases
+  (SQLite in development) the table is a plain table and retention falls
+  back to the batched maintenance sweep.
+- rollup_interactions() folds every closed hour into one InteractionRollup
+  per student, scoring it with the EmotionDetector over the same 5-minute
+  windows the live endpoint uses, and rebuilds the touched days'
+  CognitiveStateHistory rows from the rollups. Celery beat runs it hourly
+  ('rollup-interactions'), so the history trails by at most an hour and the
+  ingestion endpoint writes nothing but the events.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from .emotion_detector import EmotionDetector
+from .models import CognitiveStateHistory, InteractionEvent, InteractionRollup
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = InteractionEvent.METRIC_FIELDS
+DETECTOR_WINDOW = timedelta(minutes=5)
+EVENT_WINDOW_SECONDS = 30       # each event covers a 30-second client window
+
+TABLE = InteractionEvent._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+ROLLUP_WATERMARK_KEY = 'interaction-rollup:watermark'
+ROLLUP_CHUNK_SIZE = 2000
+SCORES = (
+    ('frustration_score', 'avg_frustration'),
+    ('engagement_score', 'avg_engagement'),
+    ('confidence_score', 'avg_confidence'),
+)
+HEADLINE_METRICS = ('typing_speed_wpm', 'backspace_rate', 'idle_seconds', 'answer_time_seconds')
+
+
+def _metrics(values) -> dict:
+    """Metric column values (in METRIC_FIELDS order) as the dict clients send."""
+    return {field: value for field, value in zip(METRIC_FIELDS, values) if value is not None}
+
+
+# ─── Ingestion ────────────────────────────────────────────────────
+
+def record_events(student, session_id, platform, events) -> list:
+    """Store one validated batch with a single INSERT."""
+    return InteractionEvent.objects.bulk_create([
+        InteractionEvent(
+            student=student,
+            session_id=session_id,
+            event_type=event['event_type'],
+            platform=platform,
+            context=event.get('context', {}),
+            **{field: event['metrics'].get(field) for field in METRIC_FIELDS},
+        )
+        for event in events
+    ])
+
+
+def recent_events(student, now=None) -> list:
+    """The student's events of the last DETECTOR_WINDOW, as EmotionDetector.analyze() reads them."""
+    since = (now or timezone.now()) - DETECTOR_WINDOW
+    rows = InteractionEvent.objects.filter(student=student, created_at__gte=since).values_list(
+        'event_type', *METRIC_FIELDS,
+    )
+    return [{'event_type': row[0], 'metrics': _metrics(row[1:])} for row in rows]
+
+
+# ─── Partitions (PostgreSQL) ──────────────────────────────────────
+
+def _day_bounds(day):
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)', [TABLE])
+        return cursor.fetchone()[0]
+
+
+def partitions(cursor) -> dict:
+    """{day: table name} of the daily partitions."""
+    cursor.execute(
+        'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = %s::regclass',
+        [TABLE],
+    )
+    days = {}
+    for (name,) in cursor.fetchall():
+        try:
+            days[datetime.strptime(name.rsplit('_', 1)[1], '%Y%m%d').date()] = name
+        except ValueError:
+            continue    # the default partition
+    return days
+
+
+def create_partition(cursor, day):
+    """
+    Create and attach the partition of `day`, moving that day's rows out of
+    the default partition first (attaching fails while the default holds any).
+    Run inside a transaction.
+    """
+    qn = connection.ops.quote_name
+    name = f'{TABLE}_{day:%Y%m%d}'
+    start, end = _day_bounds(day)
+    cursor.execute(f'LOCK TABLE {qn(DEFAULT_PARTITION)} IN ACCESS EXCLUSIVE MODE')
+    cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s '
+        f'RETURNING *) INSERT INTO {qn(name)} SELECT * FROM moved',
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    return name
+
+
+def ensure_partitions(days_ahead=None) -> list:
+    """Create the partitions of today, the next days and any day stranded in the default partition."""
+    ahead = settings.INTERACTION_PARTITIONS_AHEAD_DAYS if days_ahead is None else days_ahead
+    today = timezone.now().date()
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        existing = partitions(cursor)
+        cursor.execute(
+            f"SELECT DISTINCT (created_at AT TIME ZONE 'UTC')::date "
+            f"FROM {connection.ops.quote_name(DEFAULT_PARTITION)}"
+        )
+        wanted = {row[0] for row in cursor.fetchall()}
+        wanted.update(today + timedelta(days=n) for n in range(ahead + 1))
+        for day in sorted(wanted - existing.keys()):
+            created.append(create_partition(cursor, day))
+    if created:
+        logger.info(f"🗂️ Created interaction event partitions: {', '.join(created)}")
+    return created
+
+
+def drop_expired_partitions(retention_days=None) -> list:
+    """Drop the daily partitions entirely past the retention window, oldest first."""
+    retention = settings.INTERACTION_EVENT_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = (timezone.now() - timedelta(days=retention)).date()
+    qn = connection.ops.quote_name
+    dropped = []
+    with connection.cursor() as cursor:
+        for day, name in sorted(partitions(cursor).items()):
+            if day >= cutoff:
+                break
+            try:
+                with transaction.atomic():
+                    # DROP briefly locks the parent; give up rather than queue ingestion behind it.
+                    cursor.execute("SET LOCAL lock_timeout = '5s'")
+                    cursor.execute(f'DROP TABLE {qn(name)}')
+            except DatabaseError as e:
+                logger.warning(f"⚠️ Could not drop partition {name} (retried next run): {e}")
+                break
+            dropped.append(name)
+    if dropped:
+        logger.info(f"🗑️ Dropped expired interaction event partitions: {', '.join(dropped)}")
+    return dropped
+
+
+# ─── Rollups ──────────────────────────────────────────────────────
+
+def _hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _detector_window(moment):
+    return moment.replace(minute=moment.minute - moment.minute % 5, second=0, microsecond=0)
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 3) if values else None
+
+
+def _rollup(student_id, hour, rows) -> InteractionRollup:
+    """An hour's rows (student_id, session_id, created_at, *METRIC_FIELDS) as an InteractionRollup."""
+    detector = EmotionDetector()
+    weighted = dict.fromkeys((score for score, _ in SCORES), 0.0)
+    moods = Counter()
+    for _, window in groupby(rows, key=lambda row: _detector_window(row[2])):
+        window = list(window)
+        state = detector.analyze([{'metrics': _metrics(row[3:])} for row in window])
+        for score in weighted:
+            weighted[score] += state[score] * len(window)
+        moods[state['current_mood']] += len(window)
+
+    sessions = {}
+    for _, session_id, created_at, *_metric_values in rows:
+        first, last = sessions.get(session_id, (created_at, created_at))
+        sessions[session_id] = (min(first, created_at), max(last, created_at))
+    seconds = sum((last - first).total_seconds() + EVENT_WINDOW_SECONDS for first, last in sessions.values())
+
+    columns = {field: index for index, field in enumerate(METRIC_FIELDS, start=3)}
+    rollup = InteractionRollup(
+        student_id=student_id,
+        hour=hour,
+        event_count=len(rows),
+        session_count=len(sessions),
+        session_minutes=round(seconds / 60, 1),
+        dominant_mood=moods.most_common(1)[0][0],
+    )
+    for score, field in SCORES:
+        setattr(rollup, field, round(weighted[score] / len(rows), 3))
+    for metric in HEADLINE_METRICS:
+        setattr(rollup, f'avg_{metric}', _mean(row[columns[metric]] for row in rows))
+    return rollup
+
+
+ROLLUP_UPDATE_FIELDS = [
+    'event_count', 'session_count', 'session_minutes',
+    'avg_frustration', 'avg_engagement', 'avg_confidence', 'dominant_mood',
+    *(f'avg_{metric}' for metric in HEADLINE_METRICS), 'updated_at',
+]
+
+
+def rollup_hour(hour) -> set:
+    """(Re)build the rollups of the hour starting at `hour`. Returns the students rolled up."""
+    rows = (
+        InteractionEvent.objects.filter(created_at__gte=hour, created_at__lt=hour + timedelta(hours=1))
+        .order_by('student_id', 'created_at')
+        .values_list('student_id', 'session_id', 'created_at', *METRIC_FIELDS)
+        .iterator(chunk_size=ROLLUP_CHUNK_SIZE)
+    )
+    rollups = [
+        _rollup(student_id, hour, list(student_rows))
+        for student_id, student_rows in groupby(rows, key=itemgetter(0))
+    ]
+    InteractionRollup.objects.bulk_create(
+        rollups, batch_size=500,
+        update_conflicts=True, unique_fields=['student', 'hour'], update_fields=ROLLUP_UPDATE_FIELDS,
+    )
+    return {rollup.student_id for rollup in rollups}
+
+
+def rebuild_history(student_ids, day) -> int:
+    """Recompute the students' CognitiveStateHistory of `day` from its rollups."""
+    start, end = _day_bounds(day)
+    rollups = InteractionRollup.objects.filter(student_id__in=student_ids, hour__gte=start, hour__lt=end)
+    totals = rollups.values('student_id').annotate(
+        events=Sum('event_count'),
+        minutes=Sum('session_minutes'),
+        **{score: Sum(F(field) * F('event_count')) for score, field in SCORES},
+    ).order_by()
+    moods = {}
+    for row in (
+        rollups.values('student_id', 'dominant_mood').annotate(events=Sum('event_count'))
+        .order_by('student_id', '-events')
+    ):
+        moods.setdefault(row['student_id'], row['dominant_mood'])
+
+    history = [
+        CognitiveStateHistory(
+            student_id=row['student_id'],
+            date=day,
+            dominant_mood=moods[row['student_id']],
+            total_interaction_events=row['events'],
+            total_session_minutes=round(row['minutes']),
+            **{field: round(row[score] / row['events'], 3) for score, field in SCORES},
+        )
+        for row in totals
+    ]
+    CognitiveStateHistory.objects.bulk_create(
+        history, batch_size=500,
+        update_conflicts=True, unique_fields=['student', 'date'],
+        update_fields=[
+            'avg_frustration', 'avg_engagement', 'avg_confidence', 'dominant_mood',
+            'total_interaction_events', 'total_session_minutes', 'updated_at',
+        ],
+    )
+    return len(history)
+
+
+def rollup_interactions(now=None) -> dict:
+    """Roll up every closed hour since the last run (at most the raw event retention window)."""
+    end = _hour_start(now or timezone.now())
+    earliest = end - timedelta(days=settings.INTERACTION_EVENT_RETENTION_DAYS)
+    hour = cache.get(ROLLUP_WATERMARK_KEY)
+    if hour is None:
+        last = InteractionRollup.objects.aggregate(last=Max('hour'))['last']
+        hour = last + timedelta(hours=1) if last else earliest
+    hour = max(hour, earliest)
+
+    hours = rollups = histories = 0
+    while hour < end:
+        with transaction.atomic():
+            students = rollup_hour(hour)
+            if students:
+                histories += rebuild_history(students, hour.date())
+        rollups += len(students)
+        hours += 1
+        hour += timedelta(hours=1)
+        cache.set(ROLLUP_WATERMARK_KEY, hour, None)
+
+    if rollups:
+        logger.info(f"📈 Rolled up {hours} hours of interactions: {rollups} rollups, {histories} history rows")
+    return {'hours': hours, 'rollups': rollups, 'history_rows': histories}
@@ -3,6 +3,8 @@ from .views import (
     AskQbitView,
     GenerateQuizView,
     GenerateFlashcardsView,
+    FlashcardDueView,
+    FlashcardReviewView,
     GenerateStudyPlanView,
     RecordInteractionView,
     GetCognitiveStateView,
@@ -14,6 +16,8 @@ urlpatterns = [
     path('ask/', AskQbitView.as_view(), name='ask-qbit'),
     path('generate-quiz/', GenerateQuizView.as_view(), name='generate-quiz-ai'),
     path('generate-flashcards/', GenerateFlashcardsView.as_view(), name='generate-flashcards-ai'),
+    path('flashcards/due/', FlashcardDueView.as_view(), name='flashcards-due'),
+    path('flashcards/review/', FlashcardReviewView.as_view(), name='flashcards-review'),
     path('generate-plan/', GenerateStudyPlanView.as_view(), name='generate-study-plan-ai'),
 
     # Cognitive AI Companion endpoints
@@ -7,13 +7,18 @@ from django.db.utils import DatabaseError
 from django.utils import timezone
 from datetime import timedelta
 from .services import QbitService
-from .models import FlashcardSession, InteractionEvent, CognitiveState, CognitiveStateHistory
+from .models import FlashcardReview, FlashcardSession, CognitiveState, CognitiveStateHistory
 from .serializers import (
     BatchInteractionSerializer,
     CognitiveStateSerializer,
     CognitiveHistorySerializer,
+    FlashcardGradeSerializer,
+    FlashcardReviewStateSerializer,
+    FlashcardSerializer,
 )
 from .emotion_detector import EmotionDetector
+from .state_cache import get_state, write_state
+from .telemetry import recent_events, record_events
 from apps.lessons.models import Lesson
 from apps.enrollments.models import Enrollment
 from PIL import Image
@@ -30,6 +35,7 @@ def _table_exists(table_name):
 
 class AskQbitView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'ai'
 
     def post(self, request):
         """
@@ -117,6 +123,7 @@ class AskQbitView(APIView):
 
 class GenerateQuizView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'ai'
 
     def post(self, request):
         """
@@ -148,35 +155,105 @@ class GenerateQuizView(APIView):
             return Response({"error": "Failed to generate valid quiz data. Raw: " + quiz_json}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 class GenerateFlashcardsView(APIView):
+    """
+    POST /api/v1/ai/generate-flashcards/
+    Payload: { "topic": "string", "lesson_id": "uuid" (optional) }
+
+    Returns the stored deck for the topic (generated through the LLM only the
+    first time) and, for students, adds its cards to their review queue.
+    """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'ai'
 
     def post(self, request):
+        import json
+        from .flashcards import enroll, get_or_generate_deck
+
         topic = request.data.get("topic")
         if not topic:
              return Response({"error": "Topic is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        service = QbitService()
-        cards_json = service.generate_flashcards(topic)
+        lesson = None
+        lesson_id = request.data.get("lesson_id")
+        if lesson_id:
+            lesson = Lesson.objects.filter(id=lesson_id).first()
+            if lesson is None:
+                return Response({"error": "Lesson not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        import json
         try:
-            data = json.loads(cards_json)
-            if isinstance(data, list) and request.user.role == 'student' and _table_exists(FlashcardSession._meta.db_table):
+            deck, _ = get_or_generate_deck(topic, lesson=lesson)
+        except json.JSONDecodeError:
+            return Response({"error": "Failed to generate flashcards"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if deck is None:
+            return Response([])
+
+        cards = list(deck.cards.all())
+        if request.user.role == 'student':
+            enroll(request.user, deck)
+            if _table_exists(FlashcardSession._meta.db_table):
                 try:
                     FlashcardSession.objects.create(
                         student=request.user,
                         topic=str(topic)[:255],
-                        cards_generated=len(data),
+                        cards_generated=len(cards),
                     )
                 except DatabaseError:
                     # Keep flashcard generation successful even if analytics table is unavailable.
                     pass
-            return Response(data)
-        except json.JSONDecodeError:
-            return Response({"error": "Failed to generate flashcards"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response(FlashcardSerializer(cards, many=True).data)
+
+
+class FlashcardDueView(APIView):
+    """
+    GET /api/v1/ai/flashcards/due/?limit=20&deck=<uuid>
+
+    The student's review queue: cards whose next review is due, most overdue first.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        from .flashcards import due_cards
+
+        if getattr(request.user, 'role', '') != 'student':
+            return Response({"error": "Flashcard reviews are available for students only."},
+                            status=status.HTTP_403_FORBIDDEN)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+        reviews = due_cards(request.user, limit=limit, deck_id=request.query_params.get('deck'))
+        return Response({
+            "cards": FlashcardReviewStateSerializer(reviews, many=True).data,
+            "server_time": timezone.now(),
+        })
+
+
+class FlashcardReviewView(APIView):
+    """
+    POST /api/v1/ai/flashcards/review/
+    Payload: { "card_id": "uuid", "quality": 0-5 }
+
+    Grades one card with SM-2 and returns its next review time.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        from .flashcards import review
+
+        if getattr(request.user, 'role', '') != 'student':
+            return Response({"error": "Flashcard reviews are available for students only."},
+                            status=status.HTTP_403_FORBIDDEN)
+        serializer = FlashcardGradeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            state = review(request.user, serializer.validated_data['card_id'], serializer.validated_data['quality'])
+        except FlashcardReview.DoesNotExist:
+            return Response({"error": "This card is not in your review queue."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(FlashcardReviewStateSerializer(state).data)
 
 class GenerateStudyPlanView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'ai'
 
     def post(self, request):
         exam_date = request.data.get("exam_date")
@@ -208,7 +285,9 @@ class RecordInteractionView(APIView):
     POST /api/v1/ai/interactions/
     
     Accepts batched interaction events from mobile/web clients.
-    Processes them through EmotionDetector and updates CognitiveState.
+    Processes them through EmotionDetector and writes the CognitiveState
+    through to the cache (persisted by flush_cognitive_states_task). The
+    daily CognitiveStateHistory is rolled up hourly (rollup_interactions_task).
     
     Payload:
     {
@@ -225,6 +304,7 @@ class RecordInteractionView(APIView):
     }
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'interactions'
 
     def post(self, request):
         user = request.user
@@ -243,83 +323,21 @@ class RecordInteractionView(APIView):
         platform = data['platform']
         events = data['events']
 
-        # Store interaction events
-        created_events = []
-        for event in events:
-            try:
-                ie = InteractionEvent.objects.create(
-                    student=user,
-                    session_id=session_id,
-                    event_type=event['event_type'],
-                    platform=platform,
-                    metrics=event['metrics'],
-                    context=event.get('context', {}),
-                )
-                created_events.append(ie)
-            except Exception as e:
-                logger.warning(f"Failed to store interaction event: {e}")
+        # Store interaction events (one INSERT per batch)
+        try:
+            created_events = record_events(user, session_id, platform, events)
+        except Exception as e:
+            logger.warning(f"Failed to store interaction events: {e}")
+            created_events = []
 
         # Run EmotionDetector on recent events (last 5 minutes)
-        recent_cutoff = timezone.now() - timedelta(minutes=5)
-        recent_events = InteractionEvent.objects.filter(
-            student=user,
-            created_at__gte=recent_cutoff,
-        ).values('metrics', 'event_type', 'context')
-
         detector = EmotionDetector()
-        state_dict = detector.analyze(list(recent_events))
+        state_dict = detector.analyze(recent_events(user))
         adaptation = detector.get_adaptation_strategy(state_dict)
 
-        # Update or create CognitiveState
-        cognitive_state, _ = CognitiveState.objects.update_or_create(
-            student=user,
-            defaults={
-                'frustration_score': state_dict['frustration_score'],
-                'engagement_score': state_dict['engagement_score'],
-                'confidence_score': state_dict['confidence_score'],
-                'cognitive_load': state_dict['cognitive_load'],
-                'current_mood': state_dict['current_mood'],
-                'last_signals': state_dict.get('signals', {}),
-                'last_adaptation': adaptation,
-            }
-        )
-
-        # Update daily history
-        today = timezone.now().date()
-        history, created = CognitiveStateHistory.objects.get_or_create(
-            student=user,
-            date=today,
-            defaults={
-                'avg_frustration': state_dict['frustration_score'],
-                'avg_engagement': state_dict['engagement_score'],
-                'avg_confidence': state_dict['confidence_score'],
-                'dominant_mood': state_dict['current_mood'],
-                'total_interaction_events': len(created_events),
-            }
-        )
-        if not created:
-            # Running average update
-            n = history.total_interaction_events or 1
-            new_n = n + len(created_events)
-            history.avg_frustration = (
-                (history.avg_frustration * n + state_dict['frustration_score'] * len(created_events)) / new_n
-            )
-            history.avg_engagement = (
-                (history.avg_engagement * n + state_dict['engagement_score'] * len(created_events)) / new_n
-            )
-            history.avg_confidence = (
-                (history.avg_confidence * n + state_dict['confidence_score'] * len(created_events)) / new_n
-            )
-            history.dominant_mood = state_dict['current_mood']
-            history.total_interaction_events = new_n
-            history.save()
-
-        # Clean up old events (>20 days)
-        cleanup_cutoff = timezone.now() - timedelta(days=20)
-        InteractionEvent.objects.filter(
-            student=user,
-            created_at__lt=cleanup_cutoff,
-        ).delete()
+        # Write-through to the cache; the row is persisted by the periodic flush.
+        # The daily history is rolled up from the stored events every hour.
+        write_state(user.pk, state_dict, adaptation)
 
         return Response({
             "status": "recorded",
@@ -351,22 +369,24 @@ class GetCognitiveStateView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            state = CognitiveState.objects.get(student=user)
-            serializer = CognitiveStateSerializer(state)
+        state = get_state(user.pk)
+        if state:
+            serializer = CognitiveStateSerializer(
+                CognitiveState(student=user, updated_at=state['computed_at'], **state)
+            )
             return Response(serializer.data)
-        except CognitiveState.DoesNotExist:
-            # Return default neutral state
-            detector = EmotionDetector()
-            default = detector._default_state()
-            default['adaptation'] = detector.get_adaptation_strategy(default)
-            return Response({
-                "student": str(user.id),
-                "student_name": user.name,
-                **default,
-                "computed_at": None,
-                "message": "No interaction data recorded yet.",
-            })
+
+        # Return default neutral state
+        detector = EmotionDetector()
+        default = detector._default_state()
+        default['adaptation'] = detector.get_adaptation_strategy(default)
+        return Response({
+            "student": str(user.id),
+            "student_name": user.name,
+            **default,
+            "computed_at": None,
+            "message": "No interaction data recorded yet.",
+        })
 
 
 class CognitiveHistoryView(APIView):
@@ -375,6 +395,7 @@ class CognitiveHistoryView(APIView):
     
     Returns daily cognitive state trend for the last 20 days.
     Optional query param: ?days=7 (default: 20)
+    Days are rolled up hourly, so today's entry covers up to the last full hour.
     """
     permission_classes = [IsAuthenticated]
 
@@ -0,0 +1,137 @@
+"""
+Platform-wide counters shared by the admin dashboard and the daily
+analytics snapshot.
+
+Every counter lives under its own cache key for CACHE_TIMEOUTS['counters']
+seconds, so a dashboard load is one get_many instead of a dozen full-table
+COUNT(*)s. The cached values are kept current between recomputes:
+
+- inserts and deletes of a counted row increment/decrement the matching
+  counters after commit (apps.analytics.signals);
+- updates that may move a row in or out of a counter's filter (say a user
+  deactivated, or a payment completed) drop that counter so the next read
+  recomputes it; updates limited to other fields are ignored;
+- refresh_platform_counters_task recomputes everything on a schedule,
+  which also corrects drift from bulk writes that skip signals.
+
+With PLATFORM_COUNTERS_APPROXIMATE on PostgreSQL, unfiltered counts of
+tables above PLATFORM_COUNTERS_APPROX_MIN_ROWS come from pg_class.reltuples
+(the planner's estimate, refreshed by autovacuum/ANALYZE) instead of an
+O(n) scan; the deltas above are applied on top of the estimate.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+
+from apps.core.cache import make_key, resolve_timeout
+
+
+class Counter:
+    """One counted (or summed) slice of a model's rows."""
+
+    def __init__(self, name, model, filters=None, sum_field=None, approximate=False):
+        self.name = name
+        self.model_label = model
+        self.filters = filters or {}
+        self.sum_field = sum_field
+        # Only unfiltered counts can come from table statistics.
+        self.approximate = approximate and not self.filters and not sum_field
+        self.fields = {*self.filters, *([sum_field] if sum_field else [])}
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def key(self):
+        return make_key('platform-counter', self.name)
+
+    def matches(self, instance) -> bool:
+        return all(getattr(instance, field) == value for field, value in self.filters.items())
+
+    def compute(self):
+        if self.approximate:
+            estimate = _estimate_rows(self.model)
+            if estimate is not None:
+                return estimate
+        queryset = self.model._base_manager.filter(**self.filters)
+        if self.sum_field:
+            return queryset.aggregate(total=Sum(self.sum_field))['total'] or 0
+        return queryset.count()
+
+
+COUNTERS = [
+    Counter('total_users', 'users.User', {'is_active': True}),
+    Counter('total_students', 'users.User', {'role': 'student', 'is_active': True}),
+    Counter('total_teachers', 'users.User', {'role': 'teacher', 'is_active': True}),
+    Counter('total_courses', 'courses.Course', {'is_deleted': False}),
+    Counter('published_courses', 'courses.Course', {'is_published': True, 'is_deleted': False}),
+    Counter('total_enrollments', 'enrollments.Enrollment', {'is_active': True}),
+    Counter('total_quizzes', 'quizzes.Quiz'),
+    Counter('total_quiz_attempts', 'quizzes.QuizAttempt', approximate=True),
+    Counter('total_lessons', 'lessons.Lesson', {'is_deleted': False}),
+    Counter('total_payments', 'payments.Payment', approximate=True),
+    Counter('total_revenue', 'payments.Payment', {'status': 'completed'}, sum_field='amount'),
+    Counter('total_live_classes', 'live_classes.LiveClass', approximate=True),
+    Counter('total_announcements', 'announcements.Announcement', approximate=True),
+]
+BY_NAME = {counter.name: counter for counter in COUNTERS}
+BY_MODEL = {}
+for _counter in COUNTERS:
+    BY_MODEL.setdefault(_counter.model_label, []).append(_counter)
+
+
+def counters_for(model):
+    return BY_MODEL.get(model._meta.concrete_model._meta.label, [])
+
+
+def _estimate_rows(model):
+    if not settings.PLATFORM_COUNTERS_APPROXIMATE or connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    # reltuples is -1 until the table is first analysed; small tables are cheap to count.
+    if row is None or row[0] < settings.PLATFORM_COUNTERS_APPROX_MIN_ROWS:
+        return None
+    return row[0]
+
+
+# ─── Read / Refresh ───────────────────────────────────────────────
+
+def platform_counters(names=None) -> dict:
+    """Counter values by name; missing or expired ones are recomputed and cached."""
+    selected = [BY_NAME[name] for name in names] if names else COUNTERS
+    cached = cache.get_many([counter.key for counter in selected])
+    timeout = resolve_timeout('counters')
+    values = {}
+    for counter in selected:
+        value = cached.get(counter.key)
+        if value is None:
+            value = counter.compute()
+            cache.set(counter.key, value, timeout)
+        values[counter.name] = value
+    return values
+
+
+def refresh_counters() -> dict:
+    """Recompute every counter and overwrite the cached values."""
+    timeout = resolve_timeout('counters')
+    values = {counter.name: counter.compute() for counter in COUNTERS}
+    cache.set_many({BY_NAME[name].key: value for name, value in values.items()}, timeout)
+    return values
+
+
+# ─── Deltas (see apps.analytics.signals) ──────────────────────────
+
+def apply_delta(counter, delta):
+    try:
+        cache.incr(counter.key, delta)
+    except ValueError:
+        pass    # not cached: the next read computes it from scratch
+
+
+def drop(*counters):
+    cache.delete_many([counter.key for counter in counters])
@@ -0,0 +1,44 @@
+"""
+Keeps the cached platform counters (apps.analytics.counters) current.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import apply_delta, counters_for, drop
+
+
+def _count_change(counters, instance, delta):
+    counted = [counter for counter in counters if not counter.sum_field and counter.matches(instance)]
+    summed = [counter for counter in counters if counter.sum_field and counter.matches(instance)]
+
+    def apply():
+        for counter in counted:
+            apply_delta(counter, delta)
+        if summed:
+            drop(*summed)
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, dispatch_uid='platform_counters_save')
+def update_counters_on_save(sender, instance, created, update_fields=None, **kwargs):
+    counters = counters_for(sender)
+    if not counters:
+        return
+    if created:
+        _count_change(counters, instance, 1)
+        return
+    # The row may have moved in or out of a filter; recompute those counters on next read.
+    affected = [
+        counter for counter in counters
+        if counter.fields and (update_fields is None or counter.fields & set(update_fields))
+    ]
+    if affected:
+        transaction.on_commit(lambda: drop(*affected))
+
+
+@receiver(post_delete, dispatch_uid='platform_counters_delete')
+def update_counters_on_delete(sender, instance, **kwargs):
+    counters = counters_for(sender)
+    if counters:
+        _count_change(counters, instance, -1)
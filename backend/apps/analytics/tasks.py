@@ -1,5 +1,5 @@
 """
-Celery task to generate daily analytics snapshots.
+Celery tasks for daily analytics snapshots and the platform counters.
 """
 from celery import shared_task
 from django.utils import timezone
@@ -18,29 +18,17 @@ def generate_daily_analytics():
     from apps.payments.models import Payment
     from apps.progress.models import CourseProgress
     from apps.quizzes.models import QuizAttempt
+    from .counters import refresh_counters
     from .models import CourseAnalytics, DailyAnalytics
 
     User = get_user_model()
     today = timezone.now().date()
 
-    # Platform-wide
-    total_users = User.objects.filter(is_active=True).count()
-    total_students = User.objects.filter(role='student', is_active=True).count()
-    total_teachers = User.objects.filter(role='teacher', is_active=True).count()
+    # Platform-wide totals come from the shared counters the admin dashboard reads
+    counters = refresh_counters()
     new_users = User.objects.filter(created_at__date=today).count()
-
-    total_courses = Course.objects.filter(is_deleted=False).count()
-    published_courses = Course.objects.filter(is_published=True, is_deleted=False).count()
-
-    total_enrollments = Enrollment.objects.filter(is_active=True).count()
     new_enrollments = Enrollment.objects.filter(enrolled_at__date=today).count()
-
-    total_quiz_attempts = QuizAttempt.objects.count()
     new_quiz_attempts = QuizAttempt.objects.filter(completed_at__date=today).count()
-
-    total_revenue = Payment.objects.filter(status='completed').aggregate(
-        total=Sum('amount')
-    )['total'] or 0
     revenue_today = Payment.objects.filter(
         status='completed', created_at__date=today
     ).aggregate(total=Sum('amount'))['total'] or 0
@@ -48,17 +36,17 @@ def generate_daily_analytics():
     DailyAnalytics.objects.update_or_create(
         date=today,
         defaults={
-            'total_users': total_users,
-            'total_students': total_students,
-            'total_teachers': total_teachers,
+            'total_users': counters['total_users'],
+            'total_students': counters['total_students'],
+            'total_teachers': counters['total_teachers'],
             'new_users_today': new_users,
-            'total_courses': total_courses,
-            'published_courses': published_courses,
-            'total_enrollments': total_enrollments,
+            'total_courses': counters['total_courses'],
+            'published_courses': counters['published_courses'],
+            'total_enrollments': counters['total_enrollments'],
             'new_enrollments_today': new_enrollments,
-            'total_quiz_attempts': total_quiz_attempts,
+            'total_quiz_attempts': counters['total_quiz_attempts'],
             'new_quiz_attempts_today': new_quiz_attempts,
-            'total_revenue': total_revenue,
+            'total_revenue': counters['total_revenue'],
             'revenue_today': revenue_today,
         }
     )
@@ -93,3 +81,11 @@ def generate_daily_analytics():
         )
 
     logger.info(f"Daily analytics generated for {today}")
+
+
+@shared_task
+def refresh_platform_counters_task():
+    """Recompute the cached platform counters (see apps.analytics.counters)."""
+    from .counters import refresh_counters
+
+    return refresh_counters()
@@ -4,3 +4,6 @@ class AnnouncementsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.announcements'
     verbose_name = 'Announcements'
+
+    def ready(self):
+        import apps.announcements.signals  # noqa: F401
@@ -0,0 +1,144 @@
+"""
+Announcement inbox (fan-out on write).
+
+Visibility used to be re-derived on every feed load with an OR of role,
+audience, course and enrollment filters plus DISTINCT. Instead, every
+announcement is delivered once, when it is saved, to the audience segments
+that may see it:
+
+    students / teachers / parents   institution-wide, by role
+    course:<id>                     students enrolled in the course
+    author:<id>                     the teacher who wrote it
+    user:<id>                       a personal announcement
+
+A user's feed is then the union of their segments, read newest-first from
+AnnouncementDelivery with keyset (cursor) pagination. The segment list is
+cached per user and tagged with their enrollments, so enrolling or
+unenrolling changes the inbox on the next read.
+"""
+import base64
+import json
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from apps.core.cache import get_or_compute, make_key, tag
+
+from .models import Announcement, AnnouncementDelivery
+
+STUDENTS, TEACHERS, PARENTS = 'students', 'teachers', 'parents'
+STUDENT_AUDIENCES = ('all', 'students')
+TEACHER_AUDIENCES = ('all', 'teachers')
+PARENT_AUDIENCES = ('all', 'parents')
+
+
+# ─── Fan-out ──────────────────────────────────────────────────────
+
+def segments_for(announcement) -> list:
+    """Segments an announcement is delivered to; mirrors the per-role visibility rules."""
+    if announcement.target_student_id:
+        return [f'user:{announcement.target_student_id}']
+
+    segments = []
+    audience = announcement.target_audience
+    if announcement.teacher_id and not announcement.created_by_admin:
+        segments.append(f'author:{announcement.teacher_id}')
+    if announcement.created_by_admin and audience in TEACHER_AUDIENCES:
+        segments.append(TEACHERS)
+    if audience in STUDENT_AUDIENCES:
+        segments.append(f'course:{announcement.course_id}' if announcement.course_id else STUDENTS)
+    if audience in PARENT_AUDIENCES and not announcement.course_id:
+        segments.append(PARENTS)
+    return segments
+
+
+def deliver(announcement):
+    """(Re)write the delivery rows of one announcement."""
+    with transaction.atomic():
+        AnnouncementDelivery.objects.filter(announcement=announcement).delete()
+        AnnouncementDelivery.objects.bulk_create([
+            AnnouncementDelivery(
+                announcement=announcement, segment=segment,
+                is_pinned=announcement.is_pinned, announced_at=announcement.created_at,
+            )
+            for segment in segments_for(announcement)
+        ])
+
+
+# ─── Reading ──────────────────────────────────────────────────────
+
+def _compute_segments(user):
+    from apps.enrollments.models import Enrollment
+
+    segments = [f'user:{user.pk}']
+    if user.role == 'teacher':
+        segments += [TEACHERS, f'author:{user.pk}']
+    elif user.role == 'student':
+        segments.append(STUDENTS)
+        segments += [
+            f'course:{course_id}'
+            for course_id in Enrollment.objects.filter(student=user, is_active=True).values_list('course_id', flat=True)
+        ]
+    elif user.role == 'parent':
+        segments.append(PARENTS)
+    return segments
+
+
+def user_segments(user) -> list:
+    return get_or_compute(
+        make_key('announcement-segments', user.pk),
+        lambda: _compute_segments(user),
+        tags=[tag('enrollments:student', user.pk), tag('user', user.pk)],
+    )
+
+
+def encode_cursor(is_pinned, created_at, pk) -> str:
+    raw = json.dumps([is_pinned, created_at.isoformat(), str(pk)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(is_pinned, created_at, pk) or None for a missing or malformed cursor."""
+    try:
+        is_pinned, created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return bool(is_pinned), parse_datetime(created_at), pk
+    except (TypeError, ValueError, UnicodeError):
+        return None
+
+
+def _after(position, pinned_field, time_field, id_field):
+    """Rows strictly after `position` in (-pinned, -time, -id) order."""
+    is_pinned, created_at, pk = position
+    after = Q(**{pinned_field: is_pinned, time_field: created_at, f'{id_field}__lt': pk})
+    after |= Q(**{pinned_field: is_pinned, f'{time_field}__lt': created_at})
+    if is_pinned:
+        after |= Q(**{pinned_field: False})
+    return after
+
+
+def inbox_page(user, cursor=None, page_size=20):
+    """One feed page for `user`: (announcements, next_cursor or None)."""
+    position = decode_cursor(cursor) if cursor else None
+
+    if user.role == 'admin':
+        # Admins see every announcement; no fan-out needed.
+        qs = Announcement.objects.select_related('teacher', 'course', 'target_student')
+        if position:
+            qs = qs.filter(_after(position, 'is_pinned', 'created_at', 'id'))
+        announcements = list(qs.order_by('-is_pinned', '-created_at', '-id')[:page_size + 1])
+    else:
+        qs = AnnouncementDelivery.objects.filter(segment__in=user_segments(user)).select_related(
+            'announcement__teacher', 'announcement__course', 'announcement__target_student',
+        )
+        if position:
+            qs = qs.filter(_after(position, 'is_pinned', 'announced_at', 'announcement_id'))
+        deliveries = qs.order_by('-is_pinned', '-announced_at', '-announcement_id')[:page_size + 1]
+        announcements = [delivery.announcement for delivery in deliveries]
+
+    next_cursor = None
+    if len(announcements) > page_size:
+        announcements = announcements[:page_size]
+        last = announcements[-1]
+        next_cursor = encode_cursor(last.is_pinned, last.created_at, last.pk)
+    return announcements, next_cursor
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:38
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def deliver_existing(apps, schema_editor):
+    from apps.announcements.inbox import segments_for
+
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementDelivery = apps.get_model('announcements', 'AnnouncementDelivery')
+    AnnouncementDelivery.objects.bulk_create([
+        AnnouncementDelivery(
+            announcement=announcement, segment=segment,
+            is_pinned=announcement.is_pinned, announced_at=announcement.created_at,
+        )
+        for announcement in Announcement.objects.iterator()
+        for segment in segments_for(announcement)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("announcements", "0005_seed_admin_announcements"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnnouncementDelivery",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("segment", models.CharField(max_length=64)),
+                ("is_pinned", models.BooleanField(default=False)),
+                ("announced_at", models.DateTimeField()),
+                (
+                    "announcement",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="announcements.announcement",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "announcement_deliveries",
+                "indexes": [
+                    models.Index(
+                        fields=["segment", "-is_pinned", "-announced_at"],
+                        name="announcemen_segment_a38e9a_idx",
+                    )
+                ],
+                "unique_together": {("announcement", "segment")},
+            },
+        ),
+        migrations.RunPython(deliver_existing, migrations.RunPython.noop),
+    ]
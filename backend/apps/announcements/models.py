@@ -78,3 +78,29 @@ class Announcement(TimeStampedModel):
         scope = self.course.title if self.course else 'Global'
         audience = f" → {self.get_target_audience_display()}" if self.target_audience != 'all' else ''
         return f"[{scope}]{audience} {self.title}"
+
+
+class AnnouncementDelivery(TimeStampedModel):
+    """
+    Materialised visibility of an announcement: one row per audience segment
+    it is shown to (see apps.announcements.inbox). Sort keys are copied from
+    the announcement so a feed page is a single index range scan.
+    """
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+    )
+    segment = models.CharField(max_length=64)
+    is_pinned = models.BooleanField(default=False)
+    announced_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'announcement_deliveries'
+        unique_together = ['announcement', 'segment']
+        indexes = [
+            models.Index(fields=['segment', '-is_pinned', '-announced_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.segment} ← {self.announcement_id}"
@@ -0,0 +1,14 @@
+"""
+Signals for Announcements.
+Delivers every saved announcement to its audience segments (see inbox.py).
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .inbox import deliver
+from .models import Announcement
+
+
+@receiver(post_save, sender=Announcement)
+def deliver_announcement(sender, instance, **kwargs):
+    deliver(instance)
@@ -1,74 +1,56 @@
 """
 Announcement views.
 """
-from django.db.models import Q
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.core.pagination import StandardPagination
+from apps.core.cache import cached_view, tag
 from apps.core.permissions import IsTeacher, IsTeacherOrReadOnly
-from apps.enrollments.models import Enrollment
 
+from .inbox import inbox_page
 from .models import Announcement
 from .serializers import AnnouncementCreateSerializer, AnnouncementListSerializer
 from apps.notifications.utils import create_notification
 from apps.notifications.models import Notification
 
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
 class AnnouncementListCreateView(generics.ListCreateAPIView):
     """
     GET  /api/v1/announcements/  - List announcements for enrolled courses + global
     POST /api/v1/announcements/  - Create announcement (teacher only)
     """
     permission_classes = [IsAuthenticated, IsTeacherOrReadOnly]
-    pagination_class = StandardPagination
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return AnnouncementCreateSerializer
         return AnnouncementListSerializer
 
-    def get_queryset(self):
-        user = self.request.user
-        if user.role == 'teacher':
-            # Teachers see: their own announcements + admin announcements targeted to teachers or all
-            # PLUS personal announcements targeted directly at this teacher
-            own = Q(teacher=user) & Q(target_student__isnull=True)
-            admin_for_teachers = Q(created_by_admin=True) & (
-                Q(target_audience='teachers') | Q(target_audience='all')
-            ) & Q(target_student__isnull=True)
-            personal = Q(target_student=user)
-            return Announcement.objects.filter(
-                own | admin_for_teachers | personal
-            ).select_related('teacher', 'course').distinct()
-        elif user.role == 'student':
-            # Students see: enrolled course announcements + global, BUT only if audience is 'all' or 'students'
-            # PLUS personal announcements targeted directly at this student
-            enrolled_ids = Enrollment.objects.filter(
-                student=user, is_active=True
-            ).values_list('course_id', flat=True)
-            audience_filter = Q(target_audience='all') | Q(target_audience='students')
-            course_filter = Q(course__isnull=True) | Q(course_id__in=enrolled_ids)
-            # General announcements (not personal) matching audience + course
-            general = audience_filter & course_filter & Q(target_student__isnull=True)
-            # Personal announcements addressed to this student specifically
-            personal = Q(target_student=user)
-            return Announcement.objects.filter(
-                general | personal
-            ).select_related('teacher', 'course').distinct()
-        elif user.role == 'parent':
-            # Parents see: institutional announcements where audience is 'all' or 'parents'
-            # PLUS personal announcements targeted directly at this parent
-            audience_filter = Q(target_audience='all') | Q(target_audience='parents')
-            general = audience_filter & Q(course__isnull=True) & Q(target_student__isnull=True)
-            personal = Q(target_student=user)
-            return Announcement.objects.filter(
-                general | personal
-            ).select_related('teacher', 'course').distinct()
-        else:
-            # Admin sees all
-            return Announcement.objects.all().select_related('teacher', 'course')
+    @cached_view(
+        timeout='announcements',
+        tags=lambda view, request: ['announcements', tag('enrollments:student', request.user.pk)],
+    )
+    def list(self, request, *args, **kwargs):
+        """Served from the precomputed inbox (see inbox.py); paginate with ?cursor=."""
+        try:
+            page_size = max(1, min(int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+        except ValueError:
+            page_size = DEFAULT_PAGE_SIZE
+        announcements, next_cursor = inbox_page(request.user, request.query_params.get('cursor'), page_size)
+        return Response({
+            'success': True,
+            'data': AnnouncementListSerializer(announcements, many=True, context={'request': request}).data,
+            'pagination': {
+                'page_size': page_size,
+                'has_next': next_cursor is not None,
+                'next_cursor': next_cursor,
+            }
+        })
 
     def create(self, request, *args, **kwargs):
         serializer = AnnouncementCreateSerializer(data=request.data, context={'request': request})
@@ -0,0 +1,93 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:26
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_aggregates(apps, schema_editor):
+    from django.db.models import Count, Q
+
+    AttendanceSession = apps.get_model('attendance', 'AttendanceSession')
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    CourseAttendanceSummary = apps.get_model('attendance', 'CourseAttendanceSummary')
+
+    present = Count('records', filter=Q(records__is_present=True))
+    for session in AttendanceSession.objects.annotate(total=Count('records'), present=present):
+        AttendanceSession.objects.filter(pk=session.pk).update(
+            present_count=session.present, total_count=session.total,
+        )
+
+    totals = (
+        AttendanceRecord.objects.values('student_id', 'session__course_id')
+        .annotate(total=Count('id'), present=Count('id', filter=Q(is_present=True)))
+    )
+    CourseAttendanceSummary.objects.bulk_create([
+        CourseAttendanceSummary(
+            student_id=row['student_id'], course_id=row['session__course_id'],
+            total=row['total'], present=row['present'],
+        )
+        for row in totals
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0001_initial"),
+        ("courses", "0004_course_grade_level"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendancesession",
+            name="present_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="attendancesession",
+            name="total_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="CourseAttendanceSummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("present", models.PositiveIntegerField(default=0)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to="courses.course",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "course_attendance_summaries",
+                "unique_together": {("student", "course")},
+            },
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
@@ -9,6 +9,9 @@ class AttendanceSession(TimeStampedModel):
     teacher = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     date = models.DateField(auto_now_add=True)
     start_time = models.TimeField()
+    # Refreshed once per marking call by apps.attendance.services
+    present_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         db_table = 'attendance_sessions'
@@ -30,3 +33,21 @@ class AttendanceRecord(TimeStampedModel):
     def __str__(self):
         status = "Present" if self.is_present else "Absent"
         return f"{self.student.uid} - {self.session.date}: {status}"
+
+class CourseAttendanceSummary(TimeStampedModel):
+    """Per-student, per-course attendance totals read by the dashboards."""
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='attendance_summaries')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='attendance_summaries')
+    total = models.PositiveIntegerField(default=0)
+    present = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'course_attendance_summaries'
+        unique_together = ('student', 'course')
+
+    @property
+    def percentage(self):
+        return round((self.present / self.total) * 100, 1) if self.total > 0 else 0.0
+
+    def __str__(self):
+        return f"{self.student_id} - {self.course_id}: {self.present}/{self.total}"
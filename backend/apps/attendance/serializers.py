@@ -1,5 +1,9 @@
+from datetime import date
+
 from rest_framework import serializers
 from .models import AttendanceSession, AttendanceRecord
+from .services import mark_session, non_enrolled_students
+from apps.courses.models import Course
 from apps.users.serializers import UserProfileSerializer
 
 class AttendanceRecordSerializer(serializers.ModelSerializer):
@@ -10,10 +14,10 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         model = AttendanceRecord
         fields = ['id', 'student', 'student_name', 'student_uid', 'is_present']
 
-class AttendanceRecordCreateSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = AttendanceRecord
-        fields = ['student', 'is_present']
+class AttendanceRecordCreateSerializer(serializers.Serializer):
+    # Plain ids: enrollment is validated for the whole roster in one query.
+    student = serializers.UUIDField()
+    is_present = serializers.BooleanField(default=False)
 
 class AttendanceSessionSerializer(serializers.ModelSerializer):
     records = AttendanceRecordSerializer(many=True, read_only=True)
@@ -28,22 +32,31 @@ class AttendanceBulkCreateSerializer(serializers.Serializer):
     start_time = serializers.TimeField()
     records = AttendanceRecordCreateSerializer(many=True)
 
+    def validate(self, attrs):
+        teacher = self.context['request'].user
+        if not Course.objects.filter(id=attrs['course_id'], teacher=teacher).exists():
+            raise serializers.ValidationError({'course_id': 'Course not found or unauthorized.'})
+
+        # Last mark wins if a student appears twice.
+        attrs['marks'] = {str(item['student']): item['is_present'] for item in attrs['records']}
+        missing = non_enrolled_students(attrs['course_id'], attrs['marks'])
+        if missing:
+            raise serializers.ValidationError({'records': f"Students not enrolled in this course: {', '.join(missing)}"})
+        return attrs
+
     def create(self, validated_data):
-        course_id = validated_data['course_id']
-        start_time = validated_data['start_time']
-        records_data = validated_data['records']
         teacher = self.context['request'].user
-        
-        session = AttendanceSession.objects.create(
-            course_id=course_id,
+        # Re-marking the same class today updates its records instead of opening a new session.
+        session = AttendanceSession.objects.filter(
+            course_id=validated_data['course_id'],
             teacher=teacher,
-            start_time=start_time
-        )
-        
-        for record_item in records_data:
-            AttendanceRecord.objects.create(
-                session=session,
-                student=record_item['student'],
-                is_present=record_item['is_present']
+            date=date.today(),  # what DateField(auto_now_add) stores
+            start_time=validated_data['start_time'],
+        ).first()
+        if session is None:
+            session = AttendanceSession.objects.create(
+                course_id=validated_data['course_id'],
+                teacher=teacher,
+                start_time=validated_data['start_time']
             )
-        return session
+        return mark_session(session, validated_data['marks'])
@@ -0,0 +1,82 @@
+"""
+Bulk attendance marking.
+
+A whole roster is written with one INSERT ... ON CONFLICT statement, so
+re-marking a session updates the existing rows instead of duplicating
+them. Enrollment is checked with a single query beforehand, and the
+aggregates the dashboards read (AttendanceSession counts and
+CourseAttendanceSummary) are refreshed once per call rather than per row.
+Bulk writes skip the cache-invalidation signals, so the affected tags are
+invalidated here.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+
+from apps.core.cache import invalidate_tags_on_commit, tag
+from apps.enrollments.models import Enrollment
+
+from .models import AttendanceRecord, AttendanceSession, CourseAttendanceSummary
+
+
+def non_enrolled_students(course_id, student_ids):
+    """Ids from `student_ids` without an active enrollment in the course (one query)."""
+    wanted = {str(sid) for sid in student_ids}
+    enrolled = Enrollment.objects.filter(
+        course_id=course_id, student_id__in=wanted, is_active=True, student__role='student',
+    ).values_list('student_id', flat=True)
+    return sorted(wanted - {str(sid) for sid in enrolled})
+
+
+def upsert_marks(model, scope, marks, update_fields=('is_present', 'updated_at')):
+    """
+    Insert or update one row per student in a single statement.
+    `scope` holds the parent foreign key (e.g. {'session': session});
+    `marks` maps student id -> is_present.
+    """
+    if not marks:
+        return
+    model.objects.bulk_create(
+        [model(student_id=student_id, is_present=is_present, **scope) for student_id, is_present in marks.items()],
+        update_conflicts=True,
+        unique_fields=[*scope, 'student'],
+        update_fields=list(update_fields),
+    )
+
+
+def refresh_aggregates(session, student_ids):
+    """Recount the session and the course totals of the given students."""
+    counts = session.records.aggregate(total=Count('id'), present=Count('id', filter=Q(is_present=True)))
+    AttendanceSession.objects.filter(pk=session.pk).update(
+        present_count=counts['present'], total_count=counts['total'],
+    )
+    session.present_count, session.total_count = counts['present'], counts['total']
+
+    totals = (
+        AttendanceRecord.objects
+        .filter(session__course_id=session.course_id, student_id__in=student_ids)
+        .values('student_id')
+        .annotate(total=Count('id'), present=Count('id', filter=Q(is_present=True)))
+    )
+    CourseAttendanceSummary.objects.bulk_create(
+        [
+            CourseAttendanceSummary(
+                student_id=row['student_id'], course_id=session.course_id,
+                total=row['total'], present=row['present'],
+            )
+            for row in totals
+        ],
+        update_conflicts=True,
+        unique_fields=['student', 'course'],
+        update_fields=['total', 'present', 'updated_at'],
+    )
+
+
+def mark_session(session, marks):
+    """Upsert a session's roster and refresh its aggregates. `marks`: student id -> is_present."""
+    with transaction.atomic():
+        upsert_marks(AttendanceRecord, {'session': session}, marks)
+        refresh_aggregates(session, list(marks))
+    invalidate_tags_on_commit(
+        tag('teacher', session.teacher_id), *(tag('student', sid) for sid in marks),
+    )
+    return session
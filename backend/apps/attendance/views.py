@@ -42,6 +42,9 @@ class AttendanceSessionCreateView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         session = serializer.save()
+        session = AttendanceSession.objects.select_related('course').prefetch_related(
+            'records__student'
+        ).get(pk=session.pk)
         return Response({
             'success': True,
             'message': 'Attendance marked successfully.',
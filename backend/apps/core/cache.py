@@ -0,0 +1,209 @@
+"""
+Cache-aside helpers for hot read endpoints.
+
+Entries are grouped by *tags* such as "course:<id>", "lesson:<id>" or
+"student:<id>". Every tag owns a version stamp in the cache; an entry
+remembers the versions it was built against and is treated as a miss as
+soon as any of them changes. Model signals (see apps.core.signals) restamp
+the tags, so views only declare what they depend on.
+
+Recomputation is stampede-safe: on a miss a single caller takes a short
+lock and rebuilds the value while the others wait briefly for it, and hot
+entries are refreshed probabilistically shortly before they expire
+("XFetch" early recompute) so they rarely expire under load at all.
+"""
+import hashlib
+import math
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from .metrics import record_cache_lookup
+
+TAG_PREFIX = 'tagv:'
+LOCK_PREFIX = 'lock:'
+LOCK_TIMEOUT = 30       # seconds a recompute lock may be held
+LOCK_WAIT = 2.0         # seconds a caller waits for another worker's recompute
+LOCK_POLL = 0.05
+EARLY_RECOMPUTE_BETA = 1.0
+
+
+def tag(kind: str, pk=None) -> str:
+    """Build a tag name: tag('course', 5) -> 'course:5', tag('catalog') -> 'catalog'."""
+    return kind if pk is None else f'{kind}:{pk}'
+
+
+def resolve_timeout(timeout):
+    """Accept seconds or a named timeout from settings.CACHE_TIMEOUTS."""
+    if isinstance(timeout, str):
+        return settings.CACHE_TIMEOUTS[timeout]
+    return settings.CACHE_TIMEOUTS['default'] if timeout is None else timeout
+
+
+# ─── Tag Versions ─────────────────────────────────────────────────
+
+def _new_version():
+    # Time-based so a version recreated after eviction never matches an old entry.
+    return time.time_ns()
+
+
+def _tag_versions(tags, create=False) -> dict:
+    keys = [TAG_PREFIX + t for t in tags]
+    found = cache.get_many(keys) if keys else {}
+    if create:
+        for key in keys:
+            if key not in found:
+                version = _new_version()
+                cache.add(key, version, None)
+                found[key] = cache.get(key, version)
+    return {key[len(TAG_PREFIX):]: found.get(key) for key in keys}
+
+
+def invalidate_tags(*tags):
+    """Give every tag a new version so dependent entries miss on next read."""
+    if tags:
+        version = _new_version()
+        cache.set_many({TAG_PREFIX + t: version for t in tags}, None)
+
+
+def invalidate_tags_on_commit(*tags):
+    """Invalidate once the surrounding transaction commits (immediately in autocommit)."""
+    if tags:
+        transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+# ─── Cache-aside Core ─────────────────────────────────────────────
+
+def _is_fresh(entry, versions) -> bool:
+    return isinstance(entry, dict) and entry.get('tags') == versions
+
+
+def _should_recompute_early(entry, now) -> bool:
+    delta = entry.get('delta', 0)
+    if delta <= 0:
+        return False
+    return now - delta * EARLY_RECOMPUTE_BETA * math.log(random.random() or 1e-12) >= entry['expires']
+
+
+def _compute_and_store(key, compute, timeout, tags):
+    versions = _tag_versions(tags, create=True)
+    started = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - started
+    cache.set(key, {
+        'value': value,
+        'tags': versions,
+        'delta': delta,
+        'expires': time.time() + timeout,
+    }, timeout)
+    return value
+
+
+def get_or_compute(key: str, compute, timeout=None, tags=()):
+    """
+    Return the cached value for `key`, calling `compute()` on a miss.
+    The entry is invalidated when any of `tags` is restamped.
+    """
+    timeout = resolve_timeout(timeout)
+    tags = sorted(set(tags))
+    tag_keys = [TAG_PREFIX + t for t in tags]
+    found = cache.get_many([key, *tag_keys])
+    versions = {t: found.get(TAG_PREFIX + t) for t in tags}
+    entry = found.get(key)
+    lock_key = LOCK_PREFIX + key
+
+    fresh = _is_fresh(entry, versions)
+    record_cache_lookup(fresh)
+    if fresh:
+        if not _should_recompute_early(entry, time.time()):
+            return entry['value']
+        # Refresh ahead of expiry; whoever loses the lock keeps serving the old value.
+        if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return entry['value']
+        try:
+            return _compute_and_store(key, compute, timeout, tags)
+        finally:
+            cache.delete(lock_key)
+
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            return _compute_and_store(key, compute, timeout, tags)
+        finally:
+            cache.delete(lock_key)
+
+    # Another worker is rebuilding this entry: wait for it rather than pile on.
+    # A missing lock means it finished (or the cache is unreachable) — stop waiting.
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline and cache.get(lock_key) is not None:
+        time.sleep(LOCK_POLL)
+    entry = cache.get(key)
+    if _is_fresh(entry, _tag_versions(tags)):
+        return entry['value']
+    return _compute_and_store(key, compute, timeout, tags)
+
+
+def make_key(*parts) -> str:
+    raw = '|'.join(str(p) for p in parts)
+    return 'ca:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def cached_queryset(queryset, tags=(), timeout=None, key=None):
+    """Evaluate `queryset` through the cache and return it as a list."""
+    if key is None:
+        sql, params = queryset.query.sql_with_params()
+        key = make_key(queryset.model._meta.label, sql, params)
+    return get_or_compute(key, lambda: list(queryset), timeout=timeout, tags=tags)
+
+
+# ─── View Decorator ───────────────────────────────────────────────
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def vary_on_user(request):
+    return request.user.pk if request.user.is_authenticated else 'anon'
+
+
+def cached_view(timeout=None, tags=(), vary_on=vary_on_user):
+    """
+    Cache-aside decorator for the GET handlers (`get`/`list`/`retrieve`) of
+    DRF views. Only 200 responses are stored; their `data` is cached, so
+    renderers and headers are still produced per request.
+
+    `tags` is a list or a callable `(view, request, *args, **kwargs) -> tags`.
+    `vary_on` is a callable `(request) -> str` selecting whose copy is
+    served; pass None for responses that are identical for every user.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return method(view, request, *args, **kwargs)
+
+            entry_tags = tags(view, request, *args, **kwargs) if callable(tags) else tags
+            key = make_key(
+                'view', view.__class__.__qualname__, method.__name__,
+                request.path, sorted(request.query_params.lists()),
+                vary_on(request) if vary_on else '*',
+            )
+
+            def compute():
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    raise _Uncacheable(response)
+                return response.data
+
+            try:
+                data = get_or_compute(key, compute, timeout=timeout, tags=entry_tags)
+            except _Uncacheable as e:
+                return e.response
+            return Response(data)
+        return wrapper
+    return decorator
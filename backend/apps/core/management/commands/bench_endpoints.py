@@ -0,0 +1,346 @@
+"""
+In-process benchmark of the hot API endpoints.
+
+    python manage.py seed_synthetic --students 2000 --reset
+    python manage.py bench_endpoints --requests 2000 --output bench.json
+    python manage.py bench_endpoints --requests 2000 --baseline bench.json
+
+Requests go through the full middleware/DRF stack via the Django test
+client, authenticated as random synthetic students (the admin_* scenarios
+as the synthetic admin, teacher_* as a random synthetic teacher), following a weighted mix of scenarios. For every
+scenario the report shows p50/p95/p99 latency, SQL queries per request and
+cache hit ratio. With --baseline the run fails when a scenario's p99 or
+query count regresses beyond the tolerance, so it can gate a deploy.
+
+Scenarios in FIXED_QUERY_SCENARIOS must cost the same number of queries
+whatever the size of the course or user behind the request; the run fails
+if their query count varies between requests. That check leaves out the
+authenticated user's snapshot reload, which happens whenever its cache
+entry expires or is recomputed early.
+
+Write scenarios (quiz submit, lesson complete, sync, interactions) change
+data: point this at a database seeded with seed_synthetic, never production.
+"""
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils import timezone
+
+from apps.core.management.commands.seed_synthetic import CATEGORIES, SYNTHETIC_DOMAIN
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.offline.models import OfflineDownload
+from apps.quizzes.models import Quiz
+from apps.users.models import User
+from apps.users.tokens import RefreshToken
+
+# scenario -> relative weight
+DEFAULT_MIX = {
+    'dashboard': 20,
+    'catalog': 20,
+    'quiz_submit': 10,
+    'lesson_complete': 15,
+    'offline_sync': 10,
+    'interactions': 20,
+    'leaderboard': 5,
+    'admin_course': 3,
+    'admin_user': 3,
+    'teacher_roster': 3,
+}
+
+# Admin detail pages are built from a fixed set of prefetches (apps.admin_panel.querysets);
+# the teacher roster is one annotated query (apps.teachers.roster).
+FIXED_QUERY_SCENARIOS = {'admin_course', 'admin_user', 'teacher_roster'}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(pct / 100 * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+class Command(BaseCommand):
+    help = 'Drive the hot endpoints in-process and report p50/p99 latency and queries per request.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--warmup', type=int, default=50, help='requests run before measuring')
+        parser.add_argument('--users', type=int, default=200, help='synthetic students to sample')
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument('--mix', default='',
+                            help='override weights, e.g. "dashboard=5,catalog=1,quiz_submit=0"')
+        parser.add_argument('--output', help='write results as JSON')
+        parser.add_argument('--baseline', help='JSON from an earlier run to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='allowed relative p99 regression against the baseline')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.client = Client()
+        mix = self._parse_mix(options['mix'])
+        self._load_fixtures(options['users'])
+        if self.admin_token is None:
+            self.stdout.write(self.style.WARNING('No synthetic admin (re-run seed_synthetic): skipping admin scenarios.'))
+            mix.update({name: 0 for name in mix if name.startswith('admin_')})
+        if not self.teacher_tokens:
+            self.stdout.write(self.style.WARNING('No synthetic teachers: skipping teacher scenarios.'))
+            mix.update({name: 0 for name in mix if name.startswith('teacher_')})
+
+        scenarios = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in scenarios]
+
+        for _ in range(options['warmup']):
+            self._run(self.rng.choices(scenarios, weights)[0])
+
+        samples = defaultdict(list)
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            name = self.rng.choices(scenarios, weights)[0]
+            samples[name].append(self._run(name))
+        elapsed = time.perf_counter() - started
+
+        results = {name: self._summarise(samples[name]) for name in scenarios if samples[name]}
+        self._report(results, options['requests'], elapsed)
+        self._check_fixed_queries(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'requests': options['requests'], 'scenarios': results}, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options['baseline']:
+            self._compare(results, options['baseline'], options['tolerance'])
+
+    # ─── Setup ────────────────────────────────────────────────────
+
+    def _parse_mix(self, raw):
+        mix = dict(DEFAULT_MIX)
+        for part in filter(None, raw.split(',')):
+            name, _, weight = part.partition('=')
+            if name not in mix:
+                raise CommandError(f'Unknown scenario "{name}". Choose from: {", ".join(mix)}')
+            mix[name] = float(weight)
+        if not any(mix.values()):
+            raise CommandError('The mix has no scenario with a positive weight.')
+        return mix
+
+    def _load_fixtures(self, size):
+        student_ids = list(
+            User.objects.filter(role='student', is_active=True, email__endswith=f'@{SYNTHETIC_DOMAIN}')
+            .order_by('email').values_list('pk', flat=True)[:size]
+        )
+        if not student_ids:
+            raise CommandError('No synthetic students found — run "manage.py seed_synthetic" first.')
+
+        self.tokens = {
+            user.pk: f'Bearer {RefreshToken.for_user(user).access_token}'
+            for user in User.objects.filter(pk__in=student_ids)
+        }
+        self.students = list(self.tokens)
+
+        self.enrolled = defaultdict(list)
+        for student_id, course_id in Enrollment.objects.filter(
+            student_id__in=student_ids, is_active=True,
+        ).values_list('student_id', 'course_id'):
+            self.enrolled[student_id].append(course_id)
+        course_ids = {c for courses in self.enrolled.values() for c in courses}
+
+        self.lessons = defaultdict(list)
+        for lesson_id, course_id in Lesson.objects.filter(course_id__in=course_ids).values_list('pk', 'course_id'):
+            self.lessons[course_id].append(lesson_id)
+
+        self.quizzes = defaultdict(list)
+        for quiz in Quiz.objects.filter(course_id__in=course_ids, is_published=True).prefetch_related('questions'):
+            self.quizzes[quiz.course_id].append(
+                (quiz.pk, [(str(q.pk), q.correct_answer) for q in quiz.questions.all()])
+            )
+
+        admin = User.objects.filter(role='admin', is_active=True, email__endswith=f'@{SYNTHETIC_DOMAIN}').first()
+        self.admin_token = f'Bearer {RefreshToken.for_user(admin).access_token}' if admin else None
+        self.courses = sorted(course_ids)
+        self.teachers = list(
+            User.objects.filter(role='teacher', email__endswith=f'@{SYNTHETIC_DOMAIN}').values_list('pk', flat=True)
+        )
+        self.teacher_tokens = [
+            f'Bearer {RefreshToken.for_user(teacher).access_token}'
+            for teacher in User.objects.filter(pk__in=self.teachers)
+        ]
+
+        self.downloads = defaultdict(list)
+        for download_id, student_id in OfflineDownload.objects.filter(
+            student_id__in=student_ids,
+        ).values_list('pk', 'student_id'):
+            self.downloads[student_id].append(download_id)
+
+    # ─── Scenarios ────────────────────────────────────────────────
+    # Each returns (method, path, payload) for a randomly chosen student.
+
+    def _pick_course(self, student_id, source):
+        courses = [c for c in self.enrolled.get(student_id, []) if source.get(c)]
+        return self.rng.choice(courses) if courses else None
+
+    def scenario_dashboard(self, student_id):
+        return 'get', '/api/v1/students/dashboard/', None
+
+    def scenario_catalog(self, student_id):
+        if self.rng.random() < 0.5:
+            return 'get', '/api/v1/students/browse/', None
+        category = self.rng.choice(CATEGORIES)
+        return 'get', f'/api/v1/students/browse/?category={category}', None
+
+    def scenario_leaderboard(self, student_id):
+        return 'get', '/api/v1/progress/leaderboard/', None
+
+    def scenario_quiz_submit(self, student_id):
+        course_id = self._pick_course(student_id, self.quizzes)
+        if course_id is None:
+            return self.scenario_dashboard(student_id)
+        quiz_id, questions = self.rng.choice(self.quizzes[course_id])
+        answers = {
+            qid: correct if self.rng.random() < 0.7 else self.rng.choice('abcd')
+            for qid, correct in questions
+        }
+        return 'post', f'/api/v1/quizzes/{quiz_id}/submit/', {
+            'answers': answers, 'time_taken': self.rng.randint(60, 900),
+        }
+
+    def scenario_lesson_complete(self, student_id):
+        course_id = self._pick_course(student_id, self.lessons)
+        if course_id is None:
+            return self.scenario_dashboard(student_id)
+        return 'post', '/api/v1/progress/complete/', {
+            'lesson_id': str(self.rng.choice(self.lessons[course_id])),
+            'time_spent': self.rng.randint(30, 1800),
+        }
+
+    def scenario_offline_sync(self, student_id):
+        downloads = self.downloads.get(student_id)
+        if not downloads:
+            return self.scenario_dashboard(student_id)
+        return 'post', '/api/v1/offline/sync/bulk/', {'items': [
+            {
+                'download_id': str(download_id),
+                'progress_percentage': round(self.rng.uniform(0, 100), 1),
+                'last_position_seconds': self.rng.randint(0, 1800),
+            }
+            for download_id in self.rng.sample(downloads, min(5, len(downloads)))
+        ]}
+
+    def scenario_interactions(self, student_id):
+        now = timezone.now().isoformat()
+        return 'post', '/api/v1/ai/interactions/', {
+            'session_id': f'bench-{student_id}',
+            'platform': self.rng.choice(['mobile', 'web']),
+            'events': [
+                {
+                    'event_type': 'typing_pattern',
+                    'metrics': {
+                        'typing_speed_wpm': round(self.rng.uniform(10, 90), 1),
+                        'backspace_rate': round(self.rng.uniform(0, 0.4), 3),
+                        'pause_count': self.rng.randint(0, 10),
+                    },
+                    'context': {'screen': 'lesson_view'},
+                    'timestamp': now,
+                }
+                for _ in range(self.rng.randint(1, 10))
+            ],
+        }
+
+    def scenario_admin_course(self, student_id):
+        return 'get', f'/api/v1/admin/courses/{self.rng.choice(self.courses)}/', None
+
+    def scenario_admin_user(self, student_id):
+        if self.teachers and self.rng.random() < 0.5:
+            return 'get', f'/api/v1/admin/teachers/{self.rng.choice(self.teachers)}/', None
+        return 'get', f'/api/v1/admin/students/{student_id}/', None
+
+    def scenario_teacher_roster(self, student_id):
+        ordering = self.rng.choice(['-enrolled_at', '-progress_percentage', 'last_active', 'average_quiz_score'])
+        return 'get', f'/api/v1/teachers/students/?ordering={ordering}', None
+
+    # ─── Measurement ──────────────────────────────────────────────
+
+    def _run(self, name):
+        student_id = self.rng.choice(self.students)
+        method, path, payload = getattr(self, f'scenario_{name}')(student_id)
+        if name.startswith('admin_'):
+            token = self.admin_token
+        elif name.startswith('teacher_'):
+            token = self.rng.choice(self.teacher_tokens)
+        else:
+            token = self.tokens[student_id]
+        kwargs = {'HTTP_AUTHORIZATION': token}
+        if payload is not None:
+            kwargs.update(data=json.dumps(payload), content_type='application/json')
+
+        started = time.perf_counter()
+        response = getattr(self.client, method)(path, **kwargs)
+        duration = time.perf_counter() - started
+        # RequestLoggingMiddleware leaves its per-request counters on the request.
+        return duration, response.wsgi_request.perf_stats, response.status_code
+
+    def _summarise(self, samples):
+        latencies = sorted(d * 1000 for d, _, _ in samples)
+        queries = sorted(s.queries for _, s, _ in samples)
+        view_queries = sorted(s.queries - s.auth_queries for _, s, _ in samples)
+        hits = sum(s.cache_hits for _, s, _ in samples)
+        lookups = hits + sum(s.cache_misses for _, s, _ in samples)
+        return {
+            'count': len(samples),
+            'errors': sum(1 for _, _, code in samples if code >= 400),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_queries': round(statistics.fmean(queries), 2),
+            'min_queries': queries[0],
+            'max_queries': queries[-1],
+            'min_view_queries': view_queries[0],
+            'max_view_queries': view_queries[-1],
+            'cache_hit_ratio': round(hits / lookups, 3) if lookups else None,
+        }
+
+    def _report(self, results, total, elapsed):
+        self.stdout.write(
+            f"{'scenario':<16}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'q/req':>8}{'q max':>7}{'cache':>8}"
+        )
+        for name, r in results.items():
+            ratio = '-' if r['cache_hit_ratio'] is None else f"{r['cache_hit_ratio']:.0%}"
+            self.stdout.write(
+                f"{name:<16}{r['count']:>7}{r['errors']:>8}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+                f"{r['p99_ms']:>10.2f}{r['mean_queries']:>8.1f}{r['max_queries']:>7}{ratio:>8}"
+            )
+        self.stdout.write(f'{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)')
+
+    def _check_fixed_queries(self, results):
+        varying = [
+            f"{name}: {r['min_view_queries']}-{r['max_view_queries']} queries/request"
+            for name, r in results.items()
+            if name in FIXED_QUERY_SCENARIOS and r['min_view_queries'] != r['max_view_queries']
+        ]
+        if varying:
+            raise CommandError('Query count depends on the data behind the request:\n  ' + '\n  '.join(varying))
+
+    def _compare(self, results, path, tolerance):
+        with open(path) as fh:
+            baseline = json.load(fh)['scenarios']
+        regressions = []
+        for name, current in results.items():
+            before = baseline.get(name)
+            if not before:
+                continue
+            if current['p99_ms'] > before['p99_ms'] * (1 + tolerance):
+                regressions.append(f"{name}: p99 {before['p99_ms']}ms -> {current['p99_ms']}ms")
+            if current['mean_queries'] > before['mean_queries'] + 0.5:
+                regressions.append(
+                    f"{name}: queries/request {before['mean_queries']} -> {current['mean_queries']}"
+                )
+        if regressions:
+            raise CommandError('Performance regressions against baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}.'))
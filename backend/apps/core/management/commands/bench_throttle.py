@@ -0,0 +1,79 @@
+"""
+Benchmark the GCRA rate limiter against DRF's sliding-log throttle.
+
+    python manage.py bench_throttle --keys 1000 --hits 10,100,1000
+
+For every hits-per-key level the limiter is driven with fresh keys and the
+report shows throughput and the bytes stored per key. GCRA keeps a single
+timestamp per key, so its footprint stays flat; DRF's SimpleRateThrottle
+stores one timestamp per request inside the window, so its footprint grows
+with the rate. With CACHE_BACKEND=redis the sizes come from MEMORY USAGE,
+otherwise from the pickled values the cache would store.
+"""
+import pickle
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.core.throttling import limiter, parse_rate
+
+
+class Command(BaseCommand):
+    help = 'Measure throughput and memory per key of the GCRA rate limiter.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=500)
+        parser.add_argument('--hits', default='10,100,1000', help='comma-separated hits per key')
+        parser.add_argument('--rate', default='1000/hour', help='limit applied to every key')
+
+    def handle(self, *args, **options):
+        limit, period = parse_rate(options['rate'])
+        redis = self._redis()
+        backend = 'redis' if redis is not None else 'in-process'
+        self.stdout.write(f'GCRA backend: {backend}, rate {options["rate"]}, {options["keys"]} keys per level')
+        self.stdout.write(
+            f"{'hits/key':>9}{'allowed':>10}{'ops/s':>11}{'GCRA B/key':>12}{'DRF log B/key':>15}"
+        )
+
+        for hits in [int(h) for h in options['hits'].split(',') if h]:
+            run = uuid.uuid4().hex[:8]
+            keys = [f'throttle:bench:{run}:{i}' for i in range(options['keys'])]
+            allowed = 0
+            started = time.perf_counter()
+            for _ in range(hits):
+                for key in keys:
+                    allowed += limiter.hit(key, limit, period) == 0
+            elapsed = time.perf_counter() - started
+
+            gcra_bytes = self._gcra_bytes(redis, keys)
+            # SimpleRateThrottle keeps every allowed request's timestamp for the window.
+            history = [time.time()] * min(hits, limit)
+            drf_bytes = len(pickle.dumps(history, pickle.HIGHEST_PROTOCOL))
+
+            self.stdout.write(
+                f'{hits:>9}{allowed:>10}{hits * len(keys) / elapsed:>11.0f}'
+                f'{gcra_bytes:>12.0f}{drf_bytes:>15}'
+            )
+            if redis is not None:
+                redis.delete(*[cache.make_key(key) for key in keys])
+        limiter.reset()
+
+    def _redis(self):
+        if settings.CACHE_BACKEND not in ('redis', 'fakeredis'):
+            return None
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+
+    def _gcra_bytes(self, redis, keys):
+        if redis is None:
+            sizes = [len(pickle.dumps(limiter._local[key], pickle.HIGHEST_PROTOCOL)) for key in keys]
+        else:
+            try:
+                sizes = [redis.memory_usage(cache.make_key(key)) or 0 for key in keys]
+            except Exception:
+                # Backends without MEMORY USAGE (e.g. fakeredis): the stored value itself.
+                sizes = [len(redis.get(cache.make_key(key)) or b'') for key in keys]
+        return sum(sizes) / len(sizes)
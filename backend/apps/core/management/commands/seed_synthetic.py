@@ -0,0 +1,289 @@
+"""
+Generate a large, reproducible synthetic dataset for load tests and benchmarks.
+
+    python manage.py seed_synthetic --students 5000 --teachers 50 --courses 200 --seed 42
+
+Unlike the demo seeders (seed_all.py and friends) every table is written with
+bulk_create in batches, and all randomness — including primary keys — comes
+from one seeded RNG, so the same arguments always produce the same rows.
+Synthetic users share the SYNTHETIC_DOMAIN e-mail domain; --reset removes
+them (and everything hanging off them) before generating again.
+"""
+import random
+import time
+import uuid
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core.cache import invalidate_tags
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.lessons.ordering import spread_ranks
+from apps.offline.models import MicroLesson, OfflineDownload
+from apps.progress.models import AchievementBadge, CourseProgress, LessonProgress, StudentBadge
+from apps.quizzes.models import Quiz, QuizAttempt, QuizQuestion
+from apps.users.models import User
+
+SYNTHETIC_DOMAIN = 'synthetic.mentiq.test'
+SYNTHETIC_PASSWORD = 'Synthetic@123'
+
+CATEGORIES = [c for c, _ in Course.CategoryChoices.choices]
+LEVELS = [c for c, _ in Course.LevelChoices.choices]
+RARITIES = [c for c, _ in AchievementBadge.RARITY_CHOICES]
+OPTIONS = 'abcd'
+GRADES = [f'{g}th Class' for g in range(6, 13)]
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate a deterministic synthetic dataset (users, courses, lessons, quizzes, attempts).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--teachers', type=int, default=20)
+        parser.add_argument('--courses', type=int, default=50)
+        parser.add_argument('--lessons', type=int, default=10, help='lessons per course')
+        parser.add_argument('--quizzes', type=int, default=3, help='quizzes per course')
+        parser.add_argument('--questions', type=int, default=10, help='questions per quiz')
+        parser.add_argument('--enrollments', type=int, default=5, help='courses per student')
+        parser.add_argument('--attempts', type=int, default=5000, help='total quiz attempts')
+        parser.add_argument('--completion', type=float, default=0.4,
+                            help='share of enrolled lessons marked complete')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--reset', action='store_true', help='delete existing synthetic data first')
+
+    def handle(self, *args, **options):
+        if options['teachers'] < 1 or options['courses'] < 1:
+            raise CommandError('At least one teacher and one course are required.')
+        if options['teachers'] > 90000:
+            raise CommandError('teacher_id is 5 digits: at most 90000 teachers.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.options = options
+        started = time.perf_counter()
+
+        if options['reset']:
+            self._reset()
+        elif User.objects.filter(email__endswith=f'@{SYNTHETIC_DOMAIN}').exists():
+            raise CommandError('Synthetic data already exists; pass --reset to regenerate it.')
+
+        with transaction.atomic():
+            teachers, students = self._users()
+            courses = self._courses(teachers)
+            lessons = self._lessons(courses)
+            quizzes = self._quizzes(courses)
+            enrollments = self._enrollments(students, courses)
+            self._progress(enrollments, lessons)
+            self._attempts(enrollments, quizzes)
+            self._offline(enrollments, lessons)
+            self._badges(students)
+
+        # Bulk inserts skip the invalidation signals.
+        invalidate_tags('catalog', 'announcements')
+        self.stdout.write(self.style.SUCCESS(
+            f'Synthetic dataset ready in {time.perf_counter() - started:.1f}s '
+            f'(password for every synthetic user: {SYNTHETIC_PASSWORD})'
+        ))
+
+    # ─── Helpers ──────────────────────────────────────────────────
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _insert(self, model, objects):
+        objects = list(objects)
+        for batch in _batched(objects, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+        self.stdout.write(f'  {model.__name__:<16} {len(objects):>9,}')
+        return objects
+
+    def _reset(self):
+        users = User.objects.filter(email__endswith=f'@{SYNTHETIC_DOMAIN}')
+        Course.all_objects.filter(teacher__in=users).delete()
+        deleted, _ = users.delete()
+        AchievementBadge.objects.filter(criteria_type__startswith='synthetic_').delete()
+        self.stdout.write(f'Removed previous synthetic data ({deleted:,} rows).')
+
+    # ─── Generators ───────────────────────────────────────────────
+
+    def _users(self):
+        password = make_password(SYNTHETIC_PASSWORD)  # hash once, not per row
+        teachers = [
+            User(
+                id=self._uuid(), email=f'teacher{i:05d}@{SYNTHETIC_DOMAIN}', name=f'Teacher {i}',
+                role=User.RoleChoices.TEACHER, password=password, is_email_verified=True,
+                teacher_id=str(10000 + i),
+            )
+            for i in range(self.options['teachers'])
+        ]
+        students = [
+            User(
+                id=self._uuid(), email=f'student{i:07d}@{SYNTHETIC_DOMAIN}', name=f'Student {i}',
+                role=User.RoleChoices.STUDENT, password=password, is_email_verified=True,
+                student_id=f'9{i:07d}', grade_level=self.rng.choice(GRADES),
+            )
+            for i in range(self.options['students'])
+        ]
+        # One admin, so bench_endpoints can drive the admin pages.
+        self._insert(User, [User(
+            id=self._uuid(), email=f'admin@{SYNTHETIC_DOMAIN}', name='Synthetic Admin',
+            role=User.RoleChoices.ADMIN, password=password, is_email_verified=True, is_staff=True,
+        )])
+        return self._insert(User, teachers), self._insert(User, students)
+
+    def _courses(self, teachers):
+        return self._insert(Course, (
+            Course(
+                id=self._uuid(),
+                teacher=teachers[i % len(teachers)],
+                title=f'Synthetic Course {i}',
+                description='Generated for load testing.',
+                category=self.rng.choice(CATEGORIES),
+                level=self.rng.choice(LEVELS),
+                grade_level=self.rng.choice(GRADES),
+                is_published=True,
+                is_featured=self.rng.random() < 0.1,
+            )
+            for i in range(self.options['courses'])
+        ))
+
+    def _lessons(self, courses):
+        per_course = self.options['lessons']
+        ranks = spread_ranks(per_course)
+        lessons = self._insert(Lesson, (
+            Lesson(
+                id=self._uuid(), course=course, title=f'{course.title} - Lesson {n}',
+                content='Synthetic lesson content.', sequence_number=n, rank=ranks[n - 1],
+                duration=self.rng.randint(5, 45),
+            )
+            for course in courses for n in range(1, per_course + 1)
+        ))
+        by_course = {}
+        for lesson in lessons:
+            by_course.setdefault(lesson.course_id, []).append(lesson)
+        return by_course
+
+    def _quizzes(self, courses):
+        quizzes = self._insert(Quiz, (
+            Quiz(
+                id=self._uuid(), course=course, title=f'{course.title} - Quiz {n}',
+                duration=20, passing_score=60, is_published=True, max_attempts=3,
+            )
+            for course in courses for n in range(1, self.options['quizzes'] + 1)
+        ))
+        questions = self._insert(QuizQuestion, (
+            QuizQuestion(
+                id=self._uuid(), quiz=quiz, question_text=f'Question {n} of {quiz.title}?',
+                option_a='Option A', option_b='Option B', option_c='Option C', option_d='Option D',
+                correct_answer=self.rng.choice(OPTIONS), sequence_number=n,
+            )
+            for quiz in quizzes for n in range(1, self.options['questions'] + 1)
+        ))
+        key = {}
+        for question in questions:
+            key.setdefault(question.quiz_id, []).append(question)
+        by_course = {}
+        for quiz in quizzes:
+            by_course.setdefault(quiz.course_id, []).append((quiz, key.get(quiz.pk, [])))
+        return by_course
+
+    def _enrollments(self, students, courses):
+        per_student = min(self.options['enrollments'], len(courses))
+        return self._insert(Enrollment, (
+            Enrollment(id=self._uuid(), student=student, course=course)
+            for student in students for course in self.rng.sample(courses, per_student)
+        ))
+
+    def _progress(self, enrollments, lessons):
+        completion = self.options['completion']
+        lesson_progress, course_progress = [], []
+        for enrollment in enrollments:
+            course_lessons = lessons.get(enrollment.course_id, [])
+            done = [lesson for lesson in course_lessons if self.rng.random() < completion]
+            lesson_progress.extend(
+                LessonProgress(
+                    id=self._uuid(), student_id=enrollment.student_id, lesson=lesson,
+                    completed=True, time_spent=self.rng.randint(60, 3600),
+                )
+                for lesson in done
+            )
+            course_progress.append(CourseProgress(
+                id=self._uuid(), student_id=enrollment.student_id, course_id=enrollment.course_id,
+                progress_percentage=round(100 * len(done) / len(course_lessons), 2) if course_lessons else 0,
+                last_lesson=done[-1] if done else None,
+            ))
+        self._insert(LessonProgress, lesson_progress)
+        self._insert(CourseProgress, course_progress)
+
+    def _attempts(self, enrollments, quizzes):
+        # At most one seeded attempt per (student, quiz) so the 3-per-day
+        # submit limit still leaves room for benchmark submissions.
+        pairs = [
+            (enrollment.student_id, quiz, questions)
+            for enrollment in enrollments
+            for quiz, questions in quizzes.get(enrollment.course_id, [])
+        ]
+        picked = self.rng.sample(pairs, min(self.options['attempts'], len(pairs)))
+        attempts = []
+        for student_id, quiz, questions in picked:
+            answers = {
+                str(q.pk): q.correct_answer if self.rng.random() < 0.7 else self.rng.choice(OPTIONS)
+                for q in questions
+            }
+            attempts.append(QuizAttempt(
+                id=self._uuid(), quiz=quiz, student_id=student_id,
+                score=sum(1 for q in questions if answers[str(q.pk)] == q.correct_answer),
+                total_questions=len(questions), answers=answers,
+                time_taken=self.rng.randint(60, 1200),
+            ))
+        self._insert(QuizAttempt, attempts)
+
+    def _offline(self, enrollments, lessons):
+        micro = self._insert(MicroLesson, (
+            MicroLesson(
+                id=self._uuid(), lesson=lesson, summary_text='Synthetic micro-lesson.',
+                file_size_bytes=self.rng.randint(1, 50) * 1024 * 1024,
+                duration_seconds=lesson.duration * 60,
+                compression_status=MicroLesson.CompressionStatus.COMPLETED,
+            )
+            for course_lessons in lessons.values() for lesson in course_lessons[:2]
+        ))
+        by_course = {}
+        for item in micro:
+            by_course.setdefault(item.lesson.course_id, []).append(item)
+        self._insert(OfflineDownload, (
+            OfflineDownload(
+                id=self._uuid(), student_id=enrollment.student_id, micro_lesson=item,
+                download_status=OfflineDownload.DownloadStatus.COMPLETED,
+                progress_percentage=round(self.rng.uniform(0, 100), 1),
+            )
+            for enrollment in enrollments for item in by_course.get(enrollment.course_id, [])
+        ))
+
+    def _badges(self, students):
+        badges = self._insert(AchievementBadge, (
+            AchievementBadge(
+                id=self._uuid(), name=f'Synthetic Badge {n}', description='Generated badge.',
+                rarity=rarity, icon_url='https://example.com/badge.png',
+                criteria_type=f'synthetic_{n}', criteria_threshold=n + 1,
+            )
+            for n, rarity in enumerate(RARITIES)
+        ))
+        self._insert(StudentBadge, (
+            StudentBadge(id=self._uuid(), student=student, badge=badge, is_claimed=True, progress=1)
+            for student in students for badge in badges if self.rng.random() < 0.2
+        ))
@@ -0,0 +1,207 @@
+"""
+Per-request performance instrumentation.
+
+RequestLoggingMiddleware binds a RequestStats to every request. The DB
+execute wrapper (QueryRecorder) and the cache-aside layer feed it, and the
+middleware folds the totals into Prometheus metrics served at /metrics.
+
+With several gunicorn workers, set PROMETHEUS_MULTIPROC_DIR so every worker
+writes its samples to a shared directory and a scrape sees all of them.
+"""
+import contextvars
+import cProfile
+import heapq
+import io
+import itertools
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import Counter as PromCounter
+from prometheus_client import Histogram, multiprocess
+
+_current_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+# ─── Prometheus Metrics ───────────────────────────────────────────
+
+REQUEST_LATENCY = Histogram(
+    'mentiq_http_request_duration_seconds',
+    'Request latency by route.',
+    ['method', 'route', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'mentiq_http_request_db_queries',
+    'SQL queries executed per request.',
+    ['route'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 500),
+)
+REQUEST_DB_TIME = Histogram(
+    'mentiq_http_request_db_seconds',
+    'Time spent in SQL per request.',
+    ['route'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+N_PLUS_ONE = PromCounter(
+    'mentiq_http_n_plus_one_requests',
+    'Requests that repeated one SQL shape at least N_PLUS_ONE_THRESHOLD times.',
+    ['route'],
+)
+CACHE_LOOKUPS = PromCounter(
+    'mentiq_cache_lookups',
+    'Cache-aside lookups by result.',
+    ['result'],
+)
+MAINTENANCE_ROWS = PromCounter(
+    'mentiq_maintenance_rows',
+    'Rows deleted or updated by maintenance sweeps (apps.core.sweeps).',
+    ['sweep'],
+)
+MAINTENANCE_BATCH_SECONDS = Histogram(
+    'mentiq_maintenance_batch_seconds',
+    'Duration of one maintenance sweep batch transaction.',
+    ['sweep'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+def render_metrics() -> bytes:
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+# ─── Request Stats ────────────────────────────────────────────────
+
+class RequestStats:
+    """
+    Counters collected while a single request is being served. `auth_queries`
+    is the part of `queries` spent loading the authenticated user (a cache
+    miss on its snapshot, see apps.users.authentication).
+    """
+    __slots__ = ('queries', 'auth_queries', 'db_time', 'shapes', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries = 0
+        self.auth_queries = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def repeated_shapes(self, threshold: int):
+        """SQL shapes executed at least `threshold` times — the N+1 signature."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def bind_stats(stats):
+    return _current_stats.set(stats)
+
+
+def unbind_stats(token):
+    _current_stats.reset(token)
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+def record_cache_lookup(hit: bool):
+    stats = _current_stats.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+    CACHE_LOOKUPS.labels(result='hit' if hit else 'miss').inc()
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+
+
+def sql_shape(sql: str) -> str:
+    """Normalise SQL so queries differing only in literals or IN-list length compare equal."""
+    shape = _STRING_LITERAL.sub('?', sql)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    return _PLACEHOLDER_LIST.sub('(...)', shape)
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` hook that counts and times every query."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.db_time += time.perf_counter() - started
+            self.stats.queries += 1
+            self.stats.shapes[sql_shape(sql)] += 1
+
+
+# ─── Slow Request Sampler ─────────────────────────────────────────
+
+class SlowRequestSampler:
+    """
+    Opt-in (PROFILE_SLOW_REQUESTS): profiles a random PROFILE_SAMPLE_RATE
+    share of requests with cProfile and keeps the PROFILE_TOP_N slowest
+    snapshots of this process in memory.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def should_profile(self) -> bool:
+        return settings.PROFILE_SLOW_REQUESTS and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    def offer(self, duration, request, route, stats, profiler):
+        size = settings.PROFILE_TOP_N
+        with self._lock:
+            if len(self._heap) >= size and duration <= self._heap[0][0]:
+                return
+        # Only render the profile once we know the request makes the cut.
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(30)
+        snapshot = {
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': stats.queries,
+            'db_time_ms': round(stats.db_time * 1000, 2),
+            'captured_at': time.time(),
+            'profile': buffer.getvalue(),
+        }
+        with self._lock:
+            item = (duration, next(self._seq), snapshot)
+            if len(self._heap) < size:
+                heapq.heappush(self._heap, item)
+            elif duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def snapshots(self):
+        with self._lock:
+            return [snapshot for _, _, snapshot in sorted(self._heap, reverse=True)]
+
+
+slow_request_sampler = SlowRequestSampler()
+
+
+def new_profiler():
+    return cProfile.Profile() if slow_request_sampler.should_profile() else None
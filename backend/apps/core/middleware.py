@@ -3,21 +3,68 @@ Custom middleware for request logging, performance monitoring.
 """
 import logging
 import time
+from contextlib import ExitStack
 
-from django.utils.deprecation import MiddlewareMixin
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
 
 logger = logging.getLogger(__name__)
 
 
-class RequestLoggingMiddleware(MiddlewareMixin):
-    """Logs every API request with method, path, status, and duration."""
+class RequestLoggingMiddleware:
+    """
+    Logs every API request with method, path, status, duration and SQL cost,
+    and feeds the per-route Prometheus metrics exposed at /metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
 
-    def process_request(self, request):
+    def __call__(self, request):
         request._start_time = time.time()
+        stats = request.perf_stats = metrics.RequestStats()
+        token = metrics.bind_stats(stats)
+        profiler = metrics.new_profiler()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics.QueryRecorder(stats)))
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            metrics.unbind_stats(token)
 
-    def process_response(self, request, response):
-        duration = time.time() - getattr(request, '_start_time', time.time())
+        duration = time.time() - request._start_time
+        self._record(request, response, duration, stats, profiler)
+        return response
+
+    def _record(self, request, response, duration, stats, profiler):
         duration_ms = round(duration * 1000, 2)
+        db_ms = round(stats.db_time * 1000, 2)
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else '<unmatched>'
+
+        metrics.REQUEST_LATENCY.labels(
+            method=request.method, route=route, status=f'{response.status_code // 100}xx',
+        ).observe(duration)
+        metrics.REQUEST_QUERIES.labels(route=route).observe(stats.queries)
+        metrics.REQUEST_DB_TIME.labels(route=route).observe(stats.db_time)
+
+        repeated = stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            metrics.N_PLUS_ONE.labels(route=route).inc()
+            shape, count = repeated[0]
+            logger.warning(
+                f"⚠️ Possible N+1 on {request.method} {route}: "
+                f"{count}x {shape[:200]}"
+            )
 
         # Only log API requests
         if request.path.startswith('/api/'):
@@ -27,9 +74,16 @@ class RequestLoggingMiddleware(MiddlewareMixin):
                 f"{request.method} {request.path} | "
                 f"Status: {response.status_code} | "
                 f"Duration: {duration_ms}ms | "
+                f"Queries: {stats.queries} ({db_ms}ms) | "
+                f"Cache: {stats.cache_hits} hit/{stats.cache_misses} miss | "
                 f"User: {user_id}"
             )
 
+        if profiler is not None:
+            metrics.slow_request_sampler.offer(duration, request, route, stats, profiler)
+
         # Add performance headers
         response['X-Request-Duration-Ms'] = str(duration_ms)
-        return response
+        if settings.DEBUG:
+            response['X-DB-Queries'] = str(stats.queries)
+            response['X-DB-Time-Ms'] = str(db_ms)
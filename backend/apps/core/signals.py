@@ -0,0 +1,153 @@
+"""
+Cache invalidation wiring.
+Maps model writes to the cache tags they affect (see apps.core.cache).
+Bulk operations (`.update()`, `bulk_create`) bypass these signals; code
+doing them must call invalidate_tags() itself.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .cache import invalidate_tags_on_commit, tag
+
+FK_MEMO_TTL = 60 * 60
+
+
+def memoised_fk(label, pk, field):
+    """
+    Read one foreign-key column of a row through the cache, so resolving
+    which tags a write touches does not cost a query on the write path.
+    """
+    if pk is None:
+        return None
+
+    def load():
+        from django.apps import apps
+        model = apps.get_model(label)
+        manager = getattr(model, 'all_objects', model._default_manager)
+        return manager.filter(pk=pk).values_list(field, flat=True).first()
+
+    return cache.get_or_set(f'fk:{label}:{pk}:{field}', load, FK_MEMO_TTL)
+
+
+def course_teacher_id(course_id):
+    return memoised_fk('courses.Course', course_id, 'teacher_id')
+
+
+def _course_tags(course_id):
+    tags = [tag('course', course_id)]
+    teacher_id = course_teacher_id(course_id)
+    if teacher_id:
+        tags.append(tag('teacher', teacher_id))
+    return tags
+
+
+def _remember_course_teacher(sender, instance, **kwargs):
+    # post_save only sees the new teacher; keep the stored one for _course.
+    if not instance._state.adding:
+        instance._previous_teacher_id = course_teacher_id(instance.pk)
+
+
+def _course(instance):
+    cache.delete(f'fk:courses.Course:{instance.pk}:teacher_id')
+    tags = ['catalog', tag('course', instance.pk), tag('teacher', instance.teacher_id)]
+    previous_teacher_id = getattr(instance, '_previous_teacher_id', None)
+    if previous_teacher_id and previous_teacher_id != instance.teacher_id:
+        # Reassigned: the old teacher's dashboards and rosters still list it.
+        tags.append(tag('teacher', previous_teacher_id))
+    return tags
+
+
+def _lesson(instance):
+    return ['catalog', tag('lesson', instance.pk), *_course_tags(instance.course_id)]
+
+
+def _quiz(instance):
+    # 'catalog': the course list shows quiz_count.
+    return ['catalog', tag('quiz', instance.pk), *_course_tags(instance.course_id)]
+
+
+def _enrollment(instance):
+    # 'catalog': the course list shows student_count.
+    return [
+        'catalog',
+        tag('enrollment', instance.pk),
+        tag('student', instance.student_id),
+        tag('enrollments:student', instance.student_id),
+        *_course_tags(instance.course_id),
+    ]
+
+
+def _student_scoped(instance):
+    return [tag('student', instance.student_id)]
+
+
+def _course_progress(instance):
+    return [tag('student', instance.student_id), *_course_tags(instance.course_id)]
+
+
+def _quiz_question(instance):
+    # Rebuilds the compiled answer key (apps.quizzes.grading).
+    return [tag('quiz', instance.quiz_id)]
+
+
+def _quiz_attempt(instance):
+    course_id = memoised_fk('quizzes.Quiz', instance.quiz_id, 'course_id')
+    return [tag('student', instance.student_id), *_course_tags(course_id)]
+
+
+def _course_review(instance):
+    return _course_tags(instance.course_id)
+
+
+def _attendance_record(instance):
+    teacher_id = memoised_fk('attendance.AttendanceSession', instance.session_id, 'teacher_id')
+    return [tag('student', instance.student_id), tag('teacher', teacher_id)]
+
+
+def _session_booking(instance):
+    return [tag('teacher', instance.teacher_id)]
+
+
+def _user(instance):
+    # Drops the cached auth snapshot (apps.users.authentication).
+    return [tag('user', instance.pk)]
+
+
+def _announcement(instance):
+    return ['announcements']
+
+
+INVALIDATION_MAP = {
+    'courses.Course': _course,
+    'courses.CourseReview': _course_review,
+    'lessons.Lesson': _lesson,
+    'quizzes.Quiz': _quiz,
+    'quizzes.QuizQuestion': _quiz_question,
+    'quizzes.QuizAttempt': _quiz_attempt,
+    'enrollments.Enrollment': _enrollment,
+    'progress.LessonProgress': _student_scoped,
+    'progress.CourseProgress': _course_progress,
+    'attendance.AttendanceRecord': _attendance_record,
+    'live_classes.SessionBooking': _session_booking,
+    'announcements.Announcement': _announcement,
+    'users.User': _user,
+    # request.user is this proxy under CachedJWTAuthentication; its saves send their own signals.
+    'users.SnapshotUser': _user,
+}
+
+
+def _connect(label, tags_for):
+    def handler(sender, instance, **kwargs):
+        invalidate_tags_on_commit(*tags_for(instance))
+
+    post_save.connect(handler, sender=label, weak=False, dispatch_uid=f'cache-invalidate-save-{label}')
+    post_delete.connect(handler, sender=label, weak=False, dispatch_uid=f'cache-invalidate-delete-{label}')
+
+
+for _label, _tags_for in INVALIDATION_MAP.items():
+    _connect(_label, _tags_for)
+
+pre_save.connect(
+    _remember_course_teacher, sender='courses.Course', weak=False,
+    dispatch_uid='cache-invalidate-presave-courses.Course',
+)
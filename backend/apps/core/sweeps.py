@@ -0,0 +1,121 @@
+"""
+Batched maintenance sweeps for the housekeeping tasks.
+
+A Sweep deletes (or updates, or hands to a callback) the rows of one model
+that match a filter, walking the table in primary-key order:
+
+- Each batch selects the next MAINTENANCE_BATCH_SIZE matching keys after
+  the cursor and acts on that key range in its own short transaction, so
+  locks are held for one batch and never for the whole table. Cascades
+  (e.g. blacklist rows of expired tokens) are collected per batch too.
+- Batches are separated by MAINTENANCE_BATCH_PAUSE_MS so replicas and
+  concurrent writers keep up, and a run stops after
+  MAINTENANCE_TIME_BUDGET_SECONDS.
+- The cursor is checkpointed in the cache after every batch, so the next
+  run resumes where a budget-limited run stopped; it is cleared once a
+  pass reaches the end of the table. Losing it only means rescanning from
+  the start.
+- Rows and batch durations go to the Prometheus metrics
+  (mentiq_maintenance_*) and every run logs and returns a summary.
+"""
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import MAINTENANCE_BATCH_SECONDS, MAINTENANCE_ROWS
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_TIMEOUT = 7 * 24 * 60 * 60
+
+
+class Sweep:
+    """
+    `where(now)` returns the filter kwargs of the rows to sweep. By default
+    they are deleted; pass `update(now)` returning field values to update
+    them instead, or `action(queryset)` returning a row count for anything
+    else. `after_batch(pks)` runs after each committed batch.
+    """
+
+    def __init__(self, name, model, where, update=None, action=None, after_batch=None, batch_size=None):
+        self.name = name
+        self.model_label = model
+        self.where = where
+        self.update = update
+        self.action = action
+        self.after_batch = after_batch
+        self.batch_size = batch_size
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def checkpoint_key(self):
+        return f'maintenance-sweep:{self.name}:cursor'
+
+    def _apply(self, batch, now) -> int:
+        if self.action is not None:
+            return self.action(batch)
+        if self.update is not None:
+            return batch.update(**self.update(now))
+        # delete() reports cascaded rows too; count this model's rows only.
+        return batch.delete()[1].get(self.model_label, 0)
+
+    def run(self, time_budget=None) -> dict:
+        """Sweep until the table is done or the time budget is spent."""
+        budget = settings.MAINTENANCE_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+        batch_size = self.batch_size or settings.MAINTENANCE_BATCH_SIZE
+        pause = settings.MAINTENANCE_BATCH_PAUSE_MS / 1000
+        now = timezone.now()
+        matching = self.model._base_manager.filter(**self.where(now))
+
+        cursor = cache.get(self.checkpoint_key)
+        started = time.monotonic()
+        rows = batches = 0
+        complete = False
+        while time.monotonic() - started < budget:
+            keys = matching.order_by('pk')
+            if cursor is not None:
+                keys = keys.filter(pk__gt=cursor)
+            pks = list(keys.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                complete = True
+                break
+
+            batch_started = time.monotonic()
+            with transaction.atomic():
+                count = self._apply(matching.filter(pk__gte=pks[0], pk__lte=pks[-1]), now)
+            MAINTENANCE_BATCH_SECONDS.labels(self.name).observe(time.monotonic() - batch_started)
+            MAINTENANCE_ROWS.labels(self.name).inc(count)
+            if self.after_batch is not None:
+                self.after_batch(pks)
+
+            rows += count
+            batches += 1
+            cursor = pks[-1]
+            cache.set(self.checkpoint_key, cursor, CHECKPOINT_TIMEOUT)
+            if len(pks) < batch_size:
+                complete = True
+                break
+            time.sleep(pause)
+
+        if complete:
+            cache.delete(self.checkpoint_key)
+        summary = {
+            'sweep': self.name,
+            'rows': rows,
+            'batches': batches,
+            'seconds': round(time.monotonic() - started, 2),
+            'complete': complete,
+        }
+        logger.info(
+            f"🧹 Sweep {self.name}: {rows} rows in {batches} batches "
+            f"({summary['seconds']}s{'' if complete else ', budget spent — resumes next run'})"
+        )
+        return summary
@@ -0,0 +1,132 @@
+"""
+GCRA rate limiting: the Redis Lua script (run on fakeredis), the
+in-process fallback, and the per-role rates the DRF throttles pick.
+"""
+import time
+from unittest import mock
+
+import fakeredis
+import pytest
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from apps.core.throttling import GCRA_SCRIPT, GCRALimiter, ScopedThrottle, UserThrottle, limiter
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiter():
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+@pytest.fixture
+def redis_limiter(settings):
+    settings.CACHE_BACKEND = 'fakeredis'
+    gcra = GCRALimiter()
+    gcra._script = fakeredis.FakeRedis().register_script(GCRA_SCRIPT)
+    return gcra
+
+
+@pytest.fixture
+def rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {
+            'user': '2/minute',
+            'user.teacher': '4/minute',
+            'user.admin': None,
+            'ai': '1/minute',
+            'ai.teacher': '3/minute',
+        },
+    }
+
+
+class PingView(APIView):
+    throttle_classes = [UserThrottle, ScopedThrottle]
+
+    def get(self, request):
+        return Response({'success': True})
+
+
+class AIPingView(PingView):
+    throttle_scope = 'ai'
+
+
+def _statuses(view, user, n):
+    responses = []
+    for _ in range(n):
+        request = APIRequestFactory().get('/ping/')
+        force_authenticate(request, user)
+        responses.append(view.as_view()(request))
+    return responses
+
+
+def _user(role):
+    return User.objects.create_user(email=f'{role}@example.com', password='x', name=role.title(), role=role)
+
+
+def test_redis_script_allows_a_burst_then_refills(redis_limiter):
+    # 3 per 1.5s: one request every 500ms, with a burst of 3.
+    assert [redis_limiter.hit('k', 3, 1.5) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = redis_limiter.hit('k', 3, 1.5)
+    assert 0.4 < wait <= 0.5
+
+    time.sleep(wait + 0.05)
+    assert redis_limiter.hit('k', 3, 1.5) == 0.0
+    assert redis_limiter.hit('k', 3, 1.5) > 0
+
+    # Another key has its own allowance.
+    assert redis_limiter.hit('other', 3, 1.5) == 0.0
+
+
+def test_local_fallback_matches_the_script():
+    gcra = GCRALimiter()
+    clock = mock.Mock(return_value=1000.0)
+
+    with mock.patch('apps.core.throttling.time.monotonic', clock):
+        assert [gcra.hit('k', 3, 60) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert gcra.hit('k', 3, 60) == 20.0
+
+        clock.return_value += 20
+        assert gcra.hit('k', 3, 60) == 0.0
+        assert gcra.hit('k', 3, 60) == 20.0
+
+        clock.return_value += 60
+        assert [gcra.hit('k', 3, 60) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_unreachable_redis_falls_back_in_process(settings):
+    settings.CACHE_BACKEND = 'redis'
+    gcra = GCRALimiter()
+    gcra._script = mock.Mock(side_effect=ConnectionError('redis down'))
+
+    assert [gcra.hit('k', 2, 60) for _ in range(2)] == [0.0, 0.0]
+    assert gcra.hit('k', 2, 60) > 0
+    assert gcra._script.call_count == 3
+
+
+def test_user_rate_depends_on_role(rates):
+    student = _statuses(PingView, _user('student'), 3)
+    assert [r.status_code for r in student] == [200, 200, 429]
+    assert 0 < int(student[-1]['Retry-After']) <= 30
+
+    teacher = _statuses(PingView, _user('teacher'), 5)
+    assert [r.status_code for r in teacher] == [200] * 4 + [429]
+
+
+def test_admin_user_rate_is_disabled(rates):
+    admin = _statuses(PingView, _user('admin'), 20)
+    assert {r.status_code for r in admin} == {200}
+
+
+def test_scoped_rate_has_role_override(rates):
+    student = _statuses(AIPingView, _user('student'), 2)
+    assert [r.status_code for r in student] == [200, 429]
+
+    teacher = _statuses(AIPingView, _user('teacher'), 4)
+    assert [r.status_code for r in teacher] == [200, 200, 200, 429]
@@ -0,0 +1,171 @@
+"""
+Distributed rate limiting with GCRA (generic cell rate algorithm).
+
+DRF's SimpleRateThrottle keeps a list of request timestamps per client in
+the cache, read and rewritten non-atomically, so with the per-process
+LocMemCache every worker enforced its own limit. GCRA stores a single
+number per key — the theoretical arrival time (TAT) of the next request —
+and is evaluated atomically inside Redis by a Lua script using the Redis
+clock, so all workers share one exact limit and memory per key is constant
+regardless of the rate.
+
+Without Redis (CACHE_BACKEND=locmem) or while Redis is unreachable the
+limiter falls back to an in-process table with the same semantics.
+
+Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']:
+  - 'anon' / 'user' apply to every request;
+  - a view's `throttle_scope` selects a per-route quota ('otp', 'ai', ...);
+  - '<scope>.<role>' (e.g. 'user.teacher') overrides a scope for one role,
+    and a None rate disables it.
+Rejected requests get 429 with a Retry-After header (set by DRF from wait()).
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+LOCAL_MAX_KEYS = 100_000     # prune expired entries from the fallback table beyond this
+
+# KEYS[1] = limiter key; ARGV = emission interval (ms), period (ms).
+# Returns {allowed, wait_ms}. The TAT expires as soon as it is in the past.
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'100/hour' -> (100, 3600). Same format as DRF's throttle rates."""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class GCRALimiter:
+    """Shared limiter: Redis when configured, otherwise an in-process table."""
+
+    def __init__(self):
+        self._script = None
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def _redis_script(self):
+        if settings.CACHE_BACKEND not in ('redis', 'fakeredis'):
+            return None
+        if self._script is None:
+            from django_redis import get_redis_connection
+            self._script = get_redis_connection('default').register_script(GCRA_SCRIPT)
+        return self._script
+
+    def hit(self, key, limit, period) -> float:
+        """Count one request against `limit` per `period` seconds. Returns 0 if allowed, else seconds to wait."""
+        interval = period / limit
+        script = self._redis_script()
+        if script is not None:
+            try:
+                allowed, wait_ms = script(keys=[cache.make_key(key)], args=[interval * 1000, period * 1000])
+                return 0.0 if allowed else int(wait_ms) / 1000
+            except Exception as e:
+                logger.warning(f"⚠️ Redis rate limiter unavailable, using in-process fallback: {e}")
+        return self._hit_local(key, interval, period)
+
+    def _hit_local(self, key, interval, period) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tat = max(self._local.get(key, now), now)
+            new_tat = tat + interval
+            allow_at = new_tat - period
+            if now < allow_at:
+                return allow_at - now
+            self._local[key] = new_tat
+            if len(self._local) > LOCAL_MAX_KEYS:
+                self._local = {k: v for k, v in self._local.items() if v > now}
+        return 0.0
+
+    def reset(self):
+        with self._lock:
+            self._local.clear()
+
+
+limiter = GCRALimiter()
+
+
+# ─── DRF Throttles ────────────────────────────────────────────────
+
+class GCRAThrottle(BaseThrottle):
+    """Base class: subclasses choose the scope; the key is the user or client IP."""
+    scope = None
+
+    def get_scope(self, request, view):
+        return self.scope
+
+    def get_rate(self, request, scope):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        role = getattr(request.user, 'role', None) if request.user.is_authenticated else None
+        if role and f'{scope}.{role}' in rates:
+            return rates[f'{scope}.{role}']
+        return rates.get(scope)
+
+    def get_cache_key(self, request, scope):
+        if request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'throttle:{scope}:{ident}'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = self.get_scope(request, view)
+        rate = self.get_rate(request, scope) if scope else None
+        if rate is None:
+            return True
+        limit, period = parse_rate(rate)
+        self.wait_seconds = limiter.hit(self.get_cache_key(request, scope), limit, period)
+        return self.wait_seconds == 0
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AnonThrottle(GCRAThrottle):
+    """Platform-wide limit for unauthenticated clients, keyed by IP."""
+    scope = 'anon'
+
+    def get_scope(self, request, view):
+        return None if request.user.is_authenticated else self.scope
+
+
+class UserThrottle(GCRAThrottle):
+    """Platform-wide limit per user, with per-role overrides ('user.teacher')."""
+    scope = 'user'
+
+    def get_scope(self, request, view):
+        return self.scope if request.user.is_authenticated else None
+
+
+class ScopedThrottle(GCRAThrottle):
+    """Per-route quota for views that declare `throttle_scope`."""
+
+    def get_scope(self, request, view):
+        return getattr(view, 'throttle_scope', None)
@@ -1,14 +1,21 @@
 """
-Core views - Health check, API root info.
+Core views - Health check, metrics, API root info.
 """
 from django.conf import settings
 from django.db import connection
 from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
+from prometheus_client import CONTENT_TYPE_LATEST
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import metrics
+from .permissions import IsAdmin
+
 
 class HealthCheckView(APIView):
     """System health check endpoint - checks DB, Redis, and Celery."""
@@ -58,3 +65,36 @@ class HealthCheckView(APIView):
 
         status_code = status.HTTP_200_OK if health['status'] == 'healthy' else status.HTTP_503_SERVICE_UNAVAILABLE
         return Response(health, status=status_code)
+
+
+class MetricsView(View):
+    """
+    Prometheus scrape endpoint, guarded by METRICS_TOKEN. Without a token it
+    is only served in DEBUG, so a deploy that forgets to set one stays closed.
+    """
+
+    def get(self, request):
+        if not settings.METRICS_ENABLED:
+            raise Http404
+        if settings.METRICS_TOKEN:
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+            if not constant_time_compare(supplied, settings.METRICS_TOKEN):
+                return HttpResponse(status=401)
+        elif not settings.DEBUG:
+            return HttpResponse(status=403)
+        return HttpResponse(metrics.render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+class SlowRequestsView(APIView):
+    """Slowest cProfile-sampled requests served by this worker (PROFILE_SLOW_REQUESTS)."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response({
+            'success': True,
+            'data': {
+                'enabled': settings.PROFILE_SLOW_REQUESTS,
+                'sample_rate': settings.PROFILE_SAMPLE_RATE,
+                'requests': metrics.slow_request_sampler.snapshots(),
+            },
+        })
@@ -3,7 +3,7 @@ Course model - The core content unit of the platform.
 """
 from django.conf import settings
 from django.db import models
-from apps.core.models import SoftDeleteModel
+from apps.core.models import SoftDeleteModel, TimeStampedModel
 
 
 class Course(SoftDeleteModel):
@@ -126,3 +126,22 @@ class CourseReview(SoftDeleteModel):
 
     def __str__(self):
         return f'{self.student.name} - {self.course.title} - {self.rating}'
+
+
+class CourseRecommendation(TimeStampedModel):
+    """A student's ranked course recommendations, rebuilt nightly (see apps.courses.recommendations)."""
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='course_recommendation',
+    )
+    course_ids = models.JSONField(default=list, help_text='Recommended course ids, best first')
+    generated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'course_recommendations'
+        verbose_name = 'Course Recommendation'
+        verbose_name_plural = 'Course Recommendations'
+
+    def __str__(self):
+        return f'{self.student_id}: {len(self.course_ids)} courses'
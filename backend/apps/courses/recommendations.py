@@ -0,0 +1,284 @@
+"""
+Course recommendations by item-item collaborative filtering.
+
+Nightly, build_recommendations():
+
+1. Builds a sparse student × course interaction matrix (COO arrays) from
+   enrollments, completed lessons, quiz attempts and reviews. Each source
+   adds a capped weight; the summed score is log-damped.
+2. Computes cosine similarities between courses. The Gram matrix XᵀX is
+   accumulated over blocks of students, so only one dense block of the
+   matrix exists at a time and the product runs in BLAS. Every course keeps
+   its RECOMMENDATIONS_NEIGHBOURS most similar courses.
+3. Scores every student against every course (block @ similarities) and
+   keeps the top N courses the student has not interacted with and could
+   enrol in (published, and in the student's grade like the browse screen).
+   A tiny popularity term breaks ties and fills short lists.
+4. Stores the lists in CourseRecommendation and in the cache, where the
+   browse screen reads them with a single get.
+
+Students without interactions get the most popular courses of their grade.
+The item × item matrix is dense, which is fine for catalogues of a few
+thousand courses; SciPy is not a dependency, so the sparse parts use
+index arrays. `manage.py eval_recommendations` measures precision@k and
+build time.
+"""
+import logging
+import time
+from array import array
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.core.cache import make_key, resolve_timeout
+
+from .models import Course, CourseRecommendation
+
+logger = logging.getLogger(__name__)
+
+# Interaction weights, summed per (student, course) and then log1p-damped
+ENROLLED = 1.0
+UNENROLLED = 0.25
+PER_COMPLETED_LESSON, LESSON_CAP = 0.1, 1.0
+PER_QUIZ_ATTEMPT, ATTEMPT_CAP = 0.25, 1.0
+PER_RATING_POINT = 0.5      # applied to (rating - 3): poor reviews pull the score down
+
+BLOCK_SIZE = 4096           # students per dense block
+CHUNK_SIZE = 5000           # rows per round trip while loading interactions
+POPULARITY_EPSILON = 1e-6
+WRITE_BATCH = 1000
+
+
+class InteractionMatrix:
+    """Sparse student × course scores as COO arrays, rows sorted by student."""
+
+    def __init__(self, rows, cols, values, student_ids, course_ids):
+        order = np.argsort(rows, kind='stable')
+        self.rows = rows[order]
+        self.cols = cols[order]
+        self.values = values[order]
+        self.student_ids = student_ids
+        self.course_ids = course_ids
+
+    @property
+    def shape(self):
+        return len(self.student_ids), len(self.course_ids)
+
+    @classmethod
+    def from_triples(cls, rows, cols, weights, student_ids, course_ids):
+        """Sum duplicate (row, col) weights, clip at zero and damp with log1p."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        keys, inverse = np.unique(rows * len(course_ids) + cols, return_inverse=True)
+        totals = np.bincount(inverse, weights=np.asarray(weights, dtype=np.float64))
+        values = np.log1p(np.maximum(totals, 0.0)).astype(np.float32)
+        return cls(
+            (keys // len(course_ids)).astype(np.int32), (keys % len(course_ids)).astype(np.int32),
+            values, student_ids, course_ids,
+        )
+
+    def blocks(self, size=BLOCK_SIZE):
+        """Yield (start, stop, dense, seen) for consecutive blocks of students."""
+        n_users, n_items = self.shape
+        bounds = np.searchsorted(self.rows, np.arange(0, n_users + size, size))
+        for i, start in enumerate(range(0, n_users, size)):
+            stop = min(start + size, n_users)
+            lo, hi = bounds[i], bounds[i + 1]
+            dense = np.zeros((stop - start, n_items), dtype=np.float32)
+            seen = np.zeros((stop - start, n_items), dtype=bool)
+            dense[self.rows[lo:hi] - start, self.cols[lo:hi]] = self.values[lo:hi]
+            seen[self.rows[lo:hi] - start, self.cols[lo:hi]] = True
+            yield start, stop, dense, seen
+
+    def popularity(self):
+        return np.bincount(self.cols, weights=self.values, minlength=self.shape[1])
+
+
+# ─── Model ────────────────────────────────────────────────────────
+
+def item_similarity(matrix, neighbours):
+    """Cosine similarity between courses, keeping each course's `neighbours` best."""
+    n_items = matrix.shape[1]
+    gram = np.zeros((n_items, n_items), dtype=np.float32)
+    for _, _, dense, _ in matrix.blocks():
+        gram += dense.T @ dense
+    norms = np.sqrt(np.diag(gram))
+    norms[norms == 0] = 1.0
+    similarity = gram / norms[:, None] / norms[None, :]
+    np.fill_diagonal(similarity, 0.0)
+    if neighbours < n_items - 1:
+        weakest = np.argpartition(similarity, n_items - neighbours, axis=0)[:n_items - neighbours]
+        np.put_along_axis(similarity, weakest, 0.0, axis=0)
+    return similarity
+
+
+def top_n(matrix, similarity, n, allowed=None, groups=None):
+    """
+    Column indices of each student's top `n` unseen courses, best first,
+    padded with -1. `allowed[groups[u]]` is the boolean mask of courses
+    student u may be recommended (None = every course).
+    """
+    n_users, n_items = matrix.shape
+    n = min(n, n_items)
+    popularity = matrix.popularity()
+    tie_break = (POPULARITY_EPSILON * popularity / (popularity.max() or 1.0)).astype(np.float32)
+    result = np.full((n_users, n), -1, dtype=np.int32)
+    if n == 0:
+        return result
+
+    for start, stop, dense, seen in matrix.blocks():
+        scores = dense @ similarity + tie_break
+        scores[seen] = -np.inf
+        if allowed is not None:
+            scores[~allowed[groups[start:stop]]] = -np.inf
+        best = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best[~(np.take_along_axis(best_scores, order, axis=1) > 0)] = -1
+        result[start:stop] = best
+    return result
+
+
+# ─── Build ────────────────────────────────────────────────────────
+
+def load_interactions():
+    """Read the four interaction sources into an InteractionMatrix."""
+    from apps.enrollments.models import Enrollment
+    from apps.progress.models import LessonProgress
+    from apps.quizzes.models import QuizAttempt
+    from .models import CourseReview
+
+    students, courses = {}, {}
+    rows, cols, weights = array('q'), array('q'), array('d')
+
+    def add(student_id, course_id, weight):
+        rows.append(students.setdefault(student_id, len(students)))
+        cols.append(courses.setdefault(course_id, len(courses)))
+        weights.append(weight)
+
+    for student_id, course_id, is_active in (
+        Enrollment.objects.values_list('student_id', 'course_id', 'is_active').iterator(chunk_size=CHUNK_SIZE)
+    ):
+        add(student_id, course_id, ENROLLED if is_active else UNENROLLED)
+    for student_id, course_id, n in (
+        LessonProgress.objects.filter(completed=True).values('student_id', 'lesson__course_id')
+        .annotate(n=Count('id')).values_list('student_id', 'lesson__course_id', 'n').iterator(chunk_size=CHUNK_SIZE)
+    ):
+        add(student_id, course_id, min(n * PER_COMPLETED_LESSON, LESSON_CAP))
+    for student_id, course_id, n in (
+        QuizAttempt.objects.values('student_id', 'quiz__course_id')
+        .annotate(n=Count('id')).values_list('student_id', 'quiz__course_id', 'n').iterator(chunk_size=CHUNK_SIZE)
+    ):
+        add(student_id, course_id, min(n * PER_QUIZ_ATTEMPT, ATTEMPT_CAP))
+    for student_id, course_id, rating in (
+        CourseReview.objects.values_list('student_id', 'course_id', 'rating').iterator(chunk_size=CHUNK_SIZE)
+    ):
+        add(student_id, course_id, (rating - 3) * PER_RATING_POINT)
+
+    return InteractionMatrix.from_triples(
+        np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(weights),
+        list(students), list(courses),
+    )
+
+
+def _eligibility(matrix):
+    """(allowed, groups): per-grade course masks and each student's grade index."""
+    from apps.users.models import User
+
+    catalogue = {
+        pk: (grade, is_published and not is_deleted)
+        for pk, grade, is_published, is_deleted in Course.all_objects.filter(pk__in=matrix.course_ids)
+        .values_list('pk', 'grade_level', 'is_published', 'is_deleted')
+    }
+    course_grades = np.array([catalogue.get(pk, ('', False))[0] or '' for pk in matrix.course_ids], dtype=object)
+    open_courses = np.array([catalogue.get(pk, ('', False))[1] for pk in matrix.course_ids], dtype=bool)
+
+    grade_of = dict(User.objects.filter(pk__in=matrix.student_ids).values_list('pk', 'grade_level'))
+    grades = sorted({grade_of.get(pk) or '' for pk in matrix.student_ids})
+    index = {grade: i for i, grade in enumerate(grades)}
+    groups = np.array([index[grade_of.get(pk) or ''] for pk in matrix.student_ids], dtype=np.int32)
+    # Same rule as the browse screen: graded students only see their grade's courses.
+    allowed = np.array([open_courses & (course_grades == grade) if grade else open_courses for grade in grades])
+    return allowed, groups
+
+
+def build_recommendations() -> dict:
+    """Recompute every student's list; returns timings and sizes for logging."""
+    started = time.perf_counter()
+    now = timezone.now()
+    matrix = load_interactions()
+    n_users, n_items = matrix.shape
+    loaded = time.perf_counter()
+
+    top = np.full((n_users, 0), -1, dtype=np.int32)
+    if n_users and n_items:
+        similarity = item_similarity(matrix, settings.RECOMMENDATIONS_NEIGHBOURS)
+        allowed, groups = _eligibility(matrix)
+        top = top_n(matrix, similarity, settings.RECOMMENDATIONS_TOP_N, allowed, groups)
+    modelled = time.perf_counter()
+
+    timeout = resolve_timeout('recommendations')
+    for start in range(0, n_users, WRITE_BATCH):
+        lists = {
+            student_id: [str(matrix.course_ids[i]) for i in row if i >= 0]
+            for student_id, row in zip(matrix.student_ids[start:start + WRITE_BATCH], top[start:start + WRITE_BATCH])
+        }
+        CourseRecommendation.objects.bulk_create(
+            [CourseRecommendation(student_id=pk, course_ids=ids, generated_at=now) for pk, ids in lists.items()],
+            update_conflicts=True, unique_fields=['student'], update_fields=['course_ids', 'generated_at', 'updated_at'],
+        )
+        cache.set_many({_key(pk): ids for pk, ids in lists.items()}, timeout)
+    stale, _ = CourseRecommendation.objects.filter(generated_at__lt=now).delete()
+    cache.delete_many([make_key('recommendations', 'popular', grade) for grade in _student_grades()])
+
+    stats = {
+        'students': n_users, 'courses': n_items, 'interactions': len(matrix.values), 'stale_removed': stale,
+        'load_seconds': round(loaded - started, 2), 'model_seconds': round(modelled - loaded, 2),
+        'total_seconds': round(time.perf_counter() - started, 2),
+    }
+    logger.info(f"🎯 Course recommendations rebuilt: {stats}")
+    return stats
+
+
+# ─── Read ─────────────────────────────────────────────────────────
+
+def _key(student_id):
+    return make_key('recommendations', student_id)
+
+
+def _student_grades():
+    from apps.users.models import User
+    return {''} | set(User.objects.filter(role='student').values_list('grade_level', flat=True).distinct())
+
+
+def popular_course_ids(grade_level='', limit=None) -> list:
+    """Most-enrolled open courses of a grade; the list for students without history."""
+    key = make_key('recommendations', 'popular', grade_level or '')
+    ids = cache.get(key)
+    if ids is None:
+        courses = Course.objects.filter(is_published=True)
+        if grade_level:
+            courses = courses.filter(grade_level=grade_level)
+        ids = [
+            str(pk) for pk in courses.annotate(n=Count('enrollments')).order_by('-n', '-created_at')
+            .values_list('pk', flat=True)[:settings.RECOMMENDATIONS_TOP_N]
+        ]
+        cache.set(key, ids, resolve_timeout('recommendations'))
+    return ids[:limit]
+
+
+def recommended_course_ids(student, limit=None) -> list:
+    """The student's stored list (one cache get when warm), else the popular list."""
+    key = _key(student.pk)
+    ids = cache.get(key)
+    if ids is None:
+        row = CourseRecommendation.objects.filter(student=student).values_list('course_ids', flat=True).first()
+        if row is None:
+            return popular_course_ids(student.grade_level, limit)
+        ids = row
+        cache.set(key, ids, resolve_timeout('recommendations'))
+    return (ids or popular_course_ids(student.grade_level))[:limit]
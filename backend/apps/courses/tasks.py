@@ -0,0 +1,20 @@
+"""
+Celery tasks for course recommendations.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def build_recommendations_task():
+    """Rebuild every student's collaborative-filtering course recommendations."""
+    from .recommendations import build_recommendations
+
+    try:
+        return build_recommendations()
+    except Exception as e:
+        logger.error(f"❌ Course recommendation build failed: {e}")
+        raise
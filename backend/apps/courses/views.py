@@ -7,6 +7,7 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.cache import cached_view
 from apps.core.pagination import StandardPagination
 from apps.core.permissions import IsCourseTeacher, IsTeacher, IsTeacherOrReadOnly
 
@@ -67,6 +68,10 @@ class CourseListCreateView(generics.ListCreateAPIView):
             return CourseCreateSerializer
         return CourseListSerializer
 
+    @cached_view(timeout='catalog', tags=['catalog'])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         user = self.request.user
         queryset = Course.objects.select_related('teacher')
@@ -3,7 +3,7 @@ Email Django Admin
 """
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import EmailLog, EmailCampaign, ContactMessage, InboxEmail
+from .models import EmailLog, EmailCampaign, ContactMessage, InboxEmail, MailboxSyncState
 
 
 @admin.register(EmailLog)
@@ -57,3 +57,9 @@ class InboxEmailAdmin(admin.ModelAdmin):
     list_filter = ['is_read']
     search_fields = ['sender_email', 'subject']
     readonly_fields = ['sender_email', 'sender_name', 'subject', 'body', 'received_at', 'message_id']
+
+
+@admin.register(MailboxSyncState)
+class MailboxSyncStateAdmin(admin.ModelAdmin):
+    list_display = ['folder', 'uid_validity', 'last_uid', 'last_synced_at']
+    readonly_fields = ['folder', 'uid_validity', 'last_uid', 'last_synced_at']
@@ -0,0 +1,393 @@
+"""
+Campaign Engine - High-throughput sender for promotional email campaigns.
+
+The coordinator (the Celery task thread) streams recipients from the DB,
+bulk-inserts their EmailLog rows and checkpoints progress on the
+EmailCampaign. Worker threads talk SMTP: each one keeps a single long-lived
+connection open for the whole run, so a 10k-recipient campaign opens
+`workers` connections instead of 10k.
+
+Each recipient's SENT/FAILED mark is written by the worker right after its
+message goes out, so a crash loses at most the one in-progress mark per
+worker: a resumed run re-mails at most `workers` recipients. SQLite (dev)
+cannot take those writes while the coordinator streams recipients, so there
+the coordinator writes the marks as each batch of `batch_size` completes.
+"""
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import get_connection
+from django.db import connections as db_connections
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from .email_utils import build_email_message, promotional_email_html
+from .models import EmailCampaign, EmailLog
+
+logger = logging.getLogger(__name__)
+
+
+# ─── Rate Limiting ────────────────────────────────────────────────
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by all SMTP workers.
+    `rate` is messages per second across the whole pool; 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = float(rate or 0)
+        self.capacity = float(burst or max(1, int(self.rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+# ─── SMTP Worker Pool ─────────────────────────────────────────────
+
+class SMTPWorkerPool:
+    """
+    Thread pool in which every worker owns one open SMTP connection.
+
+    Use as a context manager; connections are closed when the block exits.
+    `submit()` takes a list of (key, EmailMessage) pairs and returns a Future
+    resolving to a list of (key, error) pairs, where error is '' on success.
+    An optional `on_result(key, error)` is called on the worker thread right
+    after each message, before the next one is sent.
+    """
+
+    def __init__(self, workers: int = None, rate_limit: float = None, backend: str = None, **connection_kwargs):
+        self.workers = workers or settings.EMAIL_CAMPAIGN_WORKERS
+        self.limiter = RateLimiter(
+            settings.EMAIL_CAMPAIGN_RATE_LIMIT if rate_limit is None else rate_limit
+        )
+        self.connections_opened = 0
+        self._backend = backend
+        self._connection_kwargs = connection_kwargs
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix='campaign-smtp',
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True)
+        for connection in self._connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._connections = []
+        return False
+
+    def submit(self, batch, on_result=None):
+        return self._executor.submit(self._send_batch, batch, on_result)
+
+    def _get_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = get_connection(self._backend, fail_silently=False, **self._connection_kwargs)
+            connection.open()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+                self.connections_opened += 1
+        return connection
+
+    def _drop_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            return
+        self._local.connection = None
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _send_batch(self, batch, on_result=None):
+        """
+        Push a batch through this thread's connection. Messages go through
+        send_messages() one at a time on the already-open connection (SMTP
+        has no multi-message transaction), which keeps a per-recipient
+        outcome so a resumed campaign knows exactly who was reached.
+        """
+        results = []
+        try:
+            for key, message in batch:
+                self.limiter.acquire()
+                error = ''
+                for attempt in range(2):
+                    try:
+                        self._get_connection().send_messages([message])
+                        error = ''
+                        break
+                    except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                        # Server dropped the long-lived session: reconnect once.
+                        self._drop_connection()
+                        error = str(e) or e.__class__.__name__
+                    except Exception as e:
+                        error = str(e) or e.__class__.__name__
+                        break
+                results.append((key, error))
+                if on_result is not None:
+                    on_result(key, error)
+        finally:
+            if on_result is not None:
+                # on_result may use the ORM; don't leave this thread's DB connection open.
+                db_connections.close_all()
+        return results
+
+
+# ─── Campaign Sender ──────────────────────────────────────────────
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CampaignSender:
+    """
+    Sends one EmailCampaign. Safe to run again on a partially sent campaign:
+    recipients with a SENT log are skipped and existing PENDING/FAILED logs
+    are reused, so no duplicate log rows appear and only a recipient whose
+    mark was lost mid-write (at most one per worker) is mailed twice.
+    """
+
+    def __init__(self, campaign, workers: int = None, batch_size: int = None,
+                 rate_limit: float = None, checkpoint_every: int = None):
+        self.campaign = campaign
+        self.workers = workers or settings.EMAIL_CAMPAIGN_WORKERS
+        self.batch_size = batch_size or settings.EMAIL_CAMPAIGN_BATCH_SIZE
+        self.rate_limit = rate_limit
+        self.checkpoint_every = checkpoint_every or settings.EMAIL_CAMPAIGN_CHECKPOINT_EVERY
+        self.checkpoint_interval = settings.EMAIL_CAMPAIGN_CHECKPOINT_SECONDS
+
+        self._dirty = []
+        self._recorded = set()
+        self._since_checkpoint = 0
+        self._sent = 0
+        self._failed = 0
+        self._sent_before = 0
+        self._last_checkpoint = time.monotonic()
+
+    def recipients(self):
+        User = get_user_model()
+        users = User.objects.filter(is_active=True)
+        if self.campaign.audience == EmailCampaign.AudienceChoices.STUDENTS:
+            users = users.filter(role='student')
+        elif self.campaign.audience == EmailCampaign.AudienceChoices.TEACHERS:
+            users = users.filter(role='teacher')
+        return users
+
+    def run(self) -> dict:
+        campaign = self.campaign
+        users = self.recipients()
+
+        campaign.total_recipients = users.count()
+        campaign.save(update_fields=['total_recipients', 'updated_at'])
+
+        already_sent = EmailLog.objects.filter(
+            campaign=campaign,
+            status=EmailLog.StatusChoices.SENT,
+            recipient_email=OuterRef('email'),
+        )
+        self._sent_before = EmailLog.objects.filter(
+            campaign=campaign, status=EmailLog.StatusChoices.SENT,
+        ).count()
+        pending = (
+            users.filter(~Exists(already_sent))
+            .order_by('pk')
+            .values_list('email', 'name')
+        )
+
+        html_content = promotional_email_html(campaign.subject, campaign.body_html)
+        record = None if db_connections['default'].vendor == 'sqlite' else self._record
+        in_flight = {}
+        started = time.monotonic()
+
+        with SMTPWorkerPool(workers=self.workers, rate_limit=self.rate_limit) as pool:
+            for chunk in _chunked(pending.iterator(chunk_size=self.batch_size * 10), self.batch_size):
+                logs = self._prepare_logs(chunk)
+                batch = [
+                    (log.pk, build_email_message(
+                        to_email=log.recipient_email,
+                        to_name=log.recipient_name,
+                        subject=campaign.subject,
+                        html_content=html_content,
+                        text_content=campaign.body_text,
+                    ))
+                    for log in logs
+                ]
+                in_flight[pool.submit(batch, on_result=record)] = logs
+                # Keep the pool busy without buffering the whole audience in memory.
+                if len(in_flight) >= self.workers * 2:
+                    self._collect(in_flight, FIRST_COMPLETED)
+            self._collect(in_flight, ALL_COMPLETED)
+            connections = pool.connections_opened
+
+        self._flush_logs()
+        counts = EmailLog.objects.filter(campaign=campaign).aggregate(
+            sent=Count('pk', filter=Q(status=EmailLog.StatusChoices.SENT)),
+            failed=Count('pk', filter=Q(status=EmailLog.StatusChoices.FAILED)),
+        )
+        now = timezone.now()
+        campaign.status = EmailCampaign.StatusChoices.COMPLETED
+        campaign.sent_count = counts['sent']
+        campaign.failed_count = counts['failed']
+        campaign.sent_at = now
+        campaign.last_checkpoint_at = now
+        campaign.save(update_fields=[
+            'status', 'sent_count', 'failed_count', 'sent_at', 'last_checkpoint_at', 'updated_at',
+        ])
+
+        return {
+            'sent': self._sent,
+            'failed': self._failed,
+            'skipped': self._sent_before,
+            'connections': connections,
+            'duration_s': round(time.monotonic() - started, 2),
+        }
+
+    def _prepare_logs(self, chunk):
+        """Reuse logs left by an earlier run, bulk-insert the rest as PENDING."""
+        names = {email: name or email for email, name in chunk}
+        existing = list(EmailLog.objects.filter(
+            campaign=self.campaign, recipient_email__in=list(names),
+        ))
+        seen = {log.recipient_email for log in existing}
+        created = EmailLog.objects.bulk_create([
+            EmailLog(
+                recipient_email=email,
+                recipient_name=name,
+                subject=self.campaign.subject,
+                email_type=EmailLog.TypeChoices.PROMOTIONAL,
+                status=EmailLog.StatusChoices.PENDING,
+                sent_by_id=self.campaign.created_by_id,
+                campaign=self.campaign,
+            )
+            for email, name in names.items() if email not in seen
+        ])
+        return existing + created
+
+    def _record(self, log_id, error):
+        """Persist one recipient's outcome; runs on the worker thread right after the send."""
+        try:
+            EmailLog.objects.filter(pk=log_id).update(
+                status=EmailLog.StatusChoices.FAILED if error else EmailLog.StatusChoices.SENT,
+                error_message=error,
+                updated_at=timezone.now(),
+            )
+        except Exception as e:
+            # Left out of _recorded, so _collect writes it from the coordinator.
+            logger.warning(f"Could not record campaign email {log_id}: {e}")
+            return
+        self._recorded.add(log_id)
+
+    def _collect(self, in_flight, return_when):
+        done, _ = wait(list(in_flight), return_when=return_when)
+        now = timezone.now()
+        for future in done:
+            logs = in_flight.pop(future)
+            try:
+                errors = dict(future.result())
+            except Exception as e:
+                errors = {log.pk: str(e) for log in logs}
+            for log in logs:
+                error = errors.get(log.pk, 'not attempted')
+                if error:
+                    log.status = EmailLog.StatusChoices.FAILED
+                    log.error_message = error
+                    self._failed += 1
+                else:
+                    log.status = EmailLog.StatusChoices.SENT
+                    log.error_message = ''
+                    self._sent += 1
+                log.updated_at = now
+            # Workers already wrote their marks; only the ones they could not are left.
+            self._dirty.extend(log for log in logs if log.pk not in self._recorded)
+            self._recorded.difference_update(log.pk for log in logs)
+            self._since_checkpoint += len(logs)
+        self._flush_logs()
+
+        if (self._since_checkpoint >= self.checkpoint_every
+                or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval):
+            self._checkpoint()
+
+    def _flush_logs(self):
+        if self._dirty:
+            EmailLog.objects.bulk_update(
+                self._dirty, ['status', 'error_message', 'updated_at'], batch_size=500,
+            )
+            self._dirty = []
+
+    def _checkpoint(self):
+        """Publish live progress counters on the campaign."""
+        now = timezone.now()
+        EmailCampaign.objects.filter(pk=self.campaign.pk).update(
+            sent_count=self._sent_before + self._sent,
+            failed_count=self._failed,
+            last_checkpoint_at=now,
+            updated_at=now,
+        )
+        self._last_checkpoint = time.monotonic()
+        self._since_checkpoint = 0
+        logger.info(
+            f"📧 Campaign '{self.campaign.title}' checkpoint: "
+            f"{self._sent_before + self._sent} sent, {self._failed} failed"
+        )
+
+
+def _stalled_before():
+    return timezone.now() - timezone.timedelta(seconds=settings.EMAIL_CAMPAIGN_STALL_SECONDS)
+
+
+def is_stalled(campaign) -> bool:
+    """A SENDING campaign whose run stopped checkpointing; resume may take it over."""
+    return campaign.status == EmailCampaign.StatusChoices.SENDING and campaign.updated_at < _stalled_before()
+
+
+def claim_campaign(campaign_id, resume: bool = False) -> bool:
+    """
+    Atomically move a campaign into SENDING. Returns False when another run
+    already owns it, so two workers can never send the same campaign at once.
+    """
+    allowed = [EmailCampaign.StatusChoices.DRAFT, EmailCampaign.StatusChoices.SCHEDULED]
+    claim = Q(status__in=allowed)
+    if resume:
+        claim |= Q(status=EmailCampaign.StatusChoices.FAILED)
+        claim |= Q(status=EmailCampaign.StatusChoices.SENDING, updated_at__lt=_stalled_before())
+    return EmailCampaign.objects.filter(claim, pk=campaign_id).update(
+        status=EmailCampaign.StatusChoices.SENDING, updated_at=timezone.now(),
+    ) == 1
@@ -210,6 +210,26 @@ def contact_acknowledgement_html(name: str, subject: str, message: str, ticket_r
 
 # ─── Core Sending Function ────────────────────────────────────────
 
+def build_email_message(
+    to_email: str,
+    to_name: str,
+    subject: str,
+    html_content: str,
+    text_content: str = "",
+    connection=None,
+) -> EmailMultiAlternatives:
+    """Build a multipart (text + HTML) message without sending it."""
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content or "Please view this email in an HTML-capable client.",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[f"{to_name} <{to_email}>" if to_name else to_email],
+        connection=connection,
+    )
+    msg.attach_alternative(html_content, "text/html")
+    return msg
+
+
 def send_email(
     to_email: str,
     to_name: str,
@@ -235,13 +255,7 @@ def send_email(
     )
 
     try:
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content or "Please view this email in an HTML-capable client.",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[f"{to_name} <{to_email}>" if to_name else to_email],
-        )
-        msg.attach_alternative(html_content, "text/html")
+        msg = build_email_message(to_email, to_name, subject, html_content, text_content)
         msg.send(fail_silently=False)
 
         log.status = EmailLog.StatusChoices.SENT
@@ -1,11 +1,19 @@
 """
 Gmail IMAP Inbox Reader
 Pulls, parses, and stores incoming emails from Gmail into the DB for admin review.
+
+Sync is incremental: a MailboxSyncState row remembers the folder's
+UIDVALIDITY and the highest UID already stored, so each run only asks the
+server for newer UIDs. Headers for new mail are fetched in batched
+`UID FETCH` ranges and bulk inserted; bodies follow in a separate, bounded
+pass for rows that still lack one.
 """
 import email
 import imaplib
 import logging
+import re
 from email.header import decode_header
+from email.utils import parsedate_to_datetime
 from django.conf import settings
 from django.utils import timezone
 
@@ -63,103 +71,223 @@ def _get_email_body(msg) -> str:
     return body[:5000]  # Truncate to 5KB max
 
 
-def fetch_inbox_emails(limit: int = 20, folder: str = "INBOX") -> dict:
-    """
-    Connect to Gmail IMAP, fetch recent emails, and save them to InboxEmail model.
+def _parse_sender(sender_raw: str):
+    """Split "Name <email@example.com>" into (name, email)."""
+    sender_name, sender_email = "", sender_raw
+    if "<" in sender_raw and ">" in sender_raw:
+        parts = sender_raw.rsplit("<", 1)
+        sender_name = parts[0].strip().strip('"')
+        sender_email = parts[1].strip(">").strip()
+    return sender_name, sender_email
 
-    Returns:
-        dict with keys: fetched, new, errors
+
+def _parse_date(date_str: str):
+    try:
+        received_at = parsedate_to_datetime(date_str)
+        if received_at.tzinfo is None:
+            received_at = timezone.make_aware(received_at)
+        return received_at
+    except Exception:
+        return timezone.now()
+
+
+def _uid_sets(uids, batch_size: int):
+    """
+    Yield compact IMAP UID sets ("101:150,152,160:170") of at most
+    `batch_size` UIDs each, so one UID FETCH covers a whole batch.
     """
-    from .models import InboxEmail
+    uids = sorted(uids)
+    for start in range(0, len(uids), batch_size):
+        chunk = uids[start:start + batch_size]
+        ranges = []
+        low = prev = chunk[0]
+        for uid in chunk[1:]:
+            if uid != prev + 1:
+                ranges.append(f"{low}:{prev}" if low != prev else str(low))
+                low = uid
+            prev = uid
+        ranges.append(f"{low}:{prev}" if low != prev else str(low))
+        yield ",".join(ranges)
 
-    imap_host = settings.IMAP_HOST
-    imap_port = settings.IMAP_PORT
-    imap_user = settings.IMAP_USER
-    imap_pass = settings.IMAP_PASSWORD
 
-    if not imap_user or not imap_pass:
-        logger.warning("IMAP credentials not configured.")
-        return {"fetched": 0, "new": 0, "errors": ["IMAP credentials not set"]}
+_UID_RE = re.compile(rb"UID (\d+)")
+_HEADER_FIELDS = "(UID BODY.PEEK[HEADER.FIELDS (MESSAGE-ID FROM SUBJECT DATE)])"
 
-    results = {"fetched": 0, "new": 0, "errors": []}
 
-    try:
-        if settings.IMAP_USE_SSL:
-            mail = imaplib.IMAP4_SSL(imap_host, imap_port)
-        else:
-            mail = imaplib.IMAP4(imap_host, imap_port)
+def _fetched_parts(data):
+    """Yield (uid, payload bytes) from an imaplib UID FETCH response."""
+    for item in data or []:
+        if not isinstance(item, tuple) or len(item) < 2:
+            continue
+        match = _UID_RE.search(item[0])
+        if match:
+            yield int(match.group(1)), item[1]
 
-        mail.login(imap_user, imap_pass)
-        mail.select(folder)
 
-        # Search for all emails, get the latest `limit` ones
-        status, data = mail.search(None, "ALL")
-        if status != "OK":
-            return {"fetched": 0, "new": 0, "errors": ["IMAP search failed"]}
+def connect_imap():
+    if settings.IMAP_USE_SSL:
+        mail = imaplib.IMAP4_SSL(settings.IMAP_HOST, settings.IMAP_PORT)
+    else:
+        mail = imaplib.IMAP4(settings.IMAP_HOST, settings.IMAP_PORT)
+    mail.login(settings.IMAP_USER, settings.IMAP_PASSWORD)
+    return mail
 
-        all_ids = data[0].split()
-        recent_ids = all_ids[-limit:] if len(all_ids) > limit else all_ids
 
-        for email_id in reversed(recent_ids):
-            try:
-                status, msg_data = mail.fetch(email_id, "(RFC822)")
-                if status != "OK":
-                    continue
+class InboxSync:
+    """
+    Incremental UID-based sync of one IMAP folder into InboxEmail.
 
-                raw_email = msg_data[0][1]
-                msg = email.message_from_bytes(raw_email)
+    `mail` is any imaplib-compatible client that is already logged in
+    (tests pass a local stub). The folder is selected read-only and bodies
+    are fetched with BODY.PEEK so syncing never flips the \\Seen flag.
+    """
 
-                # Extract headers
-                message_id = _decode_str(msg.get("Message-ID", "")).strip()
-                if not message_id:
-                    message_id = f"no-id-{email_id.decode()}"
+    def __init__(self, mail, folder: str = "INBOX", batch_size: int = None):
+        self.mail = mail
+        self.folder = folder
+        self.batch_size = batch_size or settings.IMAP_FETCH_BATCH_SIZE
+        self.uid_validity = None
+        self.results = {"fetched": 0, "new": 0, "bodies": 0, "errors": []}
 
-                # Skip if already stored
-                if InboxEmail.objects.filter(message_id=message_id).exists():
-                    results["fetched"] += 1
-                    continue
+    def _select(self) -> int:
+        status, _ = self.mail.select(self.folder, readonly=True)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"Cannot select folder {self.folder}")
+        _, data = self.mail.response("UIDVALIDITY")
+        return int(data[0]) if data and data[0] else 0
 
-                sender_raw = _decode_str(msg.get("From", ""))
-                # Parse "Name <email@example.com>"
-                sender_name, sender_email = "", sender_raw
-                if "<" in sender_raw and ">" in sender_raw:
-                    parts = sender_raw.rsplit("<", 1)
-                    sender_name = parts[0].strip().strip('"')
-                    sender_email = parts[1].strip(">" ).strip()
+    def _new_uids(self, state, limit: int):
+        status, data = self.mail.uid("SEARCH", None, f"UID {state.last_uid + 1}:*")
+        if status != "OK":
+            raise imaplib.IMAP4.error("IMAP UID SEARCH failed")
+        # "N:*" always matches the newest message, even when its UID < N.
+        uids = sorted(int(uid) for uid in data[0].split() if int(uid) > state.last_uid)
+        if state.last_uid == 0:
+            # First sync of this folder: only backfill the most recent mail.
+            return uids[-limit:]
+        return uids[:limit]
 
-                subject = _decode_str(msg.get("Subject", "(No Subject)"))
-                date_str = msg.get("Date", "")
-                try:
-                    from email.utils import parsedate_to_datetime
-                    received_at = parsedate_to_datetime(date_str)
-                    if received_at.tzinfo is None:
-                        received_at = timezone.make_aware(received_at)
-                except Exception:
-                    received_at = timezone.now()
+    def sync_headers(self, limit: int) -> None:
+        from .models import InboxEmail, MailboxSyncState
 
-                body = _get_email_body(msg)
+        state, _ = MailboxSyncState.objects.get_or_create(folder=self.folder)
+        uid_validity = self._select()
+        if state.uid_validity != uid_validity:
+            if state.uid_validity is not None:
+                logger.warning(
+                    f"UIDVALIDITY of {self.folder} changed "
+                    f"({state.uid_validity} → {uid_validity}), restarting UID cursor."
+                )
+            state.uid_validity = uid_validity
+            state.last_uid = 0
+
+        uids = self._new_uids(state, limit)
+        for uid_set in _uid_sets(uids, self.batch_size):
+            status, data = self.mail.uid("FETCH", uid_set, _HEADER_FIELDS)
+            if status != "OK":
+                self.results["errors"].append(f"UID FETCH {uid_set} failed")
+                break
 
-                InboxEmail.objects.create(
+            rows = {}
+            for uid, raw_headers in _fetched_parts(data):
+                msg = email.message_from_bytes(raw_headers)
+                message_id = _decode_str(msg.get("Message-ID", "")).strip()
+                if not message_id:
+                    message_id = f"no-id-{uid_validity}-{uid}"
+                sender_name, sender_email = _parse_sender(_decode_str(msg.get("From", "")))
+                rows[message_id[:500]] = InboxEmail(
                     sender_email=sender_email[:254],
                     sender_name=sender_name[:255],
-                    subject=subject[:500],
-                    body=body,
-                    received_at=received_at,
+                    subject=_decode_str(msg.get("Subject", "(No Subject)"))[:500],
+                    received_at=_parse_date(msg.get("Date", "")),
                     message_id=message_id[:500],
-                    is_read=False,
+                    folder=self.folder,
+                    uid=uid,
+                    uid_validity=uid_validity,
+                    body_fetched=False,
                 )
-                results["fetched"] += 1
-                results["new"] += 1
+                state.last_uid = max(state.last_uid, uid)
+
+            known = set(
+                InboxEmail.objects.filter(message_id__in=list(rows)).values_list("message_id", flat=True)
+            )
+            new_rows = [row for message_id, row in rows.items() if message_id not in known]
+            InboxEmail.objects.bulk_create(new_rows, ignore_conflicts=True)
+            self.results["fetched"] += len(rows)
+            self.results["new"] += len(new_rows)
+
+            # Advance the cursor per batch so an interrupted run resumes here.
+            state.last_synced_at = timezone.now()
+            state.save(update_fields=["uid_validity", "last_uid", "last_synced_at", "updated_at"])
+
+        if not uids:
+            state.last_synced_at = timezone.now()
+            state.save(update_fields=["uid_validity", "last_uid", "last_synced_at", "updated_at"])
+        self.uid_validity = uid_validity
+
+    def fetch_bodies(self, limit: int) -> None:
+        """Download bodies for header-only rows of the current UIDVALIDITY."""
+        from .models import InboxEmail
+
+        pending = list(
+            InboxEmail.objects.filter(
+                folder=self.folder,
+                uid_validity=self.uid_validity,
+                body_fetched=False,
+                uid__isnull=False,
+            ).order_by("-uid").only("id", "uid")[:limit]
+        )
+        by_uid = {row.uid: row for row in pending}
+
+        for uid_set in _uid_sets(by_uid, self.batch_size):
+            status, data = self.mail.uid("FETCH", uid_set, "(UID BODY.PEEK[])")
+            if status != "OK":
+                self.results["errors"].append(f"UID FETCH {uid_set} bodies failed")
+                break
+            updated = []
+            for uid, raw_email in _fetched_parts(data):
+                row = by_uid.get(uid)
+                if row is None:
+                    continue
+                row.body = _get_email_body(email.message_from_bytes(raw_email))
+                row.body_fetched = True
+                updated.append(row)
+            InboxEmail.objects.bulk_update(updated, ["body", "body_fetched"])
+            self.results["bodies"] += len(updated)
 
-            except Exception as e:
-                results["errors"].append(str(e))
-                logger.error(f"Error fetching email {email_id}: {e}")
+    def run(self, limit: int, body_limit: int = None) -> dict:
+        self.sync_headers(limit)
+        self.fetch_bodies(body_limit if body_limit is not None else settings.IMAP_BODY_FETCH_LIMIT)
+        return self.results
 
-        mail.logout()
-        logger.info(f"📥 IMAP fetch complete: {results}")
+
+def fetch_inbox_emails(limit: int = 20, folder: str = "INBOX") -> dict:
+    """
+    Connect to Gmail IMAP and incrementally sync `folder` into InboxEmail.
+    `limit` caps how many new messages are pulled per run (the first run
+    backfills the latest `limit`; later runs continue from the stored UID).
+
+    Returns:
+        dict with keys: fetched, new, bodies, errors
+    """
+    if not settings.IMAP_USER or not settings.IMAP_PASSWORD:
+        logger.warning("IMAP credentials not configured.")
+        return {"fetched": 0, "new": 0, "bodies": 0, "errors": ["IMAP credentials not set"]}
+
+    results = {"fetched": 0, "new": 0, "bodies": 0, "errors": []}
+    try:
+        mail = connect_imap()
+        try:
+            results = InboxSync(mail, folder=folder).run(limit=limit)
+        finally:
+            try:
+                mail.logout()
+            except Exception:
+                pass
+        logger.info(f"📥 IMAP sync complete: {results}")
 
     except imaplib.IMAP4.error as e:
-        results["errors"].append(f"IMAP auth error: {e}")
+        results["errors"].append(f"IMAP error: {e}")
         logger.error(f"IMAP connection error: {e}")
     except Exception as e:
         results["errors"].append(str(e))
@@ -0,0 +1,116 @@
+"""
+Benchmark the campaign engine against a local debugging SMTP server.
+
+    python manage.py bench_campaign_smtp --messages 2000 --workers 4
+
+Compares the legacy path (one SMTP connection per message, as send_email()
+does) with SMTPWorkerPool (one long-lived connection per worker thread).
+Nothing touches the database; messages are discarded by the sink server.
+"""
+import socketserver
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.emails.campaign_engine import SMTPWorkerPool
+from apps.emails.email_utils import build_email_message, promotional_email_html
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard mail."""
+
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b'220 mentiq-bench ESMTP\r\n')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line[:4].upper()
+            if verb in (b'EHLO', b'HELO'):
+                self.wfile.write(b'250 mentiq-bench\r\n')
+            elif verb == b'DATA':
+                self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.messages += 1
+                self.wfile.write(b'250 OK\r\n')
+            elif verb == b'QUIT':
+                self.wfile.write(b'221 Bye\r\n')
+                return
+            else:
+                self.wfile.write(b'250 OK\r\n')
+
+
+class SinkSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=('127.0.0.1', 0)):
+        super().__init__(address, _SinkHandler)
+        self.connections = 0
+        self.messages = 0
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-message SMTP connections vs the pooled campaign engine.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--rate', type=float, default=0, help='messages/sec, 0 = unlimited')
+
+    def handle(self, *args, **options):
+        server = SinkSMTPServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+        smtp = {
+            'backend': 'django.core.mail.backends.smtp.EmailBackend',
+            'host': host, 'port': port,
+            'username': '', 'password': '',
+            'use_tls': False, 'use_ssl': False,
+        }
+        html = promotional_email_html('Benchmark', '<p>Hello from the campaign benchmark.</p>')
+        messages = [
+            build_email_message(f'student{i}@bench.local', f'Student {i}', 'Benchmark', html)
+            for i in range(options['messages'])
+        ]
+
+        try:
+            self._report('per-message connection', server, lambda: self._legacy(messages, smtp))
+            self._report(
+                f"pooled ({options['workers']} workers)", server,
+                lambda: self._pooled(messages, smtp, options),
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _legacy(self, messages, smtp):
+        from django.core.mail import get_connection
+        for message in messages:
+            get_connection(**smtp).send_messages([message])
+
+    def _pooled(self, messages, smtp, options):
+        size = options['batch_size']
+        with SMTPWorkerPool(workers=options['workers'], rate_limit=options['rate'], **smtp) as pool:
+            futures = [
+                pool.submit([(i, m) for i, m in enumerate(messages[start:start + size], start)])
+                for start in range(0, len(messages), size)
+            ]
+            failed = sum(1 for f in futures for _, error in f.result() if error)
+        if failed:
+            self.stderr.write(f'{failed} message(s) failed')
+
+    def _report(self, label, server, run):
+        server.connections = server.messages = 0
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label:<28} {server.messages:>6} msgs  {elapsed:7.2f}s  '
+            f'{server.messages / elapsed if elapsed else 0:8.1f} msg/s  '
+            f'{server.connections:>5} connection(s)'
+        )
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailcampaign",
+            name="last_checkpoint_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last time the sender flushed progress counters",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="emaillog",
+            name="campaign",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Set for promotional sends so a campaign can be resumed without duplicates",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="logs",
+                to="emails.emailcampaign",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emaillog",
+            index=models.Index(
+                fields=["campaign", "status"], name="email_logs_campaig_087449_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="emaillog",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("campaign__isnull", False)),
+                fields=("campaign", "recipient_email"),
+                name="uniq_email_log_campaign_recipient",
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:06
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0002_campaign_engine"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MailboxSyncState",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("folder", models.CharField(max_length=255, unique=True)),
+                ("uid_validity", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("last_uid", models.PositiveBigIntegerField(default=0)),
+                ("last_synced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "mailbox_sync_states",
+            },
+        ),
+        # Rows stored before UID sync were fetched with their full body.
+        migrations.AddField(
+            model_name="inboxemail",
+            name="body_fetched",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name="inboxemail",
+            name="body_fetched",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="inboxemail",
+            name="folder",
+            field=models.CharField(default="INBOX", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="inboxemail",
+            name="uid",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="inboxemail",
+            name="uid_validity",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="inboxemail",
+            index=models.Index(
+                fields=["folder", "body_fetched", "uid"],
+                name="inbox_email_folder_810834_idx",
+            ),
+        ),
+    ]
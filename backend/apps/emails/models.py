@@ -38,6 +38,13 @@ class EmailLog(TimeStampedModel):
         on_delete=models.SET_NULL,
         related_name='sent_emails',
     )
+    campaign = models.ForeignKey(
+        'EmailCampaign',
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='logs',
+        help_text='Set for promotional sends so a campaign can be resumed without duplicates',
+    )
 
     class Meta:
         db_table = 'email_logs'
@@ -45,6 +52,14 @@ class EmailLog(TimeStampedModel):
         indexes = [
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['email_type', '-created_at']),
+            models.Index(fields=['campaign', 'status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['campaign', 'recipient_email'],
+                condition=models.Q(campaign__isnull=False),
+                name='uniq_email_log_campaign_recipient',
+            ),
         ]
 
     def __str__(self):
@@ -81,6 +96,10 @@ class EmailCampaign(TimeStampedModel):
     total_recipients = models.PositiveIntegerField(default=0)
     sent_count = models.PositiveIntegerField(default=0)
     failed_count = models.PositiveIntegerField(default=0)
+    last_checkpoint_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text='Last time the sender flushed progress counters',
+    )
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True, blank=True,
@@ -140,9 +159,37 @@ class InboxEmail(TimeStampedModel):
     message_id = models.CharField(max_length=500, unique=True, db_index=True)
     is_read = models.BooleanField(default=False)
 
+    # IMAP location — headers are synced first, the body is fetched later by UID
+    folder = models.CharField(max_length=255, default='INBOX')
+    uid = models.PositiveBigIntegerField(null=True, blank=True)
+    uid_validity = models.PositiveBigIntegerField(null=True, blank=True)
+    body_fetched = models.BooleanField(default=False)
+
     class Meta:
         db_table = 'inbox_emails'
         ordering = ['-received_at']
+        indexes = [
+            models.Index(fields=['folder', 'body_fetched', 'uid']),
+        ]
 
     def __str__(self):
         return f"📥 From {self.sender_email}: {self.subject[:40]}"
+
+
+class MailboxSyncState(TimeStampedModel):
+    """
+    Incremental IMAP sync cursor for one folder.
+    UIDs are only stable while UIDVALIDITY is unchanged; when the server
+    reports a new UIDVALIDITY the cursor restarts from zero.
+    """
+
+    folder = models.CharField(max_length=255, unique=True)
+    uid_validity = models.PositiveBigIntegerField(null=True, blank=True)
+    last_uid = models.PositiveBigIntegerField(default=0)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'mailbox_sync_states'
+
+    def __str__(self):
+        return f"{self.folder} @ UID {self.last_uid} (validity {self.uid_validity})"
@@ -44,6 +44,6 @@ class InboxEmailSerializer(serializers.ModelSerializer):
         model = InboxEmail
         fields = [
             'id', 'sender_email', 'sender_name', 'subject',
-            'body', 'received_at', 'is_read', 'created_at',
+            'body', 'body_fetched', 'received_at', 'is_read', 'created_at',
         ]
         read_only_fields = fields
@@ -26,78 +26,38 @@ def send_welcome_email_task(self, user_id: int):
 
 
 @shared_task(bind=True, max_retries=2, default_retry_delay=120)
-def send_campaign_task(self, campaign_id: int):
+def send_campaign_task(self, campaign_id, resume: bool = False):
     """
     Send a bulk promotional email campaign to all target users.
-    Updates campaign progress counters in real-time.
+    Delivery runs through the pooled campaign engine, which checkpoints
+    progress counters while sending. Retries (and `resume=True`) pick up a
+    partially sent campaign without mailing anyone twice.
     """
     try:
-        from django.contrib.auth import get_user_model
         from .models import EmailCampaign
-        from .email_utils import send_email, promotional_email_html
-
-        User = get_user_model()
-        campaign = EmailCampaign.objects.get(id=campaign_id)
+        from .campaign_engine import CampaignSender, claim_campaign
 
-        if campaign.status not in [
-            EmailCampaign.StatusChoices.DRAFT,
-            EmailCampaign.StatusChoices.SCHEDULED,
-        ]:
-            logger.warning(f"Campaign {campaign_id} already in state {campaign.status}, skipping.")
+        if not claim_campaign(campaign_id, resume=resume or self.request.retries > 0):
+            status = EmailCampaign.objects.filter(id=campaign_id).values_list('status', flat=True).first()
+            logger.warning(f"Campaign {campaign_id} already in state {status}, skipping.")
             return
 
-        # Mark as sending
-        campaign.status = EmailCampaign.StatusChoices.SENDING
-        campaign.save(update_fields=['status'])
-
-        # Build recipient queryset
-        if campaign.audience == EmailCampaign.AudienceChoices.STUDENTS:
-            users = User.objects.filter(role='student', is_active=True)
-        elif campaign.audience == EmailCampaign.AudienceChoices.TEACHERS:
-            users = User.objects.filter(role='teacher', is_active=True)
-        else:
-            users = User.objects.filter(is_active=True)
-
-        campaign.total_recipients = users.count()
-        campaign.save(update_fields=['total_recipients'])
-
-        sent = 0
-        failed = 0
-        html_content = promotional_email_html(campaign.subject, campaign.body_html)
-
-        for user in users.iterator():
-            try:
-                name = getattr(user, 'name', '') or user.email
-                success = send_email(
-                    to_email=user.email,
-                    to_name=name,
-                    subject=campaign.subject,
-                    html_content=html_content,
-                    text_content=campaign.body_text,
-                    email_type='promotional',
-                )
-                if success:
-                    sent += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                failed += 1
-                logger.error(f"Error sending campaign to {user.email}: {e}")
-
-        campaign.status = EmailCampaign.StatusChoices.COMPLETED
-        campaign.sent_count = sent
-        campaign.failed_count = failed
-        campaign.sent_at = timezone.now()
-        campaign.save(update_fields=['status', 'sent_count', 'failed_count', 'sent_at'])
+        campaign = EmailCampaign.objects.get(id=campaign_id)
+        result = CampaignSender(campaign).run()
 
-        logger.info(f"📧 Campaign '{campaign.title}' done: {sent} sent, {failed} failed")
+        logger.info(
+            f"📧 Campaign '{campaign.title}' done: {result['sent']} sent, {result['failed']} failed, "
+            f"{result['skipped']} already sent, {result['connections']} SMTP connection(s) "
+            f"in {result['duration_s']}s"
+        )
+        return result
 
     except Exception as exc:
         try:
             from .models import EmailCampaign
-            campaign = EmailCampaign.objects.get(id=campaign_id)
-            campaign.status = EmailCampaign.StatusChoices.FAILED
-            campaign.save(update_fields=['status'])
+            EmailCampaign.objects.filter(
+                id=campaign_id, status=EmailCampaign.StatusChoices.SENDING,
+            ).update(status=EmailCampaign.StatusChoices.FAILED, updated_at=timezone.now())
         except Exception:
             pass
         logger.error(f"Campaign send task error: {exc}")
@@ -0,0 +1,155 @@
+"""
+InboxSync against a stub IMAP server: UIDVALIDITY resets, the incremental
+UID cursor and the separate, bounded body pass.
+"""
+import re
+
+import pytest
+
+from apps.emails.imap_reader import InboxSync
+from apps.emails.models import InboxEmail, MailboxSyncState
+
+pytestmark = pytest.mark.django_db
+
+
+def _message(n):
+    return (
+        f"Message-ID: <m{n}@example.com>\r\n"
+        f"From: Sender {n} <sender{n}@example.com>\r\n"
+        f"Subject: Hello {n}\r\n"
+        f"Date: Mon, 05 Oct 2026 10:{n:02d}:00 +0000\r\n"
+        f"Content-Type: text/plain; charset=utf-8\r\n"
+        f"\r\n"
+        f"Body of message {n}\r\n"
+    ).encode()
+
+
+class StubIMAP:
+    """
+    The slice of imaplib.IMAP4 that InboxSync uses, serving `messages`
+    ({uid: raw bytes}) from one folder. Every UID command is recorded.
+    """
+
+    def __init__(self, messages, uid_validity=1000):
+        self.messages = dict(messages)
+        self.uid_validity = uid_validity
+        self.commands = []
+
+    def select(self, folder, readonly=False):
+        assert readonly, "sync must not select the folder read-write"
+        return "OK", [str(len(self.messages)).encode()]
+
+    def response(self, code):
+        return code, [str(self.uid_validity).encode()]
+
+    def uid(self, command, *args):
+        self.commands.append((command, *args))
+        if command == "SEARCH":
+            low = int(re.match(r"UID (\d+):\*", args[1]).group(1))
+            uids = [uid for uid in sorted(self.messages) if uid >= low]
+            # Like a real server, "N:*" matches the newest message even below N.
+            if not uids and self.messages:
+                uids = [max(self.messages)]
+            return "OK", [" ".join(map(str, uids)).encode()]
+        if command == "FETCH":
+            uid_set, spec = args
+            data = []
+            for seq, uid in enumerate(self._expand(uid_set), start=1):
+                raw = self.messages[uid]
+                payload = raw.split(b"\r\n\r\n", 1)[0] + b"\r\n\r\n" if "HEADER" in spec else raw
+                data.append((f"{seq} (UID {uid} BODY[] {{{len(payload)}}}".encode(), payload))
+                data.append(b")")
+            return "OK", data
+        raise AssertionError(f"unexpected UID {command}")
+
+    def _expand(self, uid_set):
+        for part in uid_set.split(","):
+            low, _, high = part.partition(":")
+            for uid in range(int(low), int(high or low) + 1):
+                if uid in self.messages:
+                    yield uid
+
+    def fetched(self, body=False):
+        """UID sets fetched for headers (default) or for full bodies."""
+        marker = "BODY.PEEK[]" if body else "HEADER.FIELDS"
+        return [args[0] for command, *args in self.commands if command == "FETCH" and marker in args[1]]
+
+
+def _sync(mail, limit=50, body_limit=0):
+    return InboxSync(mail, batch_size=2).run(limit=limit, body_limit=body_limit)
+
+
+def test_first_sync_backfills_latest_headers_only():
+    mail = StubIMAP({uid: _message(uid) for uid in range(1, 6)})
+
+    results = _sync(mail, limit=3)
+
+    assert results == {"fetched": 3, "new": 3, "bodies": 0, "errors": []}
+    assert mail.fetched() == ["3:4", "5"]
+    assert mail.fetched(body=True) == []
+    rows = InboxEmail.objects.order_by("uid")
+    assert [row.uid for row in rows] == [3, 4, 5]
+    assert all(row.body == "" and not row.body_fetched for row in rows)
+    assert rows[0].sender_email == "sender3@example.com"
+    assert rows[0].subject == "Hello 3"
+    state = MailboxSyncState.objects.get(folder="INBOX")
+    assert (state.uid_validity, state.last_uid) == (1000, 5)
+
+
+def test_later_syncs_only_fetch_uids_above_the_cursor():
+    mail = StubIMAP({uid: _message(uid) for uid in range(1, 4)})
+    _sync(mail)
+
+    mail.messages.update({uid: _message(uid) for uid in (4, 7)})
+    mail.commands.clear()
+    results = _sync(mail)
+
+    assert ("SEARCH", None, "UID 4:*") in mail.commands
+    assert mail.fetched() == ["4,7"]
+    assert (results["fetched"], results["new"]) == (2, 2)
+    assert MailboxSyncState.objects.get(folder="INBOX").last_uid == 7
+
+    # Nothing new: the server still answers "8:*" with UID 7, which is skipped.
+    mail.commands.clear()
+    results = _sync(mail)
+    assert mail.fetched() == []
+    assert (results["fetched"], results["new"]) == (0, 0)
+    assert InboxEmail.objects.count() == 5
+
+
+def test_uidvalidity_change_restarts_the_cursor():
+    mail = StubIMAP({uid: _message(uid) for uid in range(1, 4)})
+    _sync(mail)
+
+    # The server renumbered the folder: same mail under new UIDs, plus one new.
+    mail.uid_validity = 2000
+    mail.messages = {uid: _message(n) for uid, n in ((1, 1), (2, 2), (3, 3), (4, 9))}
+    mail.commands.clear()
+    results = _sync(mail)
+
+    assert ("SEARCH", None, "UID 1:*") in mail.commands
+    assert (results["fetched"], results["new"]) == (4, 1)
+    state = MailboxSyncState.objects.get(folder="INBOX")
+    assert (state.uid_validity, state.last_uid) == (2000, 4)
+    new = InboxEmail.objects.get(message_id="<m9@example.com>")
+    assert (new.uid, new.uid_validity) == (4, 2000)
+    assert InboxEmail.objects.count() == 4
+
+
+def test_bodies_are_fetched_lazily_newest_first():
+    mail = StubIMAP({uid: _message(uid) for uid in range(1, 5)})
+
+    results = _sync(mail, body_limit=3)
+
+    assert results["bodies"] == 3
+    assert mail.fetched(body=True) == ["2:3", "4"]
+    assert not InboxEmail.objects.get(uid=1).body_fetched
+    assert InboxEmail.objects.get(uid=4).body.strip() == "Body of message 4"
+
+    # The next run has no new headers and picks up the remaining body.
+    mail.commands.clear()
+    results = _sync(mail, body_limit=3)
+    assert mail.fetched() == []
+    assert mail.fetched(body=True) == ["1"]
+    assert results["bodies"] == 1
+    assert not InboxEmail.objects.filter(body_fetched=False).exists()
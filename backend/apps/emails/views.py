@@ -3,11 +3,14 @@ Email API Views
 Endpoints for contact forms, inbox reading, and campaign management.
 """
 import logging
+
+from django.conf import settings
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .campaign_engine import is_stalled
 from .models import ContactMessage, EmailCampaign, EmailLog, InboxEmail
 from .serializers import (
     ContactMessageSerializer, EmailCampaignSerializer,
@@ -144,7 +147,11 @@ class EmailCampaignListCreateView(generics.ListCreateAPIView):
 
 
 class SendCampaignView(APIView):
-    """POST /api/v1/emails/campaigns/<id>/send/ — Fire off a campaign via Celery."""
+    """
+    POST /api/v1/emails/campaigns/<id>/send/ — Fire off a campaign via Celery.
+    Body `{"resume": true}` restarts a failed or stalled campaign; recipients
+    who already received it are skipped.
+    """
     permission_classes = [IsAdminUser]
 
     def post(self, request, id):
@@ -156,17 +163,33 @@ class SendCampaignView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        if campaign.status not in [
+        resume = str(request.data.get('resume', '')).lower() in ('1', 'true', 'yes')
+        sendable = [
             EmailCampaign.StatusChoices.DRAFT,
             EmailCampaign.StatusChoices.SCHEDULED,
-        ]:
+        ]
+        if resume:
+            sendable += [
+                EmailCampaign.StatusChoices.SENDING,
+                EmailCampaign.StatusChoices.FAILED,
+            ]
+
+        if campaign.status not in sendable:
             return Response(
                 {'success': False, 'error': {'message': f"Campaign is already {campaign.status}."}},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if campaign.status == EmailCampaign.StatusChoices.SENDING and not is_stalled(campaign):
+            # claim_campaign() would refuse it too; say so instead of queueing a no-op.
+            return Response(
+                {'success': False, 'error': {'message': 'Campaign is still sending; it can be resumed once '
+                                                        'it has made no progress for '
+                                                        f'{settings.EMAIL_CAMPAIGN_STALL_SECONDS} seconds.'}},
+                status=status.HTTP_409_CONFLICT,
+            )
 
         from .tasks import send_campaign_task
-        send_campaign_task.delay(campaign.id)
+        send_campaign_task.delay(campaign.id, resume=resume)
 
         return Response({
             'success': True,
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:44
+
+import django.db.models.constraints
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def spread_ranks(count):
+    """`count` evenly spaced keys of equal length (as apps.lessons.ordering spreads them)."""
+    width = 1
+    while BASE ** width < BASE * (count + 1):
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value, digits = i * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def backfill_ranks(apps, schema_editor):
+    """Give every lesson a rank that follows its current sequence_number."""
+    Lesson = apps.get_model('lessons', 'Lesson')
+    lessons = list(Lesson.objects.order_by('course_id', 'sequence_number').only('id', 'course_id', 'rank'))
+    by_course = {}
+    for lesson in lessons:
+        by_course.setdefault(lesson.course_id, []).append(lesson)
+    for course_lessons in by_course.values():
+        for lesson, rank in zip(course_lessons, spread_ranks(len(course_lessons))):
+            lesson.rank = rank
+    Lesson.objects.bulk_update(lessons, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0004_course_grade_level"),
+        ("lessons", "0004_remove_offlinedownload_micro_lesson_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lesson",
+            name="rank",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Fractional ordering key within the course (see apps.lessons.ordering)",
+                max_length=64,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                fields=["course", "rank"], name="lessons_course__161058_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="lesson",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("course", "sequence_number"),
+                name="lessons_course_sequence_uniq",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="lesson",
+            unique_together=set(),
+        ),
+        migrations.RunPython(backfill_ranks, migrations.RunPython.noop),
+    ]
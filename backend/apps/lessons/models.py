@@ -24,6 +24,10 @@ class Lesson(SoftDeleteModel):
     description = models.TextField(blank=True, default='')
     content = models.TextField(blank=True, default='', help_text='Rich text lesson content')
     sequence_number = models.PositiveIntegerField(default=1, db_index=True)
+    rank = models.CharField(
+        max_length=64, blank=True, default='',
+        help_text='Fractional ordering key within the course (see apps.lessons.ordering)',
+    )
 
     # Media
     video_url = models.URLField(blank=True, default='')
@@ -44,8 +48,26 @@ class Lesson(SoftDeleteModel):
         ordering = ['sequence_number']
         indexes = [
             models.Index(fields=['course', 'sequence_number']),
+            models.Index(fields=['course', 'rank']),
+        ]
+        constraints = [
+            # Deferred so a reorder can renumber the course in one statement.
+            models.UniqueConstraint(
+                fields=['course', 'sequence_number'],
+                name='lessons_course_sequence_uniq',
+                deferrable=models.Deferrable.DEFERRED,
+            ),
         ]
-        unique_together = ['course', 'sequence_number']
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
+
+    def save(self, *args, **kwargs):
+        if not self.rank:
+            from .ordering import rank_between
+            last = (
+                Lesson.objects.filter(course_id=self.course_id).exclude(pk=self.pk)
+                .order_by('-rank').values_list('rank', flat=True).first()
+            )
+            self.rank = rank_between(last, None)
+        super().save(*args, **kwargs)
@@ -0,0 +1,204 @@
+"""
+Lesson ordering: rank keys plus a gapless sequence_number.
+
+Each lesson carries a `rank`, a base-36 fractional key ("i", "in", "j", ...)
+that orders it within its course. Moving one lesson only needs a key between
+its new neighbours, so no other rank changes. sequence_number remains the
+gapless 1..n ordinal that clients display; it follows the rank order, and
+only rows whose ordinal actually changes are written.
+
+Every operation writes with a single UPDATE of CASE expressions, inside one
+transaction that locks the course row against concurrent reorders. The
+(course, sequence_number) unique constraint is DEFERRED on PostgreSQL, so
+the statement cannot collide with itself partway through; backends without
+deferrable constraints (SQLite in dev) first park the affected rows above
+the current maximum.
+
+Soft-deleted lessons keep their rank and are numbered after the live ones.
+Queryset updates skip model signals, so the dependent caches (catalog,
+course and teacher dashboards, lesson detail) are invalidated here, once,
+after commit.
+"""
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Case, CharField, F, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from apps.core.cache import invalidate_tags_on_commit, tag
+
+from .models import Lesson
+
+logger = logging.getLogger(__name__)
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+MAX_RANK_LENGTH = 48     # longer keys trigger a rebalance of the whole course
+
+
+class OrderingError(ValueError):
+    """The requested order does not match the course's lessons."""
+
+
+# ─── Rank Keys ────────────────────────────────────────────────────
+
+def _midpoint(low, high):
+    """Key strictly between low and high (None = unbounded). Keys never end in '0'."""
+    if high is not None:
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else '0') == high[n]:
+            n += 1
+        if n:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    lo = DIGITS.index(low[0]) if low else 0
+    hi = DIGITS.index(high[0]) if high else BASE
+    if hi - lo > 1:
+        return DIGITS[(lo + hi) // 2]
+    if high and len(high) > 1:
+        return high[0]
+    return DIGITS[lo] + _midpoint(low[1:], None)
+
+
+def rank_between(before=None, after=None) -> str:
+    """Rank for a lesson placed between two neighbours (None = list end)."""
+    before = before or ''
+    if after is not None and before >= after:
+        raise OrderingError(f'Cannot place a rank between {before!r} and {after!r}.')
+    return _midpoint(before, after)
+
+
+def spread_ranks(count) -> list:
+    """`count` evenly spaced keys of equal length, leaving room on every side."""
+    width = 1
+    while BASE ** width < BASE * (count + 1):
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value, digits = i * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+# ─── Writes ───────────────────────────────────────────────────────
+
+def _lock_rows(course_id):
+    """Lock the course, then read its lessons in display order (live first)."""
+    from apps.courses.models import Course
+
+    list(Course.all_objects.select_for_update().filter(pk=course_id).values_list('pk'))
+    rows = list(
+        Lesson.all_objects.filter(course_id=course_id)
+        .values('id', 'rank', 'sequence_number', 'is_deleted')
+    )
+    rows.sort(key=lambda r: (r['is_deleted'], r['rank'], r['sequence_number']))
+    return rows
+
+
+def _write(course_id, rows, ranks=None):
+    """
+    Number `rows` 1..n in the given order (optionally with new ranks) and
+    write the rows that changed. Returns the ids whose sequence_number changed.
+    """
+    ranks = ranks or {}
+    changed = []
+    for position, row in enumerate(rows, start=1):
+        rank = ranks.get(row['id'], row['rank'])
+        if row['sequence_number'] != position or row['rank'] != rank:
+            changed.append((row['id'], rank, position, row['sequence_number'] != position))
+    if not changed:
+        return []
+
+    ids = [pk for pk, _, _, _ in changed]
+    updated = Lesson.all_objects.filter(pk__in=ids)
+    if not connection.features.supports_deferrable_unique_constraints:
+        highest = max(row['sequence_number'] for row in rows)
+        updated.update(sequence_number=F('sequence_number') + highest)
+    updated.update(
+        rank=Case(*[When(pk=pk, then=Value(rank)) for pk, rank, _, _ in changed], output_field=CharField()),
+        sequence_number=Case(
+            *[When(pk=pk, then=Value(position)) for pk, _, position, _ in changed],
+            output_field=PositiveIntegerField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    return [pk for pk, _, _, renumbered in changed if renumbered]
+
+
+def _invalidate(course, lesson_ids):
+    invalidate_tags_on_commit(
+        'catalog', tag('course', course.pk), tag('teacher', course.teacher_id),
+        *(tag('lesson', pk) for pk in lesson_ids),
+    )
+
+
+# ─── Operations ───────────────────────────────────────────────────
+
+@transaction.atomic
+def reorder(course, order) -> int:
+    """
+    Apply a full ordering: `order` lists every live lesson id exactly once.
+    Ranks are rebalanced. Returns the number of renumbered lessons.
+    """
+    rows = _lock_rows(course.pk)
+    live = {str(row['id']): row for row in rows if not row['is_deleted']}
+    order = [str(pk) for pk in order]
+    if len(order) != len(live) or set(order) != set(live):
+        raise OrderingError('order must list every lesson of the course exactly once.')
+
+    ordered = [live[pk] for pk in order]
+    ranks = dict(zip((row['id'] for row in ordered), spread_ranks(len(ordered))))
+    renumbered = _write(course.pk, ordered + [row for row in rows if row['is_deleted']], ranks)
+    _invalidate(course, renumbered)
+    logger.info(f"🔀 Reordered {len(ordered)} lessons of course {course.pk} ({len(renumbered)} renumbered)")
+    return len(renumbered)
+
+
+@transaction.atomic
+def move(lesson, after_id=None) -> int:
+    """
+    Place `lesson` right after the lesson `after_id` (None = first). Only the
+    moved lesson gets a new rank; ordinals in between shift by one.
+    """
+    rows = _lock_rows(lesson.course_id)
+    live = [row for row in rows if not row['is_deleted'] and row['id'] != lesson.pk]
+    index = 0
+    if after_id is not None:
+        index = next((i + 1 for i, row in enumerate(live) if str(row['id']) == str(after_id)), None)
+        if index is None:
+            raise OrderingError('after_id must be another lesson of the same course.')
+
+    moved = next(row for row in rows if row['id'] == lesson.pk)
+    before = live[index - 1]['rank'] if index else None
+    after = live[index]['rank'] if index < len(live) else None
+    live.insert(index, moved)
+    rank = rank_between(before, after)
+    if len(rank) > MAX_RANK_LENGTH:
+        ranks = dict(zip((row['id'] for row in live), spread_ranks(len(live))))
+    else:
+        ranks = {lesson.pk: rank}
+
+    renumbered = _write(lesson.course_id, live + [row for row in rows if row['is_deleted']], ranks)
+    _invalidate(lesson.course, renumbered + [lesson.pk])
+    return len(renumbered)
+
+
+def move_to(lesson, position) -> int:
+    """Move `lesson` to the 1-based `position` among the live lessons."""
+    others = list(
+        Lesson.objects.filter(course_id=lesson.course_id).exclude(pk=lesson.pk)
+        .order_by('rank', 'sequence_number').values_list('pk', flat=True)
+    )
+    position = min(max(int(position), 1), len(others) + 1)
+    return move(lesson, others[position - 2] if position > 1 else None)
+
+
+@transaction.atomic
+def renumber(course) -> int:
+    """Close gaps after a lesson is added or soft-deleted."""
+    renumbered = _write(course.pk, _lock_rows(course.pk))
+    _invalidate(course, renumbered)
+    return len(renumbered)
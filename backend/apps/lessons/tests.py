@@ -0,0 +1,173 @@
+"""
+Lesson ordering: rank keys, and the gapless 1..n sequence_number kept by
+reorder, move and renumber (see apps.lessons.ordering).
+"""
+import pytest
+from rest_framework.test import APIClient
+
+from apps.courses.models import Course
+from apps.lessons import ordering
+from apps.lessons.models import Lesson
+from apps.lessons.ordering import DIGITS, OrderingError, rank_between, spread_ranks
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+REORDER_URL = '/api/v1/lessons/reorder/'
+
+
+@pytest.fixture
+def teacher():
+    return User.objects.create_user(email='teacher@example.com', password='x', name='Teacher', role='teacher')
+
+
+@pytest.fixture
+def client(teacher):
+    client = APIClient()
+    client.force_authenticate(teacher)
+    return client
+
+
+@pytest.fixture
+def course(teacher):
+    course = Course.objects.create(teacher=teacher, title='Algebra', is_published=True)
+    for i in range(1, 6):
+        Lesson.objects.create(course=course, title=f'L{i}', sequence_number=i)
+    return course
+
+
+def _ids(course, *titles):
+    by_title = dict(Lesson.all_objects.filter(course=course).values_list('title', 'id'))
+    return [str(by_title[title]) for title in titles]
+
+
+def _titles(course):
+    """Titles in rank order, after checking the numbering invariants."""
+    rows = list(
+        Lesson.all_objects.filter(course=course)
+        .order_by('is_deleted', 'rank').values_list('title', 'rank', 'sequence_number', 'is_deleted')
+    )
+    ranks = [rank for _, rank, _, _ in rows]
+    assert len(set(ranks)) == len(ranks)
+    assert all(rank and not rank.endswith('0') for rank in ranks)
+    assert [number for _, _, number, _ in rows] == list(range(1, len(rows) + 1))
+    return [title for title, _, _, deleted in rows if not deleted]
+
+
+# ─── Rank Keys ────────────────────────────────────────────────────
+
+def test_rank_between_orders_keys():
+    assert rank_between() == 'i'
+    assert rank_between('a', 'b') == 'ai'
+    assert rank_between('a', 'a1') == 'a0i'
+    assert rank_between('az', 'b') == 'azi'
+    with pytest.raises(OrderingError):
+        rank_between('b', 'a')
+    with pytest.raises(OrderingError):
+        rank_between('a', 'a')
+
+    # Keep inserting at both ends and just after the first key.
+    ranks = [rank_between()]
+    for _ in range(200):
+        ranks.insert(0, rank_between(None, ranks[0]))
+        ranks.append(rank_between(ranks[-1], None))
+        ranks.insert(1, rank_between(ranks[0], ranks[1]))
+    assert ranks == sorted(set(ranks))
+    assert all(set(rank) <= set(DIGITS) and not rank.endswith('0') for rank in ranks)
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 35, 36, 500])
+def test_spread_ranks_leave_room_around_every_key(count):
+    ranks = spread_ranks(count)
+    assert len(ranks) == count
+    assert ranks == sorted(set(ranks))
+    assert all(ranks) and not any(rank.endswith('0') for rank in ranks)
+    if count:
+        assert rank_between(None, ranks[0]) < ranks[0]
+        assert rank_between(ranks[-1], None) > ranks[-1]
+
+
+# ─── Operations ───────────────────────────────────────────────────
+
+def test_reorder_applies_the_full_order(client, course):
+    response = client.post(
+        REORDER_URL, {'course_id': str(course.pk), 'order': _ids(course, 'L5', 'L3', 'L1', 'L2', 'L4')}, format='json',
+    )
+
+    assert response.status_code == 200
+    assert _titles(course) == ['L5', 'L3', 'L1', 'L2', 'L4']
+    assert list(Lesson.objects.filter(course=course).order_by('rank').values_list('rank', flat=True)) == spread_ranks(5)
+    assert list(Lesson.objects.filter(course=course).values_list('title', flat=True)) == ['L5', 'L3', 'L1', 'L2', 'L4']
+
+
+@pytest.mark.parametrize('order', [
+    ('L2', 'L1', 'L3', 'L4'),               # one missing
+    ('L2', 'L1', 'L3', 'L4', 'L4'),         # one twice
+])
+def test_partial_order_is_rejected(client, course, order):
+    before = list(Lesson.objects.filter(course=course).values_list('id', 'rank', 'sequence_number'))
+
+    response = client.post(REORDER_URL, {'course_id': str(course.pk), 'order': _ids(course, *order)}, format='json')
+
+    assert response.status_code == 400
+    assert response.data['success'] is False
+    assert list(Lesson.objects.filter(course=course).values_list('id', 'rank', 'sequence_number')) == before
+
+
+def test_move_only_reranks_the_moved_lesson(client, course):
+    ranks = dict(Lesson.objects.filter(course=course).values_list('title', 'rank'))
+    l4, l1 = _ids(course, 'L4', 'L1')
+
+    response = client.post(REORDER_URL, {'course_id': str(course.pk), 'lesson_id': l4, 'after_id': l1}, format='json')
+    assert response.status_code == 200
+    assert _titles(course) == ['L1', 'L4', 'L2', 'L3', 'L5']
+    moved = dict(Lesson.objects.filter(course=course).values_list('title', 'rank'))
+    assert {title for title in ranks if ranks[title] != moved[title]} == {'L4'}
+
+    client.post(REORDER_URL, {'course_id': str(course.pk), 'lesson_id': _ids(course, 'L5')[0], 'after_id': None}, format='json')
+    assert _titles(course) == ['L5', 'L1', 'L4', 'L2', 'L3']
+
+    response = client.post(
+        REORDER_URL, {'course_id': str(course.pk), 'lesson_id': l4, 'after_id': l4}, format='json',
+    )
+    assert response.status_code == 400
+
+
+def test_sequence_number_update_moves_the_lesson(client, course):
+    l2 = _ids(course, 'L2')[0]
+
+    response = client.patch(f'/api/v1/lessons/{l2}/', {'sequence_number': 5}, format='json')
+    assert response.status_code == 200
+    assert response.data['data']['sequence_number'] == 5
+    assert _titles(course) == ['L1', 'L3', 'L4', 'L5', 'L2']
+
+    client.patch(f'/api/v1/lessons/{l2}/', {'sequence_number': 1}, format='json')
+    assert _titles(course) == ['L2', 'L1', 'L3', 'L4', 'L5']
+
+
+def test_delete_and_create_renumber_without_gaps(client, course):
+    assert client.delete(f'/api/v1/lessons/{_ids(course, "L2")[0]}/').status_code == 200
+    assert _titles(course) == ['L1', 'L3', 'L4', 'L5']
+    assert Lesson.all_objects.get(course=course, title='L2').sequence_number == 5
+
+    response = client.post('/api/v1/lessons/', {'course': str(course.pk), 'title': 'L6'}, format='json')
+    assert response.status_code == 201
+    assert response.data['data']['sequence_number'] == 5
+    assert _titles(course) == ['L1', 'L3', 'L4', 'L5', 'L6']
+
+
+def test_long_ranks_trigger_a_rebalance(course, monkeypatch):
+    monkeypatch.setattr(ordering, 'MAX_RANK_LENGTH', 3)
+    l1, l2, l3 = (Lesson.objects.get(course=course, title=title) for title in ('L1', 'L2', 'L3'))
+
+    # Alternately slot L3 and L2 right after L1; the gap shrinks each time.
+    rebalanced = 0
+    for _ in range(10):
+        for lesson in (l3, l2):
+            ordering.move(lesson, after_id=l1.pk)
+            ranks = list(Lesson.objects.filter(course=course).order_by('rank').values_list('rank', flat=True))
+            assert max(map(len, ranks)) <= 3
+            rebalanced += ranks == spread_ranks(5)
+
+    assert rebalanced
+    assert _titles(course) == ['L1', 'L2', 'L3', 'L4', 'L5']
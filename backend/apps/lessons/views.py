@@ -6,9 +6,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.cache import cached_view, tag
 from apps.core.pagination import StandardPagination
 from apps.core.permissions import IsTeacher, IsTeacherOrReadOnly
 
+from . import ordering
 from .models import Lesson
 from .serializers import (
     LessonCreateSerializer,
@@ -42,6 +44,9 @@ class CourseLessonsView(generics.ListCreateAPIView):
         serializer = LessonCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         lesson = serializer.save()
+        # Numbered after every lesson ever created; close the gap left by deleted ones.
+        ordering.renumber(lesson.course)
+        lesson.refresh_from_db(fields=['sequence_number'])
 
         # Trigger notifications for enrolled students
         try:
@@ -98,6 +103,12 @@ class LessonDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Lesson.objects.select_related('course', 'course__teacher').filter(is_deleted=False)
 
+    # Lesson content is identical for every viewer, so one shared copy is cached.
+    @cached_view(
+        timeout='lesson',
+        tags=lambda view, request, id: ['catalog', tag('lesson', id)],
+        vary_on=None,
+    )
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = LessonDetailSerializer(instance)
@@ -114,7 +125,12 @@ class LessonDetailView(generics.RetrieveUpdateDestroyAPIView):
         partial = kwargs.pop('partial', False)
         serializer = LessonUpdateSerializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
+        # A new sequence_number is a move; the other lessons shift around it.
+        position = serializer.validated_data.pop('sequence_number', None)
         serializer.save()
+        if position is not None and position != instance.sequence_number:
+            ordering.move_to(instance, position)
+            instance.refresh_from_db(fields=['sequence_number', 'rank'])
         return Response({
             'success': True,
             'message': 'Lesson updated successfully.',
@@ -130,23 +146,28 @@ class LessonDetailView(generics.RetrieveUpdateDestroyAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
         instance.soft_delete()
+        ordering.renumber(instance.course)
         return Response({'success': True, 'message': 'Lesson deleted successfully.'})
 
 
 class ReorderLessonsView(APIView):
     """
     POST /api/v1/lessons/reorder/
-    Accepts { "course_id": "...", "order": ["lesson-id-1", "lesson-id-2", ...] }
+    Accepts either a full ordering:
+        { "course_id": "...", "order": ["lesson-id-1", "lesson-id-2", ...] }
+    or a single move (after_id null = first):
+        { "course_id": "...", "lesson_id": "...", "after_id": "lesson-id" }
     """
     permission_classes = [IsAuthenticated, IsTeacher]
 
     def post(self, request):
         course_id = request.data.get('course_id')
         order = request.data.get('order', [])
+        lesson_id = request.data.get('lesson_id')
 
-        if not course_id or not order:
+        if not course_id or not (order or lesson_id):
             return Response(
-                {'success': False, 'error': {'message': 'course_id and order are required.'}},
+                {'success': False, 'error': {'message': 'course_id and order (or lesson_id) are required.'}},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
@@ -159,7 +180,21 @@ class ReorderLessonsView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        for idx, lesson_id in enumerate(order, start=1):
-            Lesson.objects.filter(id=lesson_id, course=course).update(sequence_number=idx)
+        try:
+            if lesson_id:
+                lesson = Lesson.objects.select_related('course').filter(id=lesson_id, course=course).first()
+                if lesson is None:
+                    return Response(
+                        {'success': False, 'error': {'message': 'Lesson not found.'}},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                ordering.move(lesson, request.data.get('after_id'))
+            else:
+                ordering.reorder(course, order)
+        except ordering.OrderingError as e:
+            return Response(
+                {'success': False, 'error': {'message': str(e)}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response({'success': True, 'message': 'Lessons reordered successfully.'})
@@ -11,6 +11,12 @@ class AttendanceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'marked_at']
 
 
+class AttendanceMarkSerializer(serializers.Serializer):
+    # One entry of the teacher's attendance list; enrollment is checked for the whole list at once.
+    student_id = serializers.UUIDField()
+    is_present = serializers.BooleanField(default=False)
+
+
 class LiveClassListSerializer(serializers.ModelSerializer):
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
     course_title = serializers.CharField(source='course.title', read_only=True, default=None)
@@ -8,6 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.attendance.services import non_enrolled_students, upsert_marks
 from apps.core.pagination import StandardPagination
 from apps.core.permissions import IsStudent, IsTeacher
 
@@ -19,6 +20,7 @@ from apps.live_classes.models import SessionBooking
 from apps.users.models import User
 from .models import Attendance, LiveClass, LiveClassChat, LiveClassParticipant
 from .serializers import (
+    AttendanceMarkSerializer,
     AttendanceSerializer,
     LiveClassChatSerializer,
     LiveClassCreateSerializer,
@@ -361,26 +363,27 @@ class LiveClassAttendanceView(APIView):
         except LiveClass.DoesNotExist:
             return Response({'success': False, 'error': {'message': 'Not found.'}}, status=404)
 
-        attendance_data = request.data.get('attendance', []) # List of {student_id: int, is_present: bool}
-        
-        results = []
-        for item in attendance_data:
-            student_id = item.get('student_id')
-            is_present = item.get('is_present', False)
-            
-            if not student_id: continue
-            
-            record, created = Attendance.objects.update_or_create(
-                live_class=live_class,
-                student_id=student_id,
-                defaults={'is_present': is_present}
-            )
-            results.append(AttendanceSerializer(record).data)
+        # List of {student_id: uuid, is_present: bool}; "false"/"0" parse as absent.
+        serializer = AttendanceMarkSerializer(data=request.data.get('attendance', []), many=True)
+        serializer.is_valid(raise_exception=True)
+        marks = {str(item['student_id']): item['is_present'] for item in serializer.validated_data}
+
+        if live_class.course_id:
+            missing = non_enrolled_students(live_class.course_id, marks)
+            if missing:
+                return Response({
+                    'success': False,
+                    'error': {'message': f"Students not enrolled in this course: {', '.join(missing)}"}
+                }, status=400)
+
+        # One INSERT ... ON CONFLICT for the whole roster.
+        upsert_marks(Attendance, {'live_class': live_class}, marks, update_fields=('is_present', 'marked_at', 'updated_at'))
+        records = Attendance.objects.filter(live_class=live_class, student_id__in=marks).select_related('student')
 
         return Response({
             'success': True,
             'message': 'Attendance updated.',
-            'data': results
+            'data': AttendanceSerializer(records, many=True).data
         })
 
 
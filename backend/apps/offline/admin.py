@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MicroLesson, OfflineDownload
+from .models import MediaJob, MicroLesson, OfflineDownload
 
 
 @admin.register(MicroLesson)
@@ -30,3 +30,12 @@ class OfflineDownloadAdmin(admin.ModelAdmin):
         'micro_lesson__lesson__title',
     ]
     readonly_fields = ['id', 'created_at', 'updated_at']
+
+
+@admin.register(MediaJob)
+class MediaJobAdmin(admin.ModelAdmin):
+    list_display = ['lesson', 'kind', 'status', 'attempts', 'run_after', 'finished_at']
+    list_filter = ['kind', 'status', 'created_at']
+    search_fields = ['lesson__title', 'source_hash']
+    raw_id_fields = ['lesson']
+    readonly_fields = ['id', 'source_hash', 'started_at', 'finished_at', 'created_at', 'updated_at']
@@ -0,0 +1,296 @@
+"""
+Media job scheduler for the micro-lesson pipeline.
+
+Saving a video lesson no longer queues Celery work directly, and nothing is
+ever processed inside the web request. The Lesson post_save signal calls
+schedule_lesson(), which records MediaJob rows:
+
+- Jobs are unique per (lesson, kind, source hash). The hash covers only the
+  fields a job reads (the video source for compression, the text for the
+  summary), so reorders and unrelated edits find the existing job and
+  queue nothing. Content that returns to an earlier version re-arms that
+  version's SUPERSEDED or FAILED job, or, when it is what the last DONE job
+  produced, just cancels the pending work.
+- A new job is due MEDIA_JOB_DEBOUNCE_SECONDS after the save, and every
+  further save of the same content pushes that back, so a burst of saves
+  is processed once. A pending job for older content is SUPERSEDED by the
+  new one.
+- run_due() (Celery: run_media_jobs_task, kicked once per debounce window
+  after commit and swept by beat every minute) claims due jobs and runs
+  them. A failure is retried with exponential backoff up to
+  MEDIA_JOB_MAX_ATTEMPTS, and a lesson gets at most
+  MEDIA_JOB_LESSON_DAILY_ATTEMPTS attempts across its jobs per day, so a
+  broken source cannot keep the workers busy.
+- queue_stats() feeds the admin media-jobs dashboard.
+"""
+import hashlib
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Min, Q, Sum
+from django.utils import timezone
+
+from .models import MediaJob, MicroLesson
+
+logger = logging.getLogger(__name__)
+
+KICK_KEY = 'media-jobs-kick'
+MAX_BACKOFF = 60 * 60           # seconds
+STALL_AFTER = timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT + 5 * 60)
+
+Kind = MediaJob.KindChoices
+Status = MediaJob.StatusChoices
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256('\x1f'.join(str(part or '') for part in parts).encode()).hexdigest()
+
+
+def source_hashes(lesson) -> dict:
+    """Hash of what each job kind reads from `lesson`."""
+    video = lesson.video_url or (lesson.video_file.name if lesson.video_file else '')
+    return {
+        Kind.COMPRESS: _digest(video, lesson.duration),
+        Kind.SUMMARY: _digest(lesson.title, lesson.description, lesson.content),
+    }
+
+
+# ─── Scheduling ───────────────────────────────────────────────────
+
+QUEUED = 'queued'          # the content needs (re)processing
+RESTORED = 'restored'      # the content went back to what was last processed
+
+
+def _supersede_pending(lesson, kind, keep=None):
+    jobs = MediaJob.objects.filter(lesson=lesson, kind=kind, status=Status.PENDING)
+    if keep is not None:
+        jobs = jobs.exclude(pk=keep.pk)
+    jobs.update(status=Status.SUPERSEDED, finished_at=timezone.now())
+
+
+def _last_done(lesson, kind):
+    return (
+        MediaJob.objects.filter(lesson=lesson, kind=kind, status=Status.DONE)
+        .order_by('-finished_at').first()
+    )
+
+
+def _schedule(lesson, kind, source_hash, run_after):
+    """
+    Make sure this source gets processed. Returns QUEUED when a job was
+    created or re-armed, RESTORED when the source is what the last DONE job
+    produced, and None when a job for it is already pending or running.
+    """
+    job = MediaJob.objects.filter(lesson=lesson, kind=kind, source_hash=source_hash).first()
+    if job is None:
+        _supersede_pending(lesson, kind)
+        try:
+            with transaction.atomic():
+                MediaJob.objects.create(lesson=lesson, kind=kind, source_hash=source_hash, run_after=run_after)
+        except IntegrityError:
+            return None     # a concurrent save created it
+        return QUEUED
+
+    if job.status in (Status.PENDING, Status.RUNNING):
+        _supersede_pending(lesson, kind, keep=job)
+        # Debounce: a further save of the same content pushes back a job that has not run yet.
+        if job.status == Status.PENDING and job.attempts == 0 and job.run_after < run_after:
+            job.run_after = run_after
+            job.save(update_fields=['run_after', 'updated_at'])
+        return None
+
+    running = MediaJob.objects.filter(lesson=lesson, kind=kind, status=Status.RUNNING).exists()
+    if job.status == Status.DONE and not running and _last_done(lesson, kind) == job:
+        # Edited back (e.g. A → B → A) before B was processed: A's output is still current.
+        _supersede_pending(lesson, kind)
+        return RESTORED
+
+    # SUPERSEDED, FAILED, or DONE but since (or about to be) overwritten by other content: run it again.
+    _supersede_pending(lesson, kind, keep=job)
+    job.status = Status.PENDING
+    job.attempts = 0
+    job.run_after = run_after
+    job.started_at = job.finished_at = None
+    job.last_error = ''
+    job.save(update_fields=['status', 'attempts', 'run_after', 'started_at', 'finished_at', 'last_error', 'updated_at'])
+    return QUEUED
+
+
+def schedule_lesson(lesson) -> dict:
+    """Queue the jobs `lesson`'s current content needs. Returns {kind: QUEUED or RESTORED} for the kinds affected."""
+    run_after = timezone.now() + timedelta(seconds=settings.MEDIA_JOB_DEBOUNCE_SECONDS)
+    outcomes = {}
+    for kind, source_hash in source_hashes(lesson).items():
+        outcome = _schedule(lesson, kind, source_hash, run_after)
+        if outcome is not None:
+            outcomes[kind] = outcome
+    transaction.on_commit(kick)
+    return outcomes
+
+
+def kick():
+    """Ask a worker to run the queue once the debounce window has passed (at most once per window)."""
+    delay = settings.MEDIA_JOB_DEBOUNCE_SECONDS
+    if not cache.add(KICK_KEY, 1, delay):
+        return
+    try:
+        from .tasks import run_media_jobs_task
+        run_media_jobs_task.apply_async(countdown=delay + 1, retry=False)
+    except Exception as e:
+        # The beat sweep runs the queue once the broker is back.
+        logger.warning(f"⚠️ Could not queue media jobs (Celery not running?): {e}")
+
+
+def retry_failed(lesson_ids=None) -> int:
+    """Put FAILED jobs back in the queue with a fresh retry budget."""
+    jobs = MediaJob.objects.filter(status=Status.FAILED)
+    if lesson_ids is not None:
+        jobs = jobs.filter(lesson_id__in=lesson_ids)
+    return jobs.update(status=Status.PENDING, attempts=0, run_after=timezone.now(), finished_at=None)
+
+
+# ─── Consumer ─────────────────────────────────────────────────────
+
+def _release_stalled(now) -> int:
+    """Jobs whose worker died mid-run go back to the queue."""
+    return MediaJob.objects.filter(status=Status.RUNNING, started_at__lt=now - STALL_AFTER).update(
+        status=Status.PENDING, run_after=now,
+    )
+
+
+def _claim(now, limit) -> list:
+    with transaction.atomic():
+        ids = list(
+            MediaJob.objects.select_for_update(skip_locked=True)
+            .filter(status=Status.PENDING, run_after__lte=now)
+            .order_by('run_after').values_list('pk', flat=True)[:limit]
+        )
+        MediaJob.objects.filter(pk__in=ids).update(
+            status=Status.RUNNING, started_at=now, attempts=F('attempts') + 1,
+        )
+    return ids
+
+
+def _backoff(attempts) -> timedelta:
+    delay = min(MAX_BACKOFF, settings.MEDIA_JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(1.0, 1.2))
+
+
+def _lesson_budget_spent(lesson_id) -> bool:
+    since = timezone.now() - timedelta(days=1)
+    spent = MediaJob.objects.filter(lesson_id=lesson_id, updated_at__gte=since).aggregate(
+        total=Sum('attempts'),
+    )['total'] or 0
+    return spent >= settings.MEDIA_JOB_LESSON_DAILY_ATTEMPTS
+
+
+def _fail(job, error):
+    now = timezone.now()
+    job.last_error = f'{type(error).__name__}: {error}'[:2000]
+    if job.attempts >= settings.MEDIA_JOB_MAX_ATTEMPTS or _lesson_budget_spent(job.lesson_id):
+        job.status = Status.FAILED
+        job.finished_at = now
+        logger.error(f"❌ Media job {job.kind} for lesson {job.lesson_id} failed for good: {job.last_error}")
+    else:
+        job.status = Status.PENDING
+        job.run_after = now + _backoff(job.attempts)
+        logger.warning(f"⚠️ Media job {job.kind} for lesson {job.lesson_id} failed (attempt {job.attempts}): {error}")
+    job.save(update_fields=['status', 'last_error', 'run_after', 'finished_at', 'updated_at'])
+
+
+def _execute(job_pk):
+    from .tasks import compress_micro_lesson, summarize_micro_lesson
+
+    job = MediaJob.objects.select_related('lesson').get(pk=job_pk)
+    lesson = job.lesson
+    if lesson.is_deleted or source_hashes(lesson)[job.kind] != job.source_hash:
+        # Edited or deleted since it was queued; the newer job (if any) does the work.
+        job.status = Status.SUPERSEDED
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+        return job.status
+
+    micro_lesson, _ = MicroLesson.objects.get_or_create(lesson=lesson)
+    micro_lesson.lesson = lesson
+    processor = compress_micro_lesson if job.kind == Kind.COMPRESS else summarize_micro_lesson
+    try:
+        processor(micro_lesson)
+    except Exception as e:
+        _fail(job, e)
+        return job.status
+
+    job.status = Status.DONE
+    job.finished_at = timezone.now()
+    job.last_error = ''
+    job.save(update_fields=['status', 'finished_at', 'last_error', 'updated_at'])
+    return job.status
+
+
+def run_due(limit=None) -> dict:
+    """Run the jobs that are due. Returns how many ended in each status."""
+    now = timezone.now()
+    released = _release_stalled(now)
+    if released:
+        logger.warning(f"⚠️ Re-queued {released} stalled media jobs")
+
+    results = {}
+    for job_pk in _claim(now, limit or settings.MEDIA_JOB_BATCH_SIZE):
+        status = str(_execute(job_pk))
+        results[status] = results.get(status, 0) + 1
+    return results
+
+
+# ─── Dashboard ────────────────────────────────────────────────────
+
+def queue_stats() -> dict:
+    """Queue depth, throughput and recent failures for the admin dashboard."""
+    now = timezone.now()
+    hour_ago, day_ago = now - timedelta(hours=1), now - timedelta(days=1)
+    pending = Q(status=Status.PENDING)
+
+    depth = MediaJob.objects.aggregate(
+        due=Count('pk', filter=pending & Q(run_after__lte=now)),
+        waiting=Count('pk', filter=pending & Q(run_after__gt=now)),
+        retrying=Count('pk', filter=pending & Q(attempts__gt=0)),
+        running=Count('pk', filter=Q(status=Status.RUNNING)),
+        oldest_due=Min('run_after', filter=pending & Q(run_after__lte=now)),
+    )
+    oldest_due = depth.pop('oldest_due')
+    depth['oldest_due_seconds'] = round((now - oldest_due).total_seconds()) if oldest_due else 0
+
+    finished = MediaJob.objects.filter(finished_at__gte=day_ago)
+    throughput = finished.aggregate(
+        done_last_hour=Count('pk', filter=Q(status=Status.DONE, finished_at__gte=hour_ago)),
+        done_last_day=Count('pk', filter=Q(status=Status.DONE)),
+        failed_last_day=Count('pk', filter=Q(status=Status.FAILED)),
+        superseded_last_day=Count('pk', filter=Q(status=Status.SUPERSEDED)),
+        avg_run=Avg(
+            ExpressionWrapper(F('finished_at') - F('started_at'), output_field=DurationField()),
+            filter=Q(status=Status.DONE),
+        ),
+    )
+    avg_run = throughput.pop('avg_run')
+    throughput['avg_run_seconds'] = round(avg_run.total_seconds(), 2) if avg_run else None
+
+    by_kind = {}
+    for row in MediaJob.objects.values('kind', 'status').annotate(n=Count('pk')).order_by():
+        by_kind.setdefault(row['kind'], {})[row['status']] = row['n']
+
+    failures = [
+        {
+            'id': job.id,
+            'lesson_id': job.lesson_id,
+            'lesson_title': job.lesson.title,
+            'kind': job.kind,
+            'attempts': job.attempts,
+            'last_error': job.last_error,
+            'finished_at': job.finished_at,
+        }
+        for job in MediaJob.objects.filter(status=Status.FAILED)
+        .select_related('lesson').order_by('-finished_at')[:10]
+    ]
+    return {'queue': depth, 'throughput': throughput, 'by_kind': by_kind, 'recent_failures': failures}
@@ -0,0 +1,93 @@
+# Generated by Django 5.1.15 on 2026-10-19 18:09
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0005_lesson_rank_ordering"),
+        ("offline", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("compress", "Compress video"),
+                            ("summary", "Generate summary"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "source_hash",
+                    models.CharField(
+                        help_text="Hash of the lesson content this job processes.",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                            ("superseded", "Superseded"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("run_after", models.DateTimeField()),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "lesson",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="media_jobs",
+                        to="lessons.lesson",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "media_jobs",
+                "ordering": ["run_after"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "run_after"],
+                        name="media_jobs_status_5464f1_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("lesson", "kind", "source_hash"),
+                        name="uniq_media_job_source",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@
 Offline Mode Models
 - MicroLesson: Bite-sized, compressed version of a lesson for offline consumption.
 - OfflineDownload: Tracks which students have downloaded which micro-lessons.
+- MediaJob: Queued compression/summary work for a micro-lesson (see apps.offline.media_jobs).
 """
 from django.conf import settings
 from django.db import models
@@ -167,3 +168,55 @@ class OfflineDownload(TimeStampedModel):
 
     def __str__(self):
         return f"{self.student.name} → {self.micro_lesson.lesson.title}"
+
+
+class MediaJob(TimeStampedModel):
+    """
+    One unit of micro-lesson processing for a lesson's source content.
+    Unique per (lesson, kind, source hash), so saving a lesson again without
+    changing its video or text never queues the work twice.
+    """
+
+    class KindChoices(models.TextChoices):
+        COMPRESS = 'compress', 'Compress video'
+        SUMMARY = 'summary', 'Generate summary'
+
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'                 # gave up after the retry limit
+        SUPERSEDED = 'superseded', 'Superseded'     # the lesson changed again before it ran
+
+    lesson = models.ForeignKey(
+        'lessons.Lesson',
+        on_delete=models.CASCADE,
+        related_name='media_jobs',
+    )
+    kind = models.CharField(max_length=20, choices=KindChoices.choices)
+    source_hash = models.CharField(max_length=64, help_text='Hash of the lesson content this job processes.')
+    status = models.CharField(
+        max_length=20,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+        db_index=True,
+    )
+    # Not run before this time: pushed back by each save (debounce) and by retries (backoff)
+    run_after = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'media_jobs'
+        ordering = ['run_after']
+        constraints = [
+            models.UniqueConstraint(fields=['lesson', 'kind', 'source_hash'], name='uniq_media_job_source'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.lesson_id} [{self.status}]"
@@ -4,27 +4,23 @@ Compresses lesson videos into mobile-optimized versions for offline download.
 Uses Cloudinary's built-in video transformation for compression.
 """
 import logging
+from datetime import timedelta
 
 from celery import shared_task
-from django.utils import timezone
+
+from apps.core.sweeps import Sweep
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def compress_lesson_video(self, micro_lesson_id):
+def compress_micro_lesson(micro_lesson):
     """
-    Compress a lesson video and update the MicroLesson record.
+    Compress the lesson video and update the MicroLesson record.
     Uses Cloudinary transformations for server-side compression.
+    Raises on failure (after marking the micro-lesson FAILED).
     """
     from apps.offline.models import MicroLesson
 
-    try:
-        micro_lesson = MicroLesson.objects.select_related('lesson').get(id=micro_lesson_id)
-    except MicroLesson.DoesNotExist:
-        logger.error(f"MicroLesson {micro_lesson_id} not found.")
-        return
-
     # Mark as processing
     micro_lesson.compression_status = MicroLesson.CompressionStatus.PROCESSING
     micro_lesson.save(update_fields=['compression_status', 'updated_at'])
@@ -75,6 +71,23 @@ def compress_lesson_video(self, micro_lesson_id):
         micro_lesson.compression_status = MicroLesson.CompressionStatus.FAILED
         micro_lesson.save(update_fields=['compression_status', 'updated_at'])
         logger.error(f"Compression failed for lesson '{lesson.title}': {exc}")
+        raise
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def compress_lesson_video(self, micro_lesson_id):
+    """Compress one micro-lesson's video now (lesson saves go through apps.offline.media_jobs)."""
+    from apps.offline.models import MicroLesson
+
+    try:
+        micro_lesson = MicroLesson.objects.select_related('lesson').get(id=micro_lesson_id)
+    except MicroLesson.DoesNotExist:
+        logger.error(f"MicroLesson {micro_lesson_id} not found.")
+        return
+
+    try:
+        compress_micro_lesson(micro_lesson)
+    except Exception as exc:
         raise self.retry(exc=exc)
 
 
@@ -124,19 +137,11 @@ def _estimate_file_size(url):
     return 15 * 1024 * 1024
 
 
-@shared_task
-def generate_micro_lesson_summary(micro_lesson_id):
+def summarize_micro_lesson(micro_lesson):
     """
     Generate a text summary for a micro-lesson from the lesson content.
     This is a simple extraction — can be enhanced with AI later.
     """
-    from apps.offline.models import MicroLesson
-
-    try:
-        micro_lesson = MicroLesson.objects.select_related('lesson').get(id=micro_lesson_id)
-    except MicroLesson.DoesNotExist:
-        return
-
     lesson = micro_lesson.lesson
     summary_parts = []
 
@@ -157,22 +162,69 @@ def generate_micro_lesson_summary(micro_lesson_id):
         logger.info(f"Summary generated for micro-lesson: {lesson.title}")
 
 
+@shared_task
+def generate_micro_lesson_summary(micro_lesson_id):
+    """Summarise one micro-lesson now (lesson saves go through apps.offline.media_jobs)."""
+    from apps.offline.models import MicroLesson
+
+    try:
+        micro_lesson = MicroLesson.objects.select_related('lesson').get(id=micro_lesson_id)
+    except MicroLesson.DoesNotExist:
+        return
+
+    summarize_micro_lesson(micro_lesson)
+
+
+@shared_task
+def run_media_jobs_task():
+    """Run the due micro-lesson media jobs (see apps.offline.media_jobs)."""
+    from .media_jobs import run_due
+
+    results = run_due()
+    if results:
+        logger.info(f"🎬 Media jobs: {results}")
+    return results
+
+
+def _requeue_micro_lessons(batch):
+    from .media_jobs import retry_failed, schedule_lesson
+
+    micro_lessons = list(batch.select_related('lesson'))
+    retry_failed([ml.lesson_id for ml in micro_lessons])
+    for ml in micro_lessons:
+        schedule_lesson(ml.lesson)
+    return len(micro_lessons)
+
+
+PENDING_MICRO_LESSONS = Sweep(
+    'pending_micro_lessons',
+    'offline.MicroLesson',
+    where=lambda now: {'compression_status__in': ['pending', 'failed']},
+    action=_requeue_micro_lessons,
+    batch_size=100,
+)
+
+FINISHED_MEDIA_JOBS = Sweep(
+    'finished_media_jobs',
+    'offline.MediaJob',
+    where=lambda now: {
+        'status__in': ['done', 'superseded', 'failed'],
+        'finished_at__lt': now - timedelta(days=30),
+    },
+)
+
+
 @shared_task
 def recompress_all_pending():
     """
-    Utility task to retry compression for all pending/failed micro-lessons.
+    Queue compression for all pending/failed micro-lessons through the media
+    job scheduler (failed jobs get a fresh retry budget), in batches.
     Can be scheduled as a periodic Celery Beat task.
     """
-    from apps.offline.models import MicroLesson
-
-    pending = MicroLesson.objects.filter(
-        compression_status__in=[
-            MicroLesson.CompressionStatus.PENDING,
-            MicroLesson.CompressionStatus.FAILED,
-        ]
-    ).values_list('id', flat=True)
+    return PENDING_MICRO_LESSONS.run()
 
-    for ml_id in pending:
-        compress_lesson_video.delay(str(ml_id))
 
-    logger.info(f"Queued {len(pending)} micro-lessons for (re)compression.")
+@shared_task
+def purge_finished_media_jobs():
+    """Delete media jobs that finished more than 30 days ago."""
+    return FINISHED_MEDIA_JOBS.run()
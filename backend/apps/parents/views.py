@@ -8,7 +8,7 @@ from .serializers import (
     StudentLinkRequestSerializer, 
     WeeklyReportSerializer
 )
-from apps.courses.models import Course
+from apps.progress.reports import student_report
 from apps.students.views import StudentKnowledgeGraphView
 from apps.students.serializers import StudentCourseSerializer
 
@@ -179,13 +179,10 @@ class ChildEnrolledCoursesView(BaseParentView):
         # Ensure student is linked to this parent
         child = get_object_or_404(parent.children, id=student_id)
         
-        from apps.enrollments.models import Enrollment
-        enrolled_ids = Enrollment.objects.filter(
-            student=child, is_active=True
-        ).values_list('course_id', flat=True)
-        
-        courses = Course.objects.filter(id__in=enrolled_ids).select_related('teacher')
-        serializer = StudentCourseSerializer(courses, many=True, context={'request': request})
+        # Progress is the child's, read from their shared course report.
+        report = student_report(child)
+        courses = [course.course for course in report.courses]
+        serializer = StudentCourseSerializer(courses, many=True, context={'request': request, 'report': report})
         return Response({'success': True, 'data': serializer.data})
 
 
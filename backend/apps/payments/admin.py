@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Payment
+from .models import Payment, StripeEvent
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
@@ -7,3 +7,11 @@ class PaymentAdmin(admin.ModelAdmin):
     list_filter = ('status', 'payment_method', 'currency')
     search_fields = ('student__name', 'course__title', 'stripe_payment_intent_id')
     readonly_fields = ('stripe_payment_intent_id', 'stripe_charge_id')
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ('event_id', 'event_type', 'customer_key', 'status', 'attempts', 'stripe_created', 'processed_at')
+    list_filter = ('status', 'event_type')
+    search_fields = ('event_id', 'customer_key')
+    readonly_fields = ('event_id', 'event_type', 'customer_key', 'stripe_created', 'payload', 'processed_at')
@@ -0,0 +1,144 @@
+"""
+Generate signed fake Stripe webhook deliveries for load tests.
+
+    python manage.py fake_stripe_events --count 2000 --customers 100 --duplicates 0.2
+    python manage.py fake_stripe_events --url http://localhost:8000/api/v1/payments/webhook/
+    python manage.py fake_stripe_events --count 500 --process
+
+Each event is a checkout.session.completed for a random student and
+course from the database, signed with STRIPE_WEBHOOK_SECRET exactly like
+Stripe signs it, so it passes the real verification. A share of events is
+delivered twice to exercise the inbox's de-duplication. Deliveries go
+through Django's test client in-process, or over HTTP with --url. The
+report shows ack latency; --process then drains the inbox inline and
+reports the consumer's throughput.
+"""
+import hashlib
+import hmac
+import json
+import random
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from apps.courses.models import Course
+from apps.payments.models import StripeEvent
+from apps.payments.webhooks import process_customer
+from apps.users.models import User
+
+WEBHOOK_PATH = '/api/v1/payments/webhook/'
+
+
+def sign(payload: bytes, secret: str, timestamp=None) -> str:
+    """Stripe-Signature header value for `payload`."""
+    timestamp = int(timestamp or time.time())
+    signed = f'{timestamp}.'.encode() + payload
+    digest = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+
+def fake_checkout_event(student_id, course_id, amount_cents, created):
+    return {
+        'id': f'evt_fake_{uuid.uuid4().hex[:24]}',
+        'object': 'event',
+        'type': 'checkout.session.completed',
+        'created': created,
+        'livemode': False,
+        'data': {'object': {
+            'id': f'cs_test_{uuid.uuid4().hex[:24]}',
+            'object': 'checkout.session',
+            'amount_total': amount_cents,
+            'currency': 'usd',
+            'customer': None,
+            'payment_intent': f'pi_fake_{uuid.uuid4().hex[:24]}',
+            'payment_status': 'paid',
+            'metadata': {'student_id': str(student_id), 'course_id': str(course_id)},
+        }},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Send signed fake Stripe webhook events to the webhook endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000, help='distinct events to generate')
+        parser.add_argument('--customers', type=int, default=50, help='students the events are spread over')
+        parser.add_argument('--duplicates', type=float, default=0.1, help='share of events delivered twice')
+        parser.add_argument('--url', help='POST to a running server instead of the in-process test client')
+        parser.add_argument('--process', action='store_true', help='drain the inbox inline afterwards')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        students = list(User.objects.filter(role='student', is_active=True).values_list('id', flat=True)[:options['customers']])
+        courses = list(Course.objects.filter(is_deleted=False).values_list('id', 'price'))
+        if not students or not courses:
+            raise CommandError('Need students and courses; run seed_synthetic first.')
+
+        now = int(time.time())
+        events = [
+            fake_checkout_event(rng.choice(students), *self._course(rng.choice(courses)), now + i)
+            for i in range(options['count'])
+        ]
+        deliveries = events + rng.sample(events, int(len(events) * options['duplicates']))
+        rng.shuffle(deliveries)
+
+        send = self._http_sender(options['url']) if options['url'] else self._client_sender()
+        before = StripeEvent.objects.count()
+        latencies, failures = [], 0
+        started = time.perf_counter()
+        for event in deliveries:
+            payload = json.dumps(event).encode()
+            t = time.perf_counter()
+            status_code = send(payload, sign(payload, settings.STRIPE_WEBHOOK_SECRET))
+            latencies.append((time.perf_counter() - t) * 1000)
+            failures += status_code != 200
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        self.stdout.write(
+            f'Delivered {len(deliveries)} ({len(events)} distinct) in {elapsed:.1f}s: '
+            f'{len(deliveries) / elapsed:.0f}/s, ack p50 {statistics.median(latencies):.1f} ms, '
+            f'p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms, {failures} non-200'
+        )
+        if not options['url']:
+            self.stdout.write(f'Inbox grew by {StripeEvent.objects.count() - before} events')
+
+        if options['process']:
+            keys = set(
+                StripeEvent.objects.filter(event_id__in=[e['id'] for e in events])
+                .values_list('customer_key', flat=True)
+            )
+            started = time.perf_counter()
+            applied = sum(process_customer(key) for key in keys)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'Applied {applied} events for {len(keys)} customers in {elapsed:.1f}s '
+                              f'({applied / max(elapsed, 1e-9):.0f}/s)')
+
+    def _course(self, course):
+        course_id, price = course
+        return course_id, int(price * 100)
+
+    def _client_sender(self):
+        client = Client()
+
+        def send(payload, signature):
+            return client.post(
+                WEBHOOK_PATH, payload, content_type='application/json', HTTP_STRIPE_SIGNATURE=signature,
+            ).status_code
+        return send
+
+    def _http_sender(self, url):
+        import requests
+        session = requests.Session()
+
+        def send(payload, signature):
+            return session.post(
+                url, data=payload, timeout=10,
+                headers={'Content-Type': 'application/json', 'Stripe-Signature': signature},
+            ).status_code
+        return send
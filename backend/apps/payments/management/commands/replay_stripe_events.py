@@ -0,0 +1,91 @@
+"""
+Put Stripe webhook events back into the inbox queue.
+
+    python manage.py replay_stripe_events                       # every FAILED event
+    python manage.py replay_stripe_events evt_1 evt_2 --sync    # specific events, applied inline
+    python manage.py replay_stripe_events --status processed --since 2026-01-01
+    python manage.py replay_stripe_events --from-stripe --since 2026-01-01   # then replays pending
+
+Selected events are reset to PENDING with a fresh retry budget and their
+customers are queued (or drained inline with --sync). Re-applying a
+processed event is safe: the handlers only complete pending payments and
+upsert enrollments. --from-stripe first pulls the account's events since
+--since from the Stripe API into the inbox, recovering deliveries that
+never reached us; events already stored are left alone.
+"""
+import json
+from datetime import datetime, time as dt_time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.payments.models import StripeEvent
+from apps.payments.webhooks import enqueue, process_customer, record_event
+
+
+class Command(BaseCommand):
+    help = 'Re-queue Stripe webhook events from the inbox (or fetch missed ones from Stripe).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', help='replay only these event ids')
+        parser.add_argument('--status', action='append', choices=StripeEvent.StatusChoices.values,
+                            help='statuses to replay (repeatable, default: failed)')
+        parser.add_argument('--since', help='only events created by Stripe at or after this date/time')
+        parser.add_argument('--customer', help='only events of this customer key')
+        parser.add_argument('--from-stripe', action='store_true', help='pull missed events from the Stripe API first')
+        parser.add_argument('--sync', action='store_true', help='apply inline instead of queueing Celery tasks')
+
+    def handle(self, *args, **options):
+        since = self._parse_since(options['since'])
+        if options['from_stripe']:
+            if since is None:
+                raise CommandError('--from-stripe needs --since.')
+            self.stdout.write(f'Fetched {self._fetch(since)} new events from Stripe')
+
+        events = StripeEvent.objects.all()
+        if options['event_ids']:
+            events = events.filter(event_id__in=options['event_ids'])
+        else:
+            # Freshly fetched events are pending; otherwise the dead letters.
+            default = StripeEvent.StatusChoices.PENDING if options['from_stripe'] else StripeEvent.StatusChoices.FAILED
+            events = events.filter(status__in=options['status'] or [default])
+        if since is not None:
+            events = events.filter(stripe_created__gte=since)
+        if options['customer']:
+            events = events.filter(customer_key=options['customer'])
+
+        keys = set(events.values_list('customer_key', flat=True))
+        reset = events.update(
+            status=StripeEvent.StatusChoices.PENDING, attempts=0, last_error='',
+            processed_at=None, updated_at=timezone.now(),
+        )
+        self.stdout.write(f'Replaying {reset} events for {len(keys)} customers')
+
+        for key in sorted(keys):
+            if options['sync']:
+                self.stdout.write(f'  {key}: {process_customer(key)} applied')
+            else:
+                enqueue(key)
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _parse_since(self, value):
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None and parse_date(value) is not None:
+            parsed = datetime.combine(parse_date(value), dt_time.min)
+        if parsed is None:
+            raise CommandError(f'Invalid --since value: {value}')
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    def _fetch(self, since):
+        import stripe
+        stripe.api_key = settings.STRIPE_SECRET_KEY
+
+        created = 0
+        listing = stripe.Event.list(created={'gte': int(since.timestamp())}, limit=100)
+        for event in listing.auto_paging_iter():
+            created += record_event(json.loads(str(event)))
+        return created
@@ -64,3 +64,43 @@ class Payment(TimeStampedModel):
 
     def __str__(self):
         return f"{self.student.name} - {self.course.title} ({self.amount} {self.currency}) [{self.status}]"
+
+
+class StripeEvent(TimeStampedModel):
+    """
+    Webhook inbox: every verified Stripe event, stored once per event id
+    before it is acknowledged and applied later by the Celery consumer
+    (see apps.payments.webhooks).
+    """
+
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSED = 'processed', 'Processed'
+        SKIPPED = 'skipped', 'Skipped'      # event type without a handler
+        FAILED = 'failed', 'Failed'         # gave up after the retry limit
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    # Events of one customer are applied in order (see apps.payments.webhooks.customer_key)
+    customer_key = models.CharField(max_length=255, db_index=True)
+    stripe_created = models.DateTimeField(help_text='Event creation time reported by Stripe')
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=20,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+        db_index=True,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'stripe_webhook_events'
+        ordering = ['stripe_created']
+        indexes = [
+            models.Index(fields=['customer_key', 'status', 'stripe_created']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} ({self.event_type}) [{self.status}]"
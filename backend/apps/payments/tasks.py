@@ -0,0 +1,27 @@
+"""
+Celery tasks for the Stripe webhook inbox (see apps.payments.webhooks).
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_stripe_events_task(customer_key):
+    """Apply one customer's pending Stripe events in order."""
+    from .webhooks import process_customer
+
+    return {'customer': customer_key, 'processed': process_customer(customer_key)}
+
+
+@shared_task
+def dispatch_stripe_events_task():
+    """Queue every customer that still has pending Stripe events."""
+    from .webhooks import dispatch_pending
+
+    customers = dispatch_pending()
+    if customers:
+        logger.info(f"💳 Queued pending Stripe events for {customers} customers")
+    return {'customers': customers}
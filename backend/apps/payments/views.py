@@ -17,6 +17,7 @@ from apps.progress.models import CourseProgress
 
 from .models import Payment
 from .serializers import CreateCheckoutSerializer, PaymentSerializer
+from .webhooks import customer_key, enqueue, record_event
 
 logger = logging.getLogger(__name__)
 
@@ -129,78 +130,30 @@ class CreateCheckoutView(APIView):
 class StripeWebhookView(APIView):
     """
     POST /api/v1/payments/webhook/
-    Handles Stripe webhook events.
+    Verifies a Stripe event, stores it in the webhook inbox and acks.
+    The event is applied asynchronously (see apps.payments.webhooks).
     """
     permission_classes = [AllowAny]
+    # Authenticated by signature; Stripe's delivery rate must not hit the anon limit.
+    throttle_classes = []
 
     def post(self, request):
         import json
         try:
             import stripe
-            stripe.api_key = settings.STRIPE_SECRET_KEY
             endpoint_secret = settings.STRIPE_WEBHOOK_SECRET
 
             sig_header = request.META.get('HTTP_STRIPE_SIGNATURE', '')
             payload = request.body
 
             try:
-                event = stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
+                stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
             except (ValueError, stripe.error.SignatureVerificationError):
                 return Response(status=status.HTTP_400_BAD_REQUEST)
 
-            if event['type'] == 'checkout.session.completed':
-                session = event['data']['object']
-                student_id = session['metadata']['student_id']
-                course_id = session['metadata']['course_id']
-
-                # Update payment
-                payment = Payment.objects.filter(
-                    student_id=student_id,
-                    course_id=course_id,
-                    status='pending',
-                ).first()
-
-                if payment:
-                    payment.status = 'completed'
-                    payment.stripe_payment_intent_id = session.get('payment_intent', '')
-                    payment.save()
-
-                # Create enrollment
-                enrollment, _ = Enrollment.objects.get_or_create(
-                    student_id=student_id, course_id=course_id,
-                    defaults={'is_active': True},
-                )
-                if not enrollment.is_active:
-                    enrollment.is_active = True
-                    enrollment.save()
-
-                CourseProgress.objects.get_or_create(
-                    student_id=student_id, course_id=course_id,
-                    defaults={'progress_percentage': 0},
-                )
-
-                # 🔔 Notify student about payment completion
-                try:
-                    from apps.notifications.utils import create_notification
-                    from apps.notifications.models import Notification
-                    from apps.users.models import User
-                    from apps.courses.models import Course
-                    
-                    student = User.objects.get(id=student_id)
-                    course = Course.objects.get(id=course_id)
-                    
-                    create_notification(
-                        user=student,
-                        title=f"Payment Successful: {course.title}",
-                        body=f"Your payment was successful and you are now enrolled in {course.title}. Happy learning!",
-                        notification_type=Notification.TypeChoices.ENROLLMENT,
-                        data={'course_id': str(course.id), 'payment_status': 'completed'}
-                    )
-                except Exception as e:
-                    logger.error(f"Payment Notification Failure: {e}")
-
-                logger.info(f"Payment completed: student={student_id}, course={course_id}")
-
+            event = json.loads(payload)
+            if record_event(event):
+                enqueue(customer_key(event))
             return Response({'received': True})
 
         except ImportError:
@@ -0,0 +1,201 @@
+"""
+Stripe webhook inbox.
+
+The webhook endpoint only verifies the signature, stores the event in the
+StripeEvent inbox and acks. The inbox is keyed by Stripe's event id, so
+retries and duplicate deliveries are no-ops. Events are applied later by
+Celery:
+
+- process_customer() applies one customer's pending events strictly in
+  Stripe's creation order. An event's effects and its PROCESSED mark are
+  committed in one transaction with the event row locked, so the effects
+  land exactly once even when workers race or a task is retried.
+  Notifications go out after that commit.
+- A failing event stays PENDING and holds back the customer's later events
+  until it succeeds; after MAX_ATTEMPTS it is marked FAILED and the queue
+  moves on. `manage.py replay_stripe_events` puts events back in the queue.
+- dispatch_pending() (beat, every minute) re-queues customers that still
+  have pending events, which covers retries and broker outages at ingest.
+"""
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Payment, StripeEvent
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+LOCK_TIMEOUT = 5 * 60       # seconds one worker may own a customer's queue
+
+
+def customer_key(event) -> str:
+    """Ordering key: our student id, else the Stripe customer, else the event itself."""
+    obj = event['data']['object']
+    metadata = obj.get('metadata') or {}
+    return str(metadata.get('student_id') or obj.get('customer') or event['id'])
+
+
+# ─── Ingestion ────────────────────────────────────────────────────
+
+def record_event(event) -> bool:
+    """Store a verified event (the decoded JSON body). False if it was already stored."""
+    _, created = StripeEvent.objects.get_or_create(
+        event_id=event['id'],
+        defaults={
+            'event_type': event['type'],
+            'customer_key': customer_key(event),
+            'stripe_created': datetime.fromtimestamp(event['created'], tz=dt_timezone.utc),
+            'payload': event,
+        },
+    )
+    return created
+
+
+def enqueue(key):
+    try:
+        from .tasks import process_stripe_events_task
+        process_stripe_events_task.apply_async(args=[key], retry=False)
+    except Exception as e:
+        # The beat sweep picks the event up once the broker is back.
+        logger.warning(f"⚠️ Could not queue Stripe events for {key}: {e}")
+
+
+def dispatch_pending() -> int:
+    keys = list(
+        StripeEvent.objects.filter(status=StripeEvent.StatusChoices.PENDING)
+        .values_list('customer_key', flat=True).distinct()
+    )
+    for key in keys:
+        enqueue(key)
+    return len(keys)
+
+
+# ─── Consumer ─────────────────────────────────────────────────────
+
+def _apply(event_pk) -> bool:
+    """Apply one event. False if it failed and must hold back the customer's queue."""
+    with transaction.atomic():
+        event = StripeEvent.objects.select_for_update().get(pk=event_pk)
+        if event.status != StripeEvent.StatusChoices.PENDING:
+            return True
+        handler = HANDLERS.get(event.event_type)
+        event.attempts += 1
+        try:
+            with transaction.atomic():
+                if handler:
+                    handler(event.payload)
+        except Exception as e:
+            event.last_error = f'{type(e).__name__}: {e}'[:2000]
+            if event.attempts >= MAX_ATTEMPTS:
+                event.status = StripeEvent.StatusChoices.FAILED
+                logger.error(f"❌ Stripe event {event.event_id} failed for good: {event.last_error}")
+            else:
+                logger.warning(f"⚠️ Stripe event {event.event_id} failed (attempt {event.attempts}): {e}")
+            event.save(update_fields=['attempts', 'last_error', 'status', 'updated_at'])
+            return event.status == StripeEvent.StatusChoices.FAILED
+
+        event.status = StripeEvent.StatusChoices.PROCESSED if handler else StripeEvent.StatusChoices.SKIPPED
+        event.processed_at = timezone.now()
+        event.last_error = ''
+        event.save(update_fields=['attempts', 'last_error', 'status', 'processed_at', 'updated_at'])
+    return True
+
+
+def _drain(key):
+    processed = 0
+    while True:
+        event_pk = (
+            StripeEvent.objects.filter(customer_key=key, status=StripeEvent.StatusChoices.PENDING)
+            .order_by('stripe_created', 'created_at').values_list('pk', flat=True).first()
+        )
+        if event_pk is None:
+            return processed, False
+        if not _apply(event_pk):
+            return processed, True
+        processed += 1
+
+
+def process_customer(key) -> int:
+    """Apply a customer's pending events in order. Returns how many were applied."""
+    lock = f'stripe-inbox-lock:{key}'
+    processed = 0
+    while cache.add(lock, 1, LOCK_TIMEOUT):
+        try:
+            count, blocked = _drain(key)
+            processed += count
+        finally:
+            cache.delete(lock)
+        # An event stored while the lock was held was not picked up by its own task.
+        if blocked or not StripeEvent.objects.filter(
+            customer_key=key, status=StripeEvent.StatusChoices.PENDING,
+        ).exists():
+            break
+    return processed
+
+
+# ─── Handlers ─────────────────────────────────────────────────────
+
+def _notify_payment(student, course):
+    try:
+        from apps.notifications.models import Notification
+        from apps.notifications.utils import create_notification
+
+        create_notification(
+            user=student,
+            title=f"Payment Successful: {course.title}",
+            body=f"Your payment was successful and you are now enrolled in {course.title}. Happy learning!",
+            notification_type=Notification.TypeChoices.ENROLLMENT,
+            data={'course_id': str(course.id), 'payment_status': 'completed'},
+        )
+    except Exception as e:
+        logger.error(f"Payment Notification Failure: {e}")
+
+
+def _checkout_completed(event):
+    from apps.courses.models import Course
+    from apps.enrollments.models import Enrollment
+    from apps.progress.models import CourseProgress
+    from apps.users.models import User
+
+    session = event['data']['object']
+    student_id = session['metadata']['student_id']
+    course_id = session['metadata']['course_id']
+
+    payment = (
+        Payment.objects.select_for_update(of=('self',)).select_related('student', 'course')
+        .filter(student_id=student_id, course_id=course_id, status=Payment.StatusChoices.PENDING)
+        .first()
+    )
+    if payment:
+        payment.status = Payment.StatusChoices.COMPLETED
+        payment.stripe_payment_intent_id = session.get('payment_intent') or ''
+        payment.save(update_fields=['status', 'stripe_payment_intent_id', 'updated_at'])
+        student, course = payment.student, payment.course
+    else:
+        student, course = User.objects.get(id=student_id), Course.objects.get(id=course_id)
+
+    enrollment, _ = Enrollment.objects.get_or_create(
+        student=student, course=course,
+        defaults={'is_active': True},
+    )
+    if not enrollment.is_active:
+        enrollment.is_active = True
+        enrollment.save()
+
+    CourseProgress.objects.get_or_create(
+        student=student, course=course,
+        defaults={'progress_percentage': 0},
+    )
+
+    # 🔔 Notify student about payment completion
+    transaction.on_commit(lambda: _notify_payment(student, course))
+    logger.info(f"Payment completed: student={student_id}, course={course_id}")
+
+
+HANDLERS = {
+    'checkout.session.completed': _checkout_completed,
+}
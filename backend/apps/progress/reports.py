@@ -0,0 +1,152 @@
+"""
+Per-student course report: progress, lessons and best quiz attempts for
+every course a student is actively enrolled in.
+
+build_student_report() reads everything in a fixed five queries however
+many courses, lessons or attempts there are:
+
+    enrollments (+ course, teacher) · course progress · lessons ·
+    lesson progress · best attempt per quiz
+
+The best attempt per quiz is picked in the database with a ROW_NUMBER()
+window partitioned by quiz (highest score, then most recent), instead of
+one ORDER BY ... LIMIT 1 query per quiz.
+
+student_report() caches the report under the student's tag and the tags of
+their courses (see apps.core.signals), so the teacher drill-down and the
+parent views share one copy that is dropped whenever the student's
+progress, attempts or enrollments, or a course's lessons, change.
+"""
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from apps.core.cache import get_or_compute, make_key, tag
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.quizzes.models import QuizAttempt
+
+from .models import CourseProgress, LessonProgress
+
+
+class CourseReport:
+    """One enrolled course of a StudentReport."""
+
+    def __init__(self, course, enrolled_at, progress_percentage, lessons, quizzes):
+        self.course = course
+        self.enrolled_at = enrolled_at
+        self.progress_percentage = progress_percentage
+        self.lessons = lessons      # [{id, title, is_completed, time_spent, last_accessed}]
+        self.quizzes = quizzes      # best attempt per quiz: [{id, quiz_id, quiz_title, score, passed, attempted_at}]
+
+    @property
+    def total_lessons(self):
+        return len(self.lessons)
+
+    @property
+    def completed_lessons(self):
+        return sum(1 for lesson in self.lessons if lesson['is_completed'])
+
+    def as_dict(self):
+        return {
+            'id': self.course.id,
+            'title': self.course.title,
+            'progress_percentage': self.progress_percentage,
+            'enrolled_at': self.enrolled_at,
+            'lessons': self.lessons,
+            'quizzes': self.quizzes,
+        }
+
+
+class StudentReport:
+    """A student's CourseReports, in enrollment order."""
+
+    def __init__(self, student_id, courses):
+        self.student_id = student_id
+        self.courses = courses
+        self._by_id = {report.course.id: report for report in courses}
+
+    def course(self, course_id):
+        return self._by_id.get(course_id)
+
+    def for_teacher(self, teacher_id, course_id=None):
+        """The reports of courses taught by `teacher_id` (optionally just `course_id`)."""
+        return [
+            report for report in self.courses
+            if report.course.teacher_id == teacher_id
+            and (course_id is None or str(report.course.id) == str(course_id))
+        ]
+
+
+def build_student_report(student) -> StudentReport:
+    enrollments = list(
+        Enrollment.objects.filter(student=student, is_active=True, course__is_deleted=False)
+        .select_related('course__teacher').order_by('enrolled_at')
+    )
+    course_ids = [enrollment.course_id for enrollment in enrollments]
+
+    progress = dict(
+        CourseProgress.objects.filter(student=student, course_id__in=course_ids)
+        .values_list('course_id', 'progress_percentage')
+    )
+    lesson_progress = {
+        lp.lesson_id: lp
+        for lp in LessonProgress.objects.filter(student=student, lesson__course_id__in=course_ids)
+        .only('lesson_id', 'completed', 'time_spent', 'updated_at')
+    }
+    lessons = {course_id: [] for course_id in course_ids}
+    for lesson in (
+        Lesson.objects.filter(course_id__in=course_ids)
+        .only('id', 'course_id', 'title', 'sequence_number').order_by('sequence_number')
+    ):
+        lp = lesson_progress.get(lesson.id)
+        lessons[lesson.course_id].append({
+            'id': lesson.id,
+            'title': lesson.title,
+            'is_completed': lp.completed if lp else False,
+            'time_spent': lp.time_spent if lp else 0,
+            'last_accessed': lp.updated_at if lp else None,
+        })
+
+    quizzes = {course_id: [] for course_id in course_ids}
+    best_attempts = (
+        QuizAttempt.objects.filter(student=student, quiz__course_id__in=course_ids)
+        .annotate(rank=Window(
+            RowNumber(), partition_by=[F('quiz_id')], order_by=[F('score').desc(), F('created_at').desc()],
+        ))
+        .filter(rank=1)
+        .select_related('quiz')
+        .order_by('-created_at')
+    )
+    for attempt in best_attempts:
+        quizzes[attempt.quiz.course_id].append({
+            'id': attempt.id,
+            'quiz_id': attempt.quiz_id,
+            'quiz_title': attempt.quiz.title,
+            'score': attempt.percentage,
+            'passed': attempt.passed,
+            'attempted_at': attempt.created_at,
+        })
+
+    seen = set()
+    courses = []
+    for enrollment in enrollments:
+        if enrollment.course_id in seen:
+            continue
+        seen.add(enrollment.course_id)
+        courses.append(CourseReport(
+            enrollment.course, enrollment.enrolled_at, progress.get(enrollment.course_id, 0.0),
+            lessons[enrollment.course_id], quizzes[enrollment.course_id],
+        ))
+    return StudentReport(student.pk, courses)
+
+
+def student_report(student) -> StudentReport:
+    """The cached StudentReport of `student` (built on a miss)."""
+    course_ids = Enrollment.objects.filter(student=student, is_active=True).values_list('course_id', flat=True)
+    tags = [tag('student', student.pk), *(tag('course', course_id) for course_id in course_ids)]
+    return get_or_compute(
+        make_key('student-report', student.pk),
+        lambda: build_student_report(student),
+        timeout='student_report',
+        tags=tags,
+    )
@@ -0,0 +1,141 @@
+"""
+Adaptive quiz sessions.
+
+A session asks one question at a time. After each answer the ability
+estimate is updated and the next item is the one best matched to it,
+shifted by the student's current EmotionDetector difficulty adjustment.
+The session stops when the standard error reaches the quiz's target, the
+question budget is spent or the pool runs out. It is then stored as a
+regular QuizAttempt, so history, badges and item analysis keep working.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .grading import answer_mask, claim_attempt, record_attempt
+from .irt import difficulty_shift, estimate_ability, mastery_probability, next_question
+from .item_analysis import record_item_responses
+from .models import AdaptiveQuizSession, QuizAttempt, StudentAbility
+
+STUDENT_FIELDS = ('id', 'question_text', 'option_a', 'option_b', 'option_c', 'option_d',
+                  'sequence_number', 'options')
+
+
+def _student_payload(answer_key, question_id):
+    for question in answer_key['questions']:
+        if str(question['id']) == question_id:
+            return {field: question[field] for field in STUDENT_FIELDS}
+    return None
+
+
+def _current_adaptation(student_id):
+    from apps.ai_tutor.state_cache import get_state
+    state = get_state(student_id)
+    return state['last_adaptation'] if state else None
+
+
+def _progress(session, answer_key):
+    return {
+        'answered': len(session.items),
+        'max_questions': answer_key['adaptive_max_questions'],
+        'ability': round(session.theta, 3),
+        'standard_error': round(session.standard_error, 3),
+        'mastery_probability': round(mastery_probability(session.theta, session.standard_error), 3),
+    }
+
+
+def _pick_next(session, answer_key):
+    asked = {item['question_id'] for item in session.items}
+    target = session.theta + difficulty_shift(_current_adaptation(session.student_id))
+    entry = next_question(answer_key['irt_index'], target, asked)
+    return entry[1] if entry else None
+
+
+def start_session(student, answer_key):
+    """Resume the student's active session for this quiz or open a new one."""
+    session = (
+        AdaptiveQuizSession.objects
+        .filter(student=student, quiz_id=answer_key['quiz_id'], status=AdaptiveQuizSession.StatusChoices.ACTIVE)
+        .first()
+    )
+    if session is None:
+        ability = StudentAbility.objects.filter(student=student, course_id=answer_key['course_id']).first()
+        prior = ability.theta if ability else 0.0
+        session = AdaptiveQuizSession(
+            student=student, quiz_id=answer_key['quiz_id'],
+            prior_theta=prior, theta=prior, standard_error=1.0,
+        )
+        session.current_question_id = _pick_next(session, answer_key)
+        session.save()
+    return session
+
+
+def session_state(session, answer_key):
+    data = {
+        'session_id': str(session.pk),
+        'status': session.status,
+        'progress': _progress(session, answer_key),
+        'question': None,
+    }
+    if session.current_question_id:
+        data['question'] = _student_payload(answer_key, str(session.current_question_id))
+    if session.attempt_id:
+        data['attempt_id'] = str(session.attempt_id)
+    return data
+
+
+def submit_answer(session, answer_key, answer, recent_attempts):
+    """
+    Grade the current question, update θ and either advance or finish the
+    session. Finishing raises AttemptLimitReached if the limit was used up meanwhile.
+    """
+    masks = dict(answer_key['masks'])
+    params = {qid: (a, b) for b, qid, a in answer_key['irt_index']['items']}
+    question_id = str(session.current_question_id)
+    mask = answer_mask(answer)
+    session.items.append({
+        'question_id': question_id,
+        'answer': answer,
+        'mask': mask,
+        'correct': mask == masks.get(question_id),
+    })
+
+    answered = [
+        (*params[item['question_id']], item['correct'])
+        for item in session.items if item['question_id'] in params
+    ]
+    session.theta, session.standard_error = estimate_ability(answered, session.prior_theta)
+
+    done = (
+        session.standard_error <= answer_key['adaptive_target_se']
+        or len(session.items) >= answer_key['adaptive_max_questions']
+    )
+    session.current_question_id = None if done else _pick_next(session, answer_key)
+    if session.current_question_id is None:
+        _complete(session, answer_key, recent_attempts)
+    else:
+        session.save(update_fields=['items', 'theta', 'standard_error', 'current_question', 'updated_at'])
+    return session
+
+
+def _complete(session, answer_key, recent_attempts):
+    graded = [(item['question_id'], item['mask'], item['correct']) for item in session.items]
+    with transaction.atomic():
+        claim_attempt(session.student_id, answer_key['quiz_id'])
+        attempt = QuizAttempt.objects.create(
+            quiz_id=answer_key['quiz_id'],
+            student_id=session.student_id,
+            score=sum(1 for _, _, correct in graded if correct),
+            total_questions=len(graded),
+            answers={item['question_id']: item['answer'] for item in session.items},
+            time_taken=int((timezone.now() - session.created_at).total_seconds()),
+        )
+        record_item_responses(attempt, graded)
+        session.status = AdaptiveQuizSession.StatusChoices.COMPLETED
+        session.attempt = attempt
+        session.completed_at = timezone.now()
+        session.save()
+        StudentAbility.objects.update_or_create(
+            student_id=session.student_id, course_id=answer_key['course_id'],
+            defaults={'theta': session.theta, 'standard_error': session.standard_error},
+        )
+    record_attempt(session.student_id, answer_key['quiz_id'], recent_attempts, attempt.completed_at)
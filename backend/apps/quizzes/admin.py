@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Quiz, QuizAttempt, QuizQuestion
+from .models import AdaptiveQuizSession, QuestionStats, Quiz, QuizAttempt, QuizQuestion, StudentAbility
 
 class QuestionInline(admin.TabularInline):
     model = QuizQuestion
@@ -8,7 +8,7 @@ class QuestionInline(admin.TabularInline):
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
     list_display = ('title', 'course', 'question_count', 'duration', 'passing_score', 'is_published')
-    list_filter = ('is_published', 'course__category')
+    list_filter = ('is_published', 'is_adaptive', 'course__category')
     search_fields = ('title', 'course__title')
     inlines = [QuestionInline]
 
@@ -17,3 +17,20 @@ class QuizAttemptAdmin(admin.ModelAdmin):
     list_display = ('student', 'quiz', 'score', 'total_questions', 'percentage', 'passed', 'completed_at')
     list_filter = ('quiz__course',)
     search_fields = ('student__name', 'quiz__title')
+
+@admin.register(QuestionStats)
+class QuestionStatsAdmin(admin.ModelAdmin):
+    list_display = ('question', 'quiz', 'responses', 'correct_rate', 'discrimination', 'recomputed_at')
+    search_fields = ('quiz__title', 'question__question_text')
+    readonly_fields = [f.name for f in QuestionStats._meta.fields]
+
+@admin.register(StudentAbility)
+class StudentAbilityAdmin(admin.ModelAdmin):
+    list_display = ('student', 'course', 'theta', 'standard_error', 'responses', 'updated_at')
+    search_fields = ('student__name', 'course__title')
+
+@admin.register(AdaptiveQuizSession)
+class AdaptiveQuizSessionAdmin(admin.ModelAdmin):
+    list_display = ('student', 'quiz', 'status', 'theta', 'standard_error', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('student__name', 'quiz__title')
@@ -0,0 +1,139 @@
+"""
+Quiz grading backed by a compiled, cached answer key.
+
+Each question's correct answer ("a" or "a,c,d") is compiled once into a
+bitmask over options A–D, so grading a submission is a single pass of
+integer comparisons with no DB reads. The compiled key lives in the shared
+cache under the quiz's tag and is rebuilt whenever the quiz or one of its
+questions changes (see apps.core.signals).
+
+The 24-hour attempt limit is pre-checked in the cache: a short list of
+recent attempt timestamps per (student, quiz), seeded from the DB on a miss,
+turns away spent students without a query. The cached list is not updated
+atomically, so claim_attempt() enforces the limit for real inside the
+transaction that saves the attempt: it locks the student's row and
+re-counts the window, so concurrent submits are serialised and cannot all
+pass.
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.cache import get_or_compute, make_key, tag
+
+from .models import Quiz, QuizAttempt
+from .serializers import QuizQuestionWithAnswerSerializer
+
+OPTION_BITS = {'a': 1, 'b': 2, 'c': 4, 'd': 8}
+INVALID_OPTION = 16     # anything outside A–D never matches a valid key
+
+ATTEMPTS_PER_DAY = 3
+ATTEMPT_WINDOW = 24 * 60 * 60
+ATTEMPT_LIMIT_MESSAGE = 'You have used all 3 attempts for today. Mission will renew in 24 hours.'
+ANSWER_KEY_TIMEOUT = 60 * 60
+
+
+def answer_mask(raw: str) -> int:
+    """'b, a' -> 0b0011. Order, case and whitespace do not matter."""
+    mask = 0
+    for token in raw.lower().split(','):
+        token = token.strip()
+        if token:
+            mask |= OPTION_BITS.get(token, INVALID_OPTION)
+    return mask
+
+
+# ─── Compiled Answer Key ──────────────────────────────────────────
+
+def _compile(quiz_id):
+    from .irt import build_item_index
+    from .item_analysis import ensure_stats_rows
+
+    quiz = Quiz.objects.prefetch_related('questions').get(id=quiz_id)
+    questions = list(quiz.questions.all())
+    # Every compile follows a question change, so new questions get their stats row here.
+    ensure_stats_rows(quiz.pk, [q.pk for q in questions])
+    return {
+        'quiz_id': quiz.pk,
+        'title': quiz.title,
+        'passing_score': quiz.passing_score,
+        'is_published': quiz.is_published,
+        'is_adaptive': quiz.is_adaptive,
+        'course_id': quiz.course_id,
+        'adaptive_max_questions': quiz.adaptive_max_questions,
+        'adaptive_target_se': quiz.adaptive_target_se,
+        'irt_index': build_item_index(questions),
+        'masks': [(str(q.pk), answer_mask(q.correct_answer)) for q in questions],
+        # Pre-rendered for the result screen, so a submit never re-reads questions.
+        'questions': [dict(q) for q in QuizQuestionWithAnswerSerializer(questions, many=True).data],
+    }
+
+
+def get_answer_key(quiz_id) -> dict:
+    """Compiled answer key for a quiz. Raises Quiz.DoesNotExist."""
+    return get_or_compute(
+        make_key('quiz-answer-key', quiz_id),
+        lambda: _compile(quiz_id),
+        timeout=ANSWER_KEY_TIMEOUT,
+        tags=[tag('quiz', quiz_id)],
+    )
+
+
+def grade_responses(answer_key: dict, submitted: dict) -> list:
+    """[(question_id, submitted_mask, is_correct)] in one pass over the key."""
+    graded = []
+    for question_id, key_mask in answer_key['masks']:
+        mask = answer_mask(submitted.get(question_id, ''))
+        graded.append((question_id, mask, mask == key_mask))
+    return graded
+
+
+def grade(answer_key: dict, submitted: dict) -> int:
+    """Number of questions whose submitted option set equals the key."""
+    return sum(1 for _, _, correct in grade_responses(answer_key, submitted) if correct)
+
+
+# ─── Attempt Limit ────────────────────────────────────────────────
+
+def _attempts_key(student_id, quiz_id):
+    return f'quiz-attempts:{quiz_id}:{student_id}'
+
+
+def recent_attempt_times(student_id, quiz_id) -> list:
+    """Epoch timestamps of this student's attempts on the quiz within the window."""
+    cutoff = time.time() - ATTEMPT_WINDOW
+    times = cache.get(_attempts_key(student_id, quiz_id))
+    if times is None:
+        since = timezone.now() - timedelta(seconds=ATTEMPT_WINDOW)
+        times = [
+            completed_at.timestamp()
+            for completed_at in QuizAttempt.objects.filter(
+                student_id=student_id, quiz_id=quiz_id, completed_at__gte=since,
+            ).values_list('completed_at', flat=True)
+        ]
+        cache.set(_attempts_key(student_id, quiz_id), times, ATTEMPT_WINDOW)
+    return [t for t in times if t > cutoff]
+
+
+class AttemptLimitReached(Exception):
+    """Raised by claim_attempt() when the student has no attempt left in the window."""
+
+
+def claim_attempt(student_id, quiz_id):
+    """
+    Authoritative limit check; call inside the transaction that creates the
+    attempt. Raises AttemptLimitReached.
+    """
+    get_user_model().objects.select_for_update().filter(pk=student_id).values_list('pk', flat=True).first()
+    since = timezone.now() - timedelta(seconds=ATTEMPT_WINDOW)
+    used = QuizAttempt.objects.filter(student_id=student_id, quiz_id=quiz_id, completed_at__gte=since).count()
+    if used >= ATTEMPTS_PER_DAY:
+        raise AttemptLimitReached()
+
+
+def record_attempt(student_id, quiz_id, times, completed_at):
+    """Write-through after an attempt is saved; `times` is what recent_attempt_times returned."""
+    cache.set(_attempts_key(student_id, quiz_id), [*times, completed_at.timestamp()], ATTEMPT_WINDOW)
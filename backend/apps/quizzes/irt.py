@@ -0,0 +1,209 @@
+"""
+Adaptive testing with a two-parameter logistic (2PL) IRT model.
+
+    P(correct | θ) = 1 / (1 + exp(-a · (θ - b)))
+
+- calibrate_course() fits every question's difficulty b and discrimination a,
+  plus each student's ability θ, from the stored QuestionResponse rows of a
+  course. It is a vectorised joint MAP fit (diagonal Newton steps with weak
+  normal priors) over the whole response table at once.
+- estimate_ability() updates θ after every adaptive answer: an EAP estimate
+  over a fixed θ grid, seeded with the student's calibrated ability.
+- next_question() serves the unanswered item whose difficulty is closest to
+  the target θ by bisecting the difficulty-sorted index stored in the
+  compiled answer key, so no question rows are read per step.
+"""
+import logging
+import math
+from bisect import bisect_left
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.cache import invalidate_tags, tag
+
+from .models import QuestionResponse, QuizQuestion, StudentAbility
+
+logger = logging.getLogger(__name__)
+
+MIN_ITEM_RESPONSES = 30     # items with fewer responses keep their current parameters
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-3
+THETA_PRIOR_SD = 1.0
+DIFFICULTY_PRIOR_SD = 2.0
+LOG_DISCRIMINATION_PRIOR_SD = 0.5
+PARAM_LIMIT = 4.0
+
+THETA_GRID = np.linspace(-4, 4, 81)
+MASTERY_THETA = 0.0         # ability at which a student counts as having mastered the material
+ADJUSTMENT_SCALE = 60.0     # difficulty_adjustment of ±30% shifts the target by ±0.5 logits
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+# ─── Calibration ──────────────────────────────────────────────────
+
+def fit_2pl(person_idx, item_idx, correct, n_persons, n_items):
+    """
+    Joint MAP fit of the 2PL model on a sparse response table.
+    Returns (theta, theta_se, difficulty, discrimination) as NumPy arrays.
+    """
+    y = correct.astype(np.float64)
+    theta = np.zeros(n_persons)
+    b = np.zeros(n_items)
+    log_a = np.zeros(n_items)
+
+    for _ in range(MAX_ITERATIONS):
+        a = np.exp(log_a)
+        p = _sigmoid(a[item_idx] * (theta[person_idx] - b[item_idx]))
+        residual = y - p
+        weight = p * (1 - p)
+
+        # θ step
+        grad = np.bincount(person_idx, residual * a[item_idx], n_persons) - theta / THETA_PRIOR_SD ** 2
+        info = np.bincount(person_idx, weight * a[item_idx] ** 2, n_persons) + 1 / THETA_PRIOR_SD ** 2
+        theta_step = grad / info
+        theta = np.clip(theta + theta_step, -PARAM_LIMIT, PARAM_LIMIT)
+
+        # b and log(a) steps use the refreshed θ
+        diff = theta[person_idx] - b[item_idx]
+        p = _sigmoid(a[item_idx] * diff)
+        residual = y - p
+        weight = p * (1 - p)
+
+        grad_b = -np.bincount(item_idx, residual * a[item_idx], n_items) - b / DIFFICULTY_PRIOR_SD ** 2
+        info_b = np.bincount(item_idx, weight * a[item_idx] ** 2, n_items) + 1 / DIFFICULTY_PRIOR_SD ** 2
+        grad_la = np.bincount(item_idx, residual * a[item_idx] * diff, n_items) - log_a / LOG_DISCRIMINATION_PRIOR_SD ** 2
+        info_la = (np.bincount(item_idx, weight * (a[item_idx] * diff) ** 2, n_items)
+                   + 1 / LOG_DISCRIMINATION_PRIOR_SD ** 2)
+        b_step, la_step = grad_b / info_b, grad_la / info_la
+        b = np.clip(b + b_step, -PARAM_LIMIT, PARAM_LIMIT)
+        log_a = np.clip(log_a + la_step, -1.5, 1.5)
+
+        if max(np.abs(theta_step).max(initial=0), np.abs(b_step).max(initial=0),
+               np.abs(la_step).max(initial=0)) < TOLERANCE:
+            break
+
+    a = np.exp(log_a)
+    p = _sigmoid(a[item_idx] * (theta[person_idx] - b[item_idx]))
+    info = np.bincount(person_idx, p * (1 - p) * a[item_idx] ** 2, n_persons) + 1 / THETA_PRIOR_SD ** 2
+    return theta, 1 / np.sqrt(info), b, a
+
+
+def calibrate_course(course_id) -> dict:
+    """Fit item parameters and student abilities for all quizzes of a course."""
+    rows = list(
+        QuestionResponse.objects.filter(quiz__course_id=course_id)
+        .values_list('attempt__student_id', 'question_id', 'is_correct')
+    )
+    if not rows:
+        return {'items': 0, 'students': 0, 'responses': 0}
+
+    students, questions = {}, {}
+    person_idx = np.fromiter((students.setdefault(r[0], len(students)) for r in rows), np.int64, len(rows))
+    item_idx = np.fromiter((questions.setdefault(r[1], len(questions)) for r in rows), np.int64, len(rows))
+    correct = np.fromiter((r[2] for r in rows), bool, len(rows))
+
+    theta, theta_se, b, a = fit_2pl(person_idx, item_idx, correct, len(students), len(questions))
+    item_counts = np.bincount(item_idx, minlength=len(questions))
+    person_counts = np.bincount(person_idx, minlength=len(students))
+
+    now = timezone.now()
+    calibrated = [
+        QuizQuestion(
+            pk=qid, irt_difficulty=round(float(b[i]), 4),
+            irt_discrimination=round(float(a[i]), 4), irt_calibrated_at=now,
+        )
+        for qid, i in questions.items() if item_counts[i] >= MIN_ITEM_RESPONSES
+    ]
+    abilities = [
+        StudentAbility(
+            student_id=sid, course_id=course_id, theta=round(float(theta[i]), 4),
+            standard_error=round(float(theta_se[i]), 4), responses=int(person_counts[i]),
+        )
+        for sid, i in students.items()
+    ]
+    with transaction.atomic():
+        QuizQuestion.objects.bulk_update(
+            calibrated, ['irt_difficulty', 'irt_discrimination', 'irt_calibrated_at'], batch_size=500,
+        )
+        StudentAbility.objects.bulk_create(
+            abilities, batch_size=500, update_conflicts=True,
+            unique_fields=['student', 'course'],
+            update_fields=['theta', 'standard_error', 'responses', 'updated_at'],
+        )
+
+    # bulk_update skips signals: rebuild the compiled keys (and their item index).
+    quiz_ids = set(QuizQuestion.objects.filter(pk__in=[q.pk for q in calibrated]).values_list('quiz_id', flat=True))
+    invalidate_tags(*(tag('quiz', qid) for qid in quiz_ids))
+    logger.info(
+        f"📐 IRT calibration for course {course_id}: {len(calibrated)}/{len(questions)} items, "
+        f"{len(students)} students, {len(rows)} responses"
+    )
+    return {'items': len(calibrated), 'students': len(students), 'responses': len(rows)}
+
+
+# ─── Ability Estimation ───────────────────────────────────────────
+
+def estimate_ability(items, prior_theta=0.0):
+    """
+    EAP estimate of θ and its standard error from answered items.
+    `items` is a list of (discrimination, difficulty, correct).
+    """
+    log_post = -0.5 * ((THETA_GRID - prior_theta) / THETA_PRIOR_SD) ** 2
+    if items:
+        a = np.array([i[0] for i in items])[:, None]
+        b = np.array([i[1] for i in items])[:, None]
+        y = np.array([i[2] for i in items], dtype=bool)[:, None]
+        p = np.clip(_sigmoid(a * (THETA_GRID[None, :] - b)), 1e-9, 1 - 1e-9)
+        log_post = log_post + np.where(y, np.log(p), np.log(1 - p)).sum(axis=0)
+    weights = np.exp(log_post - log_post.max())
+    weights /= weights.sum()
+    theta = float((THETA_GRID * weights).sum())
+    se = float(np.sqrt(((THETA_GRID - theta) ** 2 * weights).sum()))
+    return theta, se
+
+
+def mastery_probability(theta, se, cutoff=MASTERY_THETA):
+    """P(true θ > cutoff) under a normal approximation of the posterior."""
+    return 0.5 * (1 + math.erf((theta - cutoff) / (max(se, 1e-6) * math.sqrt(2))))
+
+
+# ─── Item Selection ───────────────────────────────────────────────
+
+def build_item_index(questions) -> dict:
+    """Difficulty-sorted item index stored in the compiled answer key."""
+    items = sorted((q.irt_difficulty, str(q.pk), q.irt_discrimination) for q in questions)
+    return {'b': [item[0] for item in items], 'items': items}
+
+
+def next_question(index, target_theta, asked):
+    """
+    (b, question_id, a) of the unasked item whose difficulty is closest to
+    target_theta. Bisection finds the neighbourhood in O(log n); the outward
+    walk only steps over items that were already asked.
+    """
+    difficulties, items = index['b'], index['items']
+    right = bisect_left(difficulties, target_theta)
+    left = right - 1
+    while left >= 0 or right < len(items):
+        left_gap = target_theta - difficulties[left] if left >= 0 else math.inf
+        right_gap = difficulties[right] - target_theta if right < len(items) else math.inf
+        if left_gap <= right_gap:
+            candidate, left = items[left], left - 1
+        else:
+            candidate, right = items[right], right + 1
+        if candidate[1] not in asked:
+            return candidate
+    return None
+
+
+def difficulty_shift(adaptation) -> float:
+    """Map EmotionDetector's difficulty_adjustment (-30..+30 %) onto θ."""
+    try:
+        return float((adaptation or {}).get('difficulty_adjustment', 0)) / ADJUSTMENT_SCALE
+    except (TypeError, ValueError):
+        return 0.0
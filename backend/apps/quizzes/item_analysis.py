@@ -0,0 +1,227 @@
+"""
+Per-question item analysis: correct rates, distractor frequencies and
+discrimination indices.
+
+QuizSubmitView records every attempt through record_item_responses(),
+which stores the parsed responses and bumps the QuestionStats totals with
+one UPDATE. recompute_quiz_stats() rebuilds those totals from the stored
+responses with NumPy (and backfills responses for attempts made before
+this existed); it runs nightly and on demand from the teacher endpoint.
+"""
+import logging
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.utils import timezone
+
+from .grading import OPTION_BITS, answer_mask
+from .models import QuestionResponse, QuestionStats, QuizAttempt, QuizQuestion
+
+logger = logging.getLogger(__name__)
+
+EASY_THRESHOLD = 0.9
+HARD_THRESHOLD = 0.2
+LOW_DISCRIMINATION = 0.2
+MIN_RESPONSES = 20      # below this the statistics are too noisy to flag
+
+
+def ensure_stats_rows(quiz_id, question_ids):
+    QuestionStats.objects.bulk_create(
+        [QuestionStats(quiz_id=quiz_id, question_id=qid) for qid in question_ids],
+        ignore_conflicts=True,
+    )
+
+
+# ─── Incremental (submit time) ────────────────────────────────────
+
+def _bump(ids, then, default):
+    if not ids:
+        return default
+    output = FloatField() if isinstance(then.value, float) else IntegerField()
+    return Case(When(question_id__in=ids, then=then), default=default, output_field=output)
+
+
+def record_item_responses(attempt, graded):
+    """
+    Store parsed responses for `attempt` and fold them into QuestionStats.
+    `graded` is the output of grading.grade_responses().
+    """
+    if not graded:
+        return
+    QuestionResponse.objects.bulk_create([
+        QuestionResponse(
+            attempt=attempt, quiz_id=attempt.quiz_id, question_id=qid,
+            selected_mask=mask, is_correct=correct,
+        )
+        for qid, mask, correct in graded
+    ])
+
+    y = attempt.score / attempt.total_questions if attempt.total_questions else 0.0
+    ids = [qid for qid, _, _ in graded]
+    correct_ids = [qid for qid, _, correct in graded if correct]
+    blank_ids = [qid for qid, mask, _ in graded if mask == 0]
+    zero, zero_f = Value(0), Value(0.0)
+    option_updates = {
+        f'option_{option}': F(f'option_{option}') + _bump(
+            [qid for qid, mask, _ in graded if mask & bit], Value(1), zero,
+        )
+        for option, bit in OPTION_BITS.items()
+    }
+    QuestionStats.objects.filter(quiz_id=attempt.quiz_id, question_id__in=ids).update(
+        responses=F('responses') + 1,
+        correct=F('correct') + _bump(correct_ids, Value(1), zero),
+        blank=F('blank') + _bump(blank_ids, Value(1), zero),
+        score_sum=F('score_sum') + Value(y),
+        score_sq_sum=F('score_sq_sum') + Value(y * y),
+        correct_score_sum=F('correct_score_sum') + _bump(correct_ids, Value(y), zero_f),
+        updated_at=timezone.now(),
+        **option_updates,
+    )
+
+
+# ─── Batch Recompute (NumPy) ──────────────────────────────────────
+
+def backfill_responses(quiz_id, batch_size=500):
+    """Parse QuizAttempt.answers for attempts that predate QuestionResponse."""
+    keys = {
+        str(pk): answer_mask(correct_answer)
+        for pk, correct_answer in QuizQuestion.objects.filter(quiz_id=quiz_id).values_list('pk', 'correct_answer')
+    }
+    attempts = QuizAttempt.objects.filter(quiz_id=quiz_id, responses__isnull=True).values_list('pk', 'answers')
+    rows, created = [], 0
+    for attempt_id, answers in attempts.iterator(chunk_size=batch_size):
+        answers = answers if isinstance(answers, dict) else {}
+        for qid, key in keys.items():
+            mask = answer_mask(str(answers.get(qid, '')))
+            rows.append(QuestionResponse(
+                attempt_id=attempt_id, quiz_id=quiz_id, question_id=qid,
+                selected_mask=mask, is_correct=mask == key,
+            ))
+        if len(rows) >= batch_size:
+            created += len(QuestionResponse.objects.bulk_create(rows, ignore_conflicts=True))
+            rows = []
+    if rows:
+        created += len(QuestionResponse.objects.bulk_create(rows, ignore_conflicts=True))
+    return created
+
+
+def recompute_quiz_stats(quiz_id) -> int:
+    """
+    Rebuild every QuestionStats row of a quiz from its stored responses.
+    Builds an attempts × questions matrix of selected masks and derives all
+    totals with vectorised operations. Returns the number of attempts used.
+    """
+    backfill_responses(quiz_id)
+    question_ids = list(QuizQuestion.objects.filter(quiz_id=quiz_id).values_list('pk', flat=True))
+    if not question_ids:
+        return 0
+    ensure_stats_rows(quiz_id, question_ids)
+
+    rows = list(
+        QuestionResponse.objects.filter(quiz_id=quiz_id, question_id__in=question_ids)
+        .values_list('attempt_id', 'question_id', 'selected_mask', 'is_correct',
+                     'attempt__score', 'attempt__total_questions')
+    )
+    col = {qid: i for i, qid in enumerate(question_ids)}
+    attempt_index, scores = {}, []
+    for attempt_id, _, _, _, score, total in rows:
+        if attempt_id not in attempt_index:
+            attempt_index[attempt_id] = len(scores)
+            scores.append(score / total if total else 0.0)
+
+    shape = (len(scores), len(question_ids))
+    answered = np.zeros(shape, dtype=bool)
+    masks = np.zeros(shape, dtype=np.uint8)
+    correct = np.zeros(shape, dtype=bool)
+    if rows:
+        r = np.fromiter((attempt_index[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+        c = np.fromiter((col[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+        answered[r, c] = True
+        masks[r, c] = np.fromiter((row[2] for row in rows), dtype=np.uint8, count=len(rows))
+        correct[r, c] = np.fromiter((row[3] for row in rows), dtype=bool, count=len(rows))
+    y = np.asarray(scores, dtype=np.float64)[:, None]
+
+    responses = answered.sum(axis=0)
+    totals = {
+        'responses': responses,
+        'correct': correct.sum(axis=0),
+        'blank': (answered & (masks == 0)).sum(axis=0),
+        'score_sum': (answered * y).sum(axis=0),
+        'score_sq_sum': (answered * y * y).sum(axis=0),
+        'correct_score_sum': (correct * y).sum(axis=0),
+    }
+    for option, bit in OPTION_BITS.items():
+        totals[f'option_{option}'] = (answered & ((masks & bit) != 0)).sum(axis=0)
+
+    now = timezone.now()
+    stats = list(QuestionStats.objects.filter(quiz_id=quiz_id, question_id__in=question_ids))
+    for item in stats:
+        i = col[item.question_id]
+        for field, values in totals.items():
+            value = values[i]
+            setattr(item, field, float(value) if field.endswith('_sum') else int(value))
+        item.recomputed_at = now
+        item.updated_at = now
+    with transaction.atomic():
+        QuestionStats.objects.bulk_update(stats, [*totals, 'recomputed_at', 'updated_at'])
+    logger.info(f"📊 Item analysis recomputed for quiz {quiz_id}: {len(scores)} attempts")
+    return len(scores)
+
+
+# ─── Reporting ────────────────────────────────────────────────────
+
+def item_flags(stats):
+    if stats.responses < MIN_RESPONSES:
+        return []
+    flags = []
+    rate, discrimination = stats.correct_rate, stats.discrimination
+    if rate is not None and rate >= EASY_THRESHOLD:
+        flags.append('too_easy')
+    if rate is not None and rate <= HARD_THRESHOLD:
+        flags.append('too_hard')
+    if discrimination is not None and discrimination < 0:
+        flags.append('negative_discrimination')
+    elif discrimination is not None and discrimination < LOW_DISCRIMINATION:
+        flags.append('low_discrimination')
+    return flags
+
+
+def question_report(question, stats):
+    n = stats.responses if stats else 0
+    correct_mask = answer_mask(question.correct_answer)
+    options = {}
+    for option, bit in OPTION_BITS.items():
+        if not getattr(question, f'option_{option}', ''):
+            continue
+        count = getattr(stats, f'option_{option}') if stats else 0
+        options[option] = {
+            'count': count,
+            'rate': round(count / n, 4) if n else None,
+            'is_correct': bool(correct_mask & bit),
+        }
+    return {
+        'question_id': str(question.pk),
+        'sequence_number': question.sequence_number,
+        'question_text': question.question_text,
+        'correct_answer': question.correct_answer,
+        'responses': n,
+        'correct_rate': stats.correct_rate if stats else None,
+        'blank_rate': round(stats.blank / n, 4) if n else None,
+        'discrimination': stats.discrimination if stats else None,
+        'options': options,
+        'flags': item_flags(stats) if stats else [],
+        'recomputed_at': stats.recomputed_at if stats else None,
+    }
+
+
+def quiz_summary(stats_rows):
+    """Compact per-quiz roll-up used by list views."""
+    rates = [s.correct_rate for s in stats_rows if s.correct_rate is not None]
+    discriminations = [s.discrimination for s in stats_rows if s.discrimination is not None]
+    return {
+        'responses': max((s.responses for s in stats_rows), default=0),
+        'avg_correct_rate': round(sum(rates) / len(rates), 4) if rates else None,
+        'avg_discrimination': round(sum(discriminations) / len(discriminations), 4) if discriminations else None,
+        'flagged_questions': sum(1 for s in stats_rows if item_flags(s)),
+    }
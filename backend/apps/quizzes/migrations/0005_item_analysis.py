@@ -0,0 +1,120 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0004_alter_quizquestion_correct_answer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionStats",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("responses", models.PositiveIntegerField(default=0)),
+                ("correct", models.PositiveIntegerField(default=0)),
+                ("blank", models.PositiveIntegerField(default=0)),
+                ("option_a", models.PositiveIntegerField(default=0)),
+                ("option_b", models.PositiveIntegerField(default=0)),
+                ("option_c", models.PositiveIntegerField(default=0)),
+                ("option_d", models.PositiveIntegerField(default=0)),
+                ("score_sum", models.FloatField(default=0.0)),
+                ("score_sq_sum", models.FloatField(default=0.0)),
+                ("correct_score_sum", models.FloatField(default=0.0)),
+                ("recomputed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="quizzes.quizquestion",
+                    ),
+                ),
+                (
+                    "quiz",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="question_stats",
+                        to="quizzes.quiz",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Question stats",
+                "db_table": "quiz_question_stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="QuestionResponse",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "selected_mask",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        help_text="Selected options as bits: a=1, b=2, c=4, d=8 (0 = blank)",
+                    ),
+                ),
+                ("is_correct", models.BooleanField(default=False)),
+                (
+                    "attempt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="responses",
+                        to="quizzes.quizattempt",
+                    ),
+                ),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="responses",
+                        to="quizzes.quizquestion",
+                    ),
+                ),
+                (
+                    "quiz",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="responses",
+                        to="quizzes.quiz",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "quiz_question_responses",
+                "indexes": [
+                    models.Index(
+                        fields=["quiz", "question"],
+                        name="quiz_questi_quiz_id_4cea25_idx",
+                    )
+                ],
+                "unique_together": {("attempt", "question")},
+            },
+        ),
+    ]
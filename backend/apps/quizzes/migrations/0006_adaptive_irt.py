@@ -0,0 +1,171 @@
+# Generated by Django 5.1.15 on 2026-10-19 17:23
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0004_course_grade_level"),
+        ("quizzes", "0005_item_analysis"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="adaptive_max_questions",
+            field=models.PositiveIntegerField(default=15),
+        ),
+        migrations.AddField(
+            model_name="quiz",
+            name="adaptive_target_se",
+            field=models.FloatField(
+                default=0.35,
+                help_text="Stop once the ability standard error drops below this",
+            ),
+        ),
+        migrations.AddField(
+            model_name="quiz",
+            name="is_adaptive",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="quizquestion",
+            name="irt_calibrated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="quizquestion",
+            name="irt_difficulty",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="quizquestion",
+            name="irt_discrimination",
+            field=models.FloatField(default=1.0),
+        ),
+        migrations.CreateModel(
+            name="AdaptiveQuizSession",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("active", "Active"), ("completed", "Completed")],
+                        default="active",
+                        max_length=10,
+                    ),
+                ),
+                ("prior_theta", models.FloatField(default=0.0)),
+                ("theta", models.FloatField(default=0.0)),
+                ("standard_error", models.FloatField(default=1.0)),
+                (
+                    "items",
+                    models.JSONField(
+                        default=list,
+                        help_text='[{"question_id", "answer", "mask", "correct"}] in the order asked',
+                    ),
+                ),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "attempt",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="adaptive_session",
+                        to="quizzes.quizattempt",
+                    ),
+                ),
+                (
+                    "current_question",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="quizzes.quizquestion",
+                    ),
+                ),
+                (
+                    "quiz",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="adaptive_sessions",
+                        to="quizzes.quiz",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="adaptive_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "adaptive_quiz_sessions",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["student", "quiz", "status"],
+                        name="adaptive_qu_student_b742b8_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="StudentAbility",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("theta", models.FloatField(default=0.0)),
+                ("standard_error", models.FloatField(default=1.0)),
+                ("responses", models.PositiveIntegerField(default=0)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="student_abilities",
+                        to="courses.course",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="abilities",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "student_abilities",
+                "unique_together": {("student", "course")},
+            },
+        ),
+    ]
@@ -20,6 +20,14 @@ class Quiz(TimeStampedModel):
     is_published = models.BooleanField(default=False)
     max_attempts = models.PositiveIntegerField(default=0, help_text='0 = unlimited attempts')
 
+    # Adaptive mode: questions are served one at a time, chosen by IRT ability estimate
+    is_adaptive = models.BooleanField(default=False)
+    adaptive_max_questions = models.PositiveIntegerField(default=15)
+    adaptive_target_se = models.FloatField(
+        default=0.35,
+        help_text='Stop once the ability standard error drops below this',
+    )
+
     class Meta:
         db_table = 'quizzes'
         verbose_name = 'Quiz'
@@ -53,6 +61,11 @@ class QuizQuestion(TimeStampedModel):
     sequence_number = models.PositiveIntegerField(default=1)
     explanation = models.TextField(blank=True, default='', help_text='Explanation shown after answering')
 
+    # 2PL item parameters, fitted from historical responses (see apps.quizzes.irt)
+    irt_difficulty = models.FloatField(default=0.0)
+    irt_discrimination = models.FloatField(default=1.0)
+    irt_calibrated_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         db_table = 'quiz_questions'
         ordering = ['sequence_number']
@@ -110,3 +123,177 @@ class QuizAttempt(TimeStampedModel):
     @property
     def passed(self):
         return self.percentage >= self.quiz.passing_score
+
+
+class QuestionResponse(TimeStampedModel):
+    """
+    One question's answer within an attempt, parsed once at submit time so
+    item analysis never has to rescan QuizAttempt.answers.
+    """
+    attempt = models.ForeignKey(
+        QuizAttempt,
+        on_delete=models.CASCADE,
+        related_name='responses',
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.CASCADE,
+        related_name='responses',
+    )
+    question = models.ForeignKey(
+        QuizQuestion,
+        on_delete=models.CASCADE,
+        related_name='responses',
+    )
+    selected_mask = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Selected options as bits: a=1, b=2, c=4, d=8 (0 = blank)',
+    )
+    is_correct = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'quiz_question_responses'
+        unique_together = ['attempt', 'question']
+        indexes = [
+            models.Index(fields=['quiz', 'question']),
+        ]
+
+    def __str__(self):
+        return f"{self.attempt_id} - Q{self.question_id} ({'correct' if self.is_correct else 'wrong'})"
+
+
+class QuestionStats(TimeStampedModel):
+    """
+    Running item-analysis totals for one question, updated on every submit.
+
+    Alongside the response counters it keeps the sufficient statistics
+    for the point-biserial discrimination index: every attempt's score
+    fraction y, the sum of y², and the sum of y over correct answers.
+    """
+    question = models.OneToOneField(
+        QuizQuestion,
+        on_delete=models.CASCADE,
+        related_name='stats',
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.CASCADE,
+        related_name='question_stats',
+    )
+    responses = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    blank = models.PositiveIntegerField(default=0)
+    option_a = models.PositiveIntegerField(default=0)
+    option_b = models.PositiveIntegerField(default=0)
+    option_c = models.PositiveIntegerField(default=0)
+    option_d = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    score_sq_sum = models.FloatField(default=0.0)
+    correct_score_sum = models.FloatField(default=0.0)
+    recomputed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'quiz_question_stats'
+        verbose_name_plural = 'Question stats'
+
+    def __str__(self):
+        return f"Stats for {self.question_id} ({self.responses} responses)"
+
+    @property
+    def correct_rate(self):
+        return round(self.correct / self.responses, 4) if self.responses else None
+
+    @property
+    def discrimination(self):
+        """Point-biserial correlation between answering correctly and the attempt score."""
+        n, n1 = self.responses, self.correct
+        if n < 2 or n1 in (0, n):
+            return None
+        mean = self.score_sum / n
+        variance = self.score_sq_sum / n - mean * mean
+        if variance <= 1e-12:
+            return None
+        mean_correct = self.correct_score_sum / n1
+        mean_wrong = (self.score_sum - self.correct_score_sum) / (n - n1)
+        p = n1 / n
+        return round((mean_correct - mean_wrong) / variance ** 0.5 * (p * (1 - p)) ** 0.5, 4)
+
+
+class StudentAbility(TimeStampedModel):
+    """A student's IRT ability estimate (theta, logit scale) within a course."""
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='abilities',
+    )
+    course = models.ForeignKey(
+        'courses.Course',
+        on_delete=models.CASCADE,
+        related_name='student_abilities',
+    )
+    theta = models.FloatField(default=0.0)
+    standard_error = models.FloatField(default=1.0)
+    responses = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'student_abilities'
+        unique_together = ['student', 'course']
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.course_id}: θ={self.theta:.2f} ± {self.standard_error:.2f}"
+
+
+class AdaptiveQuizSession(TimeStampedModel):
+    """One adaptive run through a quiz; becomes a QuizAttempt when it finishes."""
+
+    class StatusChoices(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        COMPLETED = 'completed', 'Completed'
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='adaptive_sessions',
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.CASCADE,
+        related_name='adaptive_sessions',
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=StatusChoices.choices,
+        default=StatusChoices.ACTIVE,
+    )
+    prior_theta = models.FloatField(default=0.0)
+    theta = models.FloatField(default=0.0)
+    standard_error = models.FloatField(default=1.0)
+    current_question = models.ForeignKey(
+        QuizQuestion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    items = models.JSONField(
+        default=list,
+        help_text='[{"question_id", "answer", "mask", "correct"}] in the order asked',
+    )
+    attempt = models.OneToOneField(
+        QuizAttempt,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='adaptive_session',
+    )
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'adaptive_quiz_sessions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['student', 'quiz', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.quiz_id} ({self.status}, {len(self.items)} answered)"
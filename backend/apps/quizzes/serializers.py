@@ -53,7 +53,7 @@ class QuizListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'course', 'course_title',
             'duration', 'passing_score', 'is_published',
-            'question_count', 'max_attempts', 'created_at',
+            'question_count', 'max_attempts', 'is_adaptive', 'created_at',
         ]
 
 
@@ -68,7 +68,8 @@ class QuizDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'course', 'course_title',
             'duration', 'passing_score', 'is_published',
-            'question_count', 'max_attempts', 'questions',
+            'question_count', 'max_attempts', 'is_adaptive',
+            'adaptive_max_questions', 'adaptive_target_se', 'questions',
             'created_at', 'updated_at',
         ]
 
@@ -93,6 +94,7 @@ class QuizCreateSerializer(serializers.ModelSerializer):
         fields = [
             'course', 'title', 'description', 'duration',
             'passing_score', 'is_published', 'max_attempts', 'questions',
+            'is_adaptive', 'adaptive_max_questions', 'adaptive_target_se',
         ]
 
     def validate(self, attrs):
@@ -150,5 +152,8 @@ class QuizAttemptDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_questions(self, obj):
+        # QuizSubmitView passes the questions pre-rendered from the cached answer key.
+        if 'questions' in self.context:
+            return self.context['questions']
         questions = obj.quiz.questions.all()
         return QuizQuestionWithAnswerSerializer(questions, many=True).data
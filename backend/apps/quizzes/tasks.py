@@ -0,0 +1,64 @@
+"""
+Celery tasks for quiz item analysis and IRT calibration.
+"""
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def recompute_item_stats_task(quiz_id=None):
+    """
+    Rebuild QuestionStats with the NumPy batch pass. Without a quiz_id,
+    every quiz that received attempts in the last day is recomputed.
+    """
+    from .item_analysis import recompute_quiz_stats
+    from .models import QuizAttempt
+
+    if quiz_id:
+        quiz_ids = [quiz_id]
+    else:
+        since = timezone.now() - timedelta(days=1)
+        quiz_ids = list(
+            QuizAttempt.objects.filter(completed_at__gte=since)
+            .values_list('quiz_id', flat=True).distinct()
+        )
+
+    attempts = 0
+    for qid in quiz_ids:
+        try:
+            attempts += recompute_quiz_stats(qid)
+        except Exception as e:
+            logger.error(f"❌ Item analysis recompute failed for quiz {qid}: {e}")
+    return {'quizzes': len(quiz_ids), 'attempts': attempts}
+
+
+@shared_task
+def calibrate_irt_task(course_id=None):
+    """
+    Refit 2PL item parameters and student abilities. Without a course_id,
+    every course whose quizzes received attempts in the last day is refit.
+    """
+    from .irt import calibrate_course
+    from .models import QuizAttempt
+
+    if course_id:
+        course_ids = [course_id]
+    else:
+        since = timezone.now() - timedelta(days=1)
+        course_ids = list(
+            QuizAttempt.objects.filter(completed_at__gte=since)
+            .values_list('quiz__course_id', flat=True).distinct()
+        )
+
+    results = {}
+    for cid in course_ids:
+        try:
+            results[str(cid)] = calibrate_course(cid)
+        except Exception as e:
+            logger.error(f"❌ IRT calibration failed for course {cid}: {e}")
+    return results
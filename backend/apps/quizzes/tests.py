@@ -0,0 +1,130 @@
+"""
+Quiz grading: the compiled answer key and its invalidation, and the
+24-hour attempt limit enforced by claim_attempt() under the student's
+row lock (see apps.quizzes.grading).
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.courses.models import Course
+from apps.quizzes.grading import (
+    ATTEMPTS_PER_DAY,
+    AttemptLimitReached,
+    _attempts_key,
+    answer_mask,
+    claim_attempt,
+    get_answer_key,
+    grade,
+)
+from apps.quizzes.models import Quiz, QuizAttempt, QuizQuestion
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def student():
+    return User.objects.create_user(email='student@example.com', password='x', name='Student', role='student')
+
+
+@pytest.fixture
+def quiz():
+    teacher = User.objects.create_user(email='teacher@example.com', password='x', name='Teacher', role='teacher')
+    course = Course.objects.create(teacher=teacher, title='Algebra', is_published=True)
+    quiz = Quiz.objects.create(course=course, title='Quiz 1', is_published=True)
+    for i, answer in enumerate(['a', 'b,d'], start=1):
+        QuizQuestion.objects.create(
+            quiz=quiz, question_text=f'Q{i}', option_a='A', option_b='B', option_c='C', option_d='D',
+            correct_answer=answer, sequence_number=i,
+        )
+    return quiz
+
+
+def _question(quiz, text):
+    return str(QuizQuestion.objects.get(quiz=quiz, question_text=text).pk)
+
+
+def test_answer_mask_ignores_order_case_and_spacing():
+    assert answer_mask('b, a') == answer_mask('A,B') == 0b0011
+    assert answer_mask('') == 0
+    assert answer_mask('a,e') != answer_mask('a')
+
+
+# ─── Compiled Answer Key ──────────────────────────────────────────
+
+def test_answer_key_is_cached(quiz, django_assert_num_queries):
+    key = get_answer_key(quiz.pk)
+    with django_assert_num_queries(0):
+        assert get_answer_key(quiz.pk) == key
+
+    q1, q2 = _question(quiz, 'Q1'), _question(quiz, 'Q2')
+    assert grade(key, {q1: 'A', q2: 'd, b'}) == 2
+    assert grade(key, {q1: 'a', q2: 'b'}) == 1
+
+
+def test_answer_key_is_rebuilt_when_a_question_changes(quiz, django_capture_on_commit_callbacks):
+    q1 = _question(quiz, 'Q1')
+    assert grade(get_answer_key(quiz.pk), {q1: 'a'}) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        question = QuizQuestion.objects.get(pk=q1)
+        question.correct_answer = 'c'
+        question.save()
+
+    key = get_answer_key(quiz.pk)
+    assert grade(key, {q1: 'a'}) == 0
+    assert grade(key, {q1: 'c'}) == 1
+    assert next(q for q in key['questions'] if q['id'] == q1)['correct_answer'] == 'c'
+
+    with django_capture_on_commit_callbacks(execute=True):
+        QuizQuestion.objects.create(
+            quiz=quiz, question_text='Q3', option_a='A', option_b='B', correct_answer='b', sequence_number=3,
+        )
+    assert len(get_answer_key(quiz.pk)['masks']) == 3
+
+
+# ─── Attempt Limit ────────────────────────────────────────────────
+
+def test_claim_attempt_counts_the_window(student, quiz):
+    for _ in range(ATTEMPTS_PER_DAY - 1):
+        claim_attempt(student.pk, quiz.pk)
+        QuizAttempt.objects.create(quiz=quiz, student=student)
+    claim_attempt(student.pk, quiz.pk)
+    latest = QuizAttempt.objects.create(quiz=quiz, student=student)
+
+    with pytest.raises(AttemptLimitReached):
+        claim_attempt(student.pk, quiz.pk)
+
+    # Once an attempt is older than the window it no longer counts.
+    QuizAttempt.objects.filter(pk=latest.pk).update(completed_at=timezone.now() - timedelta(hours=25))
+    claim_attempt(student.pk, quiz.pk)
+
+
+def test_submit_enforces_the_limit_when_the_cache_is_behind(student, quiz):
+    client = APIClient()
+    client.force_authenticate(student)
+    url = f'/api/v1/quizzes/{quiz.pk}/submit/'
+    answers = {'answers': {_question(quiz, 'Q1'): 'a'}}
+
+    for _ in range(ATTEMPTS_PER_DAY):
+        response = client.post(url, answers, format='json')
+        assert response.status_code == 201
+        assert response.data['data']['score'] == 1
+    assert client.post(url, answers, format='json').status_code == 400
+
+    # Another worker's stale view of the cache lets the pre-check through;
+    # the count under the row lock still refuses the attempt.
+    cache.set(_attempts_key(student.pk, quiz.pk), [], 60)
+    response = client.post(url, answers, format='json')
+    assert response.status_code == 400
+    assert response.data['success'] is False
+    assert QuizAttempt.objects.filter(student=student, quiz=quiz).count() == ATTEMPTS_PER_DAY
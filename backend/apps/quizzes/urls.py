@@ -9,5 +9,8 @@ urlpatterns = [
     path('<uuid:quiz_id>/questions/', views.QuizQuestionManageView.as_view(), name='questions'),
     path('<uuid:quiz_id>/submit/', views.QuizSubmitView.as_view(), name='submit'),
     path('<uuid:quiz_id>/attempts/', views.QuizAttemptsView.as_view(), name='attempts'),
+    path('<uuid:quiz_id>/item-analysis/', views.QuizItemAnalysisView.as_view(), name='item-analysis'),
+    path('<uuid:quiz_id>/adaptive/', views.AdaptiveQuizStartView.as_view(), name='adaptive-start'),
+    path('adaptive/<uuid:session_id>/answer/', views.AdaptiveQuizAnswerView.as_view(), name='adaptive-answer'),
     path('attempts/all/', views.AllQuizAttemptsView.as_view(), name='all-attempts'),
 ]
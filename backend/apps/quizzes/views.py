@@ -1,6 +1,7 @@
 """
 Quiz views - CRUD for quizzes/questions, submit/grade, results.
 """
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -9,7 +10,13 @@ from rest_framework.views import APIView
 from apps.core.pagination import StandardPagination
 from apps.core.permissions import IsStudent, IsTeacher, IsTeacherOrReadOnly
 
-from .models import Quiz, QuizAttempt, QuizQuestion
+from .grading import (
+    ATTEMPT_LIMIT_MESSAGE, ATTEMPTS_PER_DAY, AttemptLimitReached, claim_attempt, get_answer_key,
+    grade_responses, record_attempt, recent_attempt_times,
+)
+from .item_analysis import question_report, record_item_responses
+from . import adaptive
+from .models import AdaptiveQuizSession, QuestionStats, Quiz, QuizAttempt, QuizQuestion
 from .serializers import (
     QuizAttemptDetailSerializer,
     QuizAttemptSerializer,
@@ -191,27 +198,29 @@ class QuizSubmitView(APIView):
 
     def post(self, request, quiz_id):
         try:
-            quiz = Quiz.objects.prefetch_related('questions').get(id=quiz_id, is_published=True)
+            answer_key = get_answer_key(quiz_id)
         except Quiz.DoesNotExist:
+            answer_key = None
+        if answer_key is None or not answer_key['is_published']:
             return Response(
                 {'success': False, 'error': {'message': 'Quiz not found.'}},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        if answer_key['is_adaptive']:
+            # Adaptive attempts are scored on ability, question by question.
+            return Response(
+                {'success': False, 'error': {
+                    'message': f'This is an adaptive quiz. Start it with POST /api/v1/quizzes/{quiz_id}/adaptive/ '
+                               f'and answer with POST /api/v1/quizzes/adaptive/<session_id>/answer/.',
+                }},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # 3 attempts limit within 24 hours logic
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        one_day_ago = timezone.now() - timedelta(hours=24)
-        recent_attempts = QuizAttempt.objects.filter(
-            student=request.user, 
-            quiz=quiz, 
-            completed_at__gte=one_day_ago
-        ).count()
-        
-        if recent_attempts >= 3:
+        # 3 attempts limit within 24 hours, counted in the cache
+        recent_attempts = recent_attempt_times(request.user.pk, quiz_id)
+        if len(recent_attempts) >= ATTEMPTS_PER_DAY:
             return Response(
-                {'success': False, 'error': {'message': 'You have used all 3 attempts for today. Mission will renew in 24 hours.'}},
+                {'success': False, 'error': {'message': ATTEMPT_LIMIT_MESSAGE}},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
@@ -221,29 +230,35 @@ class QuizSubmitView(APIView):
         submitted_answers = serializer.validated_data['answers']
         time_taken = serializer.validated_data.get('time_taken', 0)
 
-        # Grade the quiz
-        questions = quiz.questions.all()
-        total = questions.count()
-        score = 0
-
-        for question in questions:
-            submitted = submitted_answers.get(str(question.id), '').lower()
-            # Normalize for MSQ (sort options to avoid order issues)
-            sub_list = sorted([s.strip() for s in submitted.split(',') if s.strip()])
-            cor_list = sorted([c.strip() for c in question.correct_answer.lower().split(',') if c.strip()])
-            
-            if sub_list == cor_list:
-                score += 1
+        # Grade the quiz against the compiled answer key
+        graded = grade_responses(answer_key, submitted_answers)
+        total = len(graded)
+        score = sum(1 for _, _, correct in graded if correct)
 
         # Save attempt
-        attempt = QuizAttempt.objects.create(
-            quiz=quiz,
-            student=request.user,
-            score=score,
-            total_questions=total,
-            answers=submitted_answers,
-            time_taken=time_taken,
+        quiz = Quiz(
+            id=answer_key['quiz_id'],
+            title=answer_key['title'],
+            passing_score=answer_key['passing_score'],
         )
+        try:
+            with transaction.atomic():
+                claim_attempt(request.user.pk, quiz_id)
+                attempt = QuizAttempt.objects.create(
+                    quiz=quiz,
+                    student=request.user,
+                    score=score,
+                    total_questions=total,
+                    answers=submitted_answers,
+                    time_taken=time_taken,
+                )
+                record_item_responses(attempt, graded)
+        except AttemptLimitReached:
+            return Response(
+                {'success': False, 'error': {'message': ATTEMPT_LIMIT_MESSAGE}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        record_attempt(request.user.pk, quiz_id, recent_attempts, attempt.completed_at)
 
         # 🏆 Automatically Check and Award Badges
         new_badges = []
@@ -284,11 +299,94 @@ class QuizSubmitView(APIView):
         return Response({
             'success': True,
             'message': 'Quiz submitted successfully.',
-            'data': QuizAttemptDetailSerializer(attempt).data,
+            'data': QuizAttemptDetailSerializer(
+                attempt, context={'questions': answer_key['questions']},
+            ).data,
             'new_badges': new_badges
         }, status=status.HTTP_201_CREATED)
 
 
+class AdaptiveQuizStartView(APIView):
+    """
+    POST /api/v1/quizzes/<quiz_id>/adaptive/
+    Start (or resume) an adaptive session and get the first question.
+    """
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def post(self, request, quiz_id):
+        try:
+            answer_key = get_answer_key(quiz_id)
+        except Quiz.DoesNotExist:
+            answer_key = None
+        if answer_key is None or not answer_key['is_published'] or not answer_key['is_adaptive']:
+            return Response(
+                {'success': False, 'error': {'message': 'Adaptive quiz not found.'}},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if not answer_key['masks']:
+            return Response(
+                {'success': False, 'error': {'message': 'This quiz has no questions yet.'}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(recent_attempt_times(request.user.pk, quiz_id)) >= ATTEMPTS_PER_DAY:
+            return Response(
+                {'success': False, 'error': {'message': ATTEMPT_LIMIT_MESSAGE}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        session = adaptive.start_session(request.user, answer_key)
+        return Response({'success': True, 'data': adaptive.session_state(session, answer_key)})
+
+
+class AdaptiveQuizAnswerView(APIView):
+    """
+    POST /api/v1/quizzes/adaptive/<session_id>/answer/
+    Body: {"answer": "b", "question_id": "<optional, guards against double submits>"}
+    Returns the next question, or the final result once the estimate is confident.
+    """
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def post(self, request, session_id):
+        session = AdaptiveQuizSession.objects.filter(
+            id=session_id, student=request.user, status=AdaptiveQuizSession.StatusChoices.ACTIVE,
+        ).first()
+        if session is None:
+            return Response(
+                {'success': False, 'error': {'message': 'Active session not found.'}},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        question_id = request.data.get('question_id')
+        if question_id and str(question_id) != str(session.current_question_id):
+            return Response(
+                {'success': False, 'error': {'message': 'This question was already answered.'}},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        answer_key = get_answer_key(session.quiz_id)
+        recent_attempts = recent_attempt_times(request.user.pk, session.quiz_id)
+        try:
+            session = adaptive.submit_answer(session, answer_key, str(request.data.get('answer', '')), recent_attempts)
+        except AttemptLimitReached:
+            return Response(
+                {'success': False, 'error': {'message': ATTEMPT_LIMIT_MESSAGE}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        data = adaptive.session_state(session, answer_key)
+
+        if session.attempt_id:
+            attempt = session.attempt
+            attempt.quiz = Quiz(
+                id=answer_key['quiz_id'],
+                title=answer_key['title'],
+                passing_score=answer_key['passing_score'],
+            )
+            asked = {item['question_id'] for item in session.items}
+            data['result'] = QuizAttemptDetailSerializer(attempt, context={
+                'questions': [q for q in answer_key['questions'] if str(q['id']) in asked],
+            }).data
+        return Response({'success': True, 'data': data})
+
+
 class QuizAttemptsView(generics.ListAPIView):
     """
     GET /api/v1/quizzes/<quiz_id>/attempts/
@@ -320,3 +418,57 @@ class AllQuizAttemptsView(generics.ListAPIView):
 
     def get_queryset(self):
         return QuizAttempt.objects.filter(student=self.request.user).select_related('quiz', 'quiz__course').order_by('-completed_at')
+
+
+class QuizItemAnalysisView(APIView):
+    """
+    GET  /api/v1/quizzes/<quiz_id>/item-analysis/
+    Per-question correct rates, distractor frequencies and discrimination.
+    POST /api/v1/quizzes/<quiz_id>/item-analysis/
+    Queue a full recompute from the stored responses.
+    Course teacher or admin only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_quiz(self, request, quiz_id):
+        quiz = Quiz.objects.select_related('course').filter(id=quiz_id).first()
+        if quiz is None:
+            return None, Response(
+                {'success': False, 'error': {'message': 'Quiz not found.'}},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if request.user.role != 'admin' and quiz.course.teacher_id != request.user.pk:
+            return None, Response(
+                {'success': False, 'error': {'message': 'Only the course teacher can view item analysis.'}},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return quiz, None
+
+    def get(self, request, quiz_id):
+        quiz, error = self.get_quiz(request, quiz_id)
+        if error:
+            return error
+
+        stats = {s.question_id: s for s in QuestionStats.objects.filter(quiz=quiz)}
+        questions = [question_report(q, stats.get(q.pk)) for q in quiz.questions.all()]
+        return Response({
+            'success': True,
+            'data': {
+                'quiz_id': str(quiz.pk),
+                'title': quiz.title,
+                'attempts': max((q['responses'] for q in questions), default=0),
+                'questions': questions,
+            },
+        })
+
+    def post(self, request, quiz_id):
+        quiz, error = self.get_quiz(request, quiz_id)
+        if error:
+            return error
+
+        from .tasks import recompute_item_stats_task
+        recompute_item_stats_task.delay(str(quiz.pk))
+        return Response(
+            {'success': True, 'message': 'Item analysis recompute queued.'},
+            status=status.HTTP_202_ACCEPTED,
+        )
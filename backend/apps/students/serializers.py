@@ -76,10 +76,21 @@ class StudentCourseSerializer(serializers.ModelSerializer):
             'is_enrolled', 'created_at',
         ]
 
+    def _course_report(self, obj):
+        # Set by views that serialize another student's courses (parents) from a StudentReport.
+        report = self.context.get('report')
+        return report.course(obj.id) if report else None
+
     def get_total_lessons(self, obj):
+        course_report = self._course_report(obj)
+        if course_report:
+            return course_report.total_lessons
         return obj.lessons.count()
 
     def get_completed_lessons(self, obj):
+        course_report = self._course_report(obj)
+        if course_report:
+            return course_report.completed_lessons
         user = self.context.get('request')
         if user and hasattr(user, 'user'):
             user = user.user
@@ -89,6 +100,9 @@ class StudentCourseSerializer(serializers.ModelSerializer):
         return 0
 
     def get_progress_percentage(self, obj):
+        course_report = self._course_report(obj)
+        if course_report:
+            return course_report.progress_percentage
         user = self.context.get('request')
         if user and hasattr(user, 'user'):
             user = user.user
@@ -100,6 +114,8 @@ class StudentCourseSerializer(serializers.ModelSerializer):
         return 0
 
     def get_is_enrolled(self, obj):
+        if self._course_report(obj):
+            return True
         user = self.context.get('request')
         if user and hasattr(user, 'user'):
             user = user.user
@@ -109,6 +125,18 @@ class StudentCourseSerializer(serializers.ModelSerializer):
         return False
 
 
+class RecommendedCourseSerializer(serializers.ModelSerializer):
+    """Course card for the recommendations row; every field comes from the course row itself."""
+    teacher_name = serializers.CharField(source='teacher.name', read_only=True)
+
+    class Meta:
+        model = Course
+        fields = [
+            'id', 'title', 'description', 'category', 'level',
+            'cover_image', 'duration', 'teacher_name', 'created_at',
+        ]
+
+
 class StudentDashboardSerializer(serializers.Serializer):
     """Aggregated data for the student dashboard."""
     total_enrolled_courses = serializers.IntegerField()
@@ -10,6 +10,7 @@ urlpatterns = [
     path('my-teachers/', views.StudentTeachersView.as_view(), name='my-teachers'),
     path('book-session/', views.StudentSessionBookingCreateView.as_view(), name='book-session'),
     path('browse/', views.StudentBrowseCoursesView.as_view(), name='browse-courses'),
+    path('browse/recommended/', views.StudentRecommendedCoursesView.as_view(), name='recommended-courses'),
     path('progress/', views.StudentProgressView.as_view(), name='progress'),
     path('quiz-history/', views.StudentQuizHistoryView.as_view(), name='quiz-history'),
     path('messages/send/', views.StudentMessageTeacherView.as_view(), name='send-message'),
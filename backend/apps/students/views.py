@@ -15,6 +15,7 @@ from rest_framework.views import APIView
 
 from apps.ai_tutor.models import FlashcardSession
 from apps.analytics.models import UserActivityLog
+from apps.core.cache import cached_view, tag
 from apps.core.pagination import StandardPagination
 from apps.core.permissions import IsStudent
 from apps.courses.models import Course
@@ -24,8 +25,9 @@ from apps.progress.models import CourseProgress, LessonProgress
 from apps.quizzes.models import QuizAttempt
 
 from apps.live_classes.models import SessionBooking, MentorMessage
-from apps.attendance.models import AttendanceRecord, AttendanceSession
+from apps.attendance.models import CourseAttendanceSummary
 from .serializers import (
+    RecommendedCourseSerializer,
     StudentCourseSerializer,
     StudentDashboardSerializer,
     StudentProgressSummarySerializer,
@@ -56,6 +58,10 @@ class StudentDashboardView(APIView):
     """
     permission_classes = [IsAuthenticated, IsStudent]
 
+    @cached_view(
+        timeout='dashboard',
+        tags=lambda view, request: ['catalog', tag('student', request.user.pk)],
+    )
     def get(self, request):
         student = request.user
 
@@ -87,25 +93,24 @@ class StudentDashboardView(APIView):
 
         # Core Stats
         overall = course_progresses.aggregate(avg=Avg('progress_percentage'))['avg'] or 0.0
-        records = AttendanceRecord.objects.filter(student=student)
-        total_attendance = records.count()
-        present_count = records.filter(is_present=True).count()
+        # Attendance totals are maintained per course by apps.attendance.services
+        summaries = {
+            s.course_id: s for s in CourseAttendanceSummary.objects.filter(student=student, course__in=enrolled_courses)
+        }
+        total_attendance = sum(s.total for s in summaries.values())
+        present_count = sum(s.present for s in summaries.values())
         attendance_percentage = round((present_count / total_attendance) * 100, 1) if total_attendance > 0 else 0.0
 
         # Per-course attendance
         course_attendance_stats = []
         for course in enrolled_courses:
-            course_records = AttendanceRecord.objects.filter(student=student, session__course=course)
-            c_total = course_records.count()
-            c_present = course_records.filter(is_present=True).count()
-            c_percentage = round((c_present / c_total) * 100, 1) if c_total > 0 else 0.0
-            
+            summary = summaries.get(course.id)
             course_attendance_stats.append({
                 'id': str(course.id),
                 'title': course.title,
-                'total': c_total,
-                'present': c_present,
-                'percentage': c_percentage
+                'total': summary.total if summary else 0,
+                'present': summary.present if summary else 0,
+                'percentage': summary.percentage if summary else 0.0
             })
 
         # Recent 5 courses
@@ -558,6 +563,13 @@ class StudentBrowseCoursesView(generics.ListAPIView):
     permission_classes = [IsAuthenticated, IsStudent]
     pagination_class = StandardPagination
 
+    @cached_view(
+        timeout='catalog',
+        tags=lambda view, request: ['catalog', tag('student', request.user.pk)],
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         user = self.request.user
         queryset = Course.objects.filter(
@@ -594,6 +606,42 @@ class StudentBrowseCoursesView(generics.ListAPIView):
             queryset = queryset.order_by(sort)
 
         return queryset
+
+
+class StudentRecommendedCoursesView(APIView):
+    """
+    GET /api/v1/students/browse/recommended/?limit=10
+    Personalised course picks for the browse screen, from the nightly
+    collaborative-filtering build (apps.courses.recommendations).
+    """
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def get(self, request):
+        from django.conf import settings
+        from apps.courses.recommendations import recommended_course_ids
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), settings.RECOMMENDATIONS_TOP_N)
+        except ValueError:
+            limit = 10
+
+        # Over-fetch: courses enrolled in since the last build are dropped below.
+        ids = recommended_course_ids(request.user, limit * 2)
+        courses = {
+            str(course.pk): course
+            for course in Course.objects.filter(pk__in=ids, is_published=True)
+            # One subquery so both conditions apply to the same enrollment row;
+            # a two-condition exclude() across the relation does not guarantee that.
+            .exclude(pk__in=Enrollment.objects.filter(student=request.user, is_active=True).values('course_id'))
+            .select_related('teacher')
+        }
+        ordered = [courses[pk] for pk in ids if pk in courses][:limit]
+        return Response({
+            'success': True,
+            'data': RecommendedCourseSerializer(ordered, many=True, context={'request': request}).data,
+        })
+
+
 class StudentSessionBookingCreateView(generics.CreateAPIView):
     """
     POST /api/v1/students/book-session/
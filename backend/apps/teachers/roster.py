@@ -0,0 +1,139 @@
+"""
+Roster analytics for the teacher's student tables.
+
+roster_queryset() annotates each active enrollment with everything the
+roster shows: course progress, lesson counts, quiz average and attempts,
+last activity. Each figure is a correlated subquery keyed on the
+enrollment's (student, course), so the whole table is one SQL statement
+however many students the teacher has, and sorting, filtering and
+pagination happen in the database on the annotated columns.
+
+Large rosters stream as CSV/NDJSON through apps.core.exports (RosterDataset).
+"""
+from django.conf import settings
+from django.db.models import (
+    Avg, Count, DateTimeField, F, FloatField, IntegerField, Max, OuterRef, Q, Subquery,
+)
+from django.db.models.functions import Coalesce
+
+from apps.core.exports import Dataset
+from apps.enrollments.models import Enrollment
+from apps.lessons.models import Lesson
+from apps.progress.models import CourseProgress, LessonProgress
+from apps.quizzes.models import QuizAttempt
+
+# Sortable columns: ?ordering=<name> or -<name>.
+ORDERING_FIELDS = {
+    'student_name', 'course_title', 'progress_percentage', 'lessons_completed',
+    'average_quiz_score', 'quiz_attempts', 'last_active', 'enrolled_at',
+}
+DEFAULT_ORDERING = '-enrolled_at'
+
+COLUMNS = [
+    ('student_id', 'student_id'), ('student_name', 'student_name'), ('student_email', 'student_email'),
+    ('course_id', 'course_id'), ('course_title', 'course_title'),
+    ('progress_percentage', 'progress_percentage'), ('total_lessons', 'total_lessons'),
+    ('lessons_completed', 'lessons_completed'), ('average_quiz_score', 'average_quiz_score'),
+    ('quiz_attempts', 'quiz_attempts'), ('last_active', 'last_active'), ('enrolled_at', 'enrolled_at'),
+]
+
+
+def _per_enrollment(queryset, aggregate, output_field, student='student', course='course'):
+    """Correlated `aggregate` over `queryset` rows of the outer enrollment's student and course."""
+    rows = (
+        queryset.filter(**{student: OuterRef('student_id'), course: OuterRef('course_id')}).order_by()
+        .values(student).annotate(value=aggregate).values('value')
+    )
+    return Subquery(rows, output_field=output_field)
+
+
+def _total_lessons():
+    rows = (
+        Lesson.objects.filter(course=OuterRef('course_id')).order_by()
+        .values('course').annotate(n=Count('pk')).values('n')
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def roster_queryset(teacher, course=None):
+    """Active enrollments in `teacher`'s courses (or one `course`), with roster columns annotated."""
+    enrollments = Enrollment.objects.filter(
+        course__teacher=teacher, course__is_deleted=False, is_active=True,
+    )
+    if course is not None:
+        enrollments = enrollments.filter(course=course)
+
+    lesson_progress = LessonProgress.objects.all()
+    attempts = QuizAttempt.objects.all()
+    progress = CourseProgress.objects.filter(
+        student=OuterRef('student_id'), course=OuterRef('course_id'),
+    ).values('progress_percentage')[:1]
+
+    return enrollments.annotate(
+        student_name=F('student__name'),
+        student_email=F('student__email'),
+        course_title=F('course__title'),
+        progress_percentage=Coalesce(Subquery(progress, output_field=FloatField()), 0.0),
+        total_lessons=_total_lessons(),
+        lessons_completed=Coalesce(_per_enrollment(
+            lesson_progress.filter(completed=True), Count('pk'), IntegerField(), course='lesson__course',
+        ), 0),
+        average_quiz_score=_per_enrollment(attempts, Avg('score'), FloatField(), course='quiz__course'),
+        quiz_attempts=Coalesce(_per_enrollment(attempts, Count('pk'), IntegerField(), course='quiz__course'), 0),
+        last_active=Coalesce(
+            _per_enrollment(lesson_progress, Max('updated_at'), DateTimeField(), course='lesson__course'),
+            F('enrolled_at'),
+        ),
+    )
+
+
+def filter_roster(queryset, params):
+    """Apply ?course=, ?search=, ?min_progress=, ?max_progress= and ?ordering=."""
+    course_id = params.get('course')
+    if course_id:
+        queryset = queryset.filter(course_id=course_id)
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(student__name__icontains=search) | Q(student__email__icontains=search)
+            | Q(student__student_id__icontains=search)
+        )
+    for param, lookup in (('min_progress', 'progress_percentage__gte'), ('max_progress', 'progress_percentage__lte')):
+        try:
+            queryset = queryset.filter(**{lookup: float(params[param])})
+        except (KeyError, ValueError):
+            pass
+
+    ordering = params.get('ordering') or DEFAULT_ORDERING
+    if ordering.lstrip('-') not in ORDERING_FIELDS:
+        ordering = DEFAULT_ORDERING
+    field = ordering.lstrip('-')
+    expression = F(field).desc(nulls_last=True) if ordering.startswith('-') else F(field).asc(nulls_last=True)
+    return queryset.order_by(expression, 'id')
+
+
+def roster_values(queryset):
+    return queryset.values(*(lookup for _, lookup in COLUMNS))
+
+
+def present(rows) -> list:
+    """Round the quiz average of roster value dicts as the JSON views show it."""
+    rows = list(rows)
+    for row in rows:
+        avg = row['average_quiz_score']
+        row['average_quiz_score'] = round(avg, 1) if avg else None
+    return rows
+
+
+class RosterDataset(Dataset):
+    """A teacher's roster as an export dataset, filtered and sorted like the JSON view."""
+
+    def __init__(self, teacher):
+        super().__init__('roster', COLUMNS, lambda: roster_queryset(teacher))
+
+    def rows(self, params):
+        return (
+            filter_roster(self.queryset(), params)
+            .values_list(*(lookup for _, lookup in self.columns))
+            .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        )
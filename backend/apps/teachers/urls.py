@@ -8,6 +8,7 @@ urlpatterns = [
     path('dashboard-stats/', views.TeacherDashboardStatsView.as_view(), name='dashboard-stats'),
     path('courses/', views.TeacherCoursesView.as_view(), name='courses'),
     path('students/', views.TeacherStudentsView.as_view(), name='students'),
+    path('students/export.<str:fmt>', views.TeacherStudentsExportView.as_view(), name='students-export'),
     path('students/<uuid:student_id>/', views.TeacherStudentDetailView.as_view(), name='student-detail'),
     path('courses/<uuid:course_id>/students/', views.TeacherCourseStudentsView.as_view(), name='course-students'),
     path('bookings/', views.TeacherSessionBookingListView.as_view(), name='bookings-list'),
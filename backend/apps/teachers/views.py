@@ -3,22 +3,25 @@ Teacher-specific views.
 All endpoints here are restricted to users with role='teacher'.
 """
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Q
+from django.db.models import Avg, Count, Q, Sum
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.cache import cached_view, tag
+from apps.core.exports import FORMATS, StreamingExportView
 from apps.core.pagination import StandardPagination
 from apps.core.permissions import IsTeacher
 from apps.courses.models import Course, CourseReview
 from apps.courses.serializers import CourseReviewSerializer
 from apps.enrollments.models import Enrollment
 from apps.lessons.models import Lesson
-from apps.progress.models import CourseProgress, LessonProgress
+from apps.progress.reports import student_report
 from apps.quizzes.models import Quiz, QuizAttempt
 from apps.live_classes.models import SessionBooking
 
+from . import roster
 from .serializers import (
     CourseStudentProgressSerializer,
     TeacherCourseStatsSerializer,
@@ -37,6 +40,7 @@ class TeacherDashboardView(APIView):
     """
     permission_classes = [IsAuthenticated, IsTeacher]
 
+    @cached_view(timeout='dashboard', tags=lambda view, request: [tag('teacher', request.user.pk)])
     def get(self, request):
         teacher = request.user
         courses = Course.objects.filter(teacher=teacher, is_deleted=False)
@@ -95,6 +99,7 @@ class TeacherDashboardStatsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsTeacher]
 
+    @cached_view(timeout='dashboard', tags=lambda view, request: [tag('teacher', request.user.pk)])
     def get(self, request):
         teacher = request.user
         courses = Course.objects.filter(teacher=teacher, is_deleted=False)
@@ -118,11 +123,12 @@ class TeacherDashboardStatsView(APIView):
         # Average Attendance
         avg_attendance = 0 
         try:
-            from apps.attendance.models import AttendanceRecord
-            records = AttendanceRecord.objects.filter(session__course__teacher=teacher)
-            if records.exists():
-                present = records.filter(is_present=True).count()
-                avg_attendance = round((present / records.count()) * 100)
+            from apps.attendance.models import AttendanceSession
+            totals = AttendanceSession.objects.filter(course__teacher=teacher).aggregate(
+                present=Sum('present_count'), total=Sum('total_count'),
+            )
+            if totals['total']:
+                avg_attendance = round((totals['present'] / totals['total']) * 100)
         except Exception as e:
             print(f"Stats Error Check: {e}")
 
@@ -168,57 +174,38 @@ class TeacherStudentsView(APIView):
     """
     GET /api/v1/teachers/students/
     Lists all students enrolled in the teacher's courses with their progress.
+    Query params: course, search, min_progress, max_progress,
+    ordering (e.g. -progress_percentage, last_active), page, page_size.
     """
     permission_classes = [IsAuthenticated, IsTeacher]
 
     def get(self, request):
-        teacher = request.user
-        courses = Course.objects.filter(teacher=teacher, is_deleted=False)
+        queryset = roster.filter_roster(roster.roster_queryset(request.user), request.query_params)
+        rows = roster.roster_values(queryset)
 
-        enrollments = Enrollment.objects.filter(
-            course__in=courses, is_active=True
-        ).select_related('student', 'course').order_by('-enrolled_at')
-
-        students_data = []
-        for enrollment in enrollments:
-            student = enrollment.student
-            course = enrollment.course
-
-            # Get progress from CourseProgress model
-            progress_obj = CourseProgress.objects.filter(student=student, course=course).first()
-            progress_pct = progress_obj.progress_percentage if progress_obj else 0.0
-
-            # Progress details for this specific enrollment
-            total_lessons = course.lessons.count()
-            completed_lessons = LessonProgress.objects.filter(
-                student=student, lesson__course=course, completed=True
-            ).count()
-
-            # Average quiz for this course
-            avg_quiz = QuizAttempt.objects.filter(
-                student=student, quiz__course=course
-            ).aggregate(avg=Avg('score'))['avg']
-
-            # Last active
-            last_progress = LessonProgress.objects.filter(
-                student=student, lesson__course=course
-            ).order_by('-updated_at').first()
-
-            students_data.append({
-                'student_id': student.id,
-                'student_name': student.name,
-                'student_email': student.email,
-                'course_id': course.id,
-                'course_title': course.title,
-                'progress_percentage': progress_pct,
-                'total_lessons': total_lessons,
-                'lessons_completed': completed_lessons,
-                'average_quiz_score': round(avg_quiz, 1) if avg_quiz else None,
-                'last_active': last_progress.updated_at if last_progress else enrollment.enrolled_at,
-                'enrolled_at': enrollment.enrolled_at,
-            })
+        # Paginated only on request (?page=), so existing clients still get the full list.
+        if 'page' in request.query_params:
+            paginator = StandardPagination()
+            page = paginator.paginate_queryset(rows, request, view=self)
+            return paginator.get_paginated_response(roster.present(page))
+        return Response({'success': True, 'data': roster.present(rows)})
 
-        return Response({'success': True, 'data': students_data})
+
+class TeacherStudentsExportView(StreamingExportView):
+    """
+    GET /api/v1/teachers/students/export.<csv|ndjson>
+    Streams the whole roster, with the same filters and ordering as
+    /teachers/students/. Gzipped when the client sends Accept-Encoding: gzip.
+    """
+    permission_classes = [IsAuthenticated, IsTeacher]
+
+    def get(self, request, fmt):
+        if fmt not in FORMATS:
+            return Response(
+                {'success': False, 'error': {'message': f'Unknown format "{fmt}". Formats: csv, ndjson.'}},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return self.stream_response(request, roster.RosterDataset(request.user), fmt)
 
 
 class TeacherCourseStudentsView(APIView):
@@ -237,36 +224,17 @@ class TeacherCourseStudentsView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        enrollments = Enrollment.objects.filter(
-            course=course, is_active=True
-        ).select_related('student').order_by('-enrolled_at')
-
-        students_data = []
-        for enrollment in enrollments:
-            student = enrollment.student
-            
-            progress_obj = CourseProgress.objects.filter(student=student, course=course).first()
-            progress_pct = progress_obj.progress_percentage if progress_obj else 0.0
-
-            completed_lessons = LessonProgress.objects.filter(
-                student=student, lesson__course=course, completed=True
-            ).count()
-
-            quiz_attempts = QuizAttempt.objects.filter(
-                student=student, quiz__course=course
-            )
-            avg_quiz = quiz_attempts.aggregate(avg=Avg('score'))['avg']
-
-            students_data.append({
-                'student_id': student.id,
-                'student_name': student.name,
-                'lessons_completed': completed_lessons,
-                'total_lessons': course.lessons.count(),
-                'progress_percentage': progress_pct,
-                'quiz_attempts': quiz_attempts.count(),
-                'avg_quiz_score': round(avg_quiz, 1) if avg_quiz else None,
-                'enrolled_at': enrollment.enrolled_at,
-            })
+        queryset = roster.filter_roster(roster.roster_queryset(request.user, course=course), request.query_params)
+        students_data = [{
+            'student_id': row['student_id'],
+            'student_name': row['student_name'],
+            'lessons_completed': row['lessons_completed'],
+            'total_lessons': row['total_lessons'],
+            'progress_percentage': row['progress_percentage'],
+            'quiz_attempts': row['quiz_attempts'],
+            'avg_quiz_score': row['average_quiz_score'],
+            'enrolled_at': row['enrolled_at'],
+        } for row in roster.present(roster.roster_values(queryset))]
 
         return Response({'success': True, 'data': students_data})
 
@@ -289,90 +257,20 @@ class TeacherStudentDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        teacher_courses = Course.objects.filter(teacher=teacher, is_deleted=False)
-        
         course_id = request.query_params.get('course_id')
-        if course_id and course_id != 'null':
-            teacher_courses = teacher_courses.filter(id=course_id)
-
-        enrollments = Enrollment.objects.filter(
-            student=student, course__in=teacher_courses, is_active=True
-        ).select_related('course')
+        if not course_id or course_id == 'null':
+            course_id = None
 
+        report = student_report(student)
         data = {
             'student': {
                 'id': student.id,
                 'name': student.name,
                 'email': student.email,
             },
-            'courses': []
+            'courses': [course.as_dict() for course in report.for_teacher(teacher.pk, course_id)],
         }
 
-        processed_course_ids = set()
-
-        for enrollment in enrollments:
-            course = enrollment.course
-            
-            # Prevent duplicate courses if multiple enrollments exist
-            if course.id in processed_course_ids:
-                continue
-            processed_course_ids.add(course.id)
-            
-            progress_obj = CourseProgress.objects.filter(student=student, course=course).first()
-            progress_pct = progress_obj.progress_percentage if progress_obj else 0.0
-
-            # Lessons and progress
-            lessons = Lesson.objects.filter(course=course).order_by('sequence_number')
-            progress_map = {
-                lp.lesson_id: lp 
-                for lp in LessonProgress.objects.filter(student=student, lesson__course=course)
-            }
-            
-            lesson_details = []
-            for lesson in lessons:
-                progress = progress_map.get(lesson.id)
-                lesson_details.append({
-                    'id': lesson.id,
-                    'title': lesson.title,
-                    'is_completed': progress.completed if progress else False,
-                    'time_spent': progress.time_spent if progress else 0,
-                    'last_accessed': progress.updated_at if progress else None,
-                })
-
-            # Quiz attempts - Group by quiz to show only unique quizzes or best attempts
-            # For the history, we'll show unique quizzes with their best score
-            # We use set() and order_by() to ensure distinctness is not compromised by default model ordering
-            unique_quiz_ids = set(QuizAttempt.objects.filter(
-                student=student, quiz__course=course
-            ).order_by().values_list('quiz_id', flat=True).distinct())
-            
-            best_attempts = []
-            for q_id in unique_quiz_ids:
-                best_attempt = QuizAttempt.objects.filter(
-                    student=student, quiz_id=q_id
-                ).order_by('-score', '-created_at').first()
-                if best_attempt:
-                    best_attempts.append(best_attempt)
-
-            course_data = {
-                'id': course.id,
-                'title': course.title,
-                'progress_percentage': progress_pct,
-                'enrolled_at': enrollment.enrolled_at,
-                'lessons': lesson_details,
-                'quizzes': [
-                    {
-                        'id': qa.id,
-                        'quiz_id': qa.quiz.id,
-                        'quiz_title': qa.quiz.title,
-                        'score': qa.percentage,
-                        'passed': qa.passed,
-                        'attempted_at': qa.created_at,
-                    } for qa in best_attempts
-                ]
-            }
-            data['courses'].append(course_data)
-
         return Response({'success': True, 'data': data})
 
 
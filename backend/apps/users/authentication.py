@@ -0,0 +1,91 @@
+"""
+JWT authentication backed by a cached user snapshot.
+
+simplejwt's JWTAuthentication reads the User row on every request, although
+the permission classes only look at a handful of fields. Here those fields
+live in the shared cache as a compact UserSnapshot keyed by user id and the
+token version claim, so an authenticated request costs no query. The entry
+is tagged 'user:<id>' and dropped whenever the user is saved (profile edits,
+deactivation, password changes — see apps.core.signals). A password change
+also bumps User.token_version, which revokes tokens issued before it.
+
+request.user is a SnapshotUser: a regular User instance with only the
+snapshot fields loaded. Views that touch any other field get the full row
+lazily, in one query.
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.core.cache import get_or_compute, make_key, tag
+from apps.core.metrics import current_stats
+
+from .models import SnapshotUser, User
+from .tokens import TOKEN_VERSION_CLAIM
+
+
+class UserSnapshot:
+    """The fields authentication and the role permissions need."""
+    __slots__ = ('id', 'role', 'grade_level', 'is_active', 'name', 'token_version')
+
+    def __init__(self, user):
+        for field in self.__slots__:
+            setattr(self, field, getattr(user, field))
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            setattr(self, field, value)
+
+    def to_user(self):
+        values = [
+            getattr(self, f.attname) if f.attname in self.__slots__ else DEFERRED
+            for f in SnapshotUser._meta.concrete_fields
+        ]
+        return SnapshotUser.from_db(DEFAULT_DB_ALIAS, list(self.__slots__), values)
+
+
+def user_snapshot_key(user_id, token_version):
+    return make_key('auth-user', user_id, token_version)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Drop-in JWTAuthentication that resolves the user from the cache."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        token_version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+
+        snapshot = get_or_compute(
+            user_snapshot_key(user_id, token_version),
+            lambda: self._load_snapshot(user_id),
+            timeout='auth_user',
+            tags=[tag('user', user_id)],
+        )
+        if snapshot is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if api_settings.CHECK_USER_IS_ACTIVE and not snapshot.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if snapshot.token_version != token_version:
+            raise AuthenticationFailed(_('Token has been revoked.'), code='token_revoked')
+        return snapshot.to_user()
+
+    def _load_snapshot(self, user_id):
+        stats = current_stats()
+        queries_before = stats.queries if stats is not None else 0
+        user = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .only(*UserSnapshot.__slots__)
+            .first()
+        )
+        if stats is not None:
+            stats.auth_queries += stats.queries - queries_before
+        return UserSnapshot(user) if user else None
@@ -112,6 +112,9 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
         help_text="6-digit unique ID for parents"
     )
 
+    # Embedded in issued JWTs; bumping it revokes every outstanding token.
+    token_version = models.PositiveIntegerField(default=0)
+
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
@@ -164,6 +167,11 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
     def __str__(self):
         return f"{self.name} ({self.email})"
 
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        if not self._state.adding:
+            self.token_version += 1
+
     @property
     def is_teacher(self):
         return self.role == self.RoleChoices.TEACHER
@@ -187,6 +195,23 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
         return None
 
 
+class SnapshotUser(User):
+    """
+    User rebuilt from a cached auth snapshot (see apps.users.authentication).
+    Only the snapshot fields are loaded; touching any other field loads the
+    rest of the row in a single query.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
 class PhoneOTP(TimeStampedModel):
     """Model to store OTP codes for phone verification."""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='phone_otps')
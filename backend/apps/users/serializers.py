@@ -6,11 +6,14 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from .tokens import RefreshToken
+
 User = get_user_model()
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom JWT token that includes user role and name in claims."""
+    token_class = RefreshToken
 
     def validate(self, attrs):
         # Allow login via Email OR Teacher ID OR Student ID
@@ -53,7 +56,6 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         remember_me = self.initial_data.get('remember_me', False)
         if remember_me:
             from datetime import timedelta
-            from rest_framework_simplejwt.tokens import RefreshToken
             
             # Generate new tokens with longer lifetime
             refresh = RefreshToken.for_user(user)
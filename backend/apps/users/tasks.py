@@ -5,22 +5,22 @@ from celery import shared_task
 from django.utils import timezone
 import logging
 
+from apps.core.sweeps import Sweep
+
 logger = logging.getLogger(__name__)
 
 
+EXPIRED_TOKENS = Sweep(
+    'expired_tokens',
+    'token_blacklist.OutstandingToken',
+    where=lambda now: {'expires_at__lt': now},
+)
+
+
 @shared_task
 def cleanup_expired_tokens():
-    """Remove expired/blacklisted JWT tokens from the database."""
-    try:
-        from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
-        expired = OutstandingToken.objects.filter(
-            expires_at__lt=timezone.now()
-        )
-        count = expired.count()
-        expired.delete()
-        logger.info(f"Cleaned up {count} expired tokens.")
-    except Exception as e:
-        logger.error(f"Token cleanup error: {e}")
+    """Remove expired JWT tokens (and their blacklist rows) in batches."""
+    return EXPIRED_TOKENS.run()
 
 
 @shared_task
@@ -61,18 +61,27 @@ def send_weekly_progress_reminders():
     logger.info("Weekly progress reminders sent.")
 
 
+def _drop_cached_users(pks):
+    # .update() skips signals: drop the cached auth snapshots explicitly.
+    from apps.core.cache import invalidate_tags, tag
+    invalidate_tags(*(tag('user', pk) for pk in pks))
+
+
+UNVERIFIED_ACCOUNTS = Sweep(
+    'unverified_accounts',
+    'users.User',
+    where=lambda now: {
+        'is_email_verified': False,
+        'is_active': True,
+        'is_staff': False,
+        'created_at__lt': now - timezone.timedelta(days=7),
+    },
+    update=lambda now: {'is_active': False},
+    after_batch=_drop_cached_users,
+)
+
+
 @shared_task
 def deactivate_unverified_accounts():
     """Deactivate accounts not verified within 7 days."""
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-
-    cutoff = timezone.now() - timezone.timedelta(days=7)
-    unverified = User.objects.filter(
-        is_email_verified=False,
-        is_active=True,
-        created_at__lt=cutoff,
-    ).exclude(is_staff=True)
-
-    count = unverified.update(is_active=False)
-    logger.info(f"Deactivated {count} unverified accounts.")
+    return UNVERIFIED_ACCOUNTS.run()
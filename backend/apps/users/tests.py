@@ -0,0 +1,102 @@
+"""
+CachedJWTAuthentication: the user snapshot served from the cache, its
+invalidation on password changes and deactivation, and the lazily loaded
+SnapshotUser it hands to views.
+"""
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.users.authentication import CachedJWTAuthentication
+from apps.users.models import SnapshotUser, User
+from apps.users.tokens import RefreshToken
+
+pytestmark = pytest.mark.django_db
+
+PROFILE_URL = '/api/v1/auth/profile/'
+CHANGE_PASSWORD_URL = '/api/v1/auth/change-password/'
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        email='student@example.com', password='Old-pass-123', name='Student', role='student', bio='Hello',
+    )
+
+
+def _access(user):
+    return str(RefreshToken.for_user(user).access_token)
+
+
+def _client(access):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    return client
+
+
+def _authenticate(access):
+    request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+    return CachedJWTAuthentication().authenticate(request)[0]
+
+
+def test_snapshot_is_cached(user, django_assert_num_queries):
+    access = _access(user)
+    with django_assert_num_queries(1):
+        _authenticate(access)
+    with django_assert_num_queries(0):
+        authenticated = _authenticate(access)
+
+    assert authenticated.pk == user.pk
+    assert (authenticated.role, authenticated.name, authenticated.is_active) == ('student', 'Student', True)
+
+
+def test_password_change_revokes_earlier_tokens(user, django_capture_on_commit_callbacks):
+    old_access = _access(user)
+    old_client = _client(old_access)
+    assert old_client.get(PROFILE_URL).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = old_client.post(CHANGE_PASSWORD_URL, {
+            'old_password': 'Old-pass-123',
+            'new_password': 'New-pass-456!',
+            'new_password_confirm': 'New-pass-456!',
+        }, format='json')
+
+    assert response.status_code == 200
+    user.refresh_from_db()
+    assert user.token_version == 1
+    assert old_client.get(PROFILE_URL).status_code == 401
+    assert _client(old_access).get(PROFILE_URL).status_code == 401
+
+    new_client = _client(response.data['data']['tokens']['access'])
+    assert new_client.get(PROFILE_URL).status_code == 200
+
+
+def test_deactivation_drops_the_snapshot(user, django_capture_on_commit_callbacks):
+    client = _client(_access(user))
+    assert client.get(PROFILE_URL).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+
+    assert client.get(PROFILE_URL).status_code == 401
+
+
+def test_snapshot_user_loads_other_fields_in_one_query(user, django_assert_num_queries):
+    access = _access(user)
+    _authenticate(access)
+    authenticated = _authenticate(access)
+
+    assert isinstance(authenticated, SnapshotUser)
+    assert 'bio' in authenticated.get_deferred_fields()
+    with django_assert_num_queries(1):
+        assert (authenticated.email, authenticated.bio, authenticated.student_id) == (
+            'student@example.com', 'Hello', user.student_id,
+        )
+    assert not authenticated.get_deferred_fields()
@@ -0,0 +1,16 @@
+"""
+JWT token classes carrying the user's token version.
+"""
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+TOKEN_VERSION_CLAIM = 'tv'
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token (and derived access tokens) stamped with User.token_version."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
@@ -6,7 +6,6 @@ from rest_framework import generics, parsers, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 import random
@@ -15,6 +14,7 @@ from django.utils import timezone
 import os
 from twilio.rest import Client
 from .models import PhoneOTP
+from .tokens import RefreshToken
 from .serializers import (
     ChangePasswordSerializer,
     CustomTokenObtainPairSerializer,
@@ -32,12 +32,14 @@ class LoginView(TokenObtainPairView):
     """Login endpoint - returns JWT access & refresh tokens with user data."""
     serializer_class = CustomTokenObtainPairSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'auth'
 
 
 class RegisterView(generics.CreateAPIView):
     """Register a new student or teacher account."""
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'auth'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -141,9 +143,18 @@ class ChangePasswordView(APIView):
         request.user.set_password(serializer.validated_data['new_password'])
         request.user.save()
 
+        # The password change revoked every earlier token (token_version bump);
+        # hand this session a fresh pair.
+        refresh = RefreshToken.for_user(request.user)
         return Response({
             'success': True,
-            'message': 'Password changed successfully.'
+            'message': 'Password changed successfully.',
+            'data': {
+                'tokens': {
+                    'access': str(refresh.access_token),
+                    'refresh': str(refresh),
+                }
+            }
         })
 
 
@@ -167,6 +178,7 @@ class UpdateFCMTokenView(APIView):
 class RequestPhoneOTPView(APIView):
     """View to request a phone verification OTP."""
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'otp'
 
     def post(self, request):
         user = request.user
@@ -235,6 +247,7 @@ class RequestPhoneOTPView(APIView):
 class VerifyPhoneOTPView(APIView):
     """View to verify a phone verification OTP."""
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'otp_verify'
 
     def post(self, request):
         serializer = PhoneOTPVerifySerializer(data=request.data)
@@ -275,6 +288,7 @@ class VerifyPhoneOTPView(APIView):
 class ForgotPasswordRequestView(APIView):
     """View to request a password reset OTP (Public)."""
     permission_classes = [AllowAny]
+    throttle_scope = 'otp'
 
     def post(self, request):
         identifier = request.data.get('identifier')
@@ -376,6 +390,7 @@ class ForgotPasswordRequestView(APIView):
 class ForgotPasswordVerifyView(APIView):
     """View to verify OTP and reset password (Public)."""
     permission_classes = [AllowAny]
+    throttle_scope = 'otp_verify'
 
     def post(self, request):
         identifier = request.data.get('identifier')
@@ -5,7 +5,6 @@ Handles background tasks: video processing, emails, notifications, analytics
 import os
 
 from celery import Celery
-from celery.schedules import crontab
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -33,35 +32,8 @@ app.conf.update(
 
 app.autodiscover_tasks()
 
-# Periodic Tasks Schedule
-app.conf.beat_schedule = {
-    # Clean up expired tokens every day at midnight
-    'cleanup-expired-tokens': {
-        'task': 'apps.users.tasks.cleanup_expired_tokens',
-        'schedule': crontab(hour=0, minute=0),
-    },
-    # Generate daily analytics at 1 AM
-    'generate-daily-analytics': {
-        'task': 'apps.analytics.tasks.generate_daily_report',
-        'schedule': crontab(hour=1, minute=0),
-    },
-    # Clean up stale live classes every hour
-    'cleanup-stale-live-classes': {
-        'task': 'apps.live_classes.tasks.cleanup_stale_classes',
-        'schedule': crontab(minute=0),
-    },
-    # Send progress reminder emails weekly on Monday
-    'weekly-progress-reminders': {
-        'task': 'apps.notifications.tasks.send_weekly_progress_reminders',
-        'schedule': crontab(hour=9, minute=0, day_of_week=1),
-    },
-
-    # Generate weekly parent reports on Monday at 2 AM
-    'generate-weekly-reports': {
-        'task': 'apps.parents.tasks.generate_weekly_reports',
-        'schedule': crontab(hour=2, minute=0, day_of_week=1),
-    },
-}
+# Periodic tasks live in settings.CELERY_BEAT_SCHEDULE (loaded above with the
+# CELERY_ namespace); assigning app.conf.beat_schedule here would be ignored.
 
 
 @app.task(bind=True, ignore_result=True)
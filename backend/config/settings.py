@@ -115,6 +115,9 @@ DATABASES = {
     )
 }
 
+# SQLite (dev) cannot create the deferred lesson ordering constraint; PostgreSQL enforces it.
+SILENCED_SYSTEM_CHECKS = ['models.W038']
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -159,7 +162,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -172,13 +175,24 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # GCRA limits shared through Redis (apps.core.throttling)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'apps.core.throttling.AnonThrottle',
+        'apps.core.throttling.UserThrottle',
+        'apps.core.throttling.ScopedThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/hour',
-        'user': '1000/hour',
+        'anon': env.str('THROTTLE_ANON', '100/hour'),
+        'user': env.str('THROTTLE_USER', '1000/hour'),
+        'user.teacher': env.str('THROTTLE_USER_TEACHER', '3000/hour'),
+        'user.admin': None,
+        # Per-route quotas (view.throttle_scope)
+        'auth': env.str('THROTTLE_AUTH', '60/hour'),
+        'otp': env.str('THROTTLE_OTP', '5/hour'),
+        'otp_verify': env.str('THROTTLE_OTP_VERIFY', '10/hour'),
+        'ai': env.str('THROTTLE_AI', '60/hour'),
+        'ai.teacher': env.str('THROTTLE_AI_TEACHER', '200/hour'),
+        'interactions': env.str('THROTTLE_INTERACTIONS', '1200/hour'),
     },
     'EXCEPTION_HANDLER': 'apps.core.exceptions.custom_exception_handler',
 }
@@ -221,17 +235,106 @@ CORS_ALLOW_METHODS = [
     'PUT',
 ]
 
-# Redis Cache Configuration - Using local memory cache for development
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'mentiq-cache',
-        'TIMEOUT': 300,
+# Cache Configuration
+# CACHE_BACKEND: 'redis' (shared across workers), 'fakeredis' (tests) or 'locmem' (per-process, dev only)
+REDIS_URL = env.str('REDIS_URL', '')
+CACHE_BACKEND = env.str('CACHE_BACKEND', 'redis' if REDIS_URL else 'locmem')
+
+if CACHE_BACKEND in ('redis', 'fakeredis'):
+    _redis_options = {
+        'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        'SOCKET_CONNECT_TIMEOUT': 2,
+        'SOCKET_TIMEOUT': 2,
+    }
+    if CACHE_BACKEND == 'fakeredis':
+        from fakeredis import FakeConnection
+        _redis_options['CONNECTION_POOL_KWARGS'] = {'connection_class': FakeConnection}
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL or 'redis://localhost:6379/0',
+            'TIMEOUT': 300,
+            'KEY_PREFIX': 'mentiq',
+            'OPTIONS': _redis_options,
+        }
+    }
+    # A cache outage degrades to cache misses instead of failing requests
+    DJANGO_REDIS_IGNORE_EXCEPTIONS = True
+    DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'mentiq-cache',
+            'TIMEOUT': 300,
+        }
     }
+
+# Cache-aside TTLs (seconds) for apps.core.cache.cached_view / cached_queryset
+CACHE_TIMEOUTS = {
+    'default': env.int('CACHE_TIMEOUT_DEFAULT', 300),
+    'catalog': env.int('CACHE_TIMEOUT_CATALOG', 300),
+    'lesson': env.int('CACHE_TIMEOUT_LESSON', 600),
+    'announcements': env.int('CACHE_TIMEOUT_ANNOUNCEMENTS', 120),
+    'dashboard': env.int('CACHE_TIMEOUT_DASHBOARD', 60),
+    'auth_user': env.int('CACHE_TIMEOUT_AUTH_USER', 300),
+    'cognitive_state': env.int('CACHE_TIMEOUT_COGNITIVE_STATE', 24 * 60 * 60),
+    'counters': env.int('CACHE_TIMEOUT_COUNTERS', 300),
+    'recommendations': env.int('CACHE_TIMEOUT_RECOMMENDATIONS', 26 * 60 * 60),
+    'student_report': env.int('CACHE_TIMEOUT_STUDENT_REPORT', 600),
 }
 
+# Platform counters (apps.analytics.counters): on PostgreSQL, estimate unfiltered
+# counts of tables above the threshold from pg_class.reltuples
+PLATFORM_COUNTERS_APPROXIMATE = env.bool('PLATFORM_COUNTERS_APPROXIMATE', False)
+PLATFORM_COUNTERS_APPROX_MIN_ROWS = env.int('PLATFORM_COUNTERS_APPROX_MIN_ROWS', 100_000)
+
+# Cognitive state entries are served stale (and revalidated in the background)
+# after this many seconds; see apps.ai_tutor.state_cache
+COGNITIVE_STATE_FRESH_SECONDS = env.int('COGNITIVE_STATE_FRESH_SECONDS', 30)
+
+# Course recommendations (apps.courses.recommendations): list length and
+# similar courses kept per course
+RECOMMENDATIONS_TOP_N = env.int('RECOMMENDATIONS_TOP_N', 20)
+RECOMMENDATIONS_NEIGHBOURS = env.int('RECOMMENDATIONS_NEIGHBOURS', 50)
+
+# Rows fetched per round trip by the streaming admin exports (apps.admin_panel.exports)
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', 2000)
+
+# Micro-lesson media jobs (apps.offline.media_jobs): quiet period after a lesson
+# save, retry limits with exponential backoff, and jobs run per worker pass
+MEDIA_JOB_DEBOUNCE_SECONDS = env.int('MEDIA_JOB_DEBOUNCE_SECONDS', 30)
+MEDIA_JOB_MAX_ATTEMPTS = env.int('MEDIA_JOB_MAX_ATTEMPTS', 5)
+MEDIA_JOB_RETRY_BASE_SECONDS = env.int('MEDIA_JOB_RETRY_BASE_SECONDS', 60)
+MEDIA_JOB_LESSON_DAILY_ATTEMPTS = env.int('MEDIA_JOB_LESSON_DAILY_ATTEMPTS', 15)
+MEDIA_JOB_BATCH_SIZE = env.int('MEDIA_JOB_BATCH_SIZE', 20)
+
+# Maintenance sweeps (apps.core.sweeps): rows per batch transaction, pause
+# between batches, and wall-clock budget per run (the rest resumes next run)
+MAINTENANCE_BATCH_SIZE = env.int('MAINTENANCE_BATCH_SIZE', 1000)
+MAINTENANCE_BATCH_PAUSE_MS = env.int('MAINTENANCE_BATCH_PAUSE_MS', 100)
+MAINTENANCE_TIME_BUDGET_SECONDS = env.int('MAINTENANCE_TIME_BUDGET_SECONDS', 300)
+
+# Cognitive-companion telemetry (apps.ai_tutor.telemetry): days raw interaction
+# events are kept (whole daily partitions are dropped on PostgreSQL), daily
+# partitions created ahead of time, and days hourly rollups are kept
+INTERACTION_EVENT_RETENTION_DAYS = env.int('INTERACTION_EVENT_RETENTION_DAYS', 20)
+INTERACTION_PARTITIONS_AHEAD_DAYS = env.int('INTERACTION_PARTITIONS_AHEAD_DAYS', 3)
+INTERACTION_ROLLUP_RETENTION_DAYS = env.int('INTERACTION_ROLLUP_RETENTION_DAYS', 90)
+
+# ─── Performance Instrumentation ─────────────────────────────────
+# Per-route latency/SQL histograms served at /metrics (see apps.core.metrics).
+# Set PROMETHEUS_MULTIPROC_DIR in the environment when running several workers.
+METRICS_ENABLED = env.bool('METRICS_ENABLED', True)
+METRICS_TOKEN = env.str('METRICS_TOKEN', '')  # bearer token for /metrics; without one it is DEBUG-only
+N_PLUS_ONE_THRESHOLD = env.int('N_PLUS_ONE_THRESHOLD', 5)  # same SQL shape N times in one request
+PROFILE_SLOW_REQUESTS = env.bool('PROFILE_SLOW_REQUESTS', False)
+PROFILE_SAMPLE_RATE = env.float('PROFILE_SAMPLE_RATE', 0.05)  # share of requests run under cProfile
+PROFILE_TOP_N = env.int('PROFILE_TOP_N', 10)  # slowest profiled requests kept per process
+
 # Session Configuration
-SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+# cached_db: reads hit the shared cache, the DB keeps sessions alive across cache flushes
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 SESSION_CACHE_ALIAS = 'default'
 
 # Celery Configuration
@@ -256,11 +359,86 @@ CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 # Periodic tasks
 from celery.schedules import crontab
 CELERY_BEAT_SCHEDULE = {
+    # Clean up expired tokens every day at midnight
+    'cleanup-expired-tokens': {
+        'task': 'apps.users.tasks.cleanup_expired_tokens',
+        'schedule': crontab(hour=0, minute=0),
+    },
+    # Generate daily analytics at 1 AM
+    'generate-daily-analytics': {
+        'task': 'apps.analytics.tasks.generate_daily_analytics',
+        'schedule': crontab(hour=1, minute=0),
+    },
+    # Clean up stale live classes every hour
+    'cleanup-stale-live-classes': {
+        'task': 'apps.live_classes.tasks.cleanup_stale_classes',
+        'schedule': crontab(minute=0),
+    },
+    # Send progress reminder emails weekly on Monday
+    'weekly-progress-reminders': {
+        'task': 'apps.users.tasks.send_weekly_progress_reminders',
+        'schedule': crontab(hour=9, minute=0, day_of_week=1),
+    },
+    # Generate weekly parent reports on Monday at 2 AM
+    'generate-weekly-reports': {
+        'task': 'apps.parents.tasks.generate_weekly_reports',
+        'schedule': crontab(hour=2, minute=0, day_of_week=1),
+    },
+    # Create upcoming interaction event partitions, drop expired ones
+    'maintain-interaction-events': {
+        'task': 'apps.ai_tutor.tasks.maintain_interaction_events_task',
+        'schedule': crontab(hour=0, minute=30),
+    },
+    # Roll up the last hour's interaction events into the cognitive history
+    'rollup-interactions': {
+        'task': 'apps.ai_tutor.tasks.rollup_interactions_task',
+        'schedule': crontab(minute=5),
+    },
+    # Purge finished micro-lesson media jobs
+    'purge-finished-media-jobs': {
+        'task': 'apps.offline.tasks.purge_finished_media_jobs',
+        'schedule': crontab(hour=0, minute=45),
+    },
     # Sync Gmail inbox every 10 minutes
     'sync-gmail-inbox': {
         'task': 'apps.emails.tasks.fetch_inbox_task',
         'schedule': crontab(minute='*/10'),
     },
+    # Rebuild quiz item-analysis totals from stored responses
+    'recompute-item-stats': {
+        'task': 'apps.quizzes.tasks.recompute_item_stats_task',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    # Refit IRT item parameters for adaptive quizzes
+    'calibrate-irt': {
+        'task': 'apps.quizzes.tasks.calibrate_irt_task',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    # Persist cognitive states written through to the cache
+    'flush-cognitive-states': {
+        'task': 'apps.ai_tutor.tasks.flush_cognitive_states_task',
+        'schedule': crontab(minute='*'),
+    },
+    # Recompute the cached platform counters (corrects drift from bulk writes)
+    'refresh-platform-counters': {
+        'task': 'apps.analytics.tasks.refresh_platform_counters_task',
+        'schedule': crontab(minute='*/10'),
+    },
+    # Rebuild the collaborative-filtering course recommendations
+    'build-course-recommendations': {
+        'task': 'apps.courses.tasks.build_recommendations_task',
+        'schedule': crontab(hour=2, minute=30),
+    },
+    # Run due micro-lesson media jobs (debounced saves, retries, broker outages)
+    'run-media-jobs': {
+        'task': 'apps.offline.tasks.run_media_jobs_task',
+        'schedule': crontab(minute='*'),
+    },
+    # Re-queue Stripe webhook events that are still pending (retries, broker outages)
+    'dispatch-stripe-events': {
+        'task': 'apps.payments.tasks.dispatch_stripe_events_task',
+        'schedule': crontab(minute='*'),
+    },
 }
 
 # Jitsi Configuration (Live Streaming)
@@ -288,12 +466,22 @@ EMAIL_HOST_PASSWORD = env.str('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = env.str('DEFAULT_FROM_EMAIL', 'MentiQ <noreply@mentiq.com>')
 ADMIN_EMAIL = env.str('ADMIN_EMAIL', 'admin@mentiq.com')
 
+# ─── Email Campaign Engine ───────────────────────────────────────
+EMAIL_CAMPAIGN_WORKERS = env.int('EMAIL_CAMPAIGN_WORKERS', 4)  # SMTP connections per campaign
+EMAIL_CAMPAIGN_BATCH_SIZE = env.int('EMAIL_CAMPAIGN_BATCH_SIZE', 50)
+EMAIL_CAMPAIGN_RATE_LIMIT = env.float('EMAIL_CAMPAIGN_RATE_LIMIT', 10.0)  # messages/sec, 0 = unlimited
+EMAIL_CAMPAIGN_CHECKPOINT_EVERY = env.int('EMAIL_CAMPAIGN_CHECKPOINT_EVERY', 500)  # messages between progress counter updates
+EMAIL_CAMPAIGN_CHECKPOINT_SECONDS = env.int('EMAIL_CAMPAIGN_CHECKPOINT_SECONDS', 15)
+EMAIL_CAMPAIGN_STALL_SECONDS = env.int('EMAIL_CAMPAIGN_STALL_SECONDS', 600)  # SENDING with no checkpoint → resumable
+
 # ─── Email Receiving (Gmail IMAP) ────────────────────────────────
 IMAP_HOST = env.str('IMAP_HOST', 'imap.gmail.com')
 IMAP_PORT = env.int('IMAP_PORT', 993)
 IMAP_USE_SSL = env.bool('IMAP_USE_SSL', True)
 IMAP_USER = env.str('IMAP_USER', '')
 IMAP_PASSWORD = env.str('IMAP_PASSWORD', '')
+IMAP_FETCH_BATCH_SIZE = env.int('IMAP_FETCH_BATCH_SIZE', 100)  # UIDs per UID FETCH
+IMAP_BODY_FETCH_LIMIT = env.int('IMAP_BODY_FETCH_LIMIT', 200)  # bodies downloaded per sync run
 
 # ─── EmailJS (Frontend Contact Forms) ────────────────────────────
 EMAILJS_SERVICE_ID = env.str('EMAILJS_SERVICE_ID', '')
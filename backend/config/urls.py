@@ -12,7 +12,7 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
-from apps.core.views import HealthCheckView
+from apps.core.views import HealthCheckView, MetricsView, SlowRequestsView
 
 urlpatterns = [
     # Admin
@@ -21,6 +21,10 @@ urlpatterns = [
     # Health Check
     path('api/health/', HealthCheckView.as_view(), name='health-check'),
 
+    # Instrumentation
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    path('api/v1/admin/slow-requests/', SlowRequestsView.as_view(), name='slow-requests'),
+
     # API v1
     path('api/v1/auth/', include('apps.users.urls')),
     path('api/v1/students/', include('apps.students.urls')),